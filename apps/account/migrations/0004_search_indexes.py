@@ -0,0 +1,47 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("account", "0003_remove_perfilsubcontratado_cnpj"),
+        ("core", "0002_search_indexes"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="customuser",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("first_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_first_name_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="customuser",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("last_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="user_last_name_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="customuser",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("email"), name="gin_trgm_ops"
+                ),
+                name="user_email_trgm",
+            ),
+        ),
+    ]
@@ -5,6 +5,7 @@ from .choice_types import (
 from django.contrib.auth.models import AbstractUser, Group, Permission
 from django.db import models
 from django.utils import timezone
+from core.search import trigram_index
 import uuid
 
 
@@ -49,6 +50,12 @@ class CustomUser(AbstractUser):
     class Meta:
         verbose_name = 'Usuário'
         verbose_name_plural = 'Usuários'
+        indexes = [
+            # Busca de contatos por nome/email (core.search.FullTextSearchFilter)
+            trigram_index('first_name', 'user_first_name_trgm'),
+            trigram_index('last_name', 'user_last_name_trgm'),
+            trigram_index('email', 'user_email_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
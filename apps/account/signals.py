@@ -9,6 +9,7 @@ from .models import (
     PerfilFornecedor
 )
 from .choice_types import NivelAcesso, Cargo, Departamento
+from core.resolver import Resolver
 
 # ✅ ADICIONAR ESTA NOVA FUNÇÃO
 
@@ -23,16 +24,16 @@ def create_superuser_profile(sender, instance, created, **kwargs):
         if not hasattr(instance, 'perfil_interno'):
             try:
                 # Buscar dados padrão para superuser
-                nivel_executivo = NivelAcesso.objects.get(code='EXECUTIVO')
-                cargo_ceo = Cargo.objects.get(code='CEO')
-                depto_executivo = Departamento.objects.get(code='EXECUTIVO')
+                nivel_executivo = Resolver.id(NivelAcesso, 'EXECUTIVO')
+                cargo_ceo = Resolver.id(Cargo, 'CEO')
+                depto_executivo = Resolver.id(Departamento, 'EXECUTIVO')
 
                 # Criar perfil
                 PerfilInterno.objects.create(
                     user=instance,
-                    cargo=cargo_ceo,
-                    departamento=depto_executivo,
-                    nivel_acesso=nivel_executivo
+                    cargo_id=cargo_ceo,
+                    departamento_id=depto_executivo,
+                    nivel_acesso_id=nivel_executivo
                 )
                 print(
                     f"✅ PerfilInterno criado automaticamente para superuser: {instance.email}")
@@ -55,19 +56,19 @@ def ensure_internal_profile(sender, instance, **kwargs):
         try:
             # Dados padrão baseados no tipo
             if instance.is_superuser:
-                nivel = NivelAcesso.objects.get(code='EXECUTIVO')
-                cargo = Cargo.objects.get(code='CEO')
-                depto = Departamento.objects.get(code='EXECUTIVO')
+                nivel = Resolver.id(NivelAcesso, 'EXECUTIVO')
+                cargo = Resolver.id(Cargo, 'CEO')
+                depto = Resolver.id(Departamento, 'EXECUTIVO')
             else:
-                nivel = NivelAcesso.objects.get(code='BASICO')
-                cargo = Cargo.objects.get(code='ADMINISTRATIVO')  
-                depto = Departamento.objects.get(code='RH')
+                nivel = Resolver.id(NivelAcesso, 'BASICO')
+                cargo = Resolver.id(Cargo, 'ADMINISTRATIVO')
+                depto = Resolver.id(Departamento, 'RH')
             
             PerfilInterno.objects.create(
                 user=instance,
-                cargo=cargo,
-                departamento=depto,
-                nivel_acesso=nivel
+                cargo_id=cargo,
+                departamento_id=depto,
+                nivel_acesso_id=nivel
             )
             
         except Exception as e:
@@ -1,5 +1,5 @@
 from rest_framework import status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db import transaction
@@ -29,7 +29,9 @@ from .serializers import (
 )
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
+from core.reference_cache import cached_reference_data
 from core.swagger_tags import API_TAGS
+from core.throttling import PublicFormRateThrottle, ReferenceDataRateThrottle
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
@@ -68,6 +70,7 @@ class CustomTokenRefreshView(TokenRefreshView):
 class DynamicRegisterView(APIView):
     """View para registro de novos usuários com verificação de email"""
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PublicFormRateThrottle]
     # Mapear tipos para serializers
     SERIALIZER_MAP = {
         'client': ClientRegistrationSerializer,
@@ -349,6 +352,7 @@ class UserProfileView(APIView):
 class PasswordResetRequestView(APIView):
     """View para solicitar reset de senha"""
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PublicFormRateThrottle]
 
     @swagger_auto_schema(
         tags=[API_TAGS['ACCOUNT']],
@@ -410,6 +414,7 @@ class PasswordResetRequestView(APIView):
 class PasswordResetConfirmView(APIView):
     """View para confirmar reset de senha"""
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PublicFormRateThrottle]
 
     @swagger_auto_schema(
         tags=[API_TAGS['ACCOUNT']],
@@ -541,6 +546,8 @@ def verify_token_view(request):
 )
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([ReferenceDataRateThrottle])
+@cached_reference_data()
 def choices_view(request):
     """Retorna todas as opções disponíveis para formulários"""
     from .choice_types import TipoUsuario, Idioma, NivelAcesso, MetodoContato, FrequenciaAtualizacao
@@ -557,6 +564,7 @@ def choices_view(request):
 class VerifyEmailView(APIView):
     """View para verificar email através do token"""
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PublicFormRateThrottle]
 
     @swagger_auto_schema(
         tags=[API_TAGS['ACCOUNT']],
@@ -593,6 +601,7 @@ class VerifyEmailView(APIView):
 class ResendEmailVerificationView(APIView):
     """View para reenviar email de verificação"""
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [PublicFormRateThrottle]
 
     @swagger_auto_schema(
         tags=[API_TAGS['ACCOUNT']],
@@ -657,6 +666,8 @@ class ResendEmailVerificationView(APIView):
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([ReferenceDataRateThrottle])
+@cached_reference_data()
 def registration_choices_view(request):
     """Endpoint helper para obter guia completo de registro"""
     from .choice_types import (
@@ -1057,6 +1068,7 @@ class AllUsersListView(APIView):
 )
 @api_view(['GET'])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([ReferenceDataRateThrottle])
 def user_types_and_fields_view(request):
     """Retorna tipos de usuário disponíveis e seus campos específicos"""
 
@@ -3,6 +3,7 @@ from django.core.validators import MinValueValidator
 from decimal import Decimal
 from leads.models import Lead
 from simple_history.models import HistoricalRecords
+from core.search import trigram_index
 from ...projects.models.incorporation import Incorporation
 import uuid
 from django.contrib.auth import get_user_model
@@ -119,6 +120,8 @@ class Contract(models.Model):
             models.Index(fields=['sign_date']),
             models.Index(fields=['incorporation']),
             models.Index(fields=['lead']),
+            # Busca parcial por número (core.search.FullTextSearchFilter)
+            trigram_index('contract_number', 'contract_number_trgm'),
         ]
 
     def __str__(self):
@@ -16,5 +16,6 @@ class CoreConfig(AppConfig):
 
     def ready(self):
         """Executado quando app é carregado"""
-        # Import signals se necessário
-        pass
+        # Invalidação do cache de referência (core.reference_cache) e
+        # manutenção do índice da busca global (core.search_documents)
+        from . import signals  # noqa: F401
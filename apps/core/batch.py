@@ -0,0 +1,260 @@
+# apps/core/batch.py
+"""
+Multi-GET em lote (POST /api/batch/)
+
+Executa várias leituras heterogêneas (detalhes de projeto, fases, contatos,
+choices...) em uma única requisição HTTP:
+- A autenticação é feita UMA vez; os sub-requests reutilizam o usuário já
+  autenticado (sem nova validação de JWT / busca do usuário por chamada)
+- Cada sub-request é resolvido pelo URLconf e despachado em processo para a
+  view correspondente, com as mesmas permissões, filtros e paginação
+- Apenas GET: o lote é somente leitura
+- Apenas respostas JSON: sub-requests que respondem arquivo ou streaming
+  (export, bundle) retornam 406 no item; a resposta é sempre fechada (libera
+  a vaga de limit_concurrency e o gerador do streaming)
+
+Limites por lote:
+- BATCH_MAX_REQUESTS: quantidade máxima de sub-requests
+- BATCH_MAX_QUERIES: orçamento total de queries SQL; ao estourar, o
+  sub-request corrente e os seguintes retornam 429 sem executar
+"""
+import io
+import json
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import connection
+from django.urls import Resolver404, resolve
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .swagger_tags import API_TAGS
+
+BATCH_MAX_REQUESTS = getattr(settings, 'BATCH_MAX_REQUESTS', 20)
+BATCH_MAX_QUERIES = getattr(settings, 'BATCH_MAX_QUERIES', 500)
+BATCH_PATH_PREFIX = '/api/'
+
+# Headers do request externo que não se aplicam aos sub-requests
+_DROPPED_META = (
+    'CONTENT_LENGTH',
+    'CONTENT_TYPE',
+    'HTTP_IF_NONE_MATCH',
+    'HTTP_IF_MODIFIED_SINCE',
+    'HTTP_IF_MATCH',
+    'HTTP_IF_UNMODIFIED_SINCE',
+)
+
+
+class QueryBudgetExceeded(Exception):
+    """Orçamento de queries do lote esgotado"""
+
+
+class _QueryBudget:
+    """execute_wrapper que conta as queries do lote e interrompe ao estourar"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if self.count >= self.limit:
+            raise QueryBudgetExceeded
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _query_string(query):
+    if not query:
+        return ''
+    if isinstance(query, str):
+        return query.lstrip('?')
+    return urlencode(query, doseq=True)
+
+
+def _parse_item(item):
+    """(path, query_string) de um sub-request; levanta ValueError se inválido"""
+    if isinstance(item, str):
+        item = {'path': item}
+    if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+        raise ValueError('Cada item deve ser um objeto com "path".')
+
+    path, _, inline_query = item['path'].partition('?')
+    query = item.get('query')
+    if query is not None and not isinstance(query, (str, dict)):
+        raise ValueError('"query" deve ser um objeto ou uma string.')
+
+    if not path.startswith(BATCH_PATH_PREFIX):
+        raise ValueError(f'Apenas paths sob {BATCH_PATH_PREFIX} são aceitos.')
+
+    query_string = '&'.join(part for part in (inline_query, _query_string(query)) if part)
+    return path, query_string
+
+
+class BatchView(APIView):
+    """
+    View de leitura em lote
+
+    ENDPOINTS:
+    POST /api/batch/ - Executa uma lista de GETs e retorna as respostas juntas
+
+    PAYLOAD:
+    [
+        {"path": "/api/projects/projects/12/", "query": {"fields": "id,project_name"}},
+        {"path": "/api/projects/projects/12/phases/"},
+        {"path": "/api/projects/contacts/?project=12"}
+    ]
+
+    RETURNS:
+    {
+        "responses": [{"path": ..., "status": 200, "body": {...}}, ...],
+        "queries": 9
+    }
+    """
+
+    permission_classes = [IsAuthenticated]
+    max_requests = BATCH_MAX_REQUESTS
+    max_queries = BATCH_MAX_QUERIES
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['CORE']],
+        operation_summary="Leitura em lote",
+        operation_description=(
+            "Executa até BATCH_MAX_REQUESTS GETs em uma única chamada, reutilizando "
+            "a autenticação. Cada item informa `path` (sob /api/) e `query` opcional."
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_ARRAY,
+            items=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                required=['path'],
+                properties={
+                    'path': openapi.Schema(type=openapi.TYPE_STRING),
+                    'query': openapi.Schema(type=openapi.TYPE_OBJECT),
+                },
+            ),
+        ),
+        responses={200: 'Respostas dos sub-requests', 400: 'Payload inválido'}
+    )
+    def post(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'detail': 'Envie uma lista não vazia de sub-requests.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > self.max_requests:
+            return Response(
+                {'detail': f'Máximo de {self.max_requests} sub-requests por lote.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        budget = _QueryBudget(self.max_queries)
+        responses = []
+        with connection.execute_wrapper(budget):
+            for item in items:
+                responses.append(self._dispatch(request, item, budget))
+
+        return Response({'responses': responses, 'queries': budget.count})
+
+    def _dispatch(self, request, item, budget):
+        try:
+            path, query_string = _parse_item(item)
+        except ValueError as exc:
+            raw_path = item.get('path') if isinstance(item, dict) else item
+            return {'path': raw_path, 'status': status.HTTP_400_BAD_REQUEST, 'body': {'detail': str(exc)}}
+
+        full_path = f'{path}?{query_string}' if query_string else path
+        if budget.count >= budget.limit:
+            return self._budget_exceeded(full_path)
+
+        try:
+            match = resolve(path)
+        except Resolver404:
+            return {'path': full_path, 'status': status.HTTP_404_NOT_FOUND,
+                    'body': {'detail': 'Não encontrado.'}}
+        if getattr(match.func, 'view_class', None) is type(self):
+            return {'path': full_path, 'status': status.HTTP_400_BAD_REQUEST,
+                    'body': {'detail': 'Lotes aninhados não são permitidos.'}}
+
+        sub_request = self._build_request(request, path, query_string)
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except QueryBudgetExceeded:
+            return self._budget_exceeded(full_path)
+
+        try:
+            if not self._is_json(response):
+                return {'path': full_path, 'status': status.HTTP_406_NOT_ACCEPTABLE,
+                        'body': {'detail': 'Resposta não JSON (arquivo ou streaming) não é suportada no lote.'}}
+            return {'path': full_path, 'status': response.status_code, 'body': self._body(response)}
+        finally:
+            self._close(response)
+
+    def _build_request(self, request, path, query_string):
+        """WSGIRequest GET com o mesmo ambiente e o usuário já autenticado"""
+        environ = {
+            key: value for key, value in request._request.META.items()
+            if key not in _DROPPED_META
+        }
+        environ.update({
+            'REQUEST_METHOD': 'GET',
+            'PATH_INFO': path,
+            'SCRIPT_NAME': '',
+            'QUERY_STRING': query_string,
+            'wsgi.input': io.BytesIO(b''),
+        })
+        sub_request = WSGIRequest(environ)
+        sub_request.user = request.user
+        # Reaproveitado por rest_framework.request.Request (ForcedAuthentication)
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        return sub_request
+
+    @staticmethod
+    def _is_json(response):
+        """Dados DRF ainda não renderizados, JSON já renderizado ou corpo vazio"""
+        if getattr(response, 'streaming', False):
+            return False
+        if getattr(response, 'data', None) is not None:
+            return True
+        if response.status_code == status.HTTP_304_NOT_MODIFIED or not response.content:
+            return True
+        # Respostas já renderizadas (ex: core.reference_cache)
+        return response.get('Content-Type', '').startswith('application/json')
+
+    @staticmethod
+    def _body(response):
+        data = getattr(response, 'data', None)
+        if data is not None:
+            return data
+        if response.status_code == status.HTTP_304_NOT_MODIFIED or not response.content:
+            return None
+        return json.loads(response.content)
+
+    @staticmethod
+    def _close(response):
+        """
+        Executa os closers da resposta (vaga de limit_concurrency, gerador do
+        streaming), como response.close(), mas sem o request_finished: o
+        request externo continua e close_old_connections fecharia a conexão
+        do banco no meio do lote
+        """
+        for closer in response._resource_closers:
+            try:
+                closer()
+            except Exception:
+                pass
+        response._resource_closers.clear()
+
+    @staticmethod
+    def _budget_exceeded(full_path):
+        return {'path': full_path, 'status': status.HTTP_429_TOO_MANY_REQUESTS,
+                'body': {'detail': 'Orçamento de queries do lote esgotado.'}}
+
+
+batch_view = BatchView.as_view()
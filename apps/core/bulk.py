@@ -0,0 +1,507 @@
+# apps/core/bulk.py
+"""
+Criação/atualização em lote (POST/PATCH .../bulk/)
+
+Fluxo por requisição (independente do número de itens):
+- Um único serializer é instanciado; os campos são montados uma vez e
+  reaproveitados em todos os itens.
+- FKs (PrimaryKeyRelatedField) são resolvidas com UMA query `IN` por model
+  relacionado, antes da validação dos itens.
+- Unicidade (unique / unique_together) é verificada em conjunto: uma query
+  por restrição + duplicatas dentro do próprio lote.
+- Escrita com bulk_create / bulk_update em uma transação, com os registros
+  de histórico (simple_history) inseridos em lote.
+- PATCH: validação e escrita na mesma transação, com as linhas travadas
+  (select_for_update) ao carregar; o UPDATE grava apenas os campos
+  recebidos, os alterados por prepare_bulk_instance() e os auto_now.
+- Documentos da busca global (core.search_documents) reindexados no commit.
+- Detalhes em cache (core.detail_cache) dos objetos afetados invalidados.
+
+Erros são retornados por item (índice na lista enviada) e nada é gravado
+se qualquer item for inválido.
+"""
+from django.conf import settings
+from django.core.exceptions import NON_FIELD_ERRORS, FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import models, transaction
+from django.utils import timezone
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.validators import UniqueTogetherValidator, UniqueValidator
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from .detail_cache import invalidate_detail_cache
+from .search_documents import schedule_reindex
+
+BULK_MAX_ITEMS = getattr(settings, 'BULK_MAX_ITEMS', 1000)
+
+
+def _to_pk(model, value):
+    """Normaliza um valor de pk recebido na requisição (ValueError/TypeError se inválido)"""
+    if isinstance(value, bool):
+        raise TypeError(value)
+    try:
+        return model._meta.pk.to_python(value)
+    except DjangoValidationError:
+        raise ValueError(value)
+
+
+class PrefetchedLookup:
+    """
+    Substitui o queryset de um RelatedField por objetos já carregados
+
+    O PrimaryKeyRelatedField resolve cada valor com queryset.get(pk=...);
+    aqui a resolução é feita em memória a partir de uma única query `IN`.
+    """
+
+    def __init__(self, model, objects):
+        self.model = model
+        self.objects = {obj.pk: obj for obj in objects}
+
+    def all(self):
+        return self
+
+    def get(self, pk):
+        try:
+            return self.objects[_to_pk(self.model, pk)]
+        except KeyError:
+            raise self.model.DoesNotExist
+
+
+def _writable_related_fields(serializer):
+    """(nome do campo de entrada, PrimaryKeyRelatedField) dos campos graváveis"""
+    for name, field in serializer.fields.items():
+        if field.read_only:
+            continue
+        if isinstance(field, serializers.ManyRelatedField):
+            yield name, field.child_relation, True
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            yield name, field, False
+
+
+def preload_related_fields(serializer, items):
+    """
+    Troca o queryset de cada FK do serializer por um PrefetchedLookup
+
+    Campos que apontam para o mesmo model sem filtros (ex: assigned_to,
+    supervisor e team_members -> User) compartilham uma única query.
+    """
+    groups = {}
+    for name, field, many in _writable_related_fields(serializer):
+        if field.queryset is None or field.pk_field is not None:
+            continue
+        queryset = field.get_queryset()
+        model = queryset.model
+        key = model if not queryset.query.has_filters() else (model, name)
+        group = groups.setdefault(key, {'queryset': queryset, 'fields': [], 'values': set()})
+        group['fields'].append(field)
+
+        for item in items:
+            raw = item.get(name) if isinstance(item, dict) else None
+            for value in (raw if many and isinstance(raw, (list, tuple)) else [raw]):
+                if value is None:
+                    continue
+                try:
+                    group['values'].add(_to_pk(model, value))
+                except (TypeError, ValueError):
+                    continue
+
+    for group in groups.values():
+        queryset = group['queryset']
+        objects = queryset.filter(pk__in=group['values']) if group['values'] else []
+        lookup = PrefetchedLookup(queryset.model, objects)
+        for field in group['fields']:
+            field.queryset = lookup
+
+
+def strip_unique_validators(serializer):
+    """Remove os validadores de unicidade por linha (verificados em conjunto depois)"""
+    serializer.validators = [
+        validator for validator in serializer.validators
+        if not isinstance(validator, UniqueTogetherValidator)
+    ]
+    for field in serializer.fields.values():
+        field.validators = [
+            validator for validator in field.validators
+            if not isinstance(validator, UniqueValidator)
+        ]
+
+
+def unique_field_sets(model):
+    """Conjuntos de campos únicos do model (unique, unique_together, UniqueConstraint)"""
+    field_sets = [
+        (field.name,) for field in model._meta.local_concrete_fields
+        if field.unique and not field.primary_key
+    ]
+    field_sets.extend(tuple(fields) for fields in model._meta.unique_together)
+    field_sets.extend(
+        tuple(constraint.fields) for constraint in model._meta.total_unique_constraints
+    )
+    return list(dict.fromkeys(field_sets))
+
+
+class BulkWriteMixin:
+    """
+    Ação /bulk/ para criação (POST) e atualização parcial (PATCH) em lote
+
+    ENDPOINTS:
+    - POST  .../bulk/  - Lista de objetos no formato do create
+    - PATCH .../bulk/  - Lista de objetos com 'id' + campos a alterar
+
+    RETURNS:
+    - 201/200: {'created'|'updated': n, 'ids': [...]}
+    - 400: {'errors': [{'index': i, 'errors': {...}}, ...]} (nada é gravado)
+
+    USAGE:
+        class TaskProjectViewSet(BulkWriteMixin, viewsets.ModelViewSet):
+            ...
+
+    Os serializers de create/partial_update da ViewSet são reaproveitados.
+    O save() do model NÃO é chamado: efeitos colaterais do save() devem ser
+    replicados em prepare_bulk_instance(). model.clean() é executado.
+    """
+    bulk_max_items = None
+    bulk_serializer_class = None
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        partial = request.method == 'PATCH'
+        items = request.data
+        max_items = self.bulk_max_items or BULK_MAX_ITEMS
+
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'detail': 'Expected a non-empty list of objects.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > max_items:
+            return Response(
+                {'detail': f'Too many items: {len(items)} (max {max_items}).'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            return self._bulk_write(items, partial)
+
+    def _bulk_write(self, items, partial):
+        """Validação + escrita (dentro da transação aberta por bulk())"""
+        errors = {}
+        existing = self._load_bulk_instances(items, errors) if partial else {}
+
+        serializer = self.get_bulk_serializer_class(partial)(
+            context=self.get_serializer_context(), partial=partial
+        )
+        strip_unique_validators(serializer)
+        preload_related_fields(serializer, items)
+
+        model = serializer.Meta.model
+        validated = {}
+        for index, item in enumerate(items):
+            if index in errors:
+                continue
+            serializer.instance = existing.get(index)
+            serializer.initial_data = item
+            try:
+                validated[index] = serializer.run_validation(item)
+            except serializers.ValidationError as exc:
+                errors[index] = serializers.as_serializer_error(exc)
+        serializer.instance = None
+
+        self._check_raw_foreign_keys(model, validated, errors)
+
+        instances = {}
+        m2m_values = {}
+        update_fields = set()
+        defaults = {} if partial else self.get_bulk_create_defaults()
+        for index, data in validated.items():
+            if index in errors:
+                continue
+            instance = existing.get(index) or model(**defaults)
+            loaded = self._concrete_values(model, instance) if partial else None
+            m2m_values[index] = self._apply_values(model, instance, data)
+            self.prepare_bulk_instance(instance, created=not partial)
+            if partial:
+                update_fields.update(self._update_fields(model, instance, data, loaded))
+            try:
+                self._clean_instance(model, instance, data)
+            except DjangoValidationError as exc:
+                errors[index] = self._django_error_dict(exc)
+                continue
+            instances[index] = instance
+
+        self._check_unique(model, instances, errors, exclude_pks=[
+            instance.pk for instance in existing.values()
+        ])
+
+        if errors:
+            return Response(
+                {'errors': [
+                    {'index': index, 'errors': errors[index]} for index in sorted(errors)
+                ]},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        ordered = [instances[index] for index in sorted(instances)]
+        ordered_m2m = [m2m_values[index] for index in sorted(instances)]
+        if partial:
+            self._bulk_update(model, ordered, update_fields)
+        else:
+            ordered = self._bulk_create(model, ordered)
+        self._write_m2m(model, ordered, ordered_m2m, replace=partial)
+        # bulk_create / bulk_update não disparam post_save
+        schedule_reindex(model, ordered)
+        invalidate_detail_cache(model, ordered)
+
+        key = 'updated' if partial else 'created'
+        return Response(
+            {key: len(ordered), 'ids': [instance.pk for instance in ordered]},
+            status=status.HTTP_200_OK if partial else status.HTTP_201_CREATED
+        )
+
+    # ------------------------------------------------------------------
+    # Hooks
+    # ------------------------------------------------------------------
+    def get_bulk_serializer_class(self, partial):
+        """Serializer de entrada: o mesmo do create / partial_update da ViewSet"""
+        if self.bulk_serializer_class is not None:
+            return self.bulk_serializer_class
+        current_action = self.action
+        self.action = 'partial_update' if partial else 'create'
+        try:
+            return self.get_serializer_class()
+        finally:
+            self.action = current_action
+
+    def get_bulk_queryset(self):
+        """Queryset usado para carregar os objetos do PATCH (uma query)"""
+        return self.get_queryset()
+
+    def get_bulk_create_defaults(self):
+        """Valores aplicados a todos os objetos criados (equivalente ao perform_create)"""
+        model = self.get_queryset().model
+        if any(field.name == 'created_by' for field in model._meta.concrete_fields):
+            return {'created_by': self.request.user}
+        return {}
+
+    def prepare_bulk_instance(self, instance, created):
+        """Ajustes por objeto antes da gravação (substitui a lógica do save())"""
+
+    # ------------------------------------------------------------------
+    # Validação
+    # ------------------------------------------------------------------
+    def _load_bulk_instances(self, items, errors):
+        """
+        Carrega os objetos do PATCH e mapeia índice -> instância
+
+        As linhas são travadas (SELECT ... FOR UPDATE, em ordem de pk) antes
+        da leitura: uma escrita concorrente espera esta transação e nada do
+        que foi lido fica desatualizado até o UPDATE. O lock é uma query
+        separada porque get_bulk_queryset() pode ter joins/anotações que não
+        aceitam FOR UPDATE.
+        """
+        model = self.get_queryset().model
+        wanted = {}
+        seen = set()
+        for index, item in enumerate(items):
+            raw = item.get('id') if isinstance(item, dict) else None
+            if raw is None:
+                errors[index] = {'id': ['This field is required.']}
+                continue
+            try:
+                pk = _to_pk(model, raw)
+            except (TypeError, ValueError):
+                errors[index] = {'id': [f'Invalid id "{raw}".']}
+                continue
+            if pk in seen:
+                errors[index] = {'id': ['Duplicate id in this request.']}
+                continue
+            seen.add(pk)
+            wanted[index] = pk
+
+        locked = list(
+            model._default_manager.select_for_update()
+            .filter(pk__in=seen).order_by('pk').values_list('pk', flat=True)
+        )
+        found = self.get_bulk_queryset().in_bulk(locked)
+        existing = {}
+        for index, pk in wanted.items():
+            if pk in found:
+                existing[index] = found[pk]
+            else:
+                errors[index] = {'id': ['Not found.']}
+        return existing
+
+    def _check_raw_foreign_keys(self, model, validated, errors):
+        """
+        FKs recebidas como id (ex: IntegerField com source='contact')
+
+        Uma query `IN` por FK, respeitando limit_choices_to.
+        """
+        for model_field in model._meta.concrete_fields:
+            if not model_field.many_to_one:
+                continue
+            values = {
+                index: data[model_field.name] for index, data in validated.items()
+                if data.get(model_field.name) is not None
+                and not isinstance(data[model_field.name], models.Model)
+            }
+            if not values:
+                continue
+
+            related_model = model_field.related_model
+            queryset = related_model._default_manager.complex_filter(
+                model_field.get_limit_choices_to() or {}
+            )
+            found = set(
+                queryset.filter(pk__in=set(values.values())).values_list('pk', flat=True)
+            )
+            for index, value in values.items():
+                if value not in found:
+                    errors.setdefault(index, {})[model_field.name] = [
+                        f'Invalid pk "{value}" - object does not exist.'
+                    ]
+
+    @staticmethod
+    def _apply_values(model, instance, data):
+        """Aplica os dados validados na instância; retorna os valores M2M separados"""
+        m2m = {}
+        for name, value in data.items():
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                setattr(instance, name, value)
+                continue
+            if model_field.many_to_many:
+                m2m[name] = value
+            elif model_field.many_to_one and value is not None and not isinstance(value, models.Model):
+                setattr(instance, model_field.attname, value)
+            else:
+                setattr(instance, name, value)
+        return m2m
+
+    @staticmethod
+    def _concrete_values(model, instance):
+        return {field.attname: getattr(instance, field.attname) for field in model._meta.concrete_fields}
+
+    @staticmethod
+    def _update_fields(model, instance, data, loaded):
+        """Campos do UPDATE: os recebidos + os alterados por prepare_bulk_instance()"""
+        fields = set()
+        for name in data:
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete and not model_field.many_to_many:
+                fields.add(model_field.name)
+        for model_field in model._meta.concrete_fields:
+            if getattr(instance, model_field.attname) != loaded[model_field.attname]:
+                fields.add(model_field.name)
+        return fields
+
+    @staticmethod
+    def _clean_instance(model, instance, data):
+        """clean_fields() nos campos recebidos + clean() do model (sem queries de FK)"""
+        touched = set(data)
+        exclude = [
+            field.name for field in model._meta.concrete_fields
+            if field.name not in touched or field.is_relation
+        ]
+        instance.clean_fields(exclude=exclude)
+        instance.clean()
+
+    @staticmethod
+    def _django_error_dict(exc):
+        if hasattr(exc, 'error_dict'):
+            return {
+                (api_settings.NON_FIELD_ERRORS_KEY if key == NON_FIELD_ERRORS else key): messages
+                for key, messages in exc.message_dict.items()
+            }
+        return {api_settings.NON_FIELD_ERRORS_KEY: exc.messages}
+
+    def _check_unique(self, model, instances, errors, exclude_pks):
+        """Unicidade em conjunto: duplicatas no lote + uma query por restrição"""
+        for field_names in unique_field_sets(model):
+            attnames = [model._meta.get_field(name).attname for name in field_names]
+            error_key = field_names[0] if len(field_names) == 1 else api_settings.NON_FIELD_ERRORS_KEY
+
+            keys = {}
+            for index, instance in instances.items():
+                key = tuple(getattr(instance, attname) for attname in attnames)
+                if any(value is None for value in key):
+                    continue
+                keys[index] = key
+            if not keys:
+                continue
+
+            taken = set(
+                model._default_manager
+                .filter(**{f'{attnames[0]}__in': {key[0] for key in keys.values()}})
+                .exclude(pk__in=exclude_pks)
+                .values_list(*attnames)
+            )
+            seen = set()
+            for index, key in keys.items():
+                if key in taken or key in seen:
+                    message = instances[index].unique_error_message(model, field_names)
+                    errors.setdefault(index, {}).setdefault(error_key, []).extend(message.messages)
+                seen.add(key)
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def _history_user(self):
+        user = getattr(self.request, 'user', None)
+        return user if user is not None and user.is_authenticated else None
+
+    def _bulk_create(self, model, instances):
+        if getattr(model._meta, 'simple_history_manager_attribute', None):
+            return bulk_create_with_history(instances, model, default_user=self._history_user())
+        return model._default_manager.bulk_create(instances)
+
+    def _bulk_update(self, model, instances, update_fields):
+        """UPDATE apenas dos campos alterados no lote (+ auto_now)"""
+        now = timezone.now()
+        fields = []
+        for field in model._meta.concrete_fields:
+            if field.primary_key:
+                continue
+            if getattr(field, 'auto_now', False):
+                for instance in instances:
+                    setattr(instance, field.attname, now)
+            elif field.name not in update_fields:
+                continue
+            fields.append(field.name)
+        if not fields:
+            return
+
+        if getattr(model._meta, 'simple_history_manager_attribute', None):
+            bulk_update_with_history(instances, model, fields, default_user=self._history_user())
+        else:
+            model._default_manager.bulk_update(instances, fields)
+
+    @staticmethod
+    def _write_m2m(model, instances, m2m_values, replace):
+        """Grava as relações M2M direto na tabela intermediária (um INSERT por campo)"""
+        names = {name for values in m2m_values for name in values}
+        for name in names:
+            model_field = model._meta.get_field(name)
+            through = model_field.remote_field.through
+            source = through._meta.get_field(model_field.m2m_field_name()).attname
+            target = through._meta.get_field(model_field.m2m_reverse_field_name()).attname
+
+            owners = [
+                (instance, values[name]) for instance, values in zip(instances, m2m_values)
+                if name in values
+            ]
+            if replace:
+                through._default_manager.filter(
+                    **{f'{source}__in': [instance.pk for instance, _ in owners]}
+                ).delete()
+            through._default_manager.bulk_create([
+                through(**{source: instance.pk, target: related.pk})
+                for instance, related_objects in owners
+                for related in related_objects
+            ])
@@ -0,0 +1,183 @@
+# apps/core/conditional.py
+"""
+GET condicional (ETag / Last-Modified)
+
+Os validadores são calculados ANTES da serialização, a partir de dados
+baratos do banco:
+- Listas: max(updated_at) + count do queryset filtrado (uma query agregada)
+- Detalhe: updated_at do objeto
+- Endpoints agregados (conditional_on_models): max(updated_at) + count de
+  cada model usado (choices/form-data usam core.reference_cache)
+
+Se o cliente enviar If-None-Match / If-Modified-Since compatíveis, a resposta
+é 304 sem serializar nada.
+"""
+import functools
+import hashlib
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+def _has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _build_etag(*parts):
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return quote_etag(digest)
+
+
+def _request_fingerprint(request):
+    """Partes do request que mudam o conteúdo da resposta"""
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else 'anon'
+    return request.get_host(), request.get_full_path(), user_id
+
+
+def queryset_validators(queryset, timestamp_field='updated_at'):
+    """
+    (max(timestamp), count) do queryset em uma única query
+
+    Returns:
+        (last_modified: datetime | None, count: int)
+    """
+    result = queryset.order_by().aggregate(
+        last_modified=Max(timestamp_field),
+        count=Count('pk'),
+    )
+    return result['last_modified'], result['count']
+
+
+def _not_modified_or_none(request, etag, last_modified):
+    """Resposta 304/412 se as pré-condições do cliente baterem, senão None"""
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is not None and response.status_code == 304:
+        response['ETag'] = etag
+        if timestamp:
+            response['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def set_conditional_headers(response, etag, last_modified):
+    """Adiciona ETag/Last-Modified e força revalidação pelo cliente"""
+    if response.status_code != 200:
+        return response
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(int(last_modified.timestamp()))
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified para list e retrieve de ModelViewSets
+
+    - list: validadores a partir de max(updated_at) + count do queryset
+      filtrado (mesmos filtros/busca/paginação da requisição)
+    - retrieve: validadores a partir do updated_at do objeto
+
+    Models sem o campo de timestamp seguem o fluxo normal.
+    """
+    conditional_timestamp_field = 'updated_at'
+
+    def _conditional_enabled(self, model):
+        return _has_field(model, self.conditional_timestamp_field)
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not self._conditional_enabled(queryset.model):
+            return super().list(request, *args, **kwargs)
+
+        last_modified, count = queryset_validators(queryset, self.conditional_timestamp_field)
+        etag = _build_etag(
+            queryset.model._meta.label, last_modified, count,
+            self.get_serializer_class().__name__, *_request_fingerprint(request)
+        )
+        not_modified = _not_modified_or_none(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            response = self.get_paginated_response(serializer.data)
+        else:
+            serializer = self.get_serializer(queryset, many=True)
+            response = Response(serializer.data)
+        return set_conditional_headers(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if not self._conditional_enabled(type(instance)):
+            return Response(self.get_serializer(instance).data)
+
+        last_modified = getattr(instance, self.conditional_timestamp_field)
+        etag = _build_etag(
+            instance._meta.label, instance.pk, last_modified,
+            self.get_serializer_class().__name__, *_request_fingerprint(request)
+        )
+        not_modified = _not_modified_or_none(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return set_conditional_headers(Response(serializer.data), etag, last_modified)
+
+
+def conditional_on_models(*models, timestamp_field='updated_at'):
+    """
+    GET condicional para endpoints de referência (choices, form-data)
+
+    O ETag é derivado de max(updated_at) + count de cada model usado para
+    montar a resposta, então qualquer criação/edição/remoção invalida.
+
+    Args:
+        models: classes de model ou labels 'app.Model' (resolvidos no request,
+            útil quando o import precisa ser tardio)
+
+    USAGE:
+        @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+        @conditional_on_models(County, HOA)
+        def choices(self, request):
+            ...
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = next(
+                arg for arg in args if hasattr(arg, 'META') and hasattr(arg, 'method')
+            )
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(*args, **kwargs)
+
+            parts = []
+            last_modified = None
+            for model in models:
+                if isinstance(model, str):
+                    model = apps.get_model(model)
+                model_last, count = queryset_validators(model._default_manager.all(), timestamp_field)
+                parts.extend([model._meta.label, model_last, count])
+                if model_last and (last_modified is None or model_last > last_modified):
+                    last_modified = model_last
+
+            etag = _build_etag(view_func.__qualname__, *parts, *_request_fingerprint(request))
+            not_modified = _not_modified_or_none(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+
+            response = view_func(*args, **kwargs)
+            return set_conditional_headers(response, etag, last_modified)
+        return wrapper
+    return decorator
@@ -0,0 +1,214 @@
+# apps/core/detail_cache.py
+"""
+Cache das respostas de detalhe (GET .../{id}/) de Lead, Project e Contract
+
+Os serializers de detalhe desses models aninham incorporação, status,
+usuário e propriedades calculadas com queries próprias (total_owners,
+total_projects, is_sold...). Aqui o resultado serializado fica em cache sob
+uma chave que inclui uma VERSÃO POR OBJETO:
+
+- core.signals troca a versão em post_save / post_delete do próprio objeto
+  e dos models dependentes registrados em DETAIL_CACHE_MODELS
+  (ex: TaskProject -> Project, ContractOwner -> Contract, e Project /
+  ContractProject -> projetos e contratos da incorporação)
+- BulkWriteMixin e TaskTransitionService (bulk_update não dispara signals)
+  chamam invalidate_detail_cache() explicitamente
+- Versão nova => chave nova; entradas antigas expiram sozinhas
+- A chave também inclui a versão dos dados de referência
+  (core.reference_cache), o dia corrente (is_delayed, days_old), o
+  serializer e o path com query string (?fields= do SparseFieldsetMixin)
+
+Backend: alias DETAIL_CACHE_ALIAS de settings.CACHES, no Redis
+(DETAIL_CACHE_URL ou REDIS_URL) para que a invalidação alcance todos os
+workers. Sem Redis configurado cai em LocMem, correto apenas com um único
+processo.
+
+ATENÇÃO: QuerySet.update() não dispara signals; após escritas em massa
+nesses models (ou nos dependentes) chame invalidate_detail_cache().
+
+USAGE:
+    class ProjectViewSet(DetailCacheMixin, ConditionalGetMixin, ..., viewsets.ModelViewSet):
+        ...
+
+    invalidate_detail_cache(Project, projects)
+"""
+import functools
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework.response import Response
+
+from .conditional import _build_etag, _not_modified_or_none, _request_fingerprint, set_conditional_headers
+from .reference_cache import get_reference_version
+
+DETAIL_CACHE_ALIAS = getattr(settings, 'DETAIL_CACHE_ALIAS', 'default')
+DETAIL_CACHE_TIMEOUT = getattr(settings, 'DETAIL_CACHE_TIMEOUT', 60 * 60)
+
+def _incorporation_projects(incorporation):
+    return list(incorporation.projects.values_list('pk', flat=True))
+
+
+def _incorporation_contracts(incorporation):
+    return list(incorporation.contracts.values_list('pk', flat=True))
+
+
+# model em cache -> {model dependente: função que recebe o objeto alterado
+# e retorna os IDs do model em cache a invalidar}
+#
+# Os detalhes de Project e Contract aninham IncorporationListSerializer,
+# cujos agregados (total_projects, projects_sold, sold_percentage) mudam
+# quando um projeto da incorporação é criado/removido ou vendido
+# (ContractProject): esses eventos invalidam todos os projetos e contratos
+# da incorporação.
+DETAIL_CACHE_MODELS = {
+    'leads.models.Lead': {},
+    'projects.models.Project': {
+        'projects.models.Project': lambda project: _incorporation_projects(project.incorporation),
+        'projects.models.PhaseProject': lambda phase: [phase.project_id],
+        'projects.models.TaskProject': lambda task: [task.phase_project.project_id],
+        'projects.models.ContractProject': lambda link: [
+            link.project_id, *_incorporation_projects(link.project.incorporation)],
+        'projects.models.Incorporation': _incorporation_projects,
+    },
+    'projects.models.Contract': {
+        'projects.models.Project': lambda project: _incorporation_contracts(project.incorporation),
+        'projects.models.ContractOwner': lambda owner: [owner.contract_id],
+        'projects.models.ContractProject': lambda link: [
+            link.contract_id, *_incorporation_contracts(link.project.incorporation)],
+        'projects.models.Incorporation': _incorporation_contracts,
+    },
+}
+
+
+def _cache():
+    return caches[DETAIL_CACHE_ALIAS]
+
+
+def _version_key(model, pk):
+    return f'detail:version:{model._meta.concrete_model._meta.label}:{pk}'
+
+
+@functools.lru_cache(maxsize=None)
+def _watched_models():
+    """model -> [(model em cache, função de IDs ou None para o próprio objeto)]"""
+    watched = {}
+    for path, dependencies in DETAIL_CACHE_MODELS.items():
+        cached_model = import_string(path)
+        watched.setdefault(cached_model, []).append((cached_model, None))
+        for dependency_path, resolve_ids in dependencies.items():
+            watched.setdefault(import_string(dependency_path), []).append((cached_model, resolve_ids))
+    return watched
+
+
+def is_detail_cached_model(model):
+    """True para models com detalhe em cache ou dependentes deles (proxies inclusos)"""
+    return isinstance(model, type) and model._meta.concrete_model in _watched_models()
+
+
+def get_detail_version(model, pk):
+    """Versão atual do objeto; criada na primeira leitura"""
+    cache = _cache()
+    key = _version_key(model, pk)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_detail_versions(model, pks):
+    """Troca a versão dos objetos (uma única escrita no backend)"""
+    pks = {pk for pk in pks if pk is not None}
+    if pks:
+        _cache().set_many(
+            {_version_key(model, pk): uuid.uuid4().hex for pk in pks}, timeout=None
+        )
+
+
+def _affected_versions(model, instances):
+    """{model em cache: {ids}} afetados pela alteração de `instances`"""
+    affected = {}
+    for cached_model, resolve_ids in _watched_models().get(model._meta.concrete_model, []):
+        ids = affected.setdefault(cached_model, set())
+        for instance in instances:
+            if resolve_ids is None:
+                ids.add(instance.pk)
+                continue
+            try:
+                ids.update(resolve_ids(instance))
+            except ObjectDoesNotExist:
+                # Objeto pai removido na mesma cascata: nada a invalidar
+                continue
+    return affected
+
+
+def invalidate_detail_cache(model, instances):
+    """
+    Invalida o detalhe em cache dos objetos afetados por `instances`
+
+    A versão é trocada agora e de novo após o commit: uma leitura
+    concorrente que guardou dados antigos sob a versão intermediária não
+    sobrevive ao commit. Models fora de DETAIL_CACHE_MODELS são ignorados.
+    """
+    affected = _affected_versions(model, instances)
+
+    def bump():
+        for cached_model, ids in affected.items():
+            bump_detail_versions(cached_model, ids)
+
+    if any(affected.values()):
+        bump()
+        transaction.on_commit(bump)
+
+
+class DetailCacheMixin:
+    """
+    Cache do retrieve de ModelViewSets (ver docstring do módulo)
+
+    get_object() continua sendo executado a cada requisição (404 e
+    permissões de objeto); o que sai do cache é a serialização. Compatível
+    com ConditionalGetMixin: o ETag deriva da chave do cache, então
+    If-None-Match válido retorna 304.
+
+    Deve vir ANTES de ConditionalGetMixin na lista de bases. O model da
+    ViewSet precisa estar em DETAIL_CACHE_MODELS.
+
+    detail_cache_per_user: separa o cache por usuário (serializers cuja
+    saída depende de request.user)
+    """
+    detail_cache_timeout = None
+    detail_cache_per_user = False
+
+    def get_detail_cache_key(self, request, instance):
+        host, full_path, user_id = _request_fingerprint(request)
+        return _build_etag(
+            instance._meta.label, instance.pk,
+            get_detail_version(type(instance), instance.pk),
+            get_reference_version(),
+            timezone.localdate(),
+            self.get_serializer_class().__name__,
+            host, full_path,
+            user_id if self.detail_cache_per_user else '*',
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = self.get_detail_cache_key(request, instance)
+        last_modified = getattr(instance, 'updated_at', None)
+        not_modified = _not_modified_or_none(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        cache = _cache()
+        cache_key = f'detail:{instance._meta.label}:{instance.pk}:{etag}'
+        data = cache.get(cache_key)
+        if data is None:
+            data = dict(self.get_serializer(instance).data)
+            cache.set(cache_key, data, self.detail_cache_timeout or DETAIL_CACHE_TIMEOUT)
+
+        return set_conditional_headers(Response(data), etag, last_modified)
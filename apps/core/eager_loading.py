@@ -0,0 +1,258 @@
+# apps/core/eager_loading.py
+"""
+Planejador automático de eager loading (select_related / Prefetch)
+
+Inspeciona os campos do serializer ativo e deriva as relações que serão
+lidas na serialização:
+- source com caminho pontuado ('phase_project.project.project_name')
+- serializers aninhados (inclusive many=True)
+- SerializerMethodField anotados com @eager_load('owner__client')
+
+FKs/OneToOne forward viram select_related; relações reversas e M2M viram
+Prefetch (com select_related interno para as FKs lidas dentro delas).
+
+DEBUG:
+- Com EAGER_LOADING_DEBUG=True os campos que não puderam ser planejados
+  (method fields sem anotação, propriedades do model) são logados.
+- python manage.py eager_loading_report mostra o plano de cada ViewSet.
+"""
+import copy
+import logging
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+
+def get_model_field(model, name):
+    """
+    Campo do model por nome ou pelo accessor de relação reversa
+
+    Aceita tanto 'county' quanto accessors como 'projects' / 'user_set'
+    (que é como serializers e prefetch_related referenciam relações reversas).
+
+    Raises:
+        FieldDoesNotExist
+    """
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        for related in model._meta.related_objects:
+            if related.get_accessor_name() == name:
+                return related
+        raise
+
+
+def eager_load(*lookups):
+    """
+    Declara as relações usadas por um SerializerMethodField
+
+    USAGE:
+        @eager_load('owner__client')
+        def get_owner_name(self, obj):
+            return obj.owner.client.get_full_name()
+    """
+    def decorator(method):
+        method.eager_load_lookups = lookups
+        return method
+    return decorator
+
+
+@dataclass
+class _RelationNode:
+    """Nó da árvore de relações: filhos forward (select) e many (prefetch)"""
+    model: type
+    select: dict = field(default_factory=dict)
+    prefetch: dict = field(default_factory=dict)
+
+
+@dataclass
+class EagerLoadingPlan:
+    select_related: list
+    prefetch_related: list
+    unplanned: list
+
+    def apply(self, queryset):
+        """Aplica o plano sem conflitar com prefetches já definidos no queryset"""
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+
+        existing = [
+            lookup.prefetch_to if isinstance(lookup, Prefetch) else lookup
+            for lookup in getattr(queryset, '_prefetch_related_lookups', ())
+        ]
+        prefetches = [
+            copy.copy(lookup) for lookup in self.prefetch_related
+            if not any(
+                path == lookup.prefetch_to or path.startswith(f'{lookup.prefetch_to}__')
+                for path in existing
+            )
+        ]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def describe(self):
+        """Representação legível do plano (report/debug)"""
+        return {
+            'select_related': list(self.select_related),
+            'prefetch_related': [lookup.prefetch_to for lookup in self.prefetch_related],
+            'unplanned': list(self.unplanned),
+        }
+
+
+class EagerLoadingPlanner:
+    """Deriva um EagerLoadingPlan a partir de um serializer"""
+
+    def __init__(self, serializer):
+        self.serializer = getattr(serializer, 'child', serializer)
+        self.model = self.serializer.Meta.model
+        self.root = _RelationNode(self.model)
+        self.unplanned = []
+
+    def plan(self):
+        self._visit_serializer(self.serializer, self.root, prefix='')
+        select_related, prefetch_related = self._compile(self.root)
+        return EagerLoadingPlan(select_related, prefetch_related, self.unplanned)
+
+    # ------------------------------------------------------------------
+    def _visit_serializer(self, serializer, node, prefix):
+        for name, serializer_field in serializer.fields.items():
+            if serializer_field.write_only:
+                continue
+            label = f'{prefix}{name}'
+
+            if isinstance(serializer_field, serializers.SerializerMethodField):
+                method = getattr(serializer, serializer_field.method_name, None)
+                lookups = getattr(method, 'eager_load_lookups', None)
+                if lookups is None:
+                    self.unplanned.append(f'{label} (method field without @eager_load)')
+                    continue
+                for lookup in lookups:
+                    self._add_path(node, lookup.split('__'), label)
+                continue
+
+            if serializer_field.source == '*':
+                if isinstance(serializer_field, serializers.BaseSerializer):
+                    self._visit_serializer(
+                        getattr(serializer_field, 'child', serializer_field), node, f'{label}.')
+                continue
+
+            target = self._add_path(node, serializer_field.source_attrs, label)
+            if target is not None and isinstance(serializer_field, serializers.BaseSerializer):
+                child = getattr(serializer_field, 'child', serializer_field)
+                if getattr(getattr(child, 'Meta', None), 'model', None) is not None:
+                    self._visit_serializer(child, target, f'{label}.')
+
+    def _add_path(self, node, attrs, label):
+        """
+        Registra a cadeia de relações de `attrs` a partir de `node`
+
+        Returns:
+            Nó da última relação percorrida (ou None se o caminho termina
+            em uma coluna/atributo)
+        """
+        current = node
+        for index, attr in enumerate(attrs):
+            try:
+                model_field = get_model_field(current.model, attr)
+            except FieldDoesNotExist:
+                if not (attr.startswith('get_') and attr.endswith('_display')):
+                    self.unplanned.append(
+                        f'{label} ({current.model.__name__}.{attr} is not a model field)')
+                return None
+
+            if not model_field.is_relation:
+                return None
+
+            related_model = model_field.related_model
+            if model_field.many_to_many or model_field.one_to_many:
+                current = current.prefetch.setdefault(attr, _RelationNode(related_model))
+            else:
+                current = current.select.setdefault(attr, _RelationNode(related_model))
+
+            if index == len(attrs) - 1:
+                return current
+        return current
+
+    def _compile(self, node, prefix=''):
+        """Converte a árvore em (select_related, [Prefetch]) relativos a `prefix`"""
+        select_related = []
+        prefetch_related = []
+
+        for name, child in node.select.items():
+            path = f'{prefix}{name}'
+            select_related.append(path)
+            child_select, child_prefetch = self._compile(child, f'{path}__')
+            select_related.extend(child_select)
+            prefetch_related.extend(child_prefetch)
+
+        for name, child in node.prefetch.items():
+            path = f'{prefix}{name}'
+            inner_select, inner_prefetch = self._compile(child)
+            queryset = child.model._default_manager.all()
+            if inner_select:
+                queryset = queryset.select_related(*inner_select)
+            if inner_prefetch:
+                queryset = queryset.prefetch_related(*inner_prefetch)
+            prefetch_related.append(Prefetch(path, queryset=queryset))
+
+        return select_related, prefetch_related
+
+
+_plan_cache = {}
+
+
+def get_eager_loading_plan(serializer_class, context=None):
+    """Plano (em cache por classe de serializer) para o serializer informado"""
+    plan = _plan_cache.get(serializer_class)
+    if plan is None:
+        try:
+            serializer = serializer_class(context=context or {})
+            plan = EagerLoadingPlanner(serializer).plan()
+        except Exception as exc:
+            # Serializer que depende do request para montar os campos
+            plan = EagerLoadingPlan([], [], [f'{serializer_class.__name__} ({exc})'])
+        _plan_cache[serializer_class] = plan
+        if plan.unplanned and getattr(settings, 'EAGER_LOADING_DEBUG', False):
+            logger.warning(
+                "Eager loading: campos não planejados em %s: %s",
+                serializer_class.__name__, ', '.join(plan.unplanned)
+            )
+    return plan
+
+
+class EagerLoadingMixin:
+    """
+    Aplica o plano de eager loading do serializer ativo em get_queryset
+
+    USAGE:
+        class TaskProjectViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
+            ...
+
+    Ações de escrita (create/update) não são planejadas: o serializer de
+    entrada não reflete o que é lido.
+    """
+    eager_loading_actions = ('list', 'retrieve')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if getattr(self, 'action', None) not in self.eager_loading_actions:
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        if getattr(getattr(serializer_class, 'Meta', None), 'model', None) is not queryset.model:
+            return queryset
+
+        sparse_enabled = getattr(self, '_sparse_fieldset_enabled', None)
+        if sparse_enabled is not None and sparse_enabled():
+            # ?fields=/?expand= (SparseFieldsetMixin): planeja só os campos pedidos
+            serializer = self.apply_sparse_fields(
+                serializer_class(context=self.get_serializer_context()))
+            return EagerLoadingPlanner(serializer).plan().apply(queryset)
+
+        return get_eager_loading_plan(serializer_class).apply(queryset)
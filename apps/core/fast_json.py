@@ -0,0 +1,83 @@
+# apps/core/fast_json.py
+"""
+Renderer/Parser JSON rápidos (orjson)
+
+Substitutos diretos de rest_framework.renderers.JSONRenderer e
+rest_framework.parsers.JSONParser. O encode/decode é feito pelo orjson (C);
+tipos que o orjson não conhece (Decimal, lazy strings, timedelta, QuerySet...)
+são convertidos pelo mesmo JSONEncoder do DRF, então a saída é a mesma.
+
+- datetime/date/time também passam pelo encoder do DRF (ISO 8601 com
+  milissegundos e sufixo 'Z'), mantendo o formato atual das respostas
+- UUID é serializado nativamente (mesmo resultado de str(uuid))
+- Pretty print (Accept: application/json; indent=4), UNICODE_JSON/COMPACT_JSON
+  desligados e ambientes sem orjson usam o caminho padrão do DRF
+
+SETTINGS:
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': ['core.fast_json.FastJSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['core.fast_json.FastJSONParser', ...],
+}
+"""
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson é opcional
+    orjson = None
+
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    if orjson is not None else 0
+)
+_LINE_SEPARATORS = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+def _default(obj):
+    """Fallback do orjson: mesma conversão do JSONEncoder do DRF"""
+    return _drf_encoder.default(obj)
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer com encode via orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+        # Mesmo escape do DRF: JSON válido como subconjunto de JavaScript
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser com decode via orjson"""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        content = stream.read() if stream is not None else b''
+        try:
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            # orjson rejeita NaN/Infinity, como o parser em modo estrito
+            return orjson.loads(content)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,89 @@
+# apps/core/management/commands/benchmark_serialization.py
+
+import itertools
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from core.eager_loading import get_eager_loading_plan
+from core.fast_json import FastJSONRenderer
+from core.representation import FastRepresentationMixin
+
+
+class Command(BaseCommand):
+    """
+    Compara a serialização + renderização de uma listagem grande antes e
+    depois do fast path (FastRepresentationMixin + FastJSONRenderer)
+
+    As linhas são lidas do banco uma única vez (com o plano de eager loading
+    do serializer) e repetidas até --rows; nada é gravado.
+
+    USAGE:
+    python manage.py benchmark_serialization
+    python manage.py benchmark_serialization --serializer leads.serializers.LeadListSerializer --rows 10000
+    """
+
+    help = 'Benchmark: serialização/renderização padrão do DRF vs. fast path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--serializer', default='projects.serializers.TaskProjectListSerializer',
+                            help='Caminho do serializer de listagem')
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Quantidade de linhas serializadas (default: 10000)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Execuções por variante; vale a melhor (default: 3)')
+
+    def handle(self, *args, **options):
+        try:
+            serializer_class = import_string(options['serializer'])
+        except ImportError as exc:
+            raise CommandError(str(exc))
+        if not issubclass(serializer_class, FastRepresentationMixin):
+            raise CommandError(f'{serializer_class.__name__} não usa FastRepresentationMixin')
+
+        model = serializer_class.Meta.model
+        queryset = get_eager_loading_plan(serializer_class).apply(model._default_manager.all())
+        sample = list(queryset[:options['rows']])
+        if not sample:
+            raise CommandError(f'Nenhum registro de {model.__name__} no banco')
+        rows = list(itertools.islice(itertools.cycle(sample), options['rows']))
+        self.stdout.write(f'📦 {len(rows)} linhas de {model.__name__} ({len(sample)} distintas)\n')
+
+        baseline = self._best(options['repeat'], self._baseline, serializer_class, rows)
+        fast = self._best(options['repeat'], self._fast, serializer_class, rows)
+        if baseline[2] != fast[2]:
+            raise CommandError('A saída do fast path difere da serialização padrão')
+
+        for label, (serialize, render, _) in (('DRF', baseline), ('Fast path', fast)):
+            self.stdout.write(
+                f'{label:<10} serialize {serialize:>7.3f}s  render {render:>7.3f}s  '
+                f'total {serialize + render:>7.3f}s'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'\n⚡ {sum(baseline[:2]) / sum(fast[:2]):.1f}x mais rápido'
+        ))
+
+    @staticmethod
+    def _best(repeat, runner, serializer_class, rows):
+        results = [runner(serializer_class, rows) for _ in range(max(repeat, 1))]
+        return min(results, key=lambda result: result[0] + result[1])
+
+    @staticmethod
+    def _baseline(serializer_class, rows):
+        child = serializer_class()
+        started = time.perf_counter()
+        data = [serializers.Serializer.to_representation(child, row) for row in rows]
+        serialized = time.perf_counter()
+        content = JSONRenderer().render(data)
+        return serialized - started, time.perf_counter() - serialized, content
+
+    @staticmethod
+    def _fast(serializer_class, rows):
+        started = time.perf_counter()
+        data = serializer_class(rows, many=True).data
+        serialized = time.perf_counter()
+        content = FastJSONRenderer().render(data)
+        return serialized - started, time.perf_counter() - serialized, content
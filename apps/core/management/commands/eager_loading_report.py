@@ -0,0 +1,56 @@
+# apps/core/management/commands/eager_loading_report.py
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from core.eager_loading import EagerLoadingMixin, get_eager_loading_plan
+
+
+class Command(BaseCommand):
+    """
+    Mostra o plano de eager loading de cada ViewSet com EagerLoadingMixin
+
+    USAGE:
+    python manage.py eager_loading_report
+    python manage.py eager_loading_report --unplanned-only
+    """
+
+    help = 'Show select_related/prefetch plans derived from serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--unplanned-only',
+            action='store_true',
+            help='Mostrar apenas ViewSets com campos não planejados'
+        )
+
+    def handle(self, *args, **options):
+        # Garante que todas as views foram importadas
+        get_resolver().url_patterns
+
+        for viewset in sorted(self._viewsets(EagerLoadingMixin), key=lambda cls: cls.__name__):
+            for action in viewset.eager_loading_actions:
+                view = viewset()
+                view.action = action
+                view.request = None
+                view.format_kwarg = None
+                try:
+                    serializer_class = view.get_serializer_class()
+                except Exception as exc:
+                    self.stdout.write(f'{viewset.__name__}.{action}: ⚠️  {exc}')
+                    continue
+
+                plan = get_eager_loading_plan(serializer_class).describe()
+                if options['unplanned_only'] and not plan['unplanned']:
+                    continue
+
+                self.stdout.write(
+                    self.style.SUCCESS(f'\n{viewset.__name__}.{action} ({serializer_class.__name__})'))
+                self.stdout.write(f"   select_related:   {', '.join(plan['select_related']) or '-'}")
+                self.stdout.write(f"   prefetch_related: {', '.join(plan['prefetch_related']) or '-'}")
+                for item in plan['unplanned']:
+                    self.stdout.write(self.style.WARNING(f'   ⚠️  {item}'))
+
+    def _viewsets(self, base):
+        for subclass in base.__subclasses__():
+            yield subclass
+            yield from self._viewsets(subclass)
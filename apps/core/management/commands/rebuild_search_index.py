@@ -0,0 +1,44 @@
+# apps/core/management/commands/rebuild_search_index.py
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.search_documents import DOCUMENT_SPECS, INDEX_BATCH_SIZE, rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Reconstrói a tabela da busca global (core.SearchDocument)
+
+    Upsert em lote de todos os objetos de cada tipo e remoção dos documentos
+    cujo objeto não existe mais. Pode rodar com o sistema no ar: a busca
+    continua respondendo com os documentos atuais durante a reconstrução.
+
+    USAGE:
+    python manage.py rebuild_search_index
+    python manage.py rebuild_search_index --type lead --type contract --batch-size 2000
+    """
+
+    help = 'Reconstrói o índice da busca global (GET /api/search/)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', action='append', dest='types',
+                            help=f"Tipo a reconstruir (repetível): {', '.join(DOCUMENT_SPECS)}")
+        parser.add_argument('--batch-size', type=int, default=INDEX_BATCH_SIZE,
+                            help=f'Objetos por upsert (default: {INDEX_BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        entity_types = options['types'] or list(DOCUMENT_SPECS)
+        unknown = [value for value in entity_types if value not in DOCUMENT_SPECS]
+        if unknown:
+            raise CommandError(f"Tipos inválidos: {', '.join(unknown)}")
+
+        for entity_type in entity_types:
+            started = time.perf_counter()
+            indexed, removed = rebuild_index(entity_type, batch_size=options['batch_size'])
+            self.stdout.write(
+                f'  ✅ {entity_type:<24} {indexed:>8} indexados  {removed:>6} removidos  '
+                f'{time.perf_counter() - started:>7.1f}s'
+            )
+        self.stdout.write(self.style.SUCCESS('\n🎉 Índice de busca reconstruído!'))
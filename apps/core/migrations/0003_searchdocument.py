@@ -0,0 +1,107 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity_type",
+                    models.CharField(
+                        help_text="Tipo do objeto indexado (lead, contract, project...)",
+                        max_length=30,
+                        verbose_name="Entity Type",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="Object ID")),
+                ("title", models.CharField(max_length=255, verbose_name="Title")),
+                (
+                    "subtitle",
+                    models.CharField(
+                        blank=True, max_length=255, verbose_name="Subtitle"
+                    ),
+                ),
+                (
+                    "identifiers",
+                    models.TextField(
+                        blank=True,
+                        help_text="Parcel IDs, números de contrato, emails... (original e compactado)",
+                        verbose_name="Identifiers",
+                    ),
+                ),
+                (
+                    "participant_ids",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(),
+                        blank=True,
+                        default=list,
+                        size=None,
+                        verbose_name="Participant IDs",
+                    ),
+                ),
+                (
+                    "search_vector",
+                    models.GeneratedField(
+                        db_persist=True,
+                        expression=django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.CombinedSearchVector(
+                                django.contrib.postgres.search.SearchVector(
+                                    "title", config="simple", weight="A"
+                                ),
+                                "||",
+                                django.contrib.postgres.search.SearchVector(
+                                    "identifiers", config="simple", weight="A"
+                                ),
+                                django.contrib.postgres.search.SearchConfig("simple"),
+                            ),
+                            "||",
+                            django.contrib.postgres.search.SearchVector(
+                                "subtitle", config="simple", weight="B"
+                            ),
+                            django.contrib.postgres.search.SearchConfig("simple"),
+                        ),
+                        output_field=django.contrib.postgres.search.SearchVectorField(),
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Search Document",
+                "verbose_name_plural": "Search Documents",
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="search_document_vector_gin"
+                    ),
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["participant_ids"], name="search_document_users_gin"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("entity_type", "object_id"),
+                        name="search_document_unique_object",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,224 @@
+# apps/core/mixins.py
+"""
+Mixins reutilizáveis para ViewSets
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+from .eager_loading import get_model_field
+
+
+def _parse_csv_param(request, name):
+    """Lê um query param no formato 'a,b,c' como lista (vazia se ausente)"""
+    if request is None:
+        return []
+    value = request.query_params.get(name, '')
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Suporte a ?fields= e ?expand= em list/retrieve
+
+    QUERY PARAMS:
+    - fields: Campos a retornar (ex: ?fields=id,name). Campos desconhecidos
+      são ignorados.
+    - expand: Relações FK a retornar como objeto aninhado em vez do id
+      (ex: ?expand=incorporation,status_project)
+
+    QUERYSET:
+    - Com ?fields=, o queryset é reduzido com .only() às colunas usadas pelos
+      campos restantes, e select_related é refeito apenas para as relações
+      realmente lidas (campos com source 'a.b' e relações expandidas).
+    - Se algum campo restante não puder ser mapeado para colunas (ex:
+      SerializerMethodField, source='*', propriedades), o .only() não é
+      aplicado e apenas a saída é reduzida.
+
+    USAGE:
+        class ProjectViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+            expandable_fields = {'incorporation': IncorporationSummarySerializer}
+
+    Só as FKs listadas em expandable_fields podem ser expandidas, cada uma
+    com o seu serializer escrito à mão (nunca todas as colunas do model
+    relacionado: ex. created_by traria o hash da senha). ?expand= de outros
+    campos é ignorado.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+    sparse_fieldset_actions = ('list', 'retrieve')
+    expandable_fields = {}
+
+    # ------------------------------------------------------------------
+    # Serializer
+    # ------------------------------------------------------------------
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self._sparse_fieldset_enabled():
+            self.apply_sparse_fields(serializer)
+        return serializer
+
+    def _sparse_fieldset_enabled(self):
+        request = getattr(self, 'request', None)
+        if request is None or getattr(self, 'action', None) not in self.sparse_fieldset_actions:
+            return False
+        return bool(
+            _parse_csv_param(request, self.fields_query_param)
+            or _parse_csv_param(request, self.expand_query_param)
+        )
+
+    def apply_sparse_fields(self, serializer):
+        """Remove campos não pedidos e troca FKs expandidas por objetos aninhados"""
+        target = getattr(serializer, 'child', serializer)
+        fields = target.fields
+        model = getattr(getattr(target, 'Meta', None), 'model', None)
+
+        for name in _parse_csv_param(self.request, self.expand_query_param):
+            expanded = self.get_expanded_field(model, name)
+            if expanded is not None:
+                fields[name] = expanded
+
+        requested = _parse_csv_param(self.request, self.fields_query_param)
+        if requested:
+            keep = set(requested)
+            for name in list(fields):
+                if name not in keep:
+                    fields.pop(name)
+        return serializer
+
+    def get_expanded_field(self, model, name):
+        """Serializer aninhado (read-only) para a FK `name`, ou None se não expansível"""
+        serializer_class = self.expandable_fields.get(name)
+        if serializer_class is None or model is None:
+            return None
+        try:
+            model_field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not (model_field.many_to_one or model_field.one_to_one) or not model_field.concrete:
+            return None
+        return serializer_class(read_only=True)
+
+    # ------------------------------------------------------------------
+    # Queryset
+    # ------------------------------------------------------------------
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self._sparse_fieldset_enabled():
+            queryset = self.apply_sparse_queryset(queryset)
+        return queryset
+
+    def apply_sparse_queryset(self, queryset):
+        """Aplica .only()/select_related conforme os campos restantes do serializer"""
+        serializer = self.apply_sparse_fields(
+            self.get_serializer_class()(context=self.get_serializer_context())
+        )
+        model = queryset.model
+        expanded = set(_parse_csv_param(self.request, self.expand_query_param)) & set(self.expandable_fields)
+
+        columns = {model._meta.pk.name}
+        joins = set()
+        roots = set()
+        full_relations = set()
+        trimmable = True
+
+        for name, field in serializer.fields.items():
+            source_attrs = getattr(field, 'source_attrs', None) or []
+            if field.source == '*' or not source_attrs:
+                trimmable = False
+                continue
+
+            plan = self._plan_source(model, source_attrs)
+            if plan is None:
+                trimmable = False
+                continue
+            path_columns, path_joins, is_relation = plan
+            joins.update(path_joins)
+            roots.add(source_attrs[0])
+
+            if is_relation and (name in expanded or isinstance(field, serializers.BaseSerializer)):
+                # Objeto aninhado: traz o model relacionado completo no mesmo JOIN
+                relation_path = '__'.join(source_attrs)
+                if not isinstance(field, serializers.ListSerializer):
+                    joins.add(relation_path)
+                    full_relations.add(relation_path)
+            columns.update(path_columns)
+
+        if not trimmable:
+            return queryset.select_related(*joins) if joins else queryset
+
+        columns.update(self._ordering_columns(queryset, model))
+        # Relações carregadas inteiras não podem ter colunas restringidas
+        columns = {
+            column for column in columns
+            if not any(column.startswith(f'{relation}__') for relation in full_relations)
+        }
+
+        prefetches = [
+            lookup for lookup in getattr(queryset, '_prefetch_related_lookups', ())
+            if self._lookup_root(lookup) in roots
+        ]
+        queryset = queryset.select_related(None).prefetch_related(None)
+        if joins:
+            queryset = queryset.select_related(*sorted(joins))
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset.only(*sorted(columns))
+
+    @staticmethod
+    def _plan_source(model, source_attrs):
+        """
+        Mapeia um source ('a.b.c') para colunas e joins
+
+        Returns:
+            (colunas, joins, is_relation) ou None se o source não for
+            composto apenas por campos do banco (FKs forward + coluna final)
+        """
+        joins = []
+        current = model
+        path = []
+        for index, attr in enumerate(source_attrs):
+            try:
+                model_field = get_model_field(current, attr)
+            except FieldDoesNotExist:
+                return None
+            path.append(attr)
+            is_last = index == len(source_attrs) - 1
+
+            if model_field.is_relation and not model_field.concrete:
+                # Relação reversa: nenhuma coluna local, só permitido no final
+                return ([], joins, True) if is_last and len(path) == 1 else None
+            if model_field.many_to_many:
+                return ([], joins, True) if is_last and len(path) == 1 else None
+
+            if is_last:
+                return ['__'.join(path)], joins, model_field.is_relation
+
+            if not (model_field.many_to_one or model_field.one_to_one):
+                return None
+            joins.append('__'.join(path))
+            current = model_field.related_model
+        return None
+
+    def _ordering_columns(self, queryset, model):
+        """Colunas de ordenação locais (necessárias para cursores de paginação)"""
+        columns = set()
+        for item in queryset.query.order_by:
+            if not isinstance(item, str):
+                continue
+            name = item.lstrip('-')
+            if '__' in name:
+                continue
+            try:
+                model_field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if model_field.concrete and not model_field.many_to_many:
+                columns.add(model_field.name)
+        return columns
+
+    @staticmethod
+    def _lookup_root(lookup):
+        if isinstance(lookup, Prefetch):
+            lookup = lookup.prefetch_through
+        return lookup.split('__')[0]
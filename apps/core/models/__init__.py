@@ -3,6 +3,7 @@ from .base import ChoiceTypeBase
 from .county import County
 from .realtor import Realtor
 from .hoa import HOA
+from .search_document import SearchDocument
 
 
-__all__ = ['ChoiceTypeBase', 'County','Realtor', 'HOA']
\ No newline at end of file
+__all__ = ['ChoiceTypeBase', 'County','Realtor', 'HOA', 'SearchDocument']
\ No newline at end of file
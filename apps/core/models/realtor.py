@@ -5,6 +5,13 @@ from decimal import Decimal
 from phonenumber_field.modelfields import PhoneNumberField
 from django.db.models import Count
 from simple_history.models import HistoricalRecords
+from ..search import search_vector_index, trigram_index
+
+# Campos do tsvector de busca (FullTextSearchFilter) e pesos de relevância
+REALTOR_SEARCH_VECTOR_FIELDS = (
+    ('name', 'A'),
+    ('email', 'B'),
+)
 
 class RealtorQuerySet(models.QuerySet):
     def active(self):
@@ -74,10 +81,19 @@ class Realtor(models.Model):
     
     history = HistoricalRecords(inherit=True) # testando historical records and versions
 
+    SEARCH_VECTOR_FIELDS = REALTOR_SEARCH_VECTOR_FIELDS
+
     class Meta:
         verbose_name = 'Realtor'
         verbose_name_plural = 'Realtors'
         ordering = ['name']
+        indexes = [
+            # Busca (core.search.FullTextSearchFilter)
+            search_vector_index(REALTOR_SEARCH_VECTOR_FIELDS, 'realtor_search_vector_gin'),
+            trigram_index('name', 'realtor_name_trgm'),
+            trigram_index('email', 'realtor_email_trgm'),
+            trigram_index('phone', 'realtor_phone_trgm'),
+        ]
 
     objects = RealtorManager()
     def __str__(self):
@@ -0,0 +1,81 @@
+# apps/core/models/search_document.py
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+from ..search import search_vector
+
+# Campos do tsvector do documento e pesos de relevância
+DOCUMENT_VECTOR_FIELDS = (
+    ('title', 'A'),
+    ('identifiers', 'A'),
+    ('subtitle', 'B'),
+)
+
+
+class SearchDocument(models.Model):
+    """
+    Documento desnormalizado da busca global (GET /api/search/)
+
+    BUSINESS LOGIC:
+    - Uma linha por objeto pesquisável (lead, contrato, projeto, transação
+      Brokermint), mantida por core.search_documents (signals, endpoints
+      bulk e o comando rebuild_search_index)
+    - search_vector é coluna gerada pelo banco a partir de título,
+      identificadores e subtítulo
+    - participant_ids: usuários que enxergam o objeto sem ter a permissão
+      view_<model> (criador, proprietários do contrato, contatos do projeto)
+    """
+
+    entity_type = models.CharField(
+        max_length=30,
+        verbose_name="Entity Type",
+        help_text="Tipo do objeto indexado (lead, contract, project...)"
+    )
+    object_id = models.BigIntegerField(
+        verbose_name="Object ID"
+    )
+    title = models.CharField(
+        max_length=255,
+        verbose_name="Title"
+    )
+    subtitle = models.CharField(
+        max_length=255,
+        blank=True,
+        verbose_name="Subtitle"
+    )
+    identifiers = models.TextField(
+        blank=True,
+        verbose_name="Identifiers",
+        help_text="Parcel IDs, números de contrato, emails... (original e compactado)"
+    )
+    participant_ids = ArrayField(
+        models.BigIntegerField(),
+        default=list,
+        blank=True,
+        verbose_name="Participant IDs"
+    )
+    search_vector = models.GeneratedField(
+        expression=search_vector(DOCUMENT_VECTOR_FIELDS),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['entity_type', 'object_id'],
+                name='search_document_unique_object'
+            ),
+        ]
+        indexes = [
+            GinIndex(fields=['search_vector'], name='search_document_vector_gin'),
+            GinIndex(fields=['participant_ids'], name='search_document_users_gin'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}:{self.object_id} - {self.title}"
@@ -1,13 +1,29 @@
 # apps/core/pagination.py
-from rest_framework.pagination import PageNumberPagination
-from rest_framework.response import Response
+import base64
+import binascii
+import json
+import uuid
 from collections import OrderedDict
+from datetime import date, datetime, time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# Limite máximo de itens por página aceito via query param
+MAX_PAGE_SIZE = getattr(settings, 'PAGINATION_MAX_PAGE_SIZE', 200)
 
 
 class CustomPageNumberPagination(PageNumberPagination):
     """
     Paginação customizada com metadados adicionais
-    
+
     Fornece informações extras úteis para o frontend:
     - total_pages: Número total de páginas
     - total_items: Número total de itens
@@ -15,17 +31,37 @@ class CustomPageNumberPagination(PageNumberPagination):
     - page_size: Tamanho da página
     - has_next: Se há próxima página
     - has_previous: Se há página anterior
-    
+
+    CURSOR (KEYSET):
+    - ?pagination=cursor troca para KeysetCursorPagination (scroll infinito),
+      com tempo constante por página independente da profundidade
+
     USAGE:
     - Definir como pagination_class em ViewSets
     - Configurar como padrão em REST_FRAMEWORK settings
     """
     page_size = 20
     page_size_query_param = 'page_size'
-    max_page_size = None  # Removido limite máximo de paginação
-    
+    max_page_size = MAX_PAGE_SIZE
+    pagination_query_param = 'pagination'
+
+    _cursor_paginator = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Delega para a paginação por cursor quando ?pagination=cursor"""
+        if request.query_params.get(self.pagination_query_param) == 'cursor':
+            self._cursor_paginator = KeysetCursorPagination()
+            self._cursor_paginator.page_size = self.page_size
+            return self._cursor_paginator.paginate_queryset(queryset, request, view)
+
+        self._cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
     def get_paginated_response(self, data):
         """Resposta customizada com metadados adicionais"""
+        if self._cursor_paginator is not None:
+            return self._cursor_paginator.get_paginated_response(data)
+
         return Response(OrderedDict([
             ('count', self.page.paginator.count),
             ('total_pages', self.page.paginator.num_pages),
@@ -46,4 +82,239 @@ class SmallPageNumberPagination(CustomPageNumberPagination):
 
 class LargePageNumberPagination(CustomPageNumberPagination):
     """Paginação para listas maiores (50 itens por página)"""
-    page_size = 50
\ No newline at end of file
+    page_size = 50
+
+
+class _CursorEncoder(json.JSONEncoder):
+    """Serializa valores de ordenação sem perder precisão (ex: microssegundos)"""
+
+    def default(self, o):
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        if isinstance(o, (Decimal, uuid.UUID)):
+            return str(o)
+        return super().default(o)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Paginação por cursor (keyset) baseada na ordenação do ViewSet + id
+
+    Em vez de OFFSET/LIMIT, cada página filtra a partir da posição do último
+    item da página anterior (WHERE (a, b, id) > (...)), então a página 1.000
+    custa o mesmo que a página 1.
+
+    REGRAS:
+    - A ordenação vem do OrderingFilter (?ordering=) ou de view.ordering
+    - 'id' é sempre adicionado como desempate final
+    - Campos precisam ser colunas da própria tabela (sem '__')
+    - O primeiro campo precisa ser coberto por índice (pk, unique, db_index,
+      FK ou primeira coluna de Meta.indexes/unique_together)
+
+    QUERY PARAMS:
+    - cursor: Cursor opaco retornado em next/previous
+    - page_size: Itens por página (limitado por PAGINATION_MAX_PAGE_SIZE)
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = MAX_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.keys = self.resolve_keys(queryset.model, self.ordering)
+
+        position, reverse = self.decode_cursor(request)
+
+        directions = [desc != reverse for _, desc in self.keys]
+        queryset = queryset.order_by(*[
+            ('-' if desc else '') + field.attname
+            for (field, _), desc in zip(self.keys, directions)
+        ])
+        if position is not None:
+            queryset = queryset.filter(self.build_after_filter(position, directions))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return results
+
+    def get_page_size(self, request):
+        """Tamanho da página respeitando o limite máximo"""
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """Ordenação efetiva: ?ordering= do OrderingFilter, view.ordering ou Meta.ordering"""
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return list(ordering)
+
+        ordering = getattr(view, 'ordering', None) or queryset.query.order_by \
+            or queryset.model._meta.ordering
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        return list(ordering or [])
+
+    def resolve_keys(self, model, ordering):
+        """
+        Converte a ordenação em [(field, desc), ...] + pk e valida índices
+
+        Raises:
+            ValidationError: ordenação não suportada para paginação por cursor
+        """
+        opts = model._meta
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str):
+                raise ValidationError({
+                    'ordering': 'Cursor pagination requires field-based ordering.'
+                })
+            name = item.lstrip('-')
+            if name == 'pk':
+                name = opts.pk.name
+            if '__' in name:
+                raise ValidationError({
+                    'ordering': f"Cursor pagination does not support related ordering '{name}'."
+                })
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                raise ValidationError({'ordering': f"Unknown ordering field '{name}'."})
+            if not getattr(field, 'concrete', False) or field.many_to_many:
+                raise ValidationError({'ordering': f"Unknown ordering field '{name}'."})
+            keys.append((field, item.startswith('-')))
+            if field.primary_key:
+                # pk é único: campos seguintes nunca desempatam
+                break
+
+        if not keys or not keys[-1][0].primary_key:
+            desc = keys[0][1] if keys else False
+            keys.append((opts.pk, desc))
+
+        leading_field = keys[0][0]
+        if leading_field.name not in self.indexed_leading_fields(model):
+            raise ValidationError({
+                'ordering': (
+                    f"Ordering by '{leading_field.name}' is not index-backed and "
+                    f"cannot be used with pagination=cursor."
+                )
+            })
+        return keys
+
+    @staticmethod
+    def indexed_leading_fields(model):
+        """Campos que são a primeira coluna de algum índice da tabela"""
+        opts = model._meta
+        fields = set()
+        for field in opts.concrete_fields:
+            if field.primary_key or field.unique or field.db_index:
+                fields.add(field.name)
+        for index in opts.indexes:
+            if index.fields:
+                fields.add(index.fields[0].lstrip('-'))
+        for unique_fields in opts.unique_together:
+            fields.add(unique_fields[0])
+        for constraint in opts.constraints:
+            if getattr(constraint, 'fields', None):
+                fields.add(constraint.fields[0])
+        return fields
+
+    def build_after_filter(self, position, directions):
+        """
+        Filtro "estritamente depois de position" na ordenação informada
+
+        Equivale a (a, b, id) > (va, vb, vid) respeitando a direção de cada
+        campo e o posicionamento de NULLs do PostgreSQL (último em ASC,
+        primeiro em DESC).
+        """
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        for (field, _), desc, value in zip(self.keys, directions, position):
+            name = field.attname
+            if value is None:
+                after = Q(**{f'{name}__isnull': False}) if desc else Q(pk__in=[])
+                equal = Q(**{f'{name}__isnull': True})
+            else:
+                after = Q(**{f'{name}__lt' if desc else f'{name}__gt': value})
+                if field.null and not desc:
+                    after |= Q(**{f'{name}__isnull': True})
+                equal = Q(**{name: value})
+            condition |= equal_prefix & after
+            equal_prefix &= equal
+        return condition
+
+    def get_position(self, instance):
+        return [getattr(instance, field.attname) for field, _ in self.keys]
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, cls=_CursorEncoder)
+        cursor = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        """Retorna (position, reverse); position None quando não há cursor"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')))
+            position = payload['p']
+            reverse = bool(payload['r'])
+            if len(position) != len(self.keys):
+                raise ValueError
+            position = [
+                None if value is None else field.to_python(value)
+                for (field, _), value in zip(self.keys, position)
+            ]
+        except (TypeError, ValueError, KeyError, binascii.Error,
+                UnicodeEncodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('pagination', 'cursor'),
+            ('page_size', self.page_size),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('has_next', self.has_next),
+            ('has_previous', self.has_previous),
+            ('results', data)
+        ]))
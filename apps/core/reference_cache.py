@@ -0,0 +1,122 @@
+# apps/core/reference_cache.py
+"""
+Cache versionado para endpoints de dados de referência (choices, form-data)
+
+Os endpoints de choices são AllowAny e remontam as listas de ChoiceTypeBase,
+counties, HOAs e realtors a cada chamada. Aqui a resposta é guardada já
+renderizada (bytes JSON) sob uma chave que inclui um contador de versão:
+
+- core.signals incrementa a versão em post_save / post_delete / m2m_changed
+  de qualquer subclasse de ChoiceTypeBase, County, HOA, Realtor e
+  ModelProject (house models listados no form-data de leads) — inclusive
+  edições pelo admin
+- Versão nova => chaves novas; entradas antigas expiram sozinhas
+- ETag derivado da versão: If-None-Match válido retorna 304 sem tocar no
+  banco nem no conteúdo em cache
+
+Backend: cache default (Redis via CACHE_URL / REDIS_URL): a versão é
+compartilhada, então a edição tratada por um worker invalida todos. Com
+LocMem (sem Redis configurado) só o worker que gravou enxerga a versão nova.
+
+ATENÇÃO: QuerySet.update() e bulk_create/bulk_update não disparam signals;
+após escritas em massa nesses models chame bump_reference_version().
+
+USAGE:
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @cached_reference_data()
+    def choices(self, request):
+        ...
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+
+from .conditional import _build_etag, _not_modified_or_none, set_conditional_headers
+from .fast_json import FastJSONRenderer
+from .models.base import ChoiceTypeBase
+
+REFERENCE_CACHE_TIMEOUT = getattr(settings, 'REFERENCE_CACHE_TIMEOUT', 60 * 60 * 24)
+VERSION_KEY = 'refdata:version'
+REFERENCE_MODEL_LABELS = frozenset({
+    'core.County',
+    'core.HOA',
+    'core.Realtor',
+    'projects.ModelProject',
+})
+
+
+def is_reference_model(model):
+    """True para models cujos dados alimentam os endpoints de referência"""
+    return (
+        isinstance(model, type)
+        and (issubclass(model, ChoiceTypeBase) or model._meta.label in REFERENCE_MODEL_LABELS)
+    )
+
+
+def get_reference_version():
+    """Versão atual; inicializada com timestamp para não reaproveitar chaves após flush"""
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_reference_version():
+    """Invalida todas as respostas de referência em cache"""
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), timeout=None)
+        return cache.get(VERSION_KEY)
+
+
+def _request_key(view_func, request):
+    """Identifica a resposta: view + host + path com query string"""
+    raw = f'{view_func.__module__}.{view_func.__qualname__}|{request.get_host()}|{request.get_full_path()}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def cached_reference_data(timeout=None):
+    """
+    Cacheia a resposta (bytes JSON) de um endpoint GET de referência
+
+    Apenas respostas 200 são guardadas. Permissões e autenticação continuam
+    sendo verificadas pela view antes do decorator.
+
+    Args:
+        timeout: segundos em cache (default: REFERENCE_CACHE_TIMEOUT)
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            request = next(
+                arg for arg in args if hasattr(arg, 'META') and hasattr(arg, 'method')
+            )
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(*args, **kwargs)
+
+            version = get_reference_version()
+            request_key = _request_key(view_func, request)
+            etag = _build_etag(version, request_key)
+            not_modified = _not_modified_or_none(request, etag, None)
+            if not_modified is not None:
+                return not_modified
+
+            cache_key = f'refdata:{version}:{request_key}'
+            content = cache.get(cache_key)
+            if content is None:
+                response = view_func(*args, **kwargs)
+                if response.status_code != 200 or not hasattr(response, 'data'):
+                    return response
+                content = FastJSONRenderer().render(response.data)
+                cache.set(cache_key, content, timeout or REFERENCE_CACHE_TIMEOUT)
+
+            response = HttpResponse(content, content_type='application/json')
+            return set_conditional_headers(response, etag, None)
+        return wrapper
+    return decorator
@@ -0,0 +1,104 @@
+# apps/core/representation.py
+"""
+Fast path de to_representation para serializers de listagem
+
+O Serializer.to_representation do DRF chama, para cada campo de cada linha,
+field.get_attribute() (percorre source_attrs com try/except) e
+field.to_representation(). Em listas grandes isso domina o tempo de resposta.
+
+FastRepresentationMixin monta, uma vez por instância de serializer, um plano
+com os campos que são colunas simples do model:
+- Coluna local (CharField, IntegerField, BooleanField, ChoiceField...):
+  lida direto com getattr(obj, attname); str/int/bool voltam sem conversão,
+  os demais tipos (Decimal, datetime, date) passam pelo to_representation
+  do campo
+- FK como PrimaryKeyRelatedField: lê obj.<fk>_id, sem tocar na relação
+
+Campos com source pontilhado ('project.project_name'), métodos
+('get_status_display'), SerializerMethodField e serializers aninhados seguem
+o caminho padrão do DRF. A saída é idêntica à do Serializer padrão.
+
+USAGE:
+    class TaskProjectListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
+        ...
+"""
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+# to_representation -> tipos de valor que ele devolve sem alteração
+_IDENTITY_TYPES = {
+    serializers.CharField.to_representation: (str,),
+    serializers.IntegerField.to_representation: (int,),
+    serializers.BooleanField.to_representation: (bool,),
+    serializers.ChoiceField.to_representation: (str, int),
+}
+
+# Modos do plano
+_DEFAULT = 0   # caminho padrão do DRF
+_COLUMN = 1    # getattr + to_representation (exceto tipos nativos)
+_RAW = 2       # getattr sem conversão (pk de FK)
+
+
+class FastRepresentationMixin:
+    """Serializer com plano de leitura direto para colunas simples"""
+
+    def to_representation(self, instance):
+        plan = self.__dict__.get('_representation_plan')
+        if plan is None:
+            plan = self._representation_plan = self._build_representation_plan()
+
+        ret = OrderedDict()
+        for field, attname, mode, native in plan:
+            if mode == _DEFAULT:
+                try:
+                    attribute = field.get_attribute(instance)
+                except SkipField:
+                    continue
+                check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+                ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+                continue
+
+            value = getattr(instance, attname)
+            if value is None or mode == _RAW or type(value) in native:
+                ret[field.field_name] = value
+            else:
+                ret[field.field_name] = field.to_representation(value)
+        return ret
+
+    def _build_representation_plan(self):
+        model = getattr(getattr(self, 'Meta', None), 'model', None)
+        plan = []
+        for field in self._readable_fields:
+            attname, mode = self._plan_field(model, field)
+            native = _IDENTITY_TYPES.get(type(field).to_representation, ())
+            plan.append((field, attname, mode, native))
+        return plan
+
+    @staticmethod
+    def _plan_field(model, field):
+        """(attname, modo) do campo; (None, _DEFAULT) se não for coluna simples"""
+        source_attrs = getattr(field, 'source_attrs', None)
+        if model is None or field.source == '*' or not source_attrs or len(source_attrs) != 1:
+            return None, _DEFAULT
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+            return None, _DEFAULT
+        try:
+            model_field = model._meta.get_field(source_attrs[0])
+        except FieldDoesNotExist:
+            return None, _DEFAULT
+        if not model_field.concrete or model_field.many_to_many:
+            return None, _DEFAULT
+
+        if not model_field.is_relation:
+            if type(field).get_attribute is not serializers.Field.get_attribute:
+                return None, _DEFAULT
+            return model_field.attname, _COLUMN
+        if (isinstance(field, serializers.PrimaryKeyRelatedField)
+                and field.pk_field is None
+                and model_field.target_field.attname == model_field.related_model._meta.pk.attname):
+            return model_field.attname, _RAW
+        return None, _DEFAULT
@@ -0,0 +1,108 @@
+# apps/core/resolver.py
+"""
+Resolver code -> id para subclasses de ChoiceTypeBase
+
+Substitui lookups repetidos como StatusChoice.objects.get(code='QUALIFIED')
+por um mapa em memória do processo:
+
+- Cada tabela é carregada inteira (code, id, is_active) na primeira consulta
+- O mapa é invalidado pela mesma versão usada pelo cache de dados de
+  referência (core.reference_cache), incrementada em post_save/post_delete
+  de qualquer ChoiceTypeBase e compartilhada entre os processos pelo cache
+  default (Redis)
+- Cada mapa vale no máximo RESOLVER_TABLE_TTL segundos: alteração que não
+  trocou a versão (update(), signal perdido, cache local ao processo) tem
+  atraso limitado em todos os workers web e do Celery
+- Código ausente no mapa (ex: criado via bulk_create, sem signal) é buscado
+  no banco antes de ser considerado inexistente
+
+USAGE:
+    from core.resolver import Resolver
+
+    lead.status_id = Resolver.id(StatusChoice, 'QUALIFIED')
+    ids = Resolver.ids(StatusChoice, ['PENDING', 'QUALIFIED'], active_only=True)
+    status_id = Resolver.first_id(StatusContract, ['ACTIVE', 'SIGNED'])
+"""
+import threading
+import time
+
+from django.conf import settings
+
+from .models.base import ChoiceTypeBase
+from .reference_cache import get_reference_version
+
+RESOLVER_TABLE_TTL = getattr(settings, 'RESOLVER_TABLE_TTL', 5 * 60)
+
+
+class Resolver:
+    """Mapa code -> id por model, local ao processo"""
+
+    _tables = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def id(cls, model, code, active_only=False):
+        """
+        ID do registro com o código informado
+
+        Raises:
+            model.DoesNotExist: código inexistente (ou inativo com active_only)
+        """
+        entry = cls._lookup(model, code)
+        if entry is None or (active_only and not entry[1]):
+            raise model.DoesNotExist(f"{model.__name__} with code '{code}' does not exist")
+        return entry[0]
+
+    @classmethod
+    def ids(cls, model, codes, active_only=False):
+        """IDs dos códigos encontrados, na ordem informada"""
+        if isinstance(codes, str):
+            codes = [codes]
+        result = []
+        for code in codes:
+            entry = cls._lookup(model, code)
+            if entry is not None and (entry[1] or not active_only):
+                result.append(entry[0])
+        return result
+
+    @classmethod
+    def first_id(cls, model, codes, active_only=True):
+        """ID do primeiro código existente (ordem de prioridade), ou None"""
+        ids = cls.ids(model, codes, active_only=active_only)
+        return ids[0] if ids else None
+
+    @classmethod
+    def clear(cls):
+        """Descarta os mapas carregados neste processo"""
+        with cls._lock:
+            cls._tables.clear()
+
+    @classmethod
+    def _lookup(cls, model, code):
+        """(id, is_active) do código ou None"""
+        table = cls._table(model)
+        entry = table.get(code)
+        if entry is None:
+            entry = model._default_manager.filter(code=code).values_list('id', 'is_active').first()
+            if entry is not None:
+                table[code] = entry
+        return entry
+
+    @classmethod
+    def _table(cls, model):
+        if not issubclass(model, ChoiceTypeBase):
+            raise TypeError(f'{model.__name__} is not a ChoiceTypeBase subclass')
+
+        version = get_reference_version()
+        label = model._meta.label
+        cached = cls._tables.get(label)
+        if cached is not None and cached[0] == version and time.monotonic() < cached[1]:
+            return cached[2]
+
+        table = {
+            code: (pk, is_active)
+            for code, pk, is_active in model._default_manager.values_list('code', 'id', 'is_active')
+        }
+        with cls._lock:
+            cls._tables[label] = (version, time.monotonic() + RESOLVER_TABLE_TTL, table)
+        return table
@@ -0,0 +1,127 @@
+# apps/core/search.py
+"""
+Busca textual indexada (PostgreSQL full-text + pg_trgm)
+
+O SearchFilter padrão do DRF gera UPPER(col::text) LIKE UPPER('%termo%') em
+cada campo de search_fields: sem índice possível, é um seq scan por busca.
+
+Este módulo oferece:
+- search_vector(): tsvector ponderado (config 'simple', sem stemming — nomes,
+  emails e parcel IDs não são texto em inglês). A MESMA expressão é usada no
+  GinIndex do model e no filtro, então o planner usa o índice
+- trigram_index(): GIN gin_trgm_ops sobre UPPER(col), exatamente a expressão
+  do lookup icontains no PostgreSQL — buscas parciais ('ohn', '@gmail')
+  passam a usar índice sem mudar o resultado
+- FullTextSearchFilter: substituto direto do SearchFilter
+
+MODELS:
+    class Lead(models.Model):
+        SEARCH_VECTOR_FIELDS = LEAD_SEARCH_VECTOR_FIELDS  # (('campo', 'A'), ...)
+
+        class Meta:
+            indexes = [
+                search_vector_index(LEAD_SEARCH_VECTOR_FIELDS, 'lead_search_vector_gin'),
+                trigram_index('client_full_name', 'lead_full_name_trgm'),
+            ]
+
+VIEWS (depois do OrderingFilter, para que ?ordering= prevaleça sobre o rank):
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
+"""
+import operator
+import re
+from functools import reduce
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Upper
+from rest_framework import filters
+from rest_framework.compat import distinct
+from rest_framework.settings import api_settings
+
+SEARCH_CONFIG = 'simple'
+_LEXEME_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_vector(weighted_fields):
+    """tsvector ponderado: (('campo', 'A'), ('outro', 'B'), ...)"""
+    vector = None
+    for field, weight in weighted_fields:
+        part = SearchVector(field, weight=weight, config=SEARCH_CONFIG)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def search_vector_index(weighted_fields, name):
+    """GinIndex de expressão sobre search_vector()"""
+    return GinIndex(search_vector(weighted_fields), name=name)
+
+
+def trigram_index(field, name):
+    """GinIndex pg_trgm que atende field__icontains"""
+    return GinIndex(OpClass(Upper(field), name='gin_trgm_ops'), name=name)
+
+
+def prefix_query(terms):
+    """
+    tsquery com prefixo para cada termo ('joh smi' -> 'joh:* & smi:*')
+
+    Apenas caracteres de palavra são mantidos, então a query raw não
+    aceita operadores vindos do usuário. Retorna None sem lexemas.
+    """
+    lexemes = [lexeme for term in terms for lexeme in _LEXEME_RE.findall(term.lower())]
+    if not lexemes:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{lexeme}:*' for lexeme in lexemes),
+        search_type='raw',
+        config=SEARCH_CONFIG,
+    )
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter com índices GIN e ordenação por relevância
+
+    Mesmo parâmetro (?search=) e mesmos search_fields. No PostgreSQL:
+    - Linhas retornadas: match no tsvector do model OU o icontains de sempre
+      (atendido pelos índices trigram) — nenhum resultado antigo desaparece
+    - Models com SEARCH_VECTOR_FIELDS recebem a anotação search_rank e, sem
+      ?ordering=, são ordenados por relevância (desempate pela ordenação atual)
+    Em outros bancos (testes em sqlite) o comportamento é o do SearchFilter.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+        if connections[queryset.db].vendor != 'postgresql':
+            return super().filter_queryset(request, queryset, view)
+
+        orm_lookups = [self.construct_search(str(field)) for field in search_fields]
+        condition = reduce(operator.and_, (
+            reduce(operator.or_, (Q(**{lookup: term}) for lookup in orm_lookups))
+            for term in search_terms
+        ))
+
+        weighted_fields = getattr(queryset.model, 'SEARCH_VECTOR_FIELDS', None)
+        query = prefix_query(search_terms) if weighted_fields else None
+        if query is not None:
+            vector = search_vector(weighted_fields)
+            # vector @@ query usa a mesma expressão do GinIndex do model
+            queryset = queryset.alias(search_document=vector).annotate(
+                search_rank=SearchRank(vector, query)
+            )
+            condition = Q(search_document=query) | condition
+
+        base = queryset
+        queryset = queryset.filter(condition)
+        if self.must_call_distinct(queryset, search_fields):
+            queryset = distinct(queryset, base)
+
+        if query is not None and api_settings.ORDERING_PARAM not in request.query_params:
+            ordering = queryset.query.order_by or queryset.model._meta.ordering
+            queryset = queryset.order_by('-search_rank', *ordering)
+        return queryset
@@ -0,0 +1,449 @@
+# apps/core/search_documents.py
+"""
+Índice da busca global (core.SearchDocument)
+
+Cada tipo pesquisável é descrito por um DocumentSpec: qual model, como
+montar título / subtítulo / identificadores e quais usuários participam do
+objeto. O índice é mantido por:
+
+- core.signals: post_save / post_delete dos models indexados e dos models
+  de vínculo (Contact -> Project, ContractOwner -> Contract, Lead -> Contract)
+- BulkWriteMixin: POST/PATCH .../bulk/ (bulk_create não dispara signals)
+- python manage.py rebuild_search_index (carga inicial / correção)
+
+A reindexação é agrupada por transação e executada no commit: várias
+gravações do mesmo objeto geram um único upsert.
+
+Consulta (search_documents()):
+- tsquery com prefixo em cada termo ('joh smi' -> 'joh:* & smi:*') e,
+  para identificadores com separadores ('12-34-5'), a forma compactada
+  ('12345:*'), gravada junto do original em identifiers
+- Candidatos limitados a SEARCH_CANDIDATES linhas pelo índice GIN, e só
+  então ordenados por relevância: o custo não cresce com o tamanho da tabela
+- Permissão: staff vê tudo; os demais veem os tipos para os quais têm
+  view_<model> e os objetos em que participam (participant_ids)
+
+ENDPOINTS:
+    GET /api/search/?q= (GlobalSearchView)
+
+USAGE:
+    from core.search_documents import search_documents, index_objects
+
+    results = search_documents(request.user, 'smith', limit=10)
+    index_objects('lead', [lead.pk])
+"""
+import functools
+import re
+import threading
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import transaction
+from django.db.models import F, Q
+from django.urls import NoReverseMatch, reverse
+from django.utils.module_loading import import_string
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import SearchDocument
+from .swagger_tags import API_TAGS
+
+SEARCH_RESULTS_LIMIT = getattr(settings, 'SEARCH_RESULTS_LIMIT', 10)
+SEARCH_MAX_RESULTS = getattr(settings, 'SEARCH_MAX_RESULTS', 50)
+SEARCH_CANDIDATES = getattr(settings, 'SEARCH_CANDIDATES', 200)
+INDEX_BATCH_SIZE = 1000
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+_SEPARATOR_RE = re.compile(r'[\W_]+', re.UNICODE)
+
+
+def compact(value):
+    """'12-34-56 7890' -> '1234567890' (identificadores sem separadores)"""
+    return _SEPARATOR_RE.sub('', value or '').lower()
+
+
+class DocumentSpec:
+    """
+    Descrição de um tipo indexado
+
+    Subclasses definem entity_type, model_path e os métodos de montagem.
+    depends_on mapeia models de vínculo para uma função que recebe a lista
+    de objetos alterados e retorna os IDs deste tipo a reindexar (no máximo
+    uma query por lote, não por objeto).
+    """
+
+    entity_type = None
+    model_path = None
+    detail_url_name = None
+    select_related = ()
+    prefetch_related = ()
+    depends_on = {}
+
+    @property
+    def model(self):
+        return import_string(self.model_path)
+
+    def get_queryset(self):
+        return (
+            self.model._default_manager
+            .select_related(*self.select_related)
+            .prefetch_related(*self.prefetch_related)
+        )
+
+    def title(self, obj):
+        return str(obj)
+
+    def subtitle(self, obj):
+        return ''
+
+    def identifiers(self, obj):
+        return []
+
+    def participants(self, obj):
+        created_by_id = getattr(obj, 'created_by_id', None)
+        return [created_by_id] if created_by_id else []
+
+    def build(self, obj):
+        identifiers = [str(value) for value in self.identifiers(obj) if value]
+        compacted = [compact(value) for value in identifiers]
+        return SearchDocument(
+            entity_type=self.entity_type,
+            object_id=obj.pk,
+            title=(self.title(obj) or '')[:255],
+            subtitle=(self.subtitle(obj) or '')[:255],
+            identifiers=' '.join(dict.fromkeys(
+                identifiers + [value for value in compacted if value]
+            )),
+            participant_ids=sorted(set(self.participants(obj))),
+        )
+
+    def detail_url(self, object_id):
+        if not self.detail_url_name:
+            return None
+        try:
+            return reverse(self.detail_url_name, kwargs={'pk': object_id})
+        except NoReverseMatch:
+            return None
+
+
+class LeadDocument(DocumentSpec):
+    entity_type = 'lead'
+    model_path = 'leads.models.Lead'
+    detail_url_name = 'leads:lead-detail'
+    select_related = ('county',)
+
+    def title(self, obj):
+        return obj.client_full_name
+
+    def subtitle(self, obj):
+        return ' · '.join(filter(None, [obj.client_company_name, obj.county.name if obj.county_id else '']))
+
+    def identifiers(self, obj):
+        return [obj.parcel_id, obj.client_email, obj.client_phone]
+
+
+def _lead_contract_ids(leads):
+    """Contratos dos leads alterados (uma query para o lote)"""
+    contract_model = import_string(ContractDocument.model_path)
+    return contract_model._default_manager.filter(
+        lead_id__in=[lead.pk for lead in leads]
+    ).values_list('pk', flat=True)
+
+
+class ContractDocument(DocumentSpec):
+    entity_type = 'contract'
+    model_path = 'projects.models.Contract'
+    detail_url_name = 'projects:contract-detail'
+    select_related = ('lead', 'incorporation')
+    prefetch_related = ('owners__client',)
+    depends_on = {
+        'projects.models.ContractOwner': lambda owners: [owner.contract_id for owner in owners],
+        'leads.models.Lead': _lead_contract_ids,
+    }
+
+    def title(self, obj):
+        return obj.contract_number
+
+    def subtitle(self, obj):
+        owners = ', '.join(owner.client.get_full_name() for owner in obj.owners.all())
+        return ' · '.join(filter(None, [owners or obj.lead.client_full_name, obj.incorporation.name]))
+
+    def identifiers(self, obj):
+        return [obj.lead.parcel_id, obj.lead.client_full_name, obj.lead.client_email] + [
+            owner.client.email for owner in obj.owners.all()
+        ]
+
+    def participants(self, obj):
+        return super().participants(obj) + [owner.client_id for owner in obj.owners.all()]
+
+
+class ProjectDocument(DocumentSpec):
+    entity_type = 'project'
+    model_path = 'projects.models.Project'
+    detail_url_name = 'projects:project-detail'
+    select_related = ('incorporation',)
+    prefetch_related = ('project_contacts',)
+    depends_on = {'projects.models.Contact': lambda contacts: [contact.project_id for contact in contacts]}
+
+    def title(self, obj):
+        return obj.project_name
+
+    def subtitle(self, obj):
+        return ' · '.join(filter(None, [obj.address, obj.incorporation.name if obj.incorporation_id else '']))
+
+    def participants(self, obj):
+        return super().participants(obj) + [contact.contact_id for contact in obj.project_contacts.all()]
+
+
+class BrokermintTransactionDocument(DocumentSpec):
+    entity_type = 'brokermint_transaction'
+    model_path = 'integrations.models.BrokermintTransaction'
+
+    def title(self, obj):
+        return obj.address or obj.transaction_name or str(obj.brokermint_id)
+
+    def subtitle(self, obj):
+        return ' · '.join(filter(None, [obj.transaction_name, obj.city, obj.state, obj.status]))
+
+    def identifiers(self, obj):
+        return [obj.parcel_id, obj.custom_id, obj.external_id, obj.brokermint_id]
+
+
+DOCUMENT_SPECS = {
+    spec.entity_type: spec
+    for spec in (LeadDocument(), ContractDocument(), ProjectDocument(), BrokermintTransactionDocument())
+}
+
+
+# ----------------------------------------------------------------------
+# Manutenção do índice
+# ----------------------------------------------------------------------
+def index_objects(entity_type, ids):
+    """Upsert dos documentos dos IDs informados; remove os de objetos inexistentes"""
+    spec = DOCUMENT_SPECS[entity_type]
+    ids = list(ids)
+    for start in range(0, len(ids), INDEX_BATCH_SIZE):
+        chunk = ids[start:start + INDEX_BATCH_SIZE]
+        documents = [spec.build(obj) for obj in spec.get_queryset().filter(pk__in=chunk)]
+        _upsert(documents)
+        found = {document.object_id for document in documents}
+        missing = [pk for pk in chunk if pk not in found]
+        if missing:
+            SearchDocument.objects.filter(entity_type=entity_type, object_id__in=missing).delete()
+
+
+def rebuild_index(entity_type, batch_size=INDEX_BATCH_SIZE):
+    """Reindexa todos os objetos do tipo; retorna (indexados, removidos)"""
+    spec = DOCUMENT_SPECS[entity_type]
+    queryset = spec.get_queryset().order_by('pk')
+    indexed = 0
+    batch = []
+    for obj in queryset.iterator(chunk_size=batch_size):
+        batch.append(spec.build(obj))
+        if len(batch) >= batch_size:
+            _upsert(batch)
+            indexed += len(batch)
+            batch = []
+    _upsert(batch)
+    indexed += len(batch)
+
+    removed, _ = SearchDocument.objects.filter(entity_type=entity_type).exclude(
+        object_id__in=spec.model._default_manager.values('pk')
+    ).delete()
+    return indexed, removed
+
+
+def _upsert(documents):
+    if documents:
+        SearchDocument.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=['entity_type', 'object_id'],
+            update_fields=['title', 'subtitle', 'identifiers', 'participant_ids', 'updated_at'],
+        )
+
+
+_pending = threading.local()
+
+
+@functools.lru_cache(maxsize=None)
+def _watched_models():
+    """model -> [(spec, função de IDs ou None para o próprio objeto)]"""
+    watched = {}
+    for spec in DOCUMENT_SPECS.values():
+        watched.setdefault(spec.model, []).append((spec, None))
+        for path, resolve_ids in spec.depends_on.items():
+            watched.setdefault(import_string(path), []).append((spec, resolve_ids))
+    return watched
+
+
+def is_indexed_model(model):
+    """True para models indexados ou de vínculo"""
+    return model in _watched_models()
+
+
+def schedule_reindex(model, instances):
+    """
+    Agenda a reindexação dos objetos afetados para o commit da transação
+
+    Chamado pelos signals e pelo BulkWriteMixin; models fora do índice são
+    ignorados. Os IDs pendentes da thread são acumulados e o primeiro
+    callback executado após o commit processa todos (um upsert por objeto).
+    Os IDs dependentes são resolvidos para o lote inteiro (uma query por
+    model de vínculo), não por objeto.
+    """
+    watchers = _watched_models().get(model)
+    instances = list(instances) if watchers else []
+    if not instances:
+        return
+
+    pending = getattr(_pending, 'items', None)
+    if pending is None:
+        pending = _pending.items = {}
+    for spec, resolve_ids in watchers:
+        if resolve_ids is None:
+            ids = [instance.pk for instance in instances]
+        else:
+            ids = resolve_ids(instances)
+        pending.setdefault(spec.entity_type, set()).update(pk for pk in ids if pk)
+    transaction.on_commit(_flush_pending)
+
+
+def _flush_pending():
+    pending, _pending.items = getattr(_pending, 'items', None), None
+    for entity_type, ids in (pending or {}).items():
+        index_objects(entity_type, ids)
+
+
+# ----------------------------------------------------------------------
+# Consulta
+# ----------------------------------------------------------------------
+def document_query(text):
+    """
+    tsquery de autocomplete; None se não houver termos
+
+    'joh smi' -> 'joh:* & smi:*'
+    '12-34-5' -> '(12:* & 34:* & 5:*) | 12345:*'
+    """
+    words = _WORD_RE.findall((text or '').lower())
+    if not words:
+        return None
+    raw = ' & '.join(f'{word}:*' for word in words)
+    compacted = compact(text)
+    if len(words) > 1 and len(text.split()) == 1:
+        raw = f'({raw}) | {compacted}:*'
+    return SearchQuery(raw, search_type='raw', config='simple')
+
+
+def visible_entity_types(user):
+    """Tipos que o usuário vê integralmente (staff: todos)"""
+    if user.is_staff or user.is_superuser:
+        return set(DOCUMENT_SPECS)
+    visible = set()
+    for entity_type, spec in DOCUMENT_SPECS.items():
+        opts = spec.model._meta
+        if user.has_perm(f'{opts.app_label}.view_{opts.model_name}'):
+            visible.add(entity_type)
+    return visible
+
+
+def search_documents(user, text, entity_types=None, limit=SEARCH_RESULTS_LIMIT):
+    """Documentos visíveis ao usuário que casam com text, por relevância"""
+    query = document_query(text)
+    if query is None:
+        return []
+
+    queryset = SearchDocument.objects.filter(search_vector=query)
+    if entity_types:
+        queryset = queryset.filter(entity_type__in=entity_types)
+    if not (user.is_staff or user.is_superuser):
+        queryset = queryset.filter(
+            Q(entity_type__in=sorted(visible_entity_types(user))) | Q(participant_ids__contains=[user.pk])
+        )
+
+    candidates = queryset.values('pk')[:SEARCH_CANDIDATES]
+    documents = (
+        SearchDocument.objects
+        .filter(pk__in=candidates)
+        .annotate(rank=SearchRank(F('search_vector'), query))
+        .order_by('-rank', 'title')
+        .only('entity_type', 'object_id', 'title', 'subtitle')[:min(limit, SEARCH_MAX_RESULTS)]
+    )
+    return [
+        {
+            'type': document.entity_type,
+            'id': document.object_id,
+            'title': document.title,
+            'subtitle': document.subtitle,
+            'url': DOCUMENT_SPECS[document.entity_type].detail_url(document.object_id),
+        }
+        for document in documents
+    ]
+
+
+class GlobalSearchView(APIView):
+    """
+    Busca global / autocomplete
+
+    ENDPOINTS:
+    GET /api/search/?q=smith
+    GET /api/search/?q=12-34-5&types=lead,brokermint_transaction&limit=5
+
+    RETURNS:
+    {
+        "query": "smith",
+        "results": [
+            {"type": "lead", "id": 42, "title": "Robert Smith",
+             "subtitle": "Smith Family Trust · Sarasota", "url": "/api/leads/42/"},
+            ...
+        ]
+    }
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['CORE']],
+        operation_summary="Busca global",
+        operation_description=(
+            "Autocomplete sobre leads, contratos, projetos e transações Brokermint "
+            "(nome, parcel ID, número de contrato, email...). Resultados filtrados "
+            "pelas permissões do usuário."
+        ),
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description='Texto buscado (prefixo de cada termo)'),
+            openapi.Parameter('types', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description=f"Tipos separados por vírgula: {', '.join(DOCUMENT_SPECS)}"),
+            openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description=f'Máximo de resultados (default {SEARCH_RESULTS_LIMIT}, '
+                                          f'máx. {SEARCH_MAX_RESULTS})'),
+        ],
+        responses={200: 'Resultados da busca', 400: 'Parâmetros inválidos'}
+    )
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+
+        entity_types = [value for value in request.query_params.get('types', '').split(',') if value]
+        unknown = [value for value in entity_types if value not in DOCUMENT_SPECS]
+        if unknown:
+            return Response(
+                {'detail': f"Tipos inválidos: {', '.join(unknown)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', SEARCH_RESULTS_LIMIT))
+        except ValueError:
+            return Response({'detail': '"limit" deve ser um inteiro.'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, SEARCH_MAX_RESULTS))
+
+        results = search_documents(request.user, text, entity_types, limit) if text else []
+        return Response({'query': text, 'results': results})
+
+
+search_view = GlobalSearchView.as_view()
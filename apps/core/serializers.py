@@ -1,5 +1,6 @@
 # apps/core/serializers.py
 from rest_framework import serializers
+from .eager_loading import eager_load
 from .models import County, HOA, Realtor
 
 
@@ -136,6 +137,7 @@ class RealtorListSerializer(serializers.ModelSerializer):
             'counties_count', 'created_at'
         ]
         
+    @eager_load('usually_works_in')
     def get_counties_count(self, obj):
         return obj.usually_works_in.count()
 
@@ -156,6 +158,7 @@ class RealtorDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
         
+    @eager_load('usually_works_in')
     def get_counties_count(self, obj):
         return obj.usually_works_in.count()
 
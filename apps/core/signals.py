@@ -0,0 +1,49 @@
+# apps/core/signals.py
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .detail_cache import invalidate_detail_cache, is_detail_cached_model
+from .reference_cache import bump_reference_version, is_reference_model
+from .search_documents import is_indexed_model, schedule_reindex
+
+
+def _invalidate_reference_data():
+    """
+    Incrementa a versão agora e de novo após o commit: uma leitura
+    concorrente que guardou dados antigos sob a versão intermediária não
+    sobrevive ao commit
+    """
+    bump_reference_version()
+    transaction.on_commit(bump_reference_version)
+
+
+@receiver(post_save, dispatch_uid='core_reference_data_saved')
+@receiver(post_delete, dispatch_uid='core_reference_data_deleted')
+def reference_data_changed(sender, **kwargs):
+    """Invalida o cache de choices/form-data ao alterar dados de referência"""
+    if is_reference_model(sender):
+        _invalidate_reference_data()
+
+
+@receiver(m2m_changed, dispatch_uid='core_reference_data_m2m_changed')
+def reference_data_m2m_changed(sender, instance, action, **kwargs):
+    """Ex: Realtor.usually_works_in"""
+    if action.startswith('post_') and is_reference_model(type(instance)):
+        _invalidate_reference_data()
+
+
+@receiver(post_save, dispatch_uid='core_search_document_saved')
+@receiver(post_delete, dispatch_uid='core_search_document_deleted')
+def search_document_changed(sender, instance, raw=False, **kwargs):
+    """Reindexa a busca global (core.search_documents) após o commit"""
+    if not raw and is_indexed_model(sender):
+        schedule_reindex(sender, [instance])
+
+
+@receiver(post_save, dispatch_uid='core_detail_cache_saved')
+@receiver(post_delete, dispatch_uid='core_detail_cache_deleted')
+def detail_cache_changed(sender, instance, **kwargs):
+    """Invalida o detalhe em cache (core.detail_cache) do objeto e dos dependentes"""
+    if is_detail_cached_model(sender):
+        invalidate_detail_cache(sender, [instance])
@@ -0,0 +1,152 @@
+# apps/core/throttling.py
+"""
+Controle de admissão: throttles por escopo e limite de concorrência
+
+Throttles (taxa, settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']):
+- reference: choices / form-data / guias de registro (AllowAny)
+- public_form: registro, reset de senha, verificação de email, POST /api/leads/
+  (AllowAny)
+- stats: ações stats / dashboard
+- export: ações export / bundle
+
+Identidade: usuário autenticado (pk) ou IP do cliente. Os contadores ficam
+no cache default (Redis: CACHE_URL ou REDIS_URL).
+
+Concorrência (settings.CONCURRENCY_LIMITS): ações pesadas seguram uma vaga
+do escopo enquanto executam (e, em respostas streaming, até o fim do envio).
+Sem vaga a resposta é 429 com Retry-After, em vez de ocupar o worker. Cada
+vaga é uma chave própria no cache default (concurrency:<escopo>:<n>, com
+TTL CONCURRENCY_SLOT_TIMEOUT): uma vaga não liberada (worker morto) expira
+sozinha, sem depender do tráfego parar. Com Redis o limite vale para todos
+os workers; só sem Redis configurado (LocMem) ele é por worker.
+
+USAGE:
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
+    def export(self, request):
+        ...
+
+    @api_view(['GET'])
+    @permission_classes([AllowAny])
+    @throttle_classes([ReferenceDataRateThrottle])
+    def choices_view(request):
+        ...
+"""
+import functools
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.exceptions import Throttled
+from rest_framework.throttling import SimpleRateThrottle
+
+CONCURRENCY_LIMITS = getattr(settings, 'CONCURRENCY_LIMITS', {'stats': 2, 'export': 1})
+CONCURRENCY_RETRY_AFTER = getattr(settings, 'CONCURRENCY_RETRY_AFTER', 5)
+# Vaga não liberada (worker morto no meio da requisição) expira sozinha; deve
+# cobrir a requisição mais longa do escopo (streaming incluído)
+CONCURRENCY_SLOT_TIMEOUT = getattr(settings, 'CONCURRENCY_SLOT_TIMEOUT', 120)
+
+
+class IdentityRateThrottle(SimpleRateThrottle):
+    """Taxa por usuário autenticado ou, para anônimos, por IP"""
+
+    def get_cache_key(self, request, view):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            ident = user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+
+class ReferenceDataRateThrottle(IdentityRateThrottle):
+    scope = 'reference'
+
+
+class PublicFormRateThrottle(IdentityRateThrottle):
+    scope = 'public_form'
+
+
+class StatsRateThrottle(IdentityRateThrottle):
+    scope = 'stats'
+
+
+class ExportRateThrottle(IdentityRateThrottle):
+    scope = 'export'
+
+
+class ConcurrencyLimiter:
+    """
+    Vagas simultâneas de um escopo, uma chave de cache por vaga
+
+    acquire() ocupa a primeira vaga livre com cache.add (SET NX EX) e retorna
+    o seu handle, ou None quando o escopo já está no limite; toda aquisição
+    bem-sucedida deve ser seguida de release(handle). O TTL de cada vaga
+    conta a partir da aquisição e nunca é renovado.
+    """
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.key = f'concurrency:{scope}'
+
+    @property
+    def limit(self):
+        return CONCURRENCY_LIMITS.get(self.scope, 1)
+
+    def slot_keys(self):
+        return [f'{self.key}:{index}' for index in range(self.limit)]
+
+    def acquire(self):
+        token = uuid.uuid4().hex
+        for slot_key in self.slot_keys():
+            if cache.add(slot_key, token, timeout=CONCURRENCY_SLOT_TIMEOUT):
+                return slot_key, token
+        return None
+
+    def release(self, handle):
+        """Libera a vaga se ainda é nossa (expirada e retomada por outro = não mexe)"""
+        slot_key, token = handle
+        if cache.get(slot_key) == token:
+            cache.delete(slot_key)
+
+    def in_flight(self):
+        return len(cache.get_many(self.slot_keys()))
+
+
+def limit_concurrency(scope, retry_after=None):
+    """
+    Limita as execuções simultâneas de uma view/ação ao CONCURRENCY_LIMITS[scope]
+
+    Acima do limite levanta Throttled (429 + Retry-After). Em respostas
+    streaming (StreamingHttpResponse) a vaga só é liberada quando o servidor
+    fecha a resposta.
+
+    Args:
+        scope: chave de CONCURRENCY_LIMITS (ex: 'stats', 'export')
+        retry_after: segundos sugeridos ao cliente (default: CONCURRENCY_RETRY_AFTER)
+    """
+    limiter = ConcurrencyLimiter(scope)
+
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(*args, **kwargs):
+            slot = limiter.acquire()
+            if slot is None:
+                raise Throttled(
+                    wait=retry_after or CONCURRENCY_RETRY_AFTER,
+                    detail='Too many concurrent requests for this endpoint.'
+                )
+            try:
+                response = view_func(*args, **kwargs)
+            except BaseException:
+                limiter.release(slot)
+                raise
+            if getattr(response, 'streaming', False):
+                # Chamados por HttpResponseBase.close() ao fim do envio
+                response._resource_closers.append(functools.partial(limiter.release, slot))
+            else:
+                limiter.release(slot)
+            return response
+        wrapper.concurrency_limiter = limiter
+        return wrapper
+    return decorator
@@ -2,6 +2,8 @@
 
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from .batch import batch_view
+from .search_documents import search_view
 from .views import health_check, api_root_view, CountyViewSet, RealtorViewSet, HOAViewSet, api_schema_info
 
 # Router para ViewSets do core
@@ -15,6 +17,8 @@ urlpatterns = [
     path('', api_root_view, name='api_root'),
     path('health/', health_check, name='health_check'),
     path('schema-info/', api_schema_info, name='api_schema_info'),
+    path('batch/', batch_view, name='batch'),
+    path('search/', search_view, name='search'),
 
 
     # API endpoints
@@ -9,6 +9,12 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters
+from .conditional import ConditionalGetMixin
+from .reference_cache import cached_reference_data
+from .throttling import ReferenceDataRateThrottle
+from .eager_loading import EagerLoadingMixin
+from .mixins import SparseFieldsetMixin
+from .search import FullTextSearchFilter
 from .models import County, Realtor, HOA
 from django.conf import settings
 from .serializers import (
@@ -108,6 +114,24 @@ def api_root_view(request):
                     "method": "POST",
                     "description": "Confirmar reset com token"
                 }
+            },
+
+            "batch": {
+                "read": {
+                    "url": f"{base_url}/api/batch/",
+                    "method": "POST",
+                    "description": "Executa vários GETs em uma única chamada",
+                    "requires": "Bearer Token"
+                }
+            },
+
+            "search": {
+                "global": {
+                    "url": f"{base_url}/api/search/?q=",
+                    "method": "GET",
+                    "description": "Busca global: leads, contratos, projetos e transações Brokermint",
+                    "requires": "Bearer Token"
+                }
             }
         },
 
@@ -216,12 +240,13 @@ def health_check(request):
     return JsonResponse({'status': 'ok'})
 
 
-class CountyViewSet(viewsets.ReadOnlyModelViewSet):
+class CountyViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet read-only para counties (dados de apoio)"""
 
     queryset = County.get_florida_counties()
     serializer_class = CountyChoiceSerializer
     permission_classes = [AllowAny]  # Público para formulários
+    throttle_classes = [ReferenceDataRateThrottle]
     
     @swagger_auto_schema(
         tags=[API_TAGS['CORE']],
@@ -251,6 +276,7 @@ class CountyViewSet(viewsets.ReadOnlyModelViewSet):
         responses={200: 'Lista de counties como choices'}
     )
     @action(detail=False, methods=['get'])
+    @cached_reference_data()
     def choices(self, request):
         """Retorna counties como choices para forms"""
         counties = self.get_queryset()
@@ -259,7 +285,7 @@ class CountyViewSet(viewsets.ReadOnlyModelViewSet):
         return Response({'counties': choices})
 
 
-class RealtorViewSet(viewsets.ModelViewSet):
+class RealtorViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de realtors
     
@@ -276,7 +302,7 @@ class RealtorViewSet(viewsets.ModelViewSet):
     queryset = Realtor.objects.select_related().prefetch_related('usually_works_in').all()
     serializer_class = RealtorListSerializer
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, FullTextSearchFilter]
     
     # Filtros disponíveis
     filterset_fields = {
@@ -396,7 +422,9 @@ class RealtorViewSet(viewsets.ModelViewSet):
         operation_description="Retorna realtors formatados como choices para formulários",
         responses={200: 'Lista de realtors como choices'}
     )
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny],
+            throttle_classes=[ReferenceDataRateThrottle])
+    @cached_reference_data()
     def choices(self, request):
         """Retorna realtors como choices para forms"""
         realtors = Realtor.get_active()
@@ -412,7 +440,7 @@ class RealtorViewSet(viewsets.ModelViewSet):
         return Response({'realtors': choices})
 
 
-class HOAViewSet(viewsets.ModelViewSet):
+class HOAViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de HOAs (Homeowners Associations)
     
@@ -429,6 +457,7 @@ class HOAViewSet(viewsets.ModelViewSet):
     
     queryset = HOA.objects.select_related('county').all()
     serializer_class = HOAListSerializer
+    expandable_fields = {'county': CountyChoiceSerializer}
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     
@@ -550,7 +579,9 @@ class HOAViewSet(viewsets.ModelViewSet):
         operation_description="Retorna HOAs formatados como choices para formulários",
         responses={200: 'Lista de HOAs como choices'}
     )
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny],
+            throttle_classes=[ReferenceDataRateThrottle])
+    @cached_reference_data()
     def choices(self, request):
         """Retorna HOAs como choices para forms"""
         hoas = self.get_queryset().filter(is_active=True).order_by('name')
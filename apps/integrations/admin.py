@@ -6,8 +6,12 @@ from django.db.models import Count
 from .models import (
     BrokermintTransaction,
     BrokermintActivity,
-    BrokermintDocument
+    BrokermintDocument,
+    BrokermintWebhookEvent,
+    SyncCheckpoint,
+    SyncRun,
 )
+from .typed_columns import DRAW_AMOUNT_COLUMNS, fill_typed_columns
 import json
 
 
@@ -21,19 +25,26 @@ class BrokermintTransactionAdmin(admin.ModelAdmin):
         'address_display',
         'status_display',
         'parcel_id_display',
+        'closing_at',
+        'draws_total_display',
         'has_detailed_data',
         'last_synced',
     ]
 
+    # Datas e valores pelas colunas tipadas (closing_at indexado)
     list_filter = [
         'status',
         'representing',
         'transaction_type',
         'has_detailed_data',
         'state',
+        'closing_at',
+        'acceptance_at',
         'last_synced',
     ]
 
+    date_hierarchy = 'closing_at'
+
     search_fields = [
         'brokermint_id',
         'custom_id',
@@ -47,6 +58,11 @@ class BrokermintTransactionAdmin(admin.ModelAdmin):
         'brokermint_id',
         'last_synced',
         'created_at',
+        'acceptance_at',
+        'closing_at',
+        'listing_at',
+        'expiration_at',
+        'draws_total_display',
     ]
 
     ordering = ['-last_synced']
@@ -87,6 +103,16 @@ class BrokermintTransactionAdmin(admin.ModelAdmin):
                 'total_gross_commission',
                 'soft_costs',
                 'hard_costs',
+                'draws_total_display',
+            ),
+            'classes': ('collapse',)
+        }),
+        ('Datas', {
+            'fields': (
+                'acceptance_at',
+                'listing_at',
+                'closing_at',
+                'expiration_at',
             ),
             'classes': ('collapse',)
         }),
@@ -123,6 +149,13 @@ class BrokermintTransactionAdmin(admin.ModelAdmin):
         )
     status_display.short_description = 'Status'
 
+    def draws_total_display(self, obj):
+        amounts = [getattr(obj, column) for column in DRAW_AMOUNT_COLUMNS]
+        if all(amount is None for amount in amounts):
+            return '-'
+        return f"${sum(amount for amount in amounts if amount is not None):,.2f}"
+    draws_total_display.short_description = 'Draws'
+
     def parcel_id_display(self, obj):
         if obj.parcel_id:
             return obj.parcel_id
@@ -157,6 +190,7 @@ class BrokermintTransactionAdmin(admin.ModelAdmin):
                     transaction.zip = details.get('ZIP', '')
                     transaction.price = details.get('Price', 0)
                     # TODO: colocar os demais itens do modelo.
+                    fill_typed_columns(transaction)
                     transaction.has_detailed_data = True
                     transaction.save()
                     updated += 1
@@ -343,3 +377,114 @@ class BrokermintDocumentAdmin(admin.ModelAdmin):
         )
     # FIXME: CORRIGIR A CHAMADA DO BOTÃO E A API.
     refresh_button.short_description = 'Action'
+
+
+
+@admin.register(BrokermintWebhookEvent)
+class BrokermintWebhookEventAdmin(admin.ModelAdmin):
+    """Inbox de webhooks (somente leitura; reprocessar via replay_webhook_events)"""
+
+    list_display = [
+        'id',
+        'event_id',
+        'event_type',
+        'bm_transaction_id',
+        'received_at',
+        'processed_at',
+        'outcome',
+        'attempts',
+    ]
+
+    list_filter = [
+        'outcome',
+        'event_type',
+        'received_at',
+    ]
+
+    search_fields = [
+        'event_id',
+        'bm_transaction_id',
+    ]
+
+    readonly_fields = [field.name for field in BrokermintWebhookEvent._meta.fields]
+
+    ordering = ['-id']
+
+    actions = ['replay_events']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def replay_events(self, request, queryset):
+        """Devolve os eventos selecionados para a fila"""
+        from integrations.webhooks import replay_events, schedule_drain
+
+        replayed = replay_events(queryset)
+        schedule_drain()
+        self.message_user(request, f'{replayed} eventos devolvidos para a fila')
+
+    replay_events.short_description = "🔁 Reprocessar eventos"
+
+
+class SyncCheckpointInline(admin.TabularInline):
+    model = SyncCheckpoint
+    extra = 0
+    can_delete = False
+    fields = ['created_at', 'processed', 'errors', 'last_processed_id', 'cursor']
+    readonly_fields = fields
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(SyncRun)
+class SyncRunAdmin(admin.ModelAdmin):
+    """Histórico das sincronizações (somente leitura)"""
+
+    list_display = [
+        'id',
+        'run_type',
+        'trigger',
+        'status',
+        'started_at',
+        'elapsed_display',
+        'processed',
+        'inserted',
+        'updated',
+        'errors',
+        'throughput_display',
+        'lock_wait',
+        'resumed_from',
+    ]
+
+    list_filter = [
+        'run_type',
+        'status',
+        'trigger',
+        'started_at',
+    ]
+
+    readonly_fields = [field.name for field in SyncRun._meta.fields] + ['elapsed_display', 'throughput_display']
+
+    inlines = [SyncCheckpointInline]
+
+    ordering = ['-started_at']
+
+    date_hierarchy = 'started_at'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def elapsed_display(self, obj):
+        return f"{obj.elapsed:.1f}s"
+    elapsed_display.short_description = 'Duração'
+
+    def throughput_display(self, obj):
+        return f"{obj.throughput:.1f}/s"
+    throughput_display.short_description = 'Registros/s'
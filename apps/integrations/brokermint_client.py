@@ -1,32 +1,246 @@
 # integrations/brokermint_client.py
+"""
+Cliente HTTP da API do Brokermint
+
+Transporte:
+- Uma requests.Session por processo (pool de conexões keep-alive),
+  recriada após fork (workers Celery prefork)
+- Timeouts de conexão e leitura em toda requisição
+- Retry com backoff exponencial + jitter em 5xx, 429 e erros de conexão;
+  Retry-After do servidor é respeitado (acima de BROKERMINT_MAX_RETRY_AFTER
+  o erro sobe imediatamente para o chamador / retry da task)
+- Falhas viram exceções tipadas (BrokermintError e subclasses) em vez de
+  None / []: 429 nunca é confundido com "sem dados"
+- Latência e erros acumulados por endpoint (BrokermintClient.metrics())
+- Listagem de transações paginada (count/offset, BROKERMINT_PAGE_SIZE):
+  iter_transaction_pages() entrega página a página, sem teto de 1000 linhas
+
+USAGE:
+    client = BrokermintClient()
+    try:
+        details = client.get_transaction_details(123)
+    except BrokermintNotFound:
+        ...
+    except BrokermintError as exc:
+        logger.warning(f"Brokermint indisponível: {exc}")
+"""
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
 import requests
 from django.conf import settings
-import logging
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# ====================================
+# ERROS
+# ====================================
+class BrokermintError(Exception):
+    """Falha ao consultar a API do Brokermint"""
+
+    def __init__(self, message, endpoint=None, status_code=None):
+        super().__init__(message)
+        self.endpoint = endpoint
+        self.status_code = status_code
+
+
+class BrokermintConnectionError(BrokermintError):
+    """Conexão recusada / timeout, após esgotar as tentativas"""
+
+
+class BrokermintHTTPError(BrokermintError):
+    """Resposta com status de erro"""
+
+
+class BrokermintNotFound(BrokermintHTTPError):
+    """404: objeto inexistente no Brokermint"""
+
+
+class BrokermintRateLimited(BrokermintHTTPError):
+    """429 após esgotar as tentativas; retry_after em segundos (se informado)"""
+
+    def __init__(self, message, endpoint=None, status_code=429, retry_after=None):
+        super().__init__(message, endpoint=endpoint, status_code=status_code)
+        self.retry_after = retry_after
+
+
+class BrokermintServerError(BrokermintHTTPError):
+    """5xx após esgotar as tentativas"""
+
+
+class BrokermintResponseError(BrokermintError):
+    """Resposta 2xx com corpo que não é JSON"""
+
+
+# ====================================
+# MÉTRICAS
+# ====================================
+class EndpointStats:
+    """Contadores de um endpoint (por processo)"""
+
+    __slots__ = ('requests', 'errors', 'retries', 'total_seconds', 'max_seconds', 'last_error')
 
-class BrokermintClient:
     def __init__(self):
+        self.requests = 0
+        self.errors = {}
+        self.retries = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.last_error = None
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': dict(self.errors),
+            'retries': self.retries,
+            'avg_ms': round(self.total_seconds / self.requests * 1000, 1) if self.requests else 0.0,
+            'max_ms': round(self.max_seconds * 1000, 1),
+            'last_error': self.last_error,
+        }
+
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def _record(endpoint, elapsed, error=None, retried=False):
+    with _stats_lock:
+        stats = _stats.setdefault(endpoint, EndpointStats())
+        stats.requests += 1
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
+        if retried:
+            stats.retries += 1
+        if error:
+            stats.errors[error] = stats.errors.get(error, 0) + 1
+            stats.last_error = error
+
+
+# ====================================
+# SESSÃO
+# ====================================
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Session compartilhada do processo (recriada após fork)"""
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is None or _session_pid != pid:
+        with _session_lock:
+            if _session is None or _session_pid != pid:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=getattr(settings, 'BROKERMINT_POOL_SIZE', 10),
+                    max_retries=0,
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session, _session_pid = session, pid
+    return _session
+
+
+def _parse_retry_after(value):
+    """Retry-After em segundos (inteiro ou HTTP-date); None se ausente/inválido"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max((parsedate_to_datetime(value) - timezone.now()).total_seconds(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class BrokermintClient:
+    def __init__(self, base_url=None, connect_timeout=None, read_timeout=None,
+                 max_retries=None, backoff_base=None, backoff_max=None, max_retry_after=None):
         self.api_key = settings.BROKERMINT_API_KEY
-        self.base_url_v3 = "https://my.brokermint.com/api/v3"
-        self.base_url_v1 = "https://my.brokermint.com/api/v1"
+        base_url = (base_url or getattr(settings, 'BROKERMINT_API_URL', 'https://my.brokermint.com/api')).rstrip('/')
+        self.base_url_v3 = f"{base_url}/v3"
+        self.base_url_v1 = f"{base_url}/v1"
 
-    def get_all_transactions(self):
-        """GET /api/v3/transactions - Lista todas as transações"""
+        self.timeout = (
+            connect_timeout or getattr(settings, 'BROKERMINT_CONNECT_TIMEOUT', 5),
+            read_timeout or getattr(settings, 'BROKERMINT_READ_TIMEOUT', 30),
+        )
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'BROKERMINT_MAX_RETRIES', 4)
+        self.backoff_base = backoff_base if backoff_base is not None else getattr(settings, 'BROKERMINT_BACKOFF_BASE', 1.0)
+        self.backoff_max = backoff_max if backoff_max is not None else getattr(settings, 'BROKERMINT_BACKOFF_MAX', 30.0)
+        self.max_retry_after = (
+            max_retry_after if max_retry_after is not None
+            else getattr(settings, 'BROKERMINT_MAX_RETRY_AFTER', 120.0)
+        )
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    def iter_transaction_pages(self, page_size=None, start_offset=0):
+        """
+        GET /api/v3/transactions paginado por count/offset
+
+        Gerador de páginas (listas de transações): a próxima página só é
+        pedida quando o consumidor pede o próximo item, então parar a
+        iteração (break / close()) encerra as requisições.
+
+        Args:
+            start_offset: Offset da primeira página (retomada de checkpoint)
+
+        Raises:
+            BrokermintResponseError: página que não é lista ou que repete a
+                anterior (servidor ignorando offset)
+        """
         url = f"{self.base_url_v3}/transactions"
-        params = {'api_key': self.api_key, 'count': 1000}
+        page_size = page_size or getattr(settings, 'BROKERMINT_PAGE_SIZE', 1000)
+        offset = start_offset
+        previous_first_id = None
+        while True:
+            params = {'api_key': self.api_key, 'count': page_size, 'offset': offset}
+            page = self._get('transactions.list', url, params)
+            if not isinstance(page, list):
+                raise BrokermintResponseError(
+                    "transactions.list: resposta não é uma lista", endpoint='transactions.list')
+            if not page:
+                return
+            first_id = page[0].get('id')
+            if previous_first_id is not None and first_id == previous_first_id:
+                raise BrokermintResponseError(
+                    f"transactions.list: offset {offset} repetiu a página anterior", endpoint='transactions.list')
+            previous_first_id = first_id
+
+            yield page
+            if len(page) < page_size:
+                return
+            offset += len(page)
 
-        response = requests.get(url, params=params)
-        return response.json() if response.status_code == 200 else []
+    def iter_transactions(self, page_size=None):
+        """Gerador de transações (uma a uma) sobre iter_transaction_pages()"""
+        for page in self.iter_transaction_pages(page_size=page_size):
+            yield from page
+
+    def get_all_transactions(self):
+        """GET /api/v3/transactions - Lista todas as transações (todas as páginas, em memória)"""
+        return list(self.iter_transactions())
 
     def get_transaction_details(self, transaction_id):
         """GET /api/v3/transactions/{id} - Detalhes de uma transação"""
         url = f"{self.base_url_v3}/transactions/{transaction_id}"
         params = {'api_key': self.api_key}
-
-        response = requests.get(url, params=params)
-        return response.json() if response.status_code == 200 else None
+        return self._get('transactions.detail', url, params)
 
     def get_signature_activities(self, transaction_ids):
         """GET /api/v1/activities - Atividades de assinatura"""
@@ -38,14 +252,87 @@ class BrokermintClient:
             # Como string separada por vírgula
             "bm_transaction_ids": ",".join(map(str, transaction_ids))
         }
-
-        response = requests.get(url, params=params)  # ← GET ao invés de POST
-        return response.json() if response.status_code == 200 else []
+        return self._get('activities.list', url, params)
 
     def get_document_details(self, transaction_id, document_id):
         """GET /api/v1/transactions/{id}/documents/{doc_id}"""
         url = f"{self.base_url_v1}/transactions/{transaction_id}/documents/{document_id}"
         params = {'api_key': self.api_key}
+        return self._get('documents.detail', url, params)
+
+    @staticmethod
+    def metrics():
+        """{endpoint: {requests, errors, retries, avg_ms, max_ms, last_error}} deste processo"""
+        with _stats_lock:
+            return {endpoint: stats.as_dict() for endpoint, stats in _stats.items()}
+
+    @staticmethod
+    def reset_metrics():
+        with _stats_lock:
+            _stats.clear()
+
+    # ------------------------------------------------------------------
+    # Transporte
+    # ------------------------------------------------------------------
+    def _backoff(self, attempt):
+        """Backoff exponencial com jitter completo"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _get(self, endpoint, url, params):
+        """
+        GET com timeout e retry; retorna o JSON decodificado
+
+        Raises:
+            BrokermintNotFound, BrokermintRateLimited, BrokermintServerError,
+            BrokermintHTTPError, BrokermintConnectionError, BrokermintResponseError
+        """
+        session = get_session()
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = session.get(url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                # Só a classe da exceção: str(exc) traz a URL com ?api_key=
+                kind = 'timeout' if isinstance(exc, requests.Timeout) else 'connection'
+                error = BrokermintConnectionError(
+                    f"{endpoint}: {kind} ({type(exc).__name__})", endpoint=endpoint)
+                retry_after = None
+            except requests.RequestException as exc:
+                _record(endpoint, time.perf_counter() - started, error=type(exc).__name__, retried=attempt > 0)
+                raise BrokermintConnectionError(f"{endpoint}: {type(exc).__name__}", endpoint=endpoint) from None
+            else:
+                status = response.status_code
+                if status < 400:
+                    _record(endpoint, time.perf_counter() - started, retried=attempt > 0)
+                    try:
+                        return response.json()
+                    except ValueError:
+                        raise BrokermintResponseError(
+                            f"{endpoint}: resposta não é JSON", endpoint=endpoint, status_code=status)
+
+                kind = str(status)
+                retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                if status == 429:
+                    error = BrokermintRateLimited(
+                        f"{endpoint}: rate limit (429)", endpoint=endpoint, retry_after=retry_after)
+                elif status >= 500:
+                    error = BrokermintServerError(f"{endpoint}: HTTP {status}", endpoint=endpoint, status_code=status)
+                elif status == 404:
+                    error = BrokermintNotFound(f"{endpoint}: não encontrado", endpoint=endpoint, status_code=status)
+                else:
+                    error = BrokermintHTTPError(f"{endpoint}: HTTP {status}", endpoint=endpoint, status_code=status)
+
+            _record(endpoint, time.perf_counter() - started, error=kind, retried=attempt > 0)
+
+            retryable = not isinstance(error, BrokermintHTTPError) or error.status_code in RETRY_STATUSES
+            if not retryable or attempt >= self.max_retries:
+                raise error
+            if retry_after is not None and retry_after > self.max_retry_after:
+                raise error
 
-        response = requests.get(url, params=params)
-        return response.json() if response.status_code == 200 else None
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            attempt += 1
+            logger.warning(
+                f"Brokermint {endpoint}: {kind}, tentativa {attempt}/{self.max_retries} em {delay:.1f}s")
+            time.sleep(delay)
@@ -0,0 +1,271 @@
+# integrations/detail_fetcher.py
+"""
+Busca concorrente dos detalhes de transações (GET /api/v3/transactions/{id})
+
+- Pool de threads com concorrência limitada (BROKERMINT_DETAIL_CONCURRENCY):
+  as threads só fazem HTTP; o banco é acessado apenas pela thread chamadora
+- Token bucket compartilhado pelas threads limita a taxa ao permitido pelo
+  Brokermint (BROKERMINT_RATE_LIMIT req/s, rajada BROKERMINT_RATE_BURST)
+- Resultados gravados em lotes: um SELECT + um bulk_update por lote
+- Progresso reportado a cada lote (callback + log)
+
+Usado por:
+- python manage.py sync_all_details / continue_sync
+- integrations.tasks.sync_transaction_details_task
+- BrokermintSyncService.sync_transaction_details()
+
+USAGE:
+    from integrations.detail_fetcher import sync_transaction_details
+
+    result = sync_transaction_details(limit=500)
+    print(result.as_dict())
+"""
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+
+from django.conf import settings
+from django.db import models, transaction
+from django.utils import timezone
+
+from core.search_documents import schedule_reindex
+
+from .brokermint_client import BrokermintClient, BrokermintError, BrokermintNotFound, BrokermintRateLimited
+from .models import BrokermintTransaction
+from .sync_service import TRANSACTION_DETAIL_UPDATE_FIELDS, apply_transaction_details
+
+logger = logging.getLogger(__name__)
+
+DETAIL_CONCURRENCY = getattr(settings, 'BROKERMINT_DETAIL_CONCURRENCY', 4)
+RATE_LIMIT = getattr(settings, 'BROKERMINT_RATE_LIMIT', 5.0)
+RATE_BURST = getattr(settings, 'BROKERMINT_RATE_BURST', 5)
+DETAIL_BATCH_SIZE = 100
+
+
+class TokenBucket:
+    """
+    Limitador de taxa thread-safe
+
+    `rate` fichas por segundo, acumulando até `burst`; acquire() bloqueia
+    até haver uma ficha.
+    """
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(self.rate, 1.0))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+class ConcurrentDetailFetcher:
+    """
+    Busca detalhes de transações em paralelo, respeitando o limite de taxa
+
+    fetch() é um gerador de (brokermint_id, details | None, erro | None) na
+    ordem de conclusão; no máximo 2 x concurrency requisições são enfileiradas
+    por vez, então a memória não cresce com o número de IDs.
+    """
+
+    def __init__(self, client=None, concurrency=None, rate=None, burst=None):
+        self.client = client or BrokermintClient()
+        self.concurrency = max(1, concurrency or DETAIL_CONCURRENCY)
+        self.bucket = TokenBucket(rate or RATE_LIMIT, burst or RATE_BURST)
+
+    def _fetch_one(self, transaction_id):
+        self.bucket.acquire()
+        try:
+            return self.client.get_transaction_details(transaction_id), None
+        except BrokermintError as exc:
+            return None, exc
+
+    def fetch(self, transaction_ids):
+        ids = iter(transaction_ids)
+        executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='brokermint-detail')
+        pending = {}
+
+        def submit_next():
+            for transaction_id in ids:
+                pending[executor.submit(self._fetch_one, transaction_id)] = transaction_id
+                return True
+            return False
+
+        try:
+            for _ in range(self.concurrency * 2):
+                if not submit_next():
+                    break
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    transaction_id = pending.pop(future)
+                    submit_next()
+                    details, error = future.result()
+                    yield transaction_id, details, error
+        finally:
+            # Consumidor parou antes do fim: descarta o que ainda não começou
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+@dataclass
+class DetailSyncResult:
+    """
+    Resumo de uma sincronização de detalhes
+
+    Attributes:
+        total: IDs selecionados
+        processed: IDs com resposta (sucesso ou erro)
+        updated: Transações gravadas com detalhes
+        not_found: 404 no Brokermint
+        errors: Demais erros (após os retries do cliente)
+        aborted: Motivo da interrupção (rate limit prolongado), se houver
+        elapsed: Segundos
+    """
+    total: int = 0
+    processed: int = 0
+    updated: int = 0
+    not_found: int = 0
+    errors: int = 0
+    aborted: str = ''
+    elapsed: float = 0.0
+
+    @property
+    def rate(self):
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {**asdict(self), 'rate': round(self.rate, 2)}
+
+
+def pending_detail_rows(limit=None, after_pk=0):
+    """(pk, brokermint_id) das transações ainda sem detalhes, por pk"""
+    queryset = BrokermintTransaction.objects.filter(
+        models.Q(has_detailed_data=False) | models.Q(has_detailed_data__isnull=True),
+        pk__gt=after_pk,
+    ).order_by('pk').values_list('pk', 'brokermint_id')
+    return list(queryset[:limit] if limit else queryset)
+
+
+def pending_detail_ids(limit=None, after_pk=0):
+    """brokermint_ids das transações ainda sem detalhes"""
+    return [brokermint_id for _, brokermint_id in pending_detail_rows(limit, after_pk)]
+
+
+def _write_details(batch):
+    """Grava um lote {brokermint_id: details}: um SELECT + um bulk_update"""
+    now = timezone.now()
+    transactions = BrokermintTransaction.objects.in_bulk(list(batch), field_name='brokermint_id')
+    for brokermint_id, obj in transactions.items():
+        apply_transaction_details(obj, batch[brokermint_id])
+        obj.last_synced = now
+    with transaction.atomic():
+        BrokermintTransaction.objects.bulk_update(
+            list(transactions.values()), TRANSACTION_DETAIL_UPDATE_FIELDS)
+        # bulk_update não dispara post_save
+        schedule_reindex(BrokermintTransaction, transactions.values())
+    return len(transactions)
+
+
+def sync_transaction_details(transaction_ids=None, limit=None, client=None, concurrency=None,
+                             rate=None, batch_size=DETAIL_BATCH_SIZE, progress=None, run=None):
+    """
+    Busca e grava os detalhes das transações
+
+    Args:
+        transaction_ids: brokermint_ids específicos (default: pendentes)
+        limit: Máximo de transações
+        client: BrokermintClient (default: novo cliente)
+        concurrency / rate: sobrescrevem BROKERMINT_DETAIL_CONCURRENCY / BROKERMINT_RATE_LIMIT
+        batch_size: Transações por gravação
+        progress: callable(DetailSyncResult) chamado após cada lote gravado
+        run: SyncRunTracker (integrations.sync_runs); para as pendentes, o
+            checkpoint guarda o maior pk até onde tudo já foi processado
+            (gravado, 404 ou erro) e a execução retomada começa depois dele
+
+    Returns:
+        DetailSyncResult
+    """
+    if transaction_ids is not None:
+        ids, pks = list(transaction_ids)[:limit], None
+    else:
+        rows = pending_detail_rows(limit, after_pk=run.cursor.get('after_pk', 0) if run else 0)
+        ids, pks = [brokermint_id for _, brokermint_id in rows], [pk for pk, _ in rows]
+    result = DetailSyncResult(total=len(ids))
+    if run:
+        run.run.total = len(ids)
+    fetcher = ConcurrentDetailFetcher(client=client, concurrency=concurrency, rate=rate)
+    started = time.perf_counter()
+    # Checkpoint: as respostas chegam fora de ordem; o cursor só avança sobre o prefixo já concluído
+    done, position, reported = set(), 0, DetailSyncResult()
+
+    def checkpoint():
+        nonlocal position, reported
+        cursor = last_pk = None
+        if pks is not None:
+            while position < len(ids) and ids[position] in done:
+                position += 1
+            if position:
+                last_pk = pks[position - 1]
+                cursor = {'after_pk': last_pk}
+        run.advance(
+            cursor=cursor, last_processed_id=last_pk,
+            processed=result.processed - reported.processed,
+            updated=result.updated - reported.updated,
+            errors=result.errors - reported.errors,
+        )
+        reported = DetailSyncResult(**asdict(result))
+
+    def flush(batch):
+        if batch:
+            result.updated += _write_details(batch)
+            done.update(batch)
+            batch.clear()
+        if run:
+            checkpoint()
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Detalhes Brokermint: {result.processed}/{result.total} "
+            f"({result.updated} gravadas, {result.errors} erros, {result.rate:.1f}/s)")
+        if progress:
+            progress(result)
+
+    batch = {}
+    for transaction_id, details, error in fetcher.fetch(ids):
+        result.processed += 1
+        if isinstance(error, BrokermintNotFound):
+            result.not_found += 1
+            done.add(transaction_id)
+        elif isinstance(error, BrokermintRateLimited):
+            # Retry-After acima do máximo: parar e deixar o restante para a próxima execução
+            result.errors += 1
+            result.aborted = str(error)
+            break
+        elif error is not None:
+            result.errors += 1
+            done.add(transaction_id)
+            logger.warning(f"Detalhes da transação {transaction_id}: {error}")
+        elif isinstance(details, dict) and details.get('id'):
+            batch[transaction_id] = details
+        else:
+            result.errors += 1
+            done.add(transaction_id)
+
+        if len(batch) >= batch_size:
+            flush(batch)
+
+    flush(batch)
+    return result
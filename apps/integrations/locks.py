@@ -0,0 +1,253 @@
+# integrations/locks.py
+"""
+Single-flight das sincronizações com o Brokermint
+
+Um lease por tipo de sincronização no Redis (BROKERMINT_LOCK_REDIS_URL, por
+padrão o REDIS_URL do Celery), compartilhado por web, workers, beat e
+comandos manage.py:
+- acquire(): SET chave token NX PX ttl; quem não conseguiu espera até
+  `wait` segundos ou desiste (LockBusy)
+- heartbeat: uma thread renova o lease a cada ttl/3 enquanto o dono roda;
+  processo morto => o lease expira sozinho em até `ttl` segundos
+- release(): apaga o lease se o token ainda é o nosso
+
+Coalescência: um disparo que encontra o lease ocupado pode pedir "rode
+mais uma vez depois" (request_rerun); pedidos repetidos viram um só e o
+dono, ao liberar, enfileira a task pedida uma única vez.
+
+Renovação e liberação comparam o token e agem atomicamente (script Lua:
+compare-and-pexpire / compare-and-delete).
+
+Sem Redis configurado o lease cai no cache default do Django apenas com
+BROKERMINT_LOCK_ALLOW_LOCAL (um único processo: desenvolvimento/testes);
+caso contrário ImproperlyConfigured: um lease local ao processo não impede
+execuções simultâneas e interrupt_orphan_runs() marcaria como interrompida
+uma execução viva de outro processo.
+
+USAGE:
+    lock = SingleFlightLock('minimal')
+    if not lock.acquire(wait=0):
+        lock.request_rerun('integrations.tasks.sync_minimal_transactions_task', {'incremental': True})
+        return
+    try:
+        ...
+    finally:
+        lock.release()
+"""
+import functools
+import json
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+LOCK_TTL = getattr(settings, 'BROKERMINT_LOCK_TTL', 120)
+LOCK_POLL_INTERVAL = 0.5
+LOCK_KEY_PREFIX = 'brokermint:lock'
+
+
+class RedisLeaseStore:
+    """Leases no Redis com compare-and-set atômico"""
+
+    RENEW_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('pexpire', KEYS[1], ARGV[2]) else return 0 end"
+    )
+    RELEASE_SCRIPT = (
+        "if redis.call('get', KEYS[1]) == ARGV[1] then "
+        "return redis.call('del', KEYS[1]) else return 0 end"
+    )
+    POP_SCRIPT = "local value = redis.call('get', KEYS[1]) redis.call('del', KEYS[1]) return value"
+
+    def __init__(self, url):
+        import redis
+
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self._renew = self.client.register_script(self.RENEW_SCRIPT)
+        self._release = self.client.register_script(self.RELEASE_SCRIPT)
+        self._pop = self.client.register_script(self.POP_SCRIPT)
+
+    def add(self, key, token, ttl):
+        return bool(self.client.set(key, token, nx=True, px=int(ttl * 1000)))
+
+    def get(self, key):
+        return self.client.get(key)
+
+    def renew(self, key, token, ttl):
+        return bool(self._renew(keys=[key], args=[token, int(ttl * 1000)]))
+
+    def release(self, key, token):
+        return bool(self._release(keys=[key], args=[token]))
+
+    def set_value(self, key, value, ttl):
+        self.client.set(key, json.dumps(value), px=int(ttl * 1000))
+
+    def pop_value(self, key):
+        raw = self._pop(keys=[key])
+        return json.loads(raw) if raw else None
+
+    def delete(self, key):
+        self.client.delete(key)
+
+
+class CacheLeaseStore:
+    """Leases no cache default do Django (só com BROKERMINT_LOCK_ALLOW_LOCAL)"""
+
+    def add(self, key, token, ttl):
+        return cache.add(key, token, timeout=ttl)
+
+    def get(self, key):
+        return cache.get(key)
+
+    def renew(self, key, token, ttl):
+        return cache.get(key) == token and cache.touch(key, ttl)
+
+    def release(self, key, token):
+        if cache.get(key) != token:
+            return False
+        cache.delete(key)
+        return True
+
+    def set_value(self, key, value, ttl):
+        cache.set(key, value, timeout=ttl)
+
+    def pop_value(self, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.delete(key)
+        return value
+
+    def delete(self, key):
+        cache.delete(key)
+
+
+@functools.lru_cache(maxsize=None)
+def _redis_store(url):
+    return RedisLeaseStore(url)
+
+
+def lease_store():
+    """
+    Store dos leases conforme as settings
+
+    Raises:
+        ImproperlyConfigured: sem Redis e sem BROKERMINT_LOCK_ALLOW_LOCAL
+    """
+    url = getattr(settings, 'BROKERMINT_LOCK_REDIS_URL', '')
+    if url:
+        return _redis_store(url)
+    if getattr(settings, 'BROKERMINT_LOCK_ALLOW_LOCAL', False):
+        return CacheLeaseStore()
+    raise ImproperlyConfigured(
+        'integrations.locks: defina BROKERMINT_LOCK_REDIS_URL (ou REDIS_URL); um lease local ao '
+        'processo não é single-flight entre workers, beat e comandos')
+
+
+class LockBusy(Exception):
+    """Lease ocupado por outra execução"""
+
+    def __init__(self, name, waited=0.0, rerun_requested=False):
+        self.name = name
+        self.waited = waited
+        self.rerun_requested = rerun_requested
+        message = f"Sincronização '{name}' já em execução"
+        if rerun_requested:
+            message += '; nova execução agendada para depois dela'
+        super().__init__(message)
+
+
+class SingleFlightLock:
+    """
+    Lease com token (SET NX PX) + heartbeat
+
+    Attributes:
+        name: Escopo do lease (ex: 'minimal', 'signatures')
+        token: Identifica o dono; informar para liberar de outro processo
+            (ex: callback de chord)
+        waited: Segundos esperados no último acquire()
+    """
+
+    def __init__(self, name, ttl=None, token=None):
+        self.name = name
+        self.ttl = ttl or LOCK_TTL
+        self.token = token
+        self.key = f'{LOCK_KEY_PREFIX}:{name}'
+        self.rerun_key = f'{self.key}:rerun'
+        self.waited = 0.0
+        self.store = lease_store()
+        self._stop = None
+
+    def acquire(self, wait=0, heartbeat=True):
+        """Tenta o lease por até `wait` segundos; True se conseguiu"""
+        token = uuid.uuid4().hex
+        started = time.monotonic()
+        while True:
+            if self.store.add(self.key, token, self.ttl):
+                self.token = token
+                self.waited = time.monotonic() - started
+                if heartbeat:
+                    self._start_heartbeat()
+                return True
+            self.waited = time.monotonic() - started
+            if self.waited >= wait:
+                return False
+            time.sleep(min(LOCK_POLL_INTERVAL, wait - self.waited))
+
+    def owned(self):
+        return self.token is not None and self.store.get(self.key) == self.token
+
+    def renew(self):
+        """Estende o lease por mais `ttl` segundos; False se não é mais nosso"""
+        return self.token is not None and self.store.renew(self.key, self.token, self.ttl)
+
+    def release(self):
+        """Libera o lease (se ainda é nosso) e enfileira a execução coalescida, se pedida"""
+        self._stop_heartbeat()
+        if self.token is not None:
+            self.store.release(self.key, self.token)
+        self.token = None
+        self._run_requested()
+
+    def request_rerun(self, task_name, kwargs=None):
+        """Pede ao dono atual uma nova execução de `task_name` ao liberar (pedidos repetidos = um)"""
+        self.store.set_value(self.rerun_key, {'task': task_name, 'kwargs': kwargs or {}}, self.ttl * 10)
+
+    def cancel_rerun(self):
+        """Descarta o pedido de reexecução (a execução atual já o atende)"""
+        self.store.delete(self.rerun_key)
+
+    def _run_requested(self):
+        request = self.store.pop_value(self.rerun_key)
+        if not request:
+            return
+        from celery import current_app
+
+        logger.info(f"Lease '{self.name}': execução coalescida de {request['task']} {request['kwargs']}")
+        try:
+            current_app.tasks[request['task']].apply_async(kwargs=request['kwargs'])
+        except Exception as exc:
+            # Broker fora: o próximo disparo do beat cobre
+            logger.warning(f"Lease '{self.name}': execução coalescida não agendada: {exc}")
+
+    def _start_heartbeat(self):
+        self._stop = threading.Event()
+        thread = threading.Thread(target=self._heartbeat, args=(self._stop,), daemon=True,
+                                  name=f'lease-{self.name}')
+        thread.start()
+
+    def _stop_heartbeat(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._stop = None
+
+    def _heartbeat(self, stop):
+        while not stop.wait(self.ttl / 3):
+            if not self.renew():
+                logger.warning(f"Lease '{self.name}' perdido (expirou ou foi tomado)")
+                return
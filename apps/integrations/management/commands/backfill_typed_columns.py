@@ -0,0 +1,52 @@
+# integrations/management/commands/backfill_typed_columns.py
+import time
+
+from django.core.management.base import BaseCommand
+
+from integrations.models import BrokermintTransaction
+from integrations.typed_columns import BACKFILL_BATCH_SIZE, backfill_typed_columns
+
+
+class Command(BaseCommand):
+    """
+    Preenche as colunas tipadas (dinheiro / datas) das transações existentes
+
+    Online e em lotes por pk: cada lote é um SELECT + um bulk_update em
+    transação própria, com o sistema no ar. Interrompido, retoma com
+    --start-pk (o último pk é impresso a cada lote).
+
+    USAGE:
+    python manage.py backfill_typed_columns
+    python manage.py backfill_typed_columns --batch-size 500 --pause 0.2 --start-pk 12000
+    """
+
+    help = 'Backfill das colunas tipadas (DecimalField / DateTimeField) da BrokermintTransaction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BACKFILL_BATCH_SIZE,
+                            help=f'Transações por lote (default: {BACKFILL_BATCH_SIZE})')
+        parser.add_argument('--start-pk', type=int, default=0,
+                            help='Retomar a partir deste pk (exclusivo)')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Pausa em segundos entre lotes (default: 0)')
+
+    def handle(self, *args, **options):
+        total = BrokermintTransaction.objects.filter(pk__gt=options['start_pk']).count()
+        self.stdout.write(f'🔢 Preenchendo colunas tipadas de {total} transações...')
+        started = time.perf_counter()
+
+        def progress(processed, last_pk):
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'   📦 {processed}/{total} (último pk {last_pk}, {processed / elapsed if elapsed else 0:.0f}/s)'
+            )
+
+        processed = backfill_typed_columns(
+            batch_size=options['batch_size'],
+            start_pk=options['start_pk'],
+            pause=options['pause'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ {processed} transações em {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,83 @@
+# integrations/management/commands/benchmark_detail_fetch.py
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from integrations.brokermint_client import BrokermintClient
+from integrations.detail_fetcher import ConcurrentDetailFetcher
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """GET /v3/transactions/{id} com latência artificial"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        transaction_id = self.path.split('?')[0].rstrip('/').rsplit('/', 1)[-1]
+        body = json.dumps({'id': int(transaction_id), 'Parcel ID': f'PCL-{transaction_id}'}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Command(BaseCommand):
+    """
+    Mede a vazão do ConcurrentDetailFetcher contra um stub HTTP local
+
+    Nenhuma chamada ao Brokermint e nenhum acesso ao banco: o stub responde
+    cada detalhe após --latency segundos. A vazão deve crescer com a
+    concorrência até o teto de --rate req/s.
+
+    USAGE:
+    python manage.py benchmark_detail_fetch
+    python manage.py benchmark_detail_fetch --requests 200 --latency 0.2 --rate 20 --levels 1,2,4,8,16
+    """
+
+    help = 'Benchmark: vazão da busca concorrente de detalhes vs. concorrência'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100,
+                            help='Detalhes por nível de concorrência (default: 100)')
+        parser.add_argument('--latency', type=float, default=0.2,
+                            help='Latência do stub em segundos (default: 0.2)')
+        parser.add_argument('--rate', type=float, default=20.0,
+                            help='Teto de requisições por segundo (default: 20)')
+        parser.add_argument('--levels', default='1,2,4,8,16',
+                            help='Níveis de concorrência (default: 1,2,4,8,16)')
+
+    def handle(self, *args, **options):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        server.daemon_threads = True
+        server.latency = options['latency']
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = BrokermintClient(base_url=f'http://127.0.0.1:{server.server_address[1]}', max_retries=0)
+
+        rate = options['rate']
+        ids = list(range(1, options['requests'] + 1))
+        header = f"{'Concorrência':>12} {'Tempo':>10} {'Req/s':>10} {'Teórico':>10}"
+        self.stdout.write(f"Stub: {options['latency'] * 1000:.0f} ms por requisição, teto {rate:.0f} req/s")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        try:
+            for level in [int(value) for value in options['levels'].split(',')]:
+                # Rajada de 1: só o limite de taxa e a concorrência contam
+                fetcher = ConcurrentDetailFetcher(client=client, concurrency=level, rate=rate, burst=1)
+                started = time.perf_counter()
+                fetched = sum(1 for _, details, error in fetcher.fetch(ids) if details and not error)
+                elapsed = time.perf_counter() - started
+                expected = min(level / options['latency'], rate)
+                self.stdout.write(
+                    f'{level:>12} {elapsed:>9.2f}s {fetched / elapsed:>10.1f} {expected:>10.1f}'
+                )
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,105 @@
+# integrations/management/commands/benchmark_upsert.py
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from integrations.models import BrokermintTransaction
+from integrations.sync_service import TRANSACTION_LIST_FIELDS, transaction_from_listing
+from integrations.upsert import bulk_upsert
+
+# IDs fora da faixa real do Brokermint; tudo é desfeito no rollback
+BENCHMARK_ID_OFFSET = 9_000_000_000
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    """
+    Round-trips ao banco por 1.000 linhas e linhas efetivamente gravadas:
+    gravação linha a linha (antiga sync_minimal_transactions) vs. bulk_upsert
+    com payload_hash
+
+    Roda dentro de uma transação desfeita ao final: nada fica gravado.
+
+    Cenários (para --rows transações):
+    - insert: todas novas
+    - update: todas existentes, --changed % com status alterado
+
+    USAGE:
+    python manage.py benchmark_upsert
+    python manage.py benchmark_upsert --rows 5000 --changed 10
+    """
+
+    help = 'Benchmark: round-trips por 1.000 linhas, linha a linha vs. bulk upsert'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Transações por cenário (default: 1000)')
+        parser.add_argument('--changed', type=int, default=10,
+                            help='%% de transações alteradas no cenário update (default: 10)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        listing = [
+            {'id': BENCHMARK_ID_OFFSET + index, 'address': f'{index} Benchmark Rd',
+             'city': 'Orlando', 'state': 'FL', 'status': 'active'}
+            for index in range(rows)
+        ]
+        changed_every = max(1, round(100 / options['changed'])) if options['changed'] else None
+        changed = [
+            {**item, 'status': 'closed'} if changed_every and index % changed_every == 0 else item
+            for index, item in enumerate(listing)
+        ]
+
+        header = f"{'Caminho':<14} {'Cenário':<8} {'Queries':>8} {'Por 1.000':>10} {'Gravadas':>9} {'Tempo':>9}"
+        self.stdout.write(f"{rows} transações, {options['changed']}% alteradas no cenário update")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for name, write in (('linha a linha', self._row_by_row), ('bulk upsert', self._bulk_upsert)):
+            for scenario, data in (('insert', listing), ('update', changed)):
+                queries, written, elapsed = self._measure(write, listing, data, seed=scenario == 'update')
+                self.stdout.write(
+                    f'{name:<14} {scenario:<8} {queries:>8} {queries * 1000 / rows:>10.1f} '
+                    f'{written:>9} {elapsed:>8.2f}s'
+                )
+
+    def _measure(self, write, listing, data, seed):
+        """Executa `write(data)` em uma transação desfeita; retorna (queries, linhas gravadas, segundos)"""
+        try:
+            with transaction.atomic():
+                if seed:
+                    bulk_upsert(
+                        BrokermintTransaction, [transaction_from_listing(item) for item in listing],
+                        unique_field='brokermint_id', update_fields=[field for field, _, _ in TRANSACTION_LIST_FIELDS],
+                        hash_field='payload_hash')
+                with CaptureQueriesContext(connection) as context:
+                    started = time.perf_counter()
+                    written = write(data)
+                    elapsed = time.perf_counter() - started
+                raise _Rollback
+        except _Rollback:
+            pass
+        return len(context.captured_queries), written, elapsed
+
+    def _row_by_row(self, data):
+        """Algoritmo anterior: um SELECT de IDs + um INSERT/UPDATE por transação"""
+        existing_ids = set(BrokermintTransaction.objects.values_list('brokermint_id', flat=True))
+        for item in data:
+            values = {field: item.get(key, default) for field, key, default in TRANSACTION_LIST_FIELDS}
+            if item['id'] not in existing_ids:
+                BrokermintTransaction.objects.create(brokermint_id=item['id'], has_detailed_data=False, **values)
+            else:
+                BrokermintTransaction.objects.filter(brokermint_id=item['id']).update(**values)
+        return len(data)
+
+    def _bulk_upsert(self, data):
+        result = bulk_upsert(
+            BrokermintTransaction, [transaction_from_listing(item) for item in data],
+            unique_field='brokermint_id', update_fields=[field for field, _, _ in TRANSACTION_LIST_FIELDS],
+            hash_field='payload_hash')
+        return result.inserted + result.updated
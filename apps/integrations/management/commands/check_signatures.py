@@ -1,11 +1,20 @@
 # integrations/management/commands/check_signatures.py
 from django.core.management.base import BaseCommand
+from integrations.models import SyncRun
+from integrations.locks import LockBusy
+from integrations.sync_runs import track_sync_run
 from integrations.sync_service import BrokermintSyncService
 
 class Command(BaseCommand):
     help = 'Verifica assinaturas de transações específicas'
     
     def add_arguments(self, parser):
+        parser.add_argument(
+            '--lock-wait',
+            type=float,
+            default=0,
+            help='Segundos esperando outra execução em andamento terminar (padrão: não espera)'
+        )
         parser.add_argument(
             '--transactions',
             nargs='+',
@@ -22,17 +31,24 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         service = BrokermintSyncService()
         
-        if options['transactions']:
-            # Verificação específica
-            self.stdout.write(f"🎯 Verificando transações: {options['transactions']}")
-            result = service.sync_only_signature_activities(transaction_ids=options['transactions'])
-        else:
-            # Verificação geral
-            self.stdout.write(f"🔍 Verificando últimas {options['hours']} horas...")
-            result = service.sync_only_signature_activities(hours_back=options['hours'])
+        try:
+            with track_sync_run(SyncRun.TYPE_SIGNATURES, trigger=SyncRun.TRIGGER_COMMAND,
+                                resume=False, lock_wait=options['lock_wait']) as run:
+                if options['transactions']:
+                    # Verificação específica
+                    self.stdout.write(f"🎯 Verificando transações: {options['transactions']}")
+                    result = service.sync_only_signature_activities(transaction_ids=options['transactions'])
+                else:
+                    # Verificação geral
+                    self.stdout.write(f"🔍 Verificando últimas {options['hours']} horas...")
+                    result = service.sync_only_signature_activities(hours_back=options['hours'])
+                run.advance(processed=result['checked_transactions'], inserted=len(result['new_activities']))
+        except LockBusy as busy:
+            self.stdout.write(self.style.WARNING(f'⏭️  {busy}'))
+            return
         
         self.stdout.write(
             self.style.SUCCESS(
                 f"✅ {len(result['new_activities'])} assinaturas, {len(result['signed_contracts'])} contratos assinados"
             )
-        )
\ No newline at end of file
+        )
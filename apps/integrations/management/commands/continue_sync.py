@@ -1,18 +1,27 @@
 # integrations/management/commands/continue_sync.py
 from django.core.management.base import BaseCommand
-from integrations.sync_service import BrokermintSyncService
-from integrations.models import BrokermintTransaction
-import time
+from integrations.detail_fetcher import sync_transaction_details
+from integrations.models import BrokermintTransaction, SyncRun
+from integrations.locks import LockBusy
+from integrations.sync_runs import track_sync_run
+
 
 class Command(BaseCommand):
+    """
+    Continua a sincronização de detalhes do último checkpoint
+
+    Se a última execução de detalhes caiu (erro, deploy, rate limit), esta
+    começa do cursor dela (SyncRun); senão, das pendentes desde o início.
+    """
+
     help = 'Continua sincronização das transações restantes'
-    
+
     def add_arguments(self, parser):
         parser.add_argument(
-            '--delay',
+            '--lock-wait',
             type=float,
-            default=1.0,
-            help='Delay em segundos entre requisições (padrão: 1s)'
+            default=0,
+            help='Segundos esperando outra execução em andamento terminar (padrão: não espera)'
         )
         parser.add_argument(
             '--max-batch',
@@ -20,58 +29,49 @@ class Command(BaseCommand):
             default=100,
             help='Máximo por execução para evitar rate limit'
         )
-    
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Requisições simultâneas (padrão: BROKERMINT_DETAIL_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=None,
+            help='Máximo de requisições por segundo (padrão: BROKERMINT_RATE_LIMIT)'
+        )
+
     def handle(self, *args, **options):
-        service = BrokermintSyncService()
-        
-        # Buscar apenas as que faltam
-        remaining = BrokermintTransaction.objects.filter(
-            has_detailed_data=False
-        )[:options['max_batch']]
-        
-        if not remaining:
+        try:
+            with track_sync_run(SyncRun.TYPE_DETAILS, trigger=SyncRun.TRIGGER_COMMAND,
+                                lock_wait=options['lock_wait']) as run:
+                if run.resumed:
+                    self.stdout.write(
+                        f'⏯️  Retomando execução #{run.run.resumed_from_id} a partir de {run.cursor}')
+                result = sync_transaction_details(
+                    limit=options['max_batch'],
+                    concurrency=options['concurrency'],
+                    rate=options['rate'],
+                    run=run,
+                )
+                if result.aborted:
+                    run.finish(SyncRun.STATUS_INTERRUPTED, error=result.aborted)
+        except LockBusy as busy:
+            self.stdout.write(self.style.WARNING(f'⏭️  {busy}'))
+            return
+
+        if result.total == 0:
             self.stdout.write('✅ Todas as transações já têm detalhes!')
             return
-        
-        self.stdout.write(f'🔄 Continuando com {remaining.count()} transações restantes...')
-        
-        processed = 0
-        errors = 0
-        
-        for transaction in remaining:
-            try:
-                self.stdout.write(f'🔍 Processando {transaction.brokermint_id}...', ending='')
-                
-                # DELAY MAIOR PARA EVITAR RATE LIMIT
-                time.sleep(options['delay'])
-                
-                details = service.client.get_transaction_details(transaction.brokermint_id)
-                
-                if details and isinstance(details, dict) and details.get('id'):
-                    # Atualizar dados (mesmo código anterior)
-                    transaction.parcel_id = details.get('Parcel ID', '')
-                    transaction.county = details.get('County', '')
-                    # ... outros campos ...
-                    transaction.has_detailed_data = True
-                    transaction.save()
-                    
-                    processed += 1
-                    self.stdout.write(f' ✅ Parcel: {transaction.parcel_id or "N/A"}')
-                else:
-                    self.stdout.write(' ⚠️  Resposta vazia')
-                    
-            except Exception as e:
-                errors += 1
-                self.stdout.write(f' ❌ Erro: {str(e)}')
-                
-                # Pausa maior em caso de erro
-                if 'rate limit' in str(e).lower() or '429' in str(e):
-                    self.stdout.write('   ⏸️  Rate limit detectado, pausando 60s...')
-                    time.sleep(60)
-        
-        self.stdout.write(f'\n✅ Processadas: {processed}, Erros: {errors}')
-        
+
+        self.stdout.write(
+            f'\n✅ Processadas: {result.updated}, Não encontradas: {result.not_found}, '
+            f'Erros: {result.errors} ({result.rate:.1f}/s)')
+        if result.aborted:
+            self.stdout.write(f'   ⏸️  Rate limit detectado, restante fica para a próxima execução: {result.aborted}')
+
         # Status final
         total_with_details = BrokermintTransaction.objects.filter(has_detailed_data=True).count()
         total = BrokermintTransaction.objects.count()
-        self.stdout.write(f'📊 Total com detalhes: {total_with_details}/{total}')
\ No newline at end of file
+        self.stdout.write(f'📊 Total com detalhes: {total_with_details}/{total}')
@@ -0,0 +1,74 @@
+# integrations/management/commands/replay_webhook_events.py
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from integrations.models import BrokermintWebhookEvent
+from integrations.webhooks import drain_inbox, replay_events
+
+
+class Command(BaseCommand):
+    """
+    Reprocessa eventos da inbox de webhooks do Brokermint
+
+    A inbox é append-only: reprocessar = devolver os eventos para a fila
+    (processed_at vazio) e drenar. Duplicados continuam sendo descartados
+    pelo event_id, exceto com --force (reaplica também os já aplicados).
+
+    USAGE:
+    python manage.py replay_webhook_events --failed
+    python manage.py replay_webhook_events --since 2026-10-01T00:00 --transaction 123 --dry-run
+    python manage.py replay_webhook_events --event-id evt_1 --event-id evt_2 --no-drain
+    """
+
+    help = 'Devolve eventos de webhook para a fila e drena a inbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--event-id', action='append', dest='event_ids', help='event_id (repetível)')
+        parser.add_argument('--transaction', type=int, help='Eventos de uma transação (brokermint_id)')
+        parser.add_argument('--since', help='Recebidos a partir de (ISO 8601)')
+        parser.add_argument('--failed', action='store_true', help='Apenas eventos com outcome=failed')
+        parser.add_argument('--force', action='store_true',
+                            help='Reaplica também eventos já aplicados (ignora a deduplicação)')
+        parser.add_argument('--dry-run', action='store_true', help='Só mostra quantos seriam reprocessados')
+        parser.add_argument('--no-drain', action='store_true', help='Só devolve para a fila (o beat drena)')
+
+    def handle(self, *args, **options):
+        queryset = BrokermintWebhookEvent.objects.filter(processed_at__isnull=False)
+        if options['event_ids']:
+            queryset = queryset.filter(event_id__in=options['event_ids'])
+        if options['transaction']:
+            queryset = queryset.filter(bm_transaction_id=options['transaction'])
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError(f"--since inválido: {options['since']}")
+            queryset = queryset.filter(received_at__gte=since)
+        if options['failed']:
+            queryset = queryset.filter(outcome=BrokermintWebhookEvent.OUTCOME_FAILED)
+        if not any(options[key] for key in ('event_ids', 'transaction', 'since', 'failed')):
+            raise CommandError('Informe ao menos um filtro: --event-id, --transaction, --since ou --failed')
+
+        if options['force']:
+            # Sem outcome=applied no histórico, a deduplicação não descarta o evento
+            queryset = queryset.exclude(outcome=BrokermintWebhookEvent.OUTCOME_DUPLICATE)
+
+        total = queryset.count()
+        if options['dry_run']:
+            self.stdout.write(f'🔎 {total} eventos seriam reprocessados')
+            return
+
+        event_ids = set(queryset.values_list('event_id', flat=True))
+        replayed = replay_events(queryset)
+        if options['force']:
+            BrokermintWebhookEvent.objects.filter(
+                event_id__in=event_ids, outcome=BrokermintWebhookEvent.OUTCOME_APPLIED
+            ).update(outcome='')
+        self.stdout.write(f'🔁 {replayed} eventos devolvidos para a fila')
+
+        if options['no_drain']:
+            return
+        totals = drain_inbox()
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {totals['applied']} aplicados, {totals['duplicate']} duplicados, "
+            f"{totals['ignored']} ignorados, {totals['failed']} falharam, {totals['retried']} voltaram para a fila"
+        ))
@@ -0,0 +1,68 @@
+# integrations/management/commands/send_test_webhook.py
+import json
+import time
+import uuid
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+
+from integrations.webhooks import SIGNATURE_HEADER, sign_payload
+
+
+class Command(BaseCommand):
+    """
+    Envia eventos sintéticos (assinados) para o endpoint de webhooks
+
+    Para testar a ingestão ponta a ponta sem o Brokermint: o corpo é
+    assinado com BROKERMINT_WEBHOOK_SECRET (ou --secret). Com --repeat > 1
+    cada evento é reenviado com o mesmo event_id (teste de deduplicação).
+
+    USAGE:
+    python manage.py send_test_webhook --url http://localhost:8000/integrations/webhooks/brokermint/ --transaction 123
+    python manage.py send_test_webhook --url ... --transaction 123 --transaction 456 --type signature.completed --batch
+    python manage.py send_test_webhook --url ... --transaction 123 --repeat 3
+    """
+
+    help = 'Envia eventos sintéticos assinados para o webhook do Brokermint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', required=True, help='URL do endpoint de webhooks')
+        parser.add_argument('--transaction', type=int, action='append', dest='transactions',
+                            required=True, help='brokermint_id da transação (repetível)')
+        parser.add_argument('--type', default='transaction.updated', help='event_type (default: transaction.updated)')
+        parser.add_argument('--repeat', type=int, default=1, help='Envios por evento (mesmo event_id)')
+        parser.add_argument('--batch', action='store_true', help='Todos os eventos em um único POST (lista)')
+        parser.add_argument('--secret', help='Segredo HMAC (default: BROKERMINT_WEBHOOK_SECRET)')
+
+    def handle(self, *args, **options):
+        events = [
+            {
+                'event_id': f'test-{uuid.uuid4()}',
+                'event_type': options['type'],
+                'transaction_id': transaction_id,
+                'timestamp': int(time.time()),
+            }
+            for transaction_id in options['transactions']
+        ]
+        bodies = [events] if options['batch'] else events
+
+        for _ in range(options['repeat']):
+            for payload in bodies:
+                body = json.dumps(payload).encode()
+                try:
+                    response = requests.post(
+                        options['url'],
+                        data=body,
+                        headers={
+                            'Content-Type': 'application/json',
+                            SIGNATURE_HEADER: sign_payload(body, options['secret']),
+                        },
+                        timeout=10,
+                    )
+                except requests.RequestException as exc:
+                    raise CommandError(f'Falha ao enviar: {exc}')
+                self.stdout.write(f'➡️  {response.status_code} {response.text}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {len(events)} eventos x {options['repeat']} envios"
+        ))
@@ -1,13 +1,22 @@
 # integrations/management/commands/sync_activities.py
 from django.core.management.base import BaseCommand
 from integrations.sync_service import BrokermintSyncService
-from integrations.models import BrokermintTransaction, BrokermintActivity
+from integrations.models import BrokermintTransaction, BrokermintActivity, SyncRun
+from integrations.locks import LockBusy
+from integrations.sync_runs import track_sync_run
+from django.utils import timezone
 import time
 
 class Command(BaseCommand):
     help = 'Sincroniza atividades de assinatura específicas'
     
     def add_arguments(self, parser):
+        parser.add_argument(
+            '--lock-wait',
+            type=float,
+            default=0,
+            help='Segundos esperando outra execução em andamento terminar (padrão: não espera)'
+        )
         parser.add_argument(
             '--transaction-ids',
             nargs='+',
@@ -27,8 +36,19 @@ class Command(BaseCommand):
         )
     
     def handle(self, *args, **options):
+        # Só a verificação de TODAS é retomada do checkpoint (cursor = pk da transação)
+        try:
+            with track_sync_run(SyncRun.TYPE_ACTIVITIES, trigger=SyncRun.TRIGGER_COMMAND,
+                                resume=options['all'], lock_wait=options['lock_wait']) as run:
+                self.check_activities(run, options)
+        except LockBusy as busy:
+            self.stdout.write(self.style.WARNING(f'⏭️  {busy}'))
+            return
+
+    def check_activities(self, run, options):
         service = BrokermintSyncService()
-        
+        pks = None
+
         if options['transaction_ids']:
             # IDs específicos fornecidos
             transaction_ids = options['transaction_ids']
@@ -36,9 +56,14 @@ class Command(BaseCommand):
             
         elif options['all']:
             # TODAS as transações
-            transaction_ids = list(
-                BrokermintTransaction.objects.values_list('brokermint_id', flat=True)
+            rows = list(
+                BrokermintTransaction.objects.filter(pk__gt=run.cursor.get('after_pk', 0))
+                .order_by('pk').values_list('pk', 'brokermint_id')
             )
+            pks = [pk for pk, _ in rows]
+            transaction_ids = [brokermint_id for _, brokermint_id in rows]
+            if run.resumed:
+                self.stdout.write(f'⏯️  Retomando execução #{run.run.resumed_from_id} a partir de {run.cursor}')
             self.stdout.write(f'🌐 Verificando atividades de TODAS as {len(transaction_ids)} transações...')
             
         else:
@@ -50,6 +75,7 @@ class Command(BaseCommand):
             )
             self.stdout.write(f'📋 Verificando atividades de {len(transaction_ids)} transações não verificadas...')
         
+        run.run.total = len(transaction_ids)
         if not transaction_ids:
             self.stdout.write('✅ Nenhuma transação para verificar!')
             return
@@ -61,6 +87,7 @@ class Command(BaseCommand):
         
         for i in range(0, len(transaction_ids), batch_size):
             batch = transaction_ids[i:i + batch_size]
+            cursor = {'after_pk': pks[i + len(batch) - 1]} if pks else None
             
             self.stdout.write(f'\n📦 Verificando lote {i//batch_size + 1} ({len(batch)} transações)...')
             
@@ -70,44 +97,30 @@ class Command(BaseCommand):
                 
                 self.stdout.write(f'   📨 API retornou {len(activities_data)} atividades')
                 
-                for activity_data in activities_data:
-                    # Salvar atividade
-                    activity, created = BrokermintActivity.objects.update_or_create(
-                        brokermint_id=activity_data['id'],
-                        defaults={
-                            'content': activity_data.get('content', ''),
-                            'bm_transaction_id': activity_data.get('bm_transaction_id'),
-                            'created_at_brokermint': activity_data.get('created_at'),
-                            'originator_id': activity_data.get('originator_id'),
-                            'document_id': activity_data.get('document_id'),
-                            'event_label': activity_data.get('event_label', ''),
-                            'signers': activity_data.get('metadata', {}).get('signers', []),
-                        }
+                # Gravação em lote; transações das atividades novas marcadas como assinadas
+                upsert = service.save_signature_activities(activities_data)
+                total_activities += upsert.inserted
+                total_signed_contracts += upsert.inserted
+                self.stdout.write(
+                    f'   💾 {upsert.inserted} novas, {upsert.updated} alteradas, {upsert.unchanged} inalteradas '
+                    f'({upsert.change_ratio:.1%} gravadas)'
+                )
+
+                for activity in upsert.inserted_objects:
+                    self.stdout.write(
+                        f'   🎉 ASSINATURA ENCONTRADA: Transação {activity.bm_transaction_id}, '
+                        f'Documento {activity.document_id}, '
+                        f'Signatários: {", ".join(activity.signers)}'
                     )
-                    
-                    if created:
-                        total_activities += 1
-                        total_signed_contracts += 1
-                        
-                        self.stdout.write(
-                            f'   🎉 ASSINATURA ENCONTRADA: Transação {activity.bm_transaction_id}, '
-                            f'Documento {activity.document_id}, '
-                            f'Signatários: {", ".join(activity.signers)}'
-                        )
-                        
-                        # Marcar transação como tendo assinatura
-                        BrokermintTransaction.objects.filter(
-                            brokermint_id=activity.bm_transaction_id
-                        ).update(
-                            has_signature_activity=True,
-                            is_contract_signed=True
-                        )
                 
                 # Marcar transações como verificadas
-                from django.utils import timezone
                 BrokermintTransaction.objects.filter(
                     brokermint_id__in=batch
                 ).update(last_activity_check=timezone.now())
+                run.advance(
+                    cursor=cursor, processed=len(batch),
+                    inserted=upsert.inserted, updated=upsert.updated, unchanged=upsert.unchanged,
+                )
                 
                 # Delay entre lotes
                 if i + batch_size < len(transaction_ids):
@@ -115,6 +128,8 @@ class Command(BaseCommand):
                     
             except Exception as e:
                 self.stdout.write(f'   ❌ Erro no lote: {str(e)}')
+                run.error(e)
+                run.advance(cursor=cursor, processed=len(batch), errors=len(batch))
         
         self.stdout.write('\n' + '='*50)
         self.stdout.write(f'✅ ATIVIDADES SINCRONIZADAS!')
@@ -123,4 +138,4 @@ class Command(BaseCommand):
         
         # Status final
         total_activities_db = BrokermintActivity.objects.count()
-        self.stdout.write(f'   💾 Total no banco: {total_activities_db}')
\ No newline at end of file
+        self.stdout.write(f'   💾 Total no banco: {total_activities_db}')
@@ -1,19 +1,26 @@
 # integrations/management/commands/sync_all_details.py
 from django.core.management.base import BaseCommand
-from integrations.sync_service import BrokermintSyncService
-from integrations.models import BrokermintTransaction
-import time
+from integrations.detail_fetcher import DETAIL_BATCH_SIZE, sync_transaction_details
+from integrations.models import BrokermintTransaction, SyncRun
+from integrations.locks import LockBusy
+from integrations.sync_runs import track_sync_run
 
 
 class Command(BaseCommand):
     help = 'Sincroniza detalhes de TODAS as transações sem dados completos'
 
     def add_arguments(self, parser):
+        parser.add_argument(
+            '--lock-wait',
+            type=float,
+            default=0,
+            help='Segundos esperando outra execução em andamento terminar (padrão: não espera)'
+        )
         parser.add_argument(
             '--batch-size',
             type=int,
-            default=100,
-            help='Quantas transações processar por vez (padrão: 50)'
+            default=DETAIL_BATCH_SIZE,
+            help=f'Transações gravadas por lote (padrão: {DETAIL_BATCH_SIZE})'
         )
         parser.add_argument(
             '--max-total',
@@ -22,144 +29,65 @@ class Command(BaseCommand):
             help='Máximo total para processar (padrão: todas)'
         )
         parser.add_argument(
-            '--delay',
+            '--concurrency',
+            type=int,
+            default=None,
+            help='Requisições simultâneas (padrão: BROKERMINT_DETAIL_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--rate',
             type=float,
-            default=0.5,
-            help='Delay em segundos entre requisições (padrão: 0.5s)'
+            default=None,
+            help='Máximo de requisições por segundo (padrão: BROKERMINT_RATE_LIMIT)'
         )
-
-    def handle(self, *args, **options):
-        service = BrokermintSyncService()
-
-        # Buscar transações sem detalhes
-        transactions_without_details = BrokermintTransaction.objects.filter(
-            has_detailed_data=False
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Ignora o checkpoint da última execução interrompida'
         )
 
-        total_pending = transactions_without_details.count()
+    def handle(self, *args, **options):
+        def progress(result):
+            self.stdout.write(
+                f'   ✅ {result.processed}/{result.total} processadas '
+                f'({result.updated} gravadas, {result.errors} erros, {result.rate:.1f}/s)')
 
-        if options['max_total']:
-            transactions_without_details = transactions_without_details[:options['max_total']]
-            total_to_process = min(total_pending, options['max_total'])
-        else:
-            total_to_process = total_pending
+        self.stdout.write(self.style.SUCCESS('🚀 Sincronizando detalhes das transações...'))
 
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'🚀 Sincronizando detalhes de {total_to_process} transações...')
-        )
+        try:
+            with track_sync_run(SyncRun.TYPE_DETAILS, trigger=SyncRun.TRIGGER_COMMAND,
+                                resume=not options['restart'], lock_wait=options['lock_wait']) as run:
+                if run.resumed:
+                    self.stdout.write(
+                        f'⏯️  Retomando execução #{run.run.resumed_from_id} a partir de {run.cursor}')
+                result = sync_transaction_details(
+                    limit=options['max_total'],
+                    concurrency=options['concurrency'],
+                    rate=options['rate'],
+                    batch_size=options['batch_size'],
+                    progress=progress,
+                    run=run,
+                )
+                if result.aborted:
+                    run.finish(SyncRun.STATUS_INTERRUPTED, error=result.aborted)
+        except LockBusy as busy:
+            self.stdout.write(self.style.WARNING(f'⏭️  {busy}'))
+            return
 
-        if total_to_process == 0:
+        if result.total == 0:
             self.stdout.write('✅ Todas as transações já têm detalhes!')
             return
 
-        batch_size = options['batch_size']
-        processed = 0
-        errors = 0
-
-        start_time = time.time()
-
-        # Processar em lotes
-        for i in range(0, total_to_process, batch_size):
-            batch = transactions_without_details[i:i + batch_size]
-
-            self.stdout.write(f'\n📦 Processando lote {i//batch_size + 1}...')
-            delay = options['delay']
-
-            for transaction in batch:
-                try:
-                    time.sleep(delay)  # Delay entre requisições
-                    # Buscar detalhes individuais
-                    details = service.client.get_transaction_details(
-                        transaction.brokermint_id)
-
-                    if details and isinstance(details, dict) and details.get('id'):
-                        # Atualizar com dados completos
-                        transaction.county = details.get('County', '')
-                        transaction.legal_description = details.get(
-                            'Legal description', '')
-                        transaction.parcel_id = details.get('Parcel ID', '')
-                        transaction.home_model = details.get('Home Model', '')
-                        transaction.bedrooms = str(details.get('Bedrooms', ''))
-                        transaction.full_baths = str(
-                            details.get('Full baths', ''))
-                        transaction.half_baths = str(
-                            details.get('Half baths', ''))
-                        transaction.building_sqft = str(
-                            details.get('Building SQFT', ''))
-                        transaction.soft_costs = str(
-                            details.get('Soft Costs', ''))
-                        transaction.hard_costs = str(
-                            details.get('Hard Costs', ''))
-                        transaction.estimated_construction_cost = str(
-                            details.get('Estimated Construction Cost', ''))
-                        transaction.builder_fee = str(
-                            details.get('Builder Fee', ''))
-                        transaction.draw_1 = str(details.get('Draw 1', ''))
-                        transaction.draw_2 = str(details.get('Draw 2', ''))
-                        transaction.draw_3 = str(details.get('Draw 3', ''))
-                        transaction.draw_4 = str(details.get('Draw 4', ''))
-                        transaction.draw_5 = str(details.get('Draw 5', ''))
-                        transaction.lot = str(details.get('Lot', ''))
-                        transaction.block = str(details.get('Block', ''))
-                        transaction.unit = str(details.get('Unit', ''))
-                        transaction.sec = str(details.get('SEC', ''))
-                        transaction.twp = str(details.get('Twp', ''))
-                        transaction.rge = str(details.get('Rge', ''))
-                        transaction.subdivision = details.get(
-                            'Subdivision', '')
-                        transaction.acceptance_date = details.get(
-                            'acceptance_date')
-                        transaction.expiration_date = details.get(
-                            'expiration_date')
-                        transaction.closing_date = details.get('closing_date')
-                        transaction.listing_date = details.get('listing_date')
-                        transaction.buyer_agreement_date = details.get(
-                            'buyer_agreement_date')
-                        transaction.buyer_expiration_date = details.get(
-                            'buyer_expiration_date')
-                        transaction.custom_id = details.get('custom_id', '')
-                        transaction.transaction_type = details.get(
-                            'transaction_type', '')
-                        transaction.external_id = details.get(
-                            'external_id', '')
-                        transaction.total_gross_commission = details.get(
-                            'total_gross_commission', 0)
-                        transaction.sales_volume = details.get(
-                            'sales_volume', 0)
-                        transaction.has_detailed_data = True
-                        transaction.save()
-
-                        processed += 1
-
-                        if processed % 10 == 0:
-                            self.stdout.write(
-                                f'   ✅ {processed}/{total_to_process} processadas...')
-                    else:
-                        self.stdout.write(
-                            f'   ❌ Detalhes não encontrados para a transação {transaction.brokermint_id}')
-
-                except Exception as e:
-                    errors += 1
-                    self.stdout.write(
-                        f'   ❌ Erro na transação {transaction.brokermint_id}: {str(e)}')
-                    # Se muitos erros seguidos, aumentar delay
-                    if errors > 5:
-                        self.stdout.write(
-                            '   ⏸️  Muitos erros, pausando 30s...')
-                        time.sleep(30)
-
-        end_time = time.time()
-
         self.stdout.write('\n' + '='*50)
         self.stdout.write(
-            self.style.SUCCESS(
-                f'✅ SINCRONIZAÇÃO CONCLUÍDA em {end_time - start_time:.2f}s')
+            self.style.SUCCESS(f'✅ SINCRONIZAÇÃO CONCLUÍDA em {result.elapsed:.2f}s')
         )
-        self.stdout.write(f'   📊 Processadas: {processed}')
-        self.stdout.write(f'   ❌ Erros: {errors}')
-        self.stdout.write(
-            f'   ⚡ Taxa: {processed/(end_time - start_time):.1f} transações/segundo')
+        self.stdout.write(f'   📊 Gravadas: {result.updated}')
+        self.stdout.write(f'   🔍 Não encontradas: {result.not_found}')
+        self.stdout.write(f'   ❌ Erros: {result.errors}')
+        self.stdout.write(f'   ⚡ Taxa: {result.rate:.1f} transações/segundo')
+        if result.aborted:
+            self.stdout.write(self.style.WARNING(f'   ⏸️  Interrompida: {result.aborted}'))
 
         # Verificar resultado final
         final_count = BrokermintTransaction.objects.filter(
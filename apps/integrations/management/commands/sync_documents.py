@@ -1,29 +1,57 @@
 # integrations/management/commands/sync_documents.py
 from django.core.management.base import BaseCommand
 from integrations.sync_service import BrokermintSyncService
-from integrations.models import BrokermintActivity, BrokermintDocument
+from integrations.models import BrokermintActivity, BrokermintDocument, SyncRun
+from integrations.locks import LockBusy
+from integrations.sync_runs import track_sync_run
+from integrations.upsert import UpsertResult
 import time
 
 class Command(BaseCommand):
     help = 'Sincroniza documentos das atividades de assinatura'
     
     def add_arguments(self, parser):
+        parser.add_argument(
+            '--lock-wait',
+            type=float,
+            default=0,
+            help='Segundos esperando outra execução em andamento terminar (padrão: não espera)'
+        )
         parser.add_argument(
             '--delay',
             type=float,
             default=0.5,
             help='Delay entre requisições em segundos'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Documentos gravados por lote (bulk upsert)'
+        )
     
     def handle(self, *args, **options):
+        # Checkpoint = pk da última atividade cujo documento já foi gravado
+        try:
+            with track_sync_run(SyncRun.TYPE_DOCUMENTS, trigger=SyncRun.TRIGGER_COMMAND,
+                                lock_wait=options['lock_wait']) as run:
+                self.sync_documents(run, options)
+        except LockBusy as busy:
+            self.stdout.write(self.style.WARNING(f'⏭️  {busy}'))
+            return
+
+    def sync_documents(self, run, options):
         service = BrokermintSyncService()
         
         # Buscar atividades que ainda não têm documentos sincronizados
         activities_without_docs = BrokermintActivity.objects.exclude(
             document_id__in=BrokermintDocument.objects.values_list('brokermint_id', flat=True)
-        )
+        ).filter(pk__gt=run.cursor.get('after_pk', 0)).order_by('pk')
+        if run.resumed:
+            self.stdout.write(f'⏯️  Retomando execução #{run.run.resumed_from_id} a partir de {run.cursor}')
         
         total_activities = activities_without_docs.count()
+        run.run.total = total_activities
         
         if total_activities == 0:
             self.stdout.write('✅ Todos os documentos já foram sincronizados!')
@@ -34,8 +62,38 @@ class Command(BaseCommand):
         processed = 0
         errors = 0
         new_documents = 0
+        written = UpsertResult()
+        pending = []
+        seen, last_pk = 0, None
+
+        def flush():
+            # Gravação em lote (bulk upsert) dos documentos buscados
+            nonlocal new_documents, seen
+            if seen and not pending:
+                run.advance(cursor={'after_pk': last_pk}, processed=seen)
+                seen = 0
+            if not pending:
+                return
+            upsert = service.save_documents(pending)
+            run.advance(
+                cursor={'after_pk': last_pk}, processed=seen,
+                inserted=upsert.inserted, updated=upsert.updated, unchanged=upsert.unchanged,
+            )
+            seen = 0
+            written.merge(upsert)
+            pending.clear()
+            new_documents += upsert.inserted
+            self.stdout.write(
+                f'   💾 Lote gravado: {upsert.inserted} novos, {upsert.updated} atualizados, '
+                f'{upsert.unchanged} inalterados'
+            )
+            for document in upsert.inserted_objects:
+                # Destacar se é contrato
+                if any(word in document.name.lower() for word in ['contract', 'app', 'agreement']):
+                    self.stdout.write(f'   🎯 POSSÍVEL CONTRATO: {document.name}')
         
         for activity in activities_without_docs:
+            seen, last_pk = seen + 1, activity.pk
             try:
                 self.stdout.write(
                     f'🔍 Documento {activity.document_id} da transação {activity.bm_transaction_id}...', 
@@ -52,48 +110,34 @@ class Command(BaseCommand):
                 )
                 
                 if doc_data and isinstance(doc_data, dict) and doc_data.get('id'):
-                    # Salvar documento
-                    document, created = BrokermintDocument.objects.update_or_create(
-                        brokermint_id=doc_data['id'],
-                        defaults={
-                            'name': doc_data.get('name', ''),
-                            'bm_transaction_id': doc_data.get('bm_transaction_id'),
-                            'task_id': doc_data.get('task_id'),
-                            'pages': doc_data.get('pages', 0),
-                            'content_type': doc_data.get('content_type', ''),
-                            'url': doc_data.get('url', ''),
-                        }
-                    )
-                    
-                    if created:
-                        new_documents += 1
-                        self.stdout.write(f' ✅ {doc_data.get("name", "N/A")} ({doc_data.get("pages", 0)} páginas)')
-                        
-                        # Destacar se é contrato
-                        if any(word in doc_data.get('name', '').lower() for word in ['contract', 'app', 'agreement']):
-                            self.stdout.write(f'   🎯 POSSÍVEL CONTRATO: {doc_data.get("name")}')
-                    else:
-                        self.stdout.write(' ↩️  Já existia')
-                        
+                    pending.append(doc_data)
+                    self.stdout.write(f' ✅ {doc_data.get("name", "N/A")} ({doc_data.get("pages", 0)} páginas)')
                     processed += 1
+                    if len(pending) >= options['batch_size']:
+                        flush()
                 else:
                     self.stdout.write(' ⚠️  Resposta vazia')
                     
             except Exception as e:
                 errors += 1
+                run.error(e)
+                run.advance(errors=1)
                 self.stdout.write(f' ❌ Erro: {str(e)}')
                 
                 # Pausa em caso de muitos erros
                 if errors > 5 and errors % 5 == 0:
                     self.stdout.write('   ⏸️  Muitos erros, pausando 30s...')
                     time.sleep(30)
+
+        flush()
         
         self.stdout.write('\n' + '='*50)
         self.stdout.write(f'✅ DOCUMENTOS SINCRONIZADOS!')
         self.stdout.write(f'   📊 Processados: {processed}')
         self.stdout.write(f'   🆕 Novos: {new_documents}')
+        self.stdout.write(f'   🔁 Alterados: {written.updated} ({written.change_ratio:.1%} gravados)')
         self.stdout.write(f'   ❌ Erros: {errors}')
         
         # Status final
         total_docs = BrokermintDocument.objects.count()
-        self.stdout.write(f'   💾 Total no banco: {total_docs}')
\ No newline at end of file
+        self.stdout.write(f'   💾 Total no banco: {total_docs}')
@@ -52,7 +52,8 @@ class Command(BaseCommand):
             f'✅ Sync mínima em {end_time - start_time:.2f}s'
         )
         self.stdout.write(
-            f'   📊 {len(result)} transações novas identificadas'
+            f'   📊 {result.inserted} transações novas identificadas '
+            f'({result.seen} recebidas em {result.pages} páginas)'
         )
 
     def test_signatures_sync(self, service):
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0010_alter_brokermintdocument_name_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="payload_hash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="brokermintactivity",
+            name="payload_hash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="brokermintdocument",
+            name="payload_hash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64),
+        ),
+    ]
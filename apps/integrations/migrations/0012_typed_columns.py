@@ -0,0 +1,106 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0011_payload_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="soft_costs_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="hard_costs_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="estimated_construction_cost_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="builder_fee_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="draw_1_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="draw_2_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="draw_3_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="draw_4_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="draw_5_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, editable=False, max_digits=14, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="acceptance_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Aceitação"),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="expiration_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Expiração"),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="closing_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Fechamento"),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="listing_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name="Listagem"),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="buyer_agreement_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="brokerminttransaction",
+            name="buyer_expiration_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
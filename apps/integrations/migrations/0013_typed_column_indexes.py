@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-19 12:30
+
+import django.contrib.postgres.operations
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("integrations", "0012_typed_columns"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="brokerminttransaction",
+            index=models.Index(fields=["closing_at"], name="bm_transaction_closing_at"),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="brokerminttransaction",
+            index=models.Index(fields=["acceptance_at"], name="bm_transaction_acceptance_at"),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.0.1 on 2026-10-19 13:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0013_typed_column_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BrokermintWebhookEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("event_id", models.CharField(max_length=100, verbose_name="ID do evento")),
+                ("event_type", models.CharField(blank=True, default="", max_length=100)),
+                ("bm_transaction_id", models.BigIntegerField(blank=True, null=True)),
+                ("payload", models.JSONField()),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "outcome",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("applied", "Aplicado"),
+                            ("duplicate", "Duplicado"),
+                            ("ignored", "Ignorado"),
+                            ("failed", "Falhou"),
+                        ],
+                        default="",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+            ],
+            options={
+                "verbose_name": "Evento de webhook Brokermint",
+                "indexes": [
+                    models.Index(fields=["event_id"], name="bm_webhook_event_id"),
+                    models.Index(fields=["received_at"], name="bm_webhook_received_at"),
+                    models.Index(
+                        condition=models.Q(("processed_at__isnull", True)),
+                        fields=["id"],
+                        name="bm_webhook_pending",
+                    ),
+                ],
+            },
+        ),
+    ]
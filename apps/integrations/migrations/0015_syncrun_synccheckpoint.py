@@ -0,0 +1,118 @@
+# Generated by Django 5.0.1 on 2026-10-19 15:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0014_brokermintwebhookevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "run_type",
+                    models.CharField(
+                        choices=[
+                            ("minimal", "Listagem (mínima)"),
+                            ("details", "Detalhes"),
+                            ("signatures", "Assinaturas"),
+                            ("activities", "Atividades"),
+                            ("documents", "Documentos"),
+                        ],
+                        max_length=20,
+                        verbose_name="Tipo",
+                    ),
+                ),
+                (
+                    "trigger",
+                    models.CharField(
+                        choices=[("task", "Task (Celery)"), ("command", "Comando")],
+                        default="task",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Em execução"),
+                            ("completed", "Concluída"),
+                            ("failed", "Falhou"),
+                            ("interrupted", "Interrompida"),
+                        ],
+                        default="running",
+                        max_length=20,
+                    ),
+                ),
+                ("cursor", models.JSONField(blank=True, default=dict)),
+                ("last_processed_id", models.BigIntegerField(blank=True, null=True)),
+                ("total", models.IntegerField(blank=True, null=True)),
+                ("processed", models.IntegerField(default=0)),
+                ("inserted", models.IntegerField(default=0)),
+                ("updated", models.IntegerField(default=0)),
+                ("unchanged", models.IntegerField(default=0)),
+                ("errors", models.IntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, default="")),
+                ("started_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("heartbeat_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "resumed_from",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="resumed_by",
+                        to="integrations.syncrun",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Execução de sincronização",
+                "verbose_name_plural": "Execuções de sincronização",
+                "indexes": [
+                    models.Index(fields=["run_type", "-started_at"], name="sync_run_type_started"),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SyncCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("cursor", models.JSONField(blank=True, default=dict)),
+                ("last_processed_id", models.BigIntegerField(blank=True, null=True)),
+                ("processed", models.IntegerField(default=0)),
+                ("errors", models.IntegerField(default=0)),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="checkpoints",
+                        to="integrations.syncrun",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Checkpoint de sincronização",
+                "ordering": ["run", "pk"],
+            },
+        ),
+    ]
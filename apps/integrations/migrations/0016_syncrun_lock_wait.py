@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0015_syncrun_synccheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncrun",
+            name="lock_wait",
+            field=models.FloatField(default=0, verbose_name="Espera pelo lease (s)"),
+        ),
+        migrations.AlterField(
+            model_name="syncrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("running", "Em execução"),
+                    ("completed", "Concluída"),
+                    ("failed", "Falhou"),
+                    ("interrupted", "Interrompida"),
+                    ("skipped", "Ignorada (já em execução)"),
+                ],
+                default="running",
+                max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0016_syncrun_lock_wait"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="syncrun",
+            name="coverage",
+            field=models.JSONField(blank=True, null=True, verbose_name="Cobertura"),
+        ),
+    ]
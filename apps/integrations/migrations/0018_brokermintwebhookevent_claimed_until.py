@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0017_syncrun_coverage"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="brokermintwebhookevent",
+            name="claimed_until",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
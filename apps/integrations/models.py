@@ -2,6 +2,26 @@
 from django.db import models
 from django.utils import timezone
 import uuid
+from decimal import Decimal
+
+from .typed_columns import DRAW_AMOUNT_COLUMNS
+
+
+class BrokermintTransactionQuerySet(models.QuerySet):
+    def closing_between(self, start=None, end=None):
+        """Fechamento no intervalo (closing_at, indexado)"""
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(closing_at__gte=start)
+        if end is not None:
+            queryset = queryset.filter(closing_at__lt=end)
+        return queryset
+
+    def draw_totals(self):
+        """Soma de cada draw e total geral, agregados no banco (colunas *_amount)"""
+        totals = self.aggregate(**{column: models.Sum(column) for column in DRAW_AMOUNT_COLUMNS})
+        totals['draws_total'] = sum((value for value in totals.values() if value is not None), Decimal('0'))
+        return totals
 
 
 class BrokermintTransaction(models.Model):
@@ -104,6 +124,36 @@ class BrokermintTransaction(models.Model):
     sales_volume = models.DecimalField(
         max_digits=12, decimal_places=2, default=0, null=True)
 
+    # COLUNAS TIPADAS (sombra dos campos acima; integrations.typed_columns)
+    soft_costs_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    hard_costs_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    estimated_construction_cost_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    builder_fee_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    draw_1_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    draw_2_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    draw_3_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    draw_4_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    draw_5_amount = models.DecimalField(
+        max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    acceptance_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Aceitação")
+    expiration_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Expiração")
+    closing_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Fechamento")
+    listing_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name="Listagem")
+    buyer_agreement_at = models.DateTimeField(null=True, blank=True, editable=False)
+    buyer_expiration_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     # Controle
     has_detailed_data = models.BooleanField(
         default=False, verbose_name="Dados Detalhados Carregados", null=True)
@@ -125,6 +175,11 @@ class BrokermintTransaction(models.Model):
         verbose_name="Contrato assinado"
     )
 
+    # SHA-256 dos campos da listagem (integrations.upsert): sync só grava se mudar
+    payload_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
+
+    objects = BrokermintTransactionQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Transação Brokermint"
         indexes = [
@@ -135,6 +190,8 @@ class BrokermintTransaction(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['last_activity_check']),
             models.Index(fields=['is_contract_signed']),
+            models.Index(fields=['closing_at'], name='bm_transaction_closing_at'),
+            models.Index(fields=['acceptance_at'], name='bm_transaction_acceptance_at'),
         ]
 
     def __str__(self):
@@ -152,6 +209,7 @@ class BrokermintActivity(models.Model):
     document_id = models.BigIntegerField()
     event_label = models.CharField(max_length=100)
     signers = models.JSONField(default=list)  # emails dos signatários
+    payload_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
 
     # Metadados
     synced_at = models.DateTimeField(auto_now_add=True)
@@ -167,5 +225,168 @@ class BrokermintDocument(models.Model):
     pages = models.IntegerField()
     content_type = models.CharField(max_length=100)
     url = models.URLField(max_length=1000)
+    payload_hash = models.CharField(max_length=64, blank=True, default='', editable=False)
 
     synced_at = models.DateTimeField(auto_now_add=True)
+
+
+class BrokermintWebhookEvent(models.Model):
+    """
+    Inbox dos webhooks do Brokermint (append-only)
+
+    O endpoint só faz um INSERT e responde 202; integrations.webhooks.drain_inbox
+    processa em lote (deduplicando por event_id) e registra o resultado em
+    processed_at / outcome. Reprocessar = zerar processed_at
+    (python manage.py replay_webhook_events).
+    """
+
+    OUTCOME_APPLIED = 'applied'
+    OUTCOME_DUPLICATE = 'duplicate'
+    OUTCOME_IGNORED = 'ignored'
+    OUTCOME_FAILED = 'failed'
+    OUTCOME_CHOICES = [
+        (OUTCOME_APPLIED, 'Aplicado'),
+        (OUTCOME_DUPLICATE, 'Duplicado'),
+        (OUTCOME_IGNORED, 'Ignorado'),
+        (OUTCOME_FAILED, 'Falhou'),
+    ]
+
+    event_id = models.CharField(max_length=100, verbose_name="ID do evento")
+    event_type = models.CharField(max_length=100, blank=True, default='')
+    bm_transaction_id = models.BigIntegerField(null=True, blank=True)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+
+    # Processamento (drain_inbox)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    outcome = models.CharField(max_length=20, choices=OUTCOME_CHOICES, blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    # Reserva do drain em andamento (refresh fora de transação); expira se o drain morrer
+    claimed_until = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Evento de webhook Brokermint"
+        indexes = [
+            models.Index(fields=['event_id'], name='bm_webhook_event_id'),
+            models.Index(fields=['received_at'], name='bm_webhook_received_at'),
+            # Fila: só os pendentes
+            models.Index(fields=['id'], condition=models.Q(processed_at__isnull=True), name='bm_webhook_pending'),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type or 'evento'} {self.event_id}"
+
+
+class SyncRun(models.Model):
+    """
+    Histórico das sincronizações com o Brokermint (uma linha por execução)
+
+    Checkpoints a cada BROKERMINT_CHECKPOINT_EVERY registros gravam cursor,
+    último ID processado e contagens; uma execução que caiu (exceção, deploy,
+    worker morto) é retomada do último checkpoint pela próxima execução do
+    mesmo tipo (integrations.sync_runs).
+
+    Disparo que encontrou outra execução do mesmo escopo em andamento
+    (integrations.locks) fica registrado como skipped, com o tempo esperado
+    pelo lease em lock_wait.
+    """
+
+    TYPE_MINIMAL = 'minimal'
+    TYPE_DETAILS = 'details'
+    TYPE_SIGNATURES = 'signatures'
+    TYPE_ACTIVITIES = 'activities'
+    TYPE_DOCUMENTS = 'documents'
+    TYPE_CHOICES = [
+        (TYPE_MINIMAL, 'Listagem (mínima)'),
+        (TYPE_DETAILS, 'Detalhes'),
+        (TYPE_SIGNATURES, 'Assinaturas'),
+        (TYPE_ACTIVITIES, 'Atividades'),
+        (TYPE_DOCUMENTS, 'Documentos'),
+    ]
+
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_INTERRUPTED = 'interrupted'
+    STATUS_SKIPPED = 'skipped'
+    STATUS_CHOICES = [
+        (STATUS_RUNNING, 'Em execução'),
+        (STATUS_COMPLETED, 'Concluída'),
+        (STATUS_FAILED, 'Falhou'),
+        (STATUS_INTERRUPTED, 'Interrompida'),
+        (STATUS_SKIPPED, 'Ignorada (já em execução)'),
+    ]
+
+    TRIGGER_TASK = 'task'
+    TRIGGER_COMMAND = 'command'
+    TRIGGER_CHOICES = [
+        (TRIGGER_TASK, 'Task (Celery)'),
+        (TRIGGER_COMMAND, 'Comando'),
+    ]
+
+    run_type = models.CharField(max_length=20, choices=TYPE_CHOICES, verbose_name="Tipo")
+    trigger = models.CharField(max_length=20, choices=TRIGGER_CHOICES, default=TRIGGER_TASK)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_RUNNING)
+    resumed_from = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.SET_NULL, related_name='resumed_by')
+
+    # Posição (último checkpoint)
+    cursor = models.JSONField(default=dict, blank=True)
+    last_processed_id = models.BigIntegerField(null=True, blank=True)
+
+    # Contagens desta execução
+    total = models.IntegerField(null=True, blank=True)
+    processed = models.IntegerField(default=0)
+    inserted = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    unchanged = models.IntegerField(default=0)
+    errors = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+
+    # Resumo do fan-out de assinaturas (sync_service.get_signature_coverage)
+    coverage = models.JSONField(null=True, blank=True, verbose_name="Cobertura")
+
+    # Tempo
+    lock_wait = models.FloatField(default=0, verbose_name="Espera pelo lease (s)")
+    started_at = models.DateTimeField(default=timezone.now)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Execução de sincronização"
+        verbose_name_plural = "Execuções de sincronização"
+        indexes = [
+            models.Index(fields=['run_type', '-started_at'], name='sync_run_type_started'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_run_type_display()} #{self.pk} ({self.status})"
+
+    @property
+    def elapsed(self):
+        """Segundos até o fim (ou até o último checkpoint, se ainda não terminou)"""
+        return ((self.finished_at or self.heartbeat_at) - self.started_at).total_seconds()
+
+    @property
+    def throughput(self):
+        """Registros processados por segundo"""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class SyncCheckpoint(models.Model):
+    """Checkpoint de uma SyncRun: cursor e contagens acumuladas naquele instante"""
+
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name='checkpoints')
+    created_at = models.DateTimeField(default=timezone.now)
+    cursor = models.JSONField(default=dict, blank=True)
+    last_processed_id = models.BigIntegerField(null=True, blank=True)
+    processed = models.IntegerField(default=0)
+    errors = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Checkpoint de sincronização"
+        ordering = ['run', 'pk']
+
+    def __str__(self):
+        return f"{self.run_id} @ {self.processed}"
@@ -1,6 +1,6 @@
 # integrations/serializers.py - CRIAR ARQUIVO
 from rest_framework import serializers
-from .models import BrokermintDocument
+from .models import BrokermintDocument, SyncCheckpoint, SyncRun
 
 class BrokermintDocumentSerializer(serializers.ModelSerializer):
     class Meta:
@@ -11,4 +11,22 @@ class BrokermintDocumentSerializer(serializers.ModelSerializer):
 class DocumentRefreshSerializer(serializers.Serializer):
     success = serializers.BooleanField()
     message = serializers.CharField()
-    document = BrokermintDocumentSerializer(required=False)
\ No newline at end of file
+    document = BrokermintDocumentSerializer(required=False)
+
+class SyncCheckpointSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SyncCheckpoint
+        fields = ['id', 'created_at', 'cursor', 'last_processed_id', 'processed', 'errors']
+
+class SyncRunSerializer(serializers.ModelSerializer):
+    elapsed = serializers.FloatField(read_only=True)
+    throughput = serializers.FloatField(read_only=True, help_text='Registros processados por segundo')
+
+    class Meta:
+        model = SyncRun
+        fields = [
+            'id', 'run_type', 'trigger', 'status', 'resumed_from', 'cursor', 'last_processed_id',
+            'total', 'processed', 'inserted', 'updated', 'unchanged', 'errors', 'last_error',
+            'lock_wait', 'started_at', 'heartbeat_at', 'finished_at', 'elapsed', 'throughput',
+        ]
+        read_only_fields = fields
\ No newline at end of file
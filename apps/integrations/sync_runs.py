@@ -0,0 +1,260 @@
+# integrations/sync_runs.py
+"""
+Execuções de sincronização com checkpoint (SyncRun / SyncCheckpoint)
+
+Cada task/comando de sincronização abre uma SyncRun e informa o progresso
+com advance(); a cada BROKERMINT_CHECKPOINT_EVERY registros o cursor, o
+último ID processado e as contagens são gravados (UPDATE da SyncRun +
+INSERT de um SyncCheckpoint).
+
+Retomada: ao abrir uma execução com resume=True, se a última execução do
+mesmo tipo não terminou (failed, ou interrupted: worker morto / deploy), a
+nova começa do cursor dela.
+O significado do cursor é de cada sincronização:
+- minimal:    {'offset': N}        próxima página da listagem completa
+- details:    {'after_pk': pk}     transações pendentes com pk maior
+- activities: {'after_pk': pk}     verificação de todas as transações (--all)
+- documents:  {'after_pk': pk}     atividades com pk maior
+
+Single-flight: cada execução segura o lease do seu escopo
+(integrations.locks) da abertura ao finish(); disparo com o lease ocupado
+vira uma SyncRun skipped + LockBusy (com `rerun`, coalescido em "mais uma
+vez depois da atual").
+
+USAGE:
+    with track_sync_run(SyncRun.TYPE_DETAILS, trigger=SyncRun.TRIGGER_COMMAND) as run:
+        for item in work_after(run.cursor.get('after_pk', 0)):
+            ...
+            run.advance(processed=1, cursor={'after_pk': item.pk}, last_processed_id=item.pk)
+"""
+import logging
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .locks import LockBusy, SingleFlightLock
+from .models import SyncCheckpoint, SyncRun
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_EVERY = getattr(settings, 'BROKERMINT_CHECKPOINT_EVERY', 500)
+
+COUNT_FIELDS = ('processed', 'inserted', 'updated', 'unchanged', 'errors')
+
+# Escopo do lease por tipo: o comando de atividades busca os mesmos dados das assinaturas
+LOCK_SCOPES = {SyncRun.TYPE_ACTIVITIES: SyncRun.TYPE_SIGNATURES}
+
+
+def lock_scope(run_type):
+    return LOCK_SCOPES.get(run_type, run_type)
+
+
+class SyncRunTracker:
+    """
+    Acumula o progresso de uma SyncRun e grava checkpoints
+
+    Attributes:
+        run: SyncRun
+        cursor: Posição atual (no início, a da execução retomada)
+        resumed: True se a execução continua uma anterior
+        lock: SingleFlightLock da execução (liberado no finish)
+    """
+
+    def __init__(self, run, checkpoint_every=None, lock=None):
+        self.run = run
+        self.checkpoint_every = checkpoint_every or CHECKPOINT_EVERY
+        self.cursor = dict(run.cursor or {})
+        self.resumed = run.resumed_from_id is not None
+        self.lock = lock
+        self._since_checkpoint = 0
+
+    @classmethod
+    def for_run(cls, run_id, checkpoint_every=None, lock_token=None):
+        """Tracker de uma execução já aberta (ex: callback do chord, com o token do lease)"""
+        run = SyncRun.objects.get(pk=run_id)
+        lock = SingleFlightLock(lock_scope(run.run_type), token=lock_token) if lock_token else None
+        return cls(run, checkpoint_every=checkpoint_every, lock=lock)
+
+    def advance(self, cursor=None, last_processed_id=None, **counts):
+        """
+        Soma contagens (processed, inserted, updated, unchanged, errors) e
+        atualiza a posição; grava checkpoint a cada `checkpoint_every`
+        registros processados
+
+        Só chamar depois que os registros foram gravados: o cursor de um
+        checkpoint é de onde a próxima execução recomeça.
+        """
+        for name, value in counts.items():
+            if name not in COUNT_FIELDS:
+                raise TypeError(f"Contagem desconhecida: {name}")
+            setattr(self.run, name, getattr(self.run, name) + value)
+        if cursor is not None:
+            self.cursor = dict(cursor)
+        if last_processed_id is not None:
+            self.run.last_processed_id = last_processed_id
+        self._since_checkpoint += counts.get('processed', 0)
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+    def error(self, message):
+        """Registra o último erro (sem interromper a execução)"""
+        self.run.last_error = str(message)[:2000]
+
+    def checkpoint(self):
+        """Grava posição e contagens (UPDATE da SyncRun + INSERT do SyncCheckpoint)"""
+        run = self.run
+        run.cursor = self.cursor
+        run.heartbeat_at = timezone.now()
+        run.save(update_fields=['cursor', 'last_processed_id', 'heartbeat_at', 'last_error', 'total', *COUNT_FIELDS])
+        SyncCheckpoint.objects.create(
+            run=run, created_at=run.heartbeat_at, cursor=run.cursor,
+            last_processed_id=run.last_processed_id, processed=run.processed, errors=run.errors,
+        )
+        self._since_checkpoint = 0
+
+    def finish(self, status=SyncRun.STATUS_COMPLETED, error=None):
+        """Encerra a execução e libera o lease; failed/interrupted mantêm o cursor para a retomada"""
+        try:
+            if error is not None:
+                self.error(error)
+            if status == SyncRun.STATUS_COMPLETED:
+                self.cursor = {}
+            self.checkpoint()
+            self.run.status = status
+            self.run.finished_at = self.run.heartbeat_at
+            self.run.save(update_fields=['status', 'finished_at'])
+            logger.info(
+                f"Sync {self.run.run_type} #{self.run.pk}: {status}, {self.run.processed} registros "
+                f"em {self.run.elapsed:.1f}s ({self.run.throughput:.1f}/s)")
+        finally:
+            if self.lock:
+                self.lock.release()
+                self.lock = None
+
+
+def interrupt_orphan_runs(run_type):
+    """
+    Execuções 'running' do escopo -> interrupted (finished_at = último checkpoint)
+
+    Só chamar com o lease do escopo: nenhuma delas está viva (worker morto,
+    deploy), então podem ser retomadas.
+    """
+    scope = lock_scope(run_type)
+    run_types = [value for value, _ in SyncRun.TYPE_CHOICES if lock_scope(value) == scope]
+    return SyncRun.objects.filter(
+        run_type__in=run_types,
+        status=SyncRun.STATUS_RUNNING,
+    ).update(status=SyncRun.STATUS_INTERRUPTED, finished_at=F('heartbeat_at'))
+
+
+def resumable_run(run_type):
+    """Última execução do tipo, se ela não terminou e tem cursor; senão None"""
+    last = (
+        SyncRun.objects.filter(run_type=run_type)
+        .exclude(status=SyncRun.STATUS_SKIPPED)
+        .order_by('-started_at', '-pk')
+        .first()
+    )
+    if last and last.status in (SyncRun.STATUS_FAILED, SyncRun.STATUS_INTERRUPTED) and last.cursor:
+        return last
+    return None
+
+
+def acquire_lease(run_type, trigger=SyncRun.TRIGGER_TASK, wait=0, rerun=None, ttl=None, heartbeat=True):
+    """
+    Lease single-flight do escopo do tipo
+
+    Ocupado: com `rerun` (nome da task, kwargs) pede mais uma execução ao
+    dono e tenta de novo (o dono pode ter liberado no meio); sem sucesso,
+    registra uma SyncRun skipped.
+
+    Returns:
+        SingleFlightLock (já adquirido)
+
+    Raises:
+        LockBusy
+    """
+    lock = SingleFlightLock(lock_scope(run_type), ttl=ttl)
+    if lock.acquire(wait=wait, heartbeat=heartbeat):
+        return lock
+    waited = lock.waited
+    if rerun:
+        lock.request_rerun(*rerun)
+        if lock.acquire(wait=0, heartbeat=heartbeat):
+            # Liberado entre as tentativas: esta execução atende o próprio pedido
+            lock.cancel_rerun()
+            lock.waited = waited
+            return lock
+
+    busy = LockBusy(lock.name, waited=waited, rerun_requested=bool(rerun))
+    now = timezone.now()
+    SyncRun.objects.create(
+        run_type=run_type, trigger=trigger, status=SyncRun.STATUS_SKIPPED, lock_wait=waited,
+        started_at=now, heartbeat_at=now, finished_at=now, last_error=str(busy),
+    )
+    logger.info(f"Sync {run_type}: {busy} (esperou {waited:.1f}s)")
+    raise busy
+
+
+def start_sync_run(run_type, trigger=SyncRun.TRIGGER_TASK, resume=True, total=None, checkpoint_every=None,
+                   lock_wait=0, rerun=None, lock_ttl=None, heartbeat=True):
+    """
+    Abre uma SyncRun (retomando a anterior do mesmo tipo, se for o caso)
+    segurando o lease do escopo; finish() libera
+
+    Args:
+        lock_wait: Segundos esperando o lease antes de desistir
+        rerun: (nome da task, kwargs) coalescido se o lease estiver ocupado
+        lock_ttl / heartbeat: lease sem heartbeat (ex: chord) precisa de
+            um ttl que cubra a execução inteira
+
+    Returns:
+        SyncRunTracker
+
+    Raises:
+        LockBusy
+    """
+    lock = acquire_lease(run_type, trigger=trigger, wait=lock_wait, rerun=rerun, ttl=lock_ttl, heartbeat=heartbeat)
+    try:
+        interrupt_orphan_runs(run_type)
+        previous = resumable_run(run_type) if resume else None
+        run = SyncRun.objects.create(
+            run_type=run_type,
+            trigger=trigger,
+            total=total,
+            resumed_from=previous,
+            cursor=previous.cursor if previous else {},
+            last_processed_id=previous.last_processed_id if previous else None,
+            lock_wait=lock.waited,
+        )
+    except BaseException:
+        lock.release()
+        raise
+    if previous:
+        logger.info(f"Sync {run_type} #{run.pk}: retomando #{previous.pk} de {previous.cursor}")
+    return SyncRunTracker(run, checkpoint_every=checkpoint_every, lock=lock)
+
+
+@contextmanager
+def track_sync_run(run_type, trigger=SyncRun.TRIGGER_TASK, resume=True, total=None, checkpoint_every=None,
+                   lock_wait=0, rerun=None):
+    """
+    start_sync_run() + encerramento automático: completed ao sair normalmente,
+    failed (com o erro e o cursor do último avanço) em exceção
+
+    Raises:
+        LockBusy: outra execução do mesmo escopo em andamento
+    """
+    tracker = start_sync_run(
+        run_type, trigger=trigger, resume=resume, total=total, checkpoint_every=checkpoint_every,
+        lock_wait=lock_wait, rerun=rerun)
+    try:
+        yield tracker
+    except BaseException as exc:
+        tracker.finish(SyncRun.STATUS_FAILED, error=f"{type(exc).__name__}: {exc}")
+        raise
+    else:
+        if tracker.run.finished_at is None:
+            tracker.finish()
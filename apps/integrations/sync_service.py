@@ -1,13 +1,194 @@
 # integrations/sync_service.py - VERSÃO INCREMENTAL
 from .brokermint_client import BrokermintClient
-from .models import BrokermintTransaction, BrokermintActivity, BrokermintDocument
+from .models import BrokermintTransaction, BrokermintActivity, BrokermintDocument, SyncRun
+from .typed_columns import TYPED_COLUMNS, fill_typed_columns
+from .upsert import UpsertResult, bulk_upsert
+from django.conf import settings
 from django.db import models
 import logging
+import time
+from dataclasses import asdict, dataclass
 from django.utils import timezone
 from datetime import timedelta
 
 logger = logging.getLogger(__name__)
 
+# Campos básicos da listagem: (campo do model, chave no JSON do Brokermint, default)
+TRANSACTION_LIST_FIELDS = [
+    ('address', 'address', ''),
+    ('city', 'city', ''),
+    ('state', 'state', ''),
+    ('status', 'status', ''),
+]
+TRANSACTION_LIST_UPDATE_FIELDS = [field for field, _, _ in TRANSACTION_LIST_FIELDS]
+
+ACTIVITY_UPDATE_FIELDS = [
+    'content', 'bm_transaction_id', 'created_at_brokermint', 'originator_id',
+    'document_id', 'event_label', 'signers',
+]
+DOCUMENT_UPDATE_FIELDS = ['name', 'bm_transaction_id', 'task_id', 'pages', 'content_type', 'url']
+
+# Campos detalhados: (campo do model, chave no JSON do Brokermint, default, conversão)
+TRANSACTION_DETAIL_FIELDS = [
+    ('county', 'County', '', None),
+    ('legal_description', 'Legal description', '', None),
+    ('parcel_id', 'Parcel ID', '', None),
+    ('home_model', 'Home Model', '', None),
+    ('bedrooms', 'Bedrooms', '', str),
+    ('full_baths', 'Full baths', '', str),
+    ('half_baths', 'Half baths', '', str),
+    ('building_sqft', 'Building SQFT', '', str),
+    # Dados financeiros
+    ('soft_costs', 'Soft Costs', '', str),
+    ('hard_costs', 'Hard Costs', '', str),
+    ('estimated_construction_cost', 'Estimated Construction Cost', '', str),
+    ('builder_fee', 'Builder Fee', '', str),
+    # Draws
+    ('draw_1', 'Draw 1', '', str),
+    ('draw_2', 'Draw 2', '', str),
+    ('draw_3', 'Draw 3', '', str),
+    ('draw_4', 'Draw 4', '', str),
+    ('draw_5', 'Draw 5', '', str),
+    # Localização
+    ('lot', 'Lot', '', str),
+    ('block', 'Block', '', str),
+    ('unit', 'Unit', '', str),
+    ('sec', 'SEC', '', str),
+    ('twp', 'Twp', '', str),
+    ('rge', 'Rge', '', str),
+    ('subdivision', 'Subdivision', '', None),
+    # Datas (timestamps unix)
+    ('acceptance_date', 'acceptance_date', None, None),
+    ('expiration_date', 'expiration_date', None, None),
+    ('closing_date', 'closing_date', None, None),
+    ('listing_date', 'listing_date', None, None),
+    ('buyer_agreement_date', 'buyer_agreement_date', None, None),
+    ('buyer_expiration_date', 'buyer_expiration_date', None, None),
+    # Dados adicionais
+    ('custom_id', 'custom_id', '', None),
+    ('transaction_type', 'transaction_type', '', None),
+    ('external_id', 'external_id', '', None),
+    ('total_gross_commission', 'total_gross_commission', 0, None),
+    ('sales_volume', 'sales_volume', 0, None),
+]
+TRANSACTION_DETAIL_UPDATE_FIELDS = [
+    field for field, _, _, _ in TRANSACTION_DETAIL_FIELDS
+] + TYPED_COLUMNS + ['has_detailed_data', 'last_synced']
+
+
+def transaction_from_listing(tx_data):
+    """Registro MÍNIMO (não salvo) a partir de um item da listagem - sem detalhes"""
+    return BrokermintTransaction(
+        brokermint_id=tx_data['id'],
+        has_detailed_data=False,
+        **{field: tx_data.get(key, default) for field, key, default in TRANSACTION_LIST_FIELDS}
+    )
+
+
+def activity_from_payload(activity_data):
+    """BrokermintActivity (não salva) a partir do JSON de /v1/activities"""
+    return BrokermintActivity(
+        brokermint_id=activity_data['id'],
+        content=activity_data.get('content', ''),
+        bm_transaction_id=activity_data.get('bm_transaction_id'),
+        created_at_brokermint=activity_data.get('created_at'),
+        originator_id=activity_data.get('originator_id'),
+        document_id=activity_data.get('document_id'),
+        event_label=activity_data.get('event_label', ''),
+        signers=activity_data.get('metadata', {}).get('signers', []),
+    )
+
+
+def document_from_payload(doc_data):
+    """BrokermintDocument (não salvo) a partir do JSON de /v1/transactions/{id}/documents/{id}"""
+    return BrokermintDocument(
+        brokermint_id=doc_data['id'],
+        name=doc_data.get('name', ''),
+        bm_transaction_id=doc_data.get('bm_transaction_id'),
+        task_id=doc_data.get('task_id'),
+        pages=doc_data.get('pages', 0),
+        content_type=doc_data.get('content_type', ''),
+        url=doc_data.get('url', ''),
+    )
+
+
+def apply_transaction_details(transaction, details):
+    """Copia os campos detalhados do JSON do Brokermint (e as colunas tipadas) para a transação (sem salvar)"""
+    for field, key, default, cast in TRANSACTION_DETAIL_FIELDS:
+        value = details.get(key, default)
+        if cast is not None:
+            value = cast(value) if value is not None else default
+        setattr(transaction, field, value)
+    # Dinheiro / datas tipados para filtros e somas no banco
+    fill_typed_columns(transaction)
+    transaction.has_detailed_data = True
+    return transaction
+
+
+@dataclass
+class TransactionListSyncResult:
+    """
+    Resumo de uma sincronização mínima (listagem de transações)
+
+    Attributes:
+        pages: Páginas lidas
+        seen: Transações recebidas
+        inserted / updated / unchanged: Resultado do upsert
+        stopped_early: Execução incremental parou em uma página inalterada
+        elapsed: Segundos
+        change_ratio: Fração das transações recebidas que foi gravada
+    """
+    pages: int = 0
+    seen: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    stopped_early: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def change_ratio(self):
+        return (self.inserted + self.updated) / self.seen if self.seen else 0.0
+
+    def as_dict(self):
+        return {**asdict(self), 'change_ratio': round(self.change_ratio, 4)}
+
+
+# Cobertura de assinaturas (fan-out em integrations.tasks)
+CLOSED_TRANSACTION_STATUSES = ['closed', 'cancelled', 'canceled', 'expired', 'withdrawn', 'terminated']
+SIGNATURE_CHUNK_SIZE = getattr(settings, 'BROKERMINT_SIGNATURE_CHUNK_SIZE', 50)
+
+
+def open_transaction_ids():
+    """brokermint_ids das transações em aberto, das verificadas há mais tempo (ou nunca) primeiro"""
+    return list(
+        BrokermintTransaction.objects.exclude(status__in=CLOSED_TRANSACTION_STATUSES)
+        .order_by(models.F('last_activity_check').asc(nulls_first=True), 'pk')
+        .values_list('brokermint_id', flat=True)
+    )
+
+
+def chunked(values, size):
+    """Divide uma lista em listas de até `size` itens"""
+    return [values[start:start + size] for start in range(0, len(values), size)]
+
+
+def get_signature_coverage():
+    """
+    Resumo da última execução do fan-out de assinaturas
+
+    watermark: toda transação em aberto teve as atividades verificadas a
+    partir deste instante (None se alguma nunca foi verificada)
+
+    Lido da SyncRun (coverage): o mesmo em qualquer processo e após restart.
+    """
+    return (
+        SyncRun.objects.filter(run_type=SyncRun.TYPE_SIGNATURES, coverage__isnull=False)
+        .order_by('-started_at', '-pk')
+        .values_list('coverage', flat=True)
+        .first()
+    )
+
 
 class BrokermintSyncService:
     def __init__(self):
@@ -49,39 +230,14 @@ class BrokermintSyncService:
         activities_data = self.client.get_signature_activities(
             target_transactions)
 
-        new_activities = []
+        upsert = self.save_signature_activities(activities_data)
+        new_activities = upsert.inserted_objects
         signed_contracts = []
 
-        for activity_data in activities_data:
-            # Salvar atividade
-            activity, created = BrokermintActivity.objects.update_or_create(
-                brokermint_id=activity_data['id'],
-                defaults={
-                    'content': activity_data.get('content', ''),
-                    'bm_transaction_id': activity_data.get('bm_transaction_id'),
-                    'created_at_brokermint': activity_data.get('created_at'),
-                    'originator_id': activity_data.get('originator_id'),
-                    'document_id': activity_data.get('document_id'),
-                    'event_label': activity_data.get('event_label', ''),
-                    'signers': activity_data.get('metadata', {}).get('signers', []),
-                }
-            )
-
-            if created:
-                new_activities.append(activity)
-
-                # Marcar transação como tendo assinatura
-                BrokermintTransaction.objects.filter(
-                    brokermint_id=activity.bm_transaction_id
-                ).update(
-                    has_signature_activity=True,
-                    is_contract_signed=True,
-                    last_activity_check=timezone.now()
-                )
-
-                signed_contracts.append(activity.bm_transaction_id)
-                logger.info(
-                    f"🎉 CONTRATO ASSINADO: Transação {activity.bm_transaction_id}")
+        for activity in new_activities:
+            signed_contracts.append(activity.bm_transaction_id)
+            logger.info(
+                f"🎉 CONTRATO ASSINADO: Transação {activity.bm_transaction_id}")
 
         # Marcar transações verificadas (mesmo sem atividades)
         BrokermintTransaction.objects.filter(
@@ -89,7 +245,8 @@ class BrokermintSyncService:
         ).update(last_activity_check=timezone.now())
 
         logger.info(
-            f"✅ Verificação concluída: {len(new_activities)} assinaturas, {len(signed_contracts)} contratos")
+            f"✅ Verificação concluída: {len(new_activities)} assinaturas, {len(signed_contracts)} contratos "
+            f"({upsert.change_ratio:.1%} das atividades alteradas)")
 
         return {
             'new_activities': new_activities,
@@ -97,59 +254,194 @@ class BrokermintSyncService:
             'checked_transactions': len(target_transactions)
         }
 
-    def sync_minimal_transactions(self):
+    def sync_minimal_transactions(self, incremental=False, page_size=None, run=None):
         """
         Sincronização MÍNIMA: Apenas identificar IDs novos
         Não busca detalhes completos!
+
+        A listagem é percorrida página a página (todas as páginas, sem o
+        teto de 1000); cada página é gravada em lote antes de pedir a
+        próxima, então só uma página fica em memória.
+
+        Args:
+            incremental: Para na primeira página sem nenhuma transação nova
+                ou alterada (a listagem vem das mais recentes para as mais
+                antigas). Sem incremental, percorre a listagem inteira.
+            page_size: Transações por página (default: BROKERMINT_PAGE_SIZE)
+            run: SyncRunTracker (integrations.sync_runs); checkpoint com o
+                offset da próxima página. Execução completa retomada começa
+                desse offset (transações novas no topo da listagem só
+                deslocam a leitura: algumas são relidas, nada se perde
+                além do que a próxima listagem completa cobre).
+
+        Returns:
+            TransactionListSyncResult
         """
         logger.info("📋 Sincronização mínima de transações...")
 
-        transactions_data = self.client.get_all_transactions()
-        existing_ids = set(
-            BrokermintTransaction.objects.values_list(
-                'brokermint_id', flat=True)
-        )
-
-        new_transactions = []
-        for tx_data in transactions_data:
-            if tx_data['id'] not in existing_ids:
-                # Criar registro MÍNIMO
-                tx = BrokermintTransaction.objects.create(
-                    brokermint_id=tx_data['id'],
-                    address=tx_data.get('address', ''),
-                    city=tx_data.get('city', ''),
-                    state=tx_data.get('state', ''),
-                    status=tx_data.get('status', ''),
-                    # NÃO buscar detalhes ainda!
-                    has_detailed_data=False
-                )
-                new_transactions.append(tx)
-            else:
-                # ATUALIZAR apenas campos básicos, manter has_detailed_data
-                BrokermintTransaction.objects.filter(
-                    brokermint_id=tx_data['id']
-                ).update(
-                    address=tx_data.get('address', ''),
-                    city=tx_data.get('city', ''),
-                    state=tx_data.get('state', ''),
-                    status=tx_data.get('status', ''),
-                    # NÃO mexer em has_detailed_data
+        result = TransactionListSyncResult()
+        started = time.perf_counter()
+        offset = run.cursor.get('offset', 0) if run and not incremental else 0
+        if offset:
+            logger.info(f"📋 Retomando a listagem do offset {offset}")
+        pages = self.client.iter_transaction_pages(page_size=page_size, start_offset=offset)
+        try:
+            for page in pages:
+                # ATUALIZA apenas campos básicos, mantém has_detailed_data
+                upsert = bulk_upsert(
+                    BrokermintTransaction,
+                    [transaction_from_listing(tx_data) for tx_data in page],
+                    unique_field='brokermint_id',
+                    update_fields=TRANSACTION_LIST_UPDATE_FIELDS,
+                    hash_field='payload_hash',
                 )
+                result.pages += 1
+                result.seen += len(page)
+                result.inserted += upsert.inserted
+                result.updated += upsert.updated
+                result.unchanged += upsert.unchanged
+                offset += len(page)
+                if run:
+                    run.advance(
+                        cursor={'offset': offset}, last_processed_id=page[-1].get('id'),
+                        processed=len(page), inserted=upsert.inserted,
+                        updated=upsert.updated, unchanged=upsert.unchanged,
+                    )
+
+                if incremental and not upsert.inserted and not upsert.updated:
+                    result.stopped_early = True
+                    break
+        finally:
+            pages.close()
+        result.elapsed = time.perf_counter() - started
 
         logger.info(
-            f"📋 {len(new_transactions)} novas transações identificadas")
-        return new_transactions
-    
-    def sync_transaction_details(self):
+            f"📋 {result.inserted} novas transações identificadas "
+            f"({result.updated} atualizadas, {result.unchanged} inalteradas, "
+            f"{result.change_ratio:.1%} alteradas, {result.pages} páginas"
+            f"{', parada antecipada' if result.stopped_early else ''})")
+        return result
+
+    def save_signature_activities(self, activities_data):
+        """
+        Grava as atividades de assinatura em lote e marca as transações das
+        atividades NOVAS como assinadas (um UPDATE para todas)
+
+        Returns:
+            UpsertResult (inserted_objects = atividades novas)
+        """
+        upsert = bulk_upsert(
+            BrokermintActivity,
+            [activity_from_payload(data) for data in activities_data],
+            unique_field='brokermint_id', update_fields=ACTIVITY_UPDATE_FIELDS, hash_field='payload_hash',
+        )
+
+        signed_ids = {activity.bm_transaction_id for activity in upsert.inserted_objects}
+        if signed_ids:
+            BrokermintTransaction.objects.filter(brokermint_id__in=signed_ids).update(
+                has_signature_activity=True,
+                is_contract_signed=True,
+                last_activity_check=timezone.now()
+            )
+        return upsert
+
+    def refresh_signature_activities(self, transaction_ids):
+        """
+        Atividades de assinatura de transações específicas (webhooks),
+        em lotes de SIGNATURE_CHUNK_SIZE IDs por requisição
+
+        Returns:
+            UpsertResult das atividades
+        """
+        result = UpsertResult()
+        for chunk in chunked(list(transaction_ids), SIGNATURE_CHUNK_SIZE):
+            activities_data = self.client.get_signature_activities(chunk)
+            result.merge(self.save_signature_activities(activities_data or []))
+            BrokermintTransaction.objects.filter(
+                brokermint_id__in=chunk
+            ).update(last_activity_check=timezone.now())
+        return result
+
+    def record_signature_chunks(self, chunk_results, started_at=None, run=None):
         """
-        CORREÇÃO: Verificar se dados estão realmente completos
+        Junta os resultados do fan-out de assinaturas (callback do chord)
+
+        Um bulk upsert para as atividades de todos os lotes, um UPDATE de
+        last_activity_check para as transações dos lotes que responderam e a
+        atualização do watermark de cobertura. Lotes com erro não marcam as
+        transações: ficam no início da fila da próxima execução.
+
+        Args:
+            chunk_results: [{'transaction_ids', 'activities', 'error'}, ...]
+            started_at: Início da execução (ISO 8601)
+            run: SyncRun da execução; recebe o resumo em coverage
+
+        Returns:
+            dict com o resumo
         """
-        transactions_without_details = BrokermintTransaction.objects.filter(
-            models.Q(has_detailed_data=False) | 
-            models.Q(parcel_id__isnull=True) |  # Verificação extra
-            models.Q(parcel_id='')
+        activities_data, covered_ids, failed = [], [], []
+        for chunk in chunk_results:
+            if chunk.get('error'):
+                failed.append({'transaction_ids': len(chunk['transaction_ids']), 'error': chunk['error']})
+                continue
+            activities_data.extend(chunk['activities'])
+            covered_ids.extend(chunk['transaction_ids'])
+
+        upsert = self.save_signature_activities(activities_data)
+        signed_contracts = sorted({activity.bm_transaction_id for activity in upsert.inserted_objects})
+        for brokermint_id in signed_contracts:
+            logger.info(f"🎉 CONTRATO ASSINADO: Transação {brokermint_id}")
+
+        checked_at = timezone.now()
+        if covered_ids:
+            BrokermintTransaction.objects.filter(
+                brokermint_id__in=covered_ids
+            ).update(last_activity_check=checked_at)
+
+        open_transactions = BrokermintTransaction.objects.exclude(status__in=CLOSED_TRANSACTION_STATUSES)
+        coverage = open_transactions.aggregate(
+            open_total=models.Count('pk'),
+            never_checked=models.Count('pk', filter=models.Q(last_activity_check__isnull=True)),
+            oldest_check=models.Min('last_activity_check'),
+        )
+        watermark = coverage['oldest_check'] if not coverage['never_checked'] else None
+
+        summary = {
+            'started_at': started_at,
+            'finished_at': checked_at.isoformat(),
+            'watermark': watermark.isoformat() if watermark else None,
+            'open_transactions': coverage['open_total'],
+            'covered': len(covered_ids),
+            'failed_chunks': failed,
+            'activities': upsert.as_dict(),
+            'signed_contracts': signed_contracts,
+        }
+        if run is not None:
+            run.coverage = summary
+            run.save(update_fields=['coverage'])
+        logger.info(
+            f"✅ Assinaturas: {len(covered_ids)}/{coverage['open_total']} transações em aberto verificadas, "
+            f"{upsert.inserted} novas atividades, {len(failed)} lotes com erro, watermark {summary['watermark']}")
+        return summary
+
+    def save_documents(self, documents_data):
+        """Grava os documentos em lote (UpsertResult)"""
+        return bulk_upsert(
+            BrokermintDocument,
+            [document_from_payload(data) for data in documents_data],
+            unique_field='brokermint_id', update_fields=DOCUMENT_UPDATE_FIELDS, hash_field='payload_hash',
         )
 
+    def sync_transaction_details(self, transaction_ids=None, limit=None, progress=None, run=None):
+        """
+        Detalhes das transações sem dados completos (ou das informadas),
+        buscados em paralelo com limite de taxa (integrations.detail_fetcher)
+        """
+        from .detail_fetcher import sync_transaction_details
+
+        return sync_transaction_details(
+            transaction_ids=transaction_ids, limit=limit, client=self.client, progress=progress, run=run)
+
     def get_transaction_details_on_demand(self, transaction_id):
         """
         Buscar detalhes APENAS quando necessário
@@ -166,59 +458,10 @@ class BrokermintSyncService:
             # Buscar detalhes da API
             details = self.client.get_transaction_details(transaction_id)
             if details:
-                    # Atualizar com dados completos
-                    transaction.county = details.get('County', '')
-                    transaction.legal_description = details.get('Legal description', '')
-                    transaction.parcel_id = details.get('Parcel ID', '')  # ← CAMPO IMPORTANTE!
-                    transaction.home_model = details.get('Home Model', '')
-                    transaction.bedrooms = str(details.get('Bedrooms', ''))
-                    transaction.full_baths = str(details.get('Full baths', ''))
-                    transaction.half_baths = str(details.get('Half baths', ''))
-                    transaction.building_sqft = str(details.get('Building SQFT', ''))
-                    
-                    # Dados financeiros
-                    transaction.soft_costs = str(details.get('Soft Costs', ''))
-                    transaction.hard_costs = str(details.get('Hard Costs', ''))
-                    transaction.estimated_construction_cost = str(details.get('Estimated Construction Cost', ''))
-                    transaction.builder_fee = str(details.get('Builder Fee', ''))
-                    
-                    # Draws
-                    transaction.draw_1 = str(details.get('Draw 1', ''))
-                    transaction.draw_2 = str(details.get('Draw 2', ''))
-                    transaction.draw_3 = str(details.get('Draw 3', ''))
-                    transaction.draw_4 = str(details.get('Draw 4', ''))
-                    transaction.draw_5 = str(details.get('Draw 5', ''))
-                    
-                    # Localização
-                    transaction.lot = str(details.get('Lot', ''))
-                    transaction.block = str(details.get('Block', ''))
-                    transaction.unit = str(details.get('Unit', ''))
-                    transaction.sec = str(details.get('SEC', ''))
-                    transaction.twp = str(details.get('Twp', ''))
-                    transaction.rge = str(details.get('Rge', ''))
-                    transaction.subdivision = details.get('Subdivision', '')
-                    
-                    # Datas
-                    transaction.acceptance_date = details.get('acceptance_date')
-                    transaction.expiration_date = details.get('expiration_date')
-                    transaction.closing_date = details.get('closing_date')
-                    transaction.listing_date = details.get('listing_date')
-                    transaction.buyer_agreement_date = details.get('buyer_agreement_date')
-                    transaction.buyer_expiration_date = details.get('buyer_expiration_date')
-                    
-                    # Dados adicionais
-                    transaction.custom_id = details.get('custom_id', '')
-                    transaction.transaction_type = details.get('transaction_type', '')
-                    transaction.external_id = details.get('external_id', '')
-                    transaction.total_gross_commission = details.get('total_gross_commission', 0)
-                    transaction.sales_volume = details.get('sales_volume', 0)
-                    
-                    # Marcar como tendo dados detalhados
-                    transaction.has_detailed_data = True
-                    transaction.save()
-                    
-                    logger.info(f"Detalhes sincronizados: {transaction.brokermint_id} - Parcel: {transaction.parcel_id}")
-                
+                apply_transaction_details(transaction, details)
+                transaction.save()
+
+                logger.info(f"Detalhes sincronizados: {transaction.brokermint_id} - Parcel: {transaction.parcel_id}")
 
             return transaction
 
@@ -1,21 +1,36 @@
 # integrations/tasks.py
-from celery import shared_task
-from .sync_service import BrokermintSyncService
-from .models import BrokermintTransaction
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.utils import timezone
+from .brokermint_client import BrokermintClient, BrokermintError, BrokermintRateLimited
+from .sync_service import BrokermintSyncService, SIGNATURE_CHUNK_SIZE, chunked, open_transaction_ids
+from .models import BrokermintTransaction, SyncRun
+from .locks import LockBusy
+from .sync_runs import SyncRunTracker, start_sync_run, track_sync_run
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Limite por worker das requisições de atividades (sintaxe de rate_limit do Celery)
+SIGNATURE_TASK_RATE_LIMIT = getattr(settings, 'BROKERMINT_SIGNATURE_TASK_RATE_LIMIT', '30/m')
+# Lease do fan-out: sem heartbeat (o chord atravessa vários workers), cobre a execução inteira
+SIGNATURE_LOCK_TTL = getattr(settings, 'BROKERMINT_SIGNATURE_LOCK_TTL', 60 * 60)
+# Verificação manual de transações específicas espera a execução em andamento (não é coalescida)
+MANUAL_LOCK_WAIT = 60
+
 
 @shared_task(bind=True)
 def sync_signature_activities_only(self, hours_back=2):
     """
-    ÚNICA TASK IMPORTANTE - A CADA 1 HORA
-    Verifica APENAS assinaturas de contratos
+    MANUAL - Verificação síncrona de até 50 transações desatualizadas
+    (o agendamento horário usa fan_out_signature_sync)
     """
     try:
         service = BrokermintSyncService()
-        result = service.sync_only_signature_activities(hours_back=hours_back)
+        with track_sync_run(SyncRun.TYPE_SIGNATURES, resume=False,
+                            rerun=(sync_signature_activities_only.name, {'hours_back': hours_back})) as run:
+            result = service.sync_only_signature_activities(hours_back=hours_back)
+            run.advance(processed=result['checked_transactions'], inserted=len(result['new_activities']))
 
         message = f"ASSINATURAS: {len(result['new_activities'])} novas, {len(result['signed_contracts'])} contratos assinados"
         logger.info(message)
@@ -28,15 +43,102 @@ def sync_signature_activities_only(self, hours_back=2):
 
         return message
 
+    except LockBusy as busy:
+        return str(busy)
     except Exception as e:
         logger.error(f"Erro na sincronização de assinaturas: {str(e)}")
         raise self.retry(countdown=60 * 10, max_retries=3)
 
 
+@shared_task
+def fan_out_signature_sync(chunk_size=None):
+    """
+    ASSINATURAS - A CADA 1 HORA
+    Todas as transações em aberto, em lotes de BROKERMINT_SIGNATURE_CHUNK_SIZE
+    IDs: um group de fetch_signature_activities_chunk (fila brokermint_sync,
+    com rate limit) unido pelo chord em finalize_signature_sync, que grava
+    tudo em lote e atualiza o watermark de cobertura
+    """
+    transaction_ids = open_transaction_ids()
+    if not transaction_ids:
+        logger.info("✅ Nenhuma transação em aberto para verificar")
+        return "Nenhuma transação em aberto"
+
+    chunks = chunked(transaction_ids, chunk_size or SIGNATURE_CHUNK_SIZE)
+    # Estado da retomada é o last_activity_check: a SyncRun só registra a execução.
+    # O lease segue com o chord e é liberado pelo callback (token nos kwargs)
+    try:
+        run = start_sync_run(
+            SyncRun.TYPE_SIGNATURES, resume=False, total=len(transaction_ids),
+            rerun=(fan_out_signature_sync.name, {'chunk_size': chunk_size}),
+            lock_ttl=SIGNATURE_LOCK_TTL, heartbeat=False,
+        )
+    except LockBusy as busy:
+        return str(busy)
+    lock_token = run.lock.token
+    try:
+        chord(
+            group(fetch_signature_activities_chunk.s(chunk) for chunk in chunks)
+        )(finalize_signature_sync.s(
+            started_at=timezone.now().isoformat(), run_id=run.run.pk, lock_token=lock_token))
+    except Exception as exc:
+        run.finish(SyncRun.STATUS_FAILED, error=exc)
+        raise
+
+    logger.info(f"🎯 Assinaturas: {len(transaction_ids)} transações em {len(chunks)} lotes")
+    return f"{len(transaction_ids)} transações em {len(chunks)} lotes"
+
+
+@shared_task(bind=True, rate_limit=SIGNATURE_TASK_RATE_LIMIT, max_retries=3)
+def fetch_signature_activities_chunk(self, transaction_ids):
+    """
+    Um lote do fan-out: só HTTP, sem escrita no banco
+
+    Falhas viram resultado com 'error' (em vez de exceção) para não
+    derrubar o chord: os demais lotes ainda são gravados.
+    """
+    try:
+        activities = BrokermintClient().get_signature_activities(transaction_ids)
+    except BrokermintRateLimited as exc:
+        if self.request.retries < self.max_retries:
+            raise self.retry(exc=exc, countdown=exc.retry_after or 60)
+        return {'transaction_ids': transaction_ids, 'activities': [], 'error': str(exc)}
+    except BrokermintError as exc:
+        logger.warning(f"Lote de assinaturas ({len(transaction_ids)} transações): {exc}")
+        return {'transaction_ids': transaction_ids, 'activities': [], 'error': str(exc)}
+
+    return {'transaction_ids': transaction_ids, 'activities': activities or [], 'error': None}
+
+
+@shared_task
+def finalize_signature_sync(chunk_results, started_at=None, run_id=None, lock_token=None):
+    """Callback do chord: bulk upsert das atividades + watermark de cobertura; libera o lease"""
+    run = SyncRunTracker.for_run(run_id, lock_token=lock_token) if run_id else None
+    try:
+        summary = BrokermintSyncService().record_signature_chunks(
+            chunk_results, started_at=started_at, run=run.run if run else None)
+    except Exception as exc:
+        if run:
+            run.finish(SyncRun.STATUS_FAILED, error=exc)
+        raise
+
+    if run:
+        run.advance(
+            processed=summary['covered'], errors=len(summary['failed_chunks']),
+            **{key: summary['activities'][key] for key in ('inserted', 'updated', 'unchanged')})
+        if summary['failed_chunks']:
+            run.error(summary['failed_chunks'][-1]['error'])
+        run.finish()
+
+    if summary['signed_contracts']:
+        logger.warning(f"✍🏾 CONTRATOS ASSINADOS: {summary['signed_contracts']}")
+    return summary
+
+
 @shared_task(bind=True)
-def sync_minimal_transactions_task(self):
+def sync_minimal_transactions_task(self, incremental=False):
     """
-    Task LEVE - A CADA 6 HORAS
+    Task LEVE - A CADA 6 HORAS (incremental) + diária (listagem completa)
     Apenas identifica transações novas (sem detalhes)
     """
     try:
@@ -44,7 +146,10 @@ def sync_minimal_transactions_task(self):
         # Contar antes
         count_before = BrokermintTransaction.objects.count()
         
-        result = service.sync_minimal_transactions()
+        # Listagem completa retoma do último checkpoint; a incremental sempre começa do topo
+        with track_sync_run(SyncRun.TYPE_MINIMAL, resume=not incremental,
+                            rerun=(sync_minimal_transactions_task.name, {'incremental': incremental})) as run:
+            result = service.sync_minimal_transactions(incremental=incremental, run=run)
         
         # Contar depois  
         count_after = BrokermintTransaction.objects.count()
@@ -53,9 +158,12 @@ def sync_minimal_transactions_task(self):
         if count_after < count_before:
             logger.error(f"🚨 PERDA DE DADOS: {count_before} → {count_after}")
             
-        logger.info(f"Transações: {count_before} → {count_after} (+{len(result)} novas)")
-        return f"SUCCESS: {len(result)} novas, total: {count_after}"
+        logger.info(f"Transações: {count_before} → {count_after} (+{result.inserted} novas, {result.pages} páginas)")
+        return (f"SUCCESS: {result.inserted} novas, {result.updated} atualizadas, {result.unchanged} inalteradas "
+                f"({result.change_ratio:.1%} alteradas), total: {count_after}")
 
+    except LockBusy as busy:
+        return str(busy)
     except Exception as e:
         logger.error(f"Erro na sincronização mínima: {str(e)}")
         raise self.retry(countdown=60 * 30, max_retries=3)
@@ -67,7 +175,47 @@ def check_specific_transactions(transaction_ids):
     Task MANUAL - Para verificar transações específicas
     """
     service = BrokermintSyncService()
-    result = service.sync_only_signature_activities(
-        transaction_ids=transaction_ids)
+    try:
+        with track_sync_run(SyncRun.TYPE_SIGNATURES, resume=False, lock_wait=MANUAL_LOCK_WAIT) as run:
+            result = service.sync_only_signature_activities(
+                transaction_ids=transaction_ids)
+            run.advance(processed=result['checked_transactions'], inserted=len(result['new_activities']))
+    except LockBusy as busy:
+        return str(busy)
 
     return f"Verificadas {len(transaction_ids)} transações: {len(result['new_activities'])} assinaturas"
+
+
+@shared_task(bind=True)
+def sync_transaction_details_task(self, limit=None):
+    """
+    Task de DETALHES - sob demanda ou agendada
+    Busca em paralelo (com limite de taxa) os detalhes das transações pendentes
+    """
+    def progress(result):
+        self.update_state(state='PROGRESS', meta=result.as_dict())
+
+    service = BrokermintSyncService()
+    try:
+        with track_sync_run(SyncRun.TYPE_DETAILS,
+                            rerun=(sync_transaction_details_task.name, {'limit': limit})) as run:
+            result = service.sync_transaction_details(limit=limit, progress=progress, run=run)
+            if result.aborted:
+                # Rate limit prolongado: a próxima execução retoma do checkpoint
+                run.finish(SyncRun.STATUS_INTERRUPTED, error=result.aborted)
+    except LockBusy as busy:
+        return str(busy)
+
+    logger.info(f"Detalhes: {result.as_dict()}")
+    return result.as_dict()
+
+
+@shared_task
+def drain_webhook_inbox(batch_size=None):
+    """
+    WEBHOOKS - agendada pelo endpoint (e a cada minuto pelo beat)
+    Processa a inbox de webhooks: dedup por event_id + refresh das transações afetadas
+    """
+    from .webhooks import WEBHOOK_DRAIN_BATCH_SIZE, drain_inbox
+
+    return drain_inbox(batch_size=batch_size or WEBHOOK_DRAIN_BATCH_SIZE)
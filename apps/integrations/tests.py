@@ -1,3 +1,844 @@
-from django.test import TestCase
+import json
+import threading
+import time
+from unittest import mock
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from celery import current_app
+from rest_framework.test import APIClient
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DatabaseError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from django.urls import include, path, reverse
+
+from core.models import SearchDocument
+
+from .brokermint_client import (
+    BrokermintClient, BrokermintConnectionError, BrokermintError, BrokermintNotFound,
+    BrokermintRateLimited, BrokermintResponseError, BrokermintServerError,
+)
+from .detail_fetcher import ConcurrentDetailFetcher, TokenBucket, sync_transaction_details
+from .models import BrokermintActivity, BrokermintTransaction, BrokermintWebhookEvent, SyncRun
+from .locks import RedisLeaseStore, SingleFlightLock, _redis_store
+from .sync_runs import start_sync_run, track_sync_run
+from .sync_service import BrokermintSyncService, get_signature_coverage
+from .tasks import fan_out_signature_sync, sync_minimal_transactions_task
+from .typed_columns import backfill_typed_columns, parse_money, parse_timestamp
+from .upsert import bulk_upsert
+from . import webhooks
+from .webhooks import (
+    WEBHOOK_CLAIM_TIMEOUT, WEBHOOK_MAX_ATTEMPTS, SIGNATURE_HEADER, drain_inbox, replay_events, sign_payload
+)
+
+# ROOT_URLCONF dos testes de webhook: só as URLs de integrations, no mesmo prefixo do projeto
+urlpatterns = [path('integrations/', include('integrations.urls'))]
+
+
+class FakeBrokermintHandler(BaseHTTPRequestHandler):
+    """
+    Responde conforme o roteiro do servidor: para cada path, uma fila de
+    falhas consumida a cada requisição; fila vazia => 200 com o JSON do path.
+    /v3/transactions pagina server.transactions por count/offset.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        server = self.server
+        with server.lock:
+            server.requests.append(path)
+            server.client_ports.add(self.client_address[1])
+            faults = server.faults.get(path, [])
+            fault = faults.pop(0) if faults else None
+
+        if server.latency:
+            time.sleep(server.latency)
+        if fault == 'hang':
+            time.sleep(server.hang_seconds)
+            fault = None
+        if fault == 'reset':
+            self.close_connection = True
+            self.connection.close()
+            return
+        if fault == 'not-json':
+            return self._send(200, b'<html>maintenance</html>', 'text/html')
+        if isinstance(fault, tuple):
+            status, headers = fault
+            return self._send(status, b'{}', headers=headers)
+        if isinstance(fault, int):
+            return self._send(fault, b'{}')
+        if path == '/v1/activities' and server.activities is not None:
+            ids = parse_qs(urlsplit(self.path).query)['bm_transaction_ids'][0].split(',')
+            body = [activity for brokermint_id in ids for activity in server.activities.get(int(brokermint_id), [])]
+            return self._send(200, json.dumps(body).encode())
+        if path == '/v3/transactions' and server.transactions is not None:
+            query = parse_qs(urlsplit(self.path).query)
+            offset, count = int(query.get('offset', ['0'])[0]), int(query['count'][0])
+            return self._send(200, json.dumps(server.transactions[offset:offset + count]).encode())
+        default = {'id': int(path.rsplit('/', 1)[-1])} if path.startswith('/v3/transactions/') else {}
+        body = json.dumps(server.payloads.get(path, default)).encode()
+        return self._send(200, body)
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeBrokermintServerMixin:
+    """Sobe o FakeBrokermintHandler em uma porta local durante a classe de testes"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBrokermintHandler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        # Cliente que desistiu por timeout derruba a conexão: ruído esperado
+        cls.server.handle_error = lambda request, client_address: None
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.faults = {}
+        self.server.payloads = {}
+        self.server.requests = []
+        self.server.client_ports = set()
+        self.server.hang_seconds = 0
+        self.server.latency = 0
+        self.server.transactions = None
+        self.server.activities = None
+        BrokermintClient.reset_metrics()
+        # Leases (integrations.locks) no cache local: um único processo de testes, sem Redis
+        lock_override = override_settings(BROKERMINT_LOCK_REDIS_URL='', BROKERMINT_LOCK_ALLOW_LOCAL=True)
+        lock_override.enable()
+        self.addCleanup(lock_override.disable)
+
+
+class BrokermintClientTransportTests(FakeBrokermintServerMixin, SimpleTestCase):
+    """
+    Testes do transporte do BrokermintClient contra um servidor HTTP local
+    que injeta falhas (5xx, 429, timeout, conexão derrubada, corpo inválido)
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.server.payloads = {'/v3/transactions/1': {'id': 1, 'Parcel ID': 'PCL-1'}}
+        self.client = BrokermintClient(
+            base_url=self.base_url, read_timeout=1, max_retries=3, backoff_base=0.01, backoff_max=0.05
+        )
+
+    def test_retries_server_errors_with_pooled_connection(self):
+        """5xx e conexão derrubada são repetidos; a conexão keep-alive é reaproveitada"""
+        self.server.faults['/v3/transactions/1'] = [503, 'reset', 502]
+
+        details = self.client.get_transaction_details(1)
+
+        self.assertEqual(details['Parcel ID'], 'PCL-1')
+        self.assertEqual(len(self.server.requests), 4)
+        for _ in range(3):
+            self.client.get_transaction_details(1)
+        # Uma conexão nova apenas após o reset
+        self.assertEqual(len(self.server.client_ports), 2)
+
+        stats = BrokermintClient.metrics()['transactions.detail']
+        self.assertEqual(stats['requests'], 7)
+        self.assertEqual(stats['retries'], 3)
+        self.assertEqual(stats['errors'], {'503': 1, 'connection': 1, '502': 1})
+
+    def test_honours_retry_after(self):
+        """429 com Retry-After espera o tempo pedido, não o backoff"""
+        self.client.backoff_base = self.client.backoff_max = 30
+        self.server.faults['/v3/transactions/1'] = [(429, {'Retry-After': '1'})]
+
+        started = time.monotonic()
+        details = self.client.get_transaction_details(1)
+
+        self.assertEqual(details['id'], 1)
+        self.assertGreaterEqual(time.monotonic() - started, 1)
+        self.assertLess(time.monotonic() - started, 10)
+
+    def test_rate_limit_is_an_error_not_empty_data(self):
+        """429 persistente vira BrokermintRateLimited (antes: [] = 'sem dados')"""
+        self.server.faults['/v1/activities'] = [(429, {'Retry-After': '0'})] * 4
+
+        with self.assertRaises(BrokermintRateLimited) as ctx:
+            self.client.get_signature_activities([1, 2])
+        self.assertEqual(ctx.exception.retry_after, 0)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_long_retry_after_is_not_slept(self):
+        """Retry-After acima do máximo sobe na hora para o chamador"""
+        self.server.faults['/v3/transactions'] = [(429, {'Retry-After': '3600'})]
+
+        with self.assertRaises(BrokermintRateLimited) as ctx:
+            self.client.get_all_transactions()
+        self.assertEqual(ctx.exception.retry_after, 3600)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_read_timeout(self):
+        """Servidor pendurado: timeout de leitura em vez de travar o worker"""
+        self.server.hang_seconds = 0.5
+        self.server.faults['/v3/transactions/1'] = ['hang'] * 2
+        self.client.timeout = (1, 0.2)
+        self.client.max_retries = 1
+
+        with self.assertRaises(BrokermintConnectionError):
+            self.client.get_transaction_details(1)
+        self.assertEqual(BrokermintClient.metrics()['transactions.detail']['errors'], {'timeout': 2})
+
+    def test_typed_errors_without_retry(self):
+        """404 e corpo inválido não são repetidos"""
+        self.server.faults['/v3/transactions/9'] = [404]
+        with self.assertRaises(BrokermintNotFound):
+            self.client.get_transaction_details(9)
+        self.assertEqual(len(self.server.requests), 1)
+
+        self.server.faults['/v1/transactions/1/documents/2'] = ['not-json']
+        with self.assertRaises(BrokermintResponseError):
+            self.client.get_document_details(1, 2)
+
+        self.server.faults['/v3/transactions/1'] = [500] * 4
+        with self.assertRaises(BrokermintServerError) as ctx:
+            self.client.get_transaction_details(1)
+        self.assertEqual(ctx.exception.status_code, 500)
+
+    def test_connection_refused(self):
+        """Porta fechada: BrokermintConnectionError após as tentativas"""
+        client = BrokermintClient(base_url='http://127.0.0.1:1', max_retries=1, backoff_base=0)
+        client.api_key = 'secret-api-key'
+
+        with self.assertRaises(BrokermintConnectionError) as ctx:
+            client.get_all_transactions()
+        self.assertEqual(BrokermintClient.metrics()['transactions.list']['errors'], {'connection': 2})
+        # A URL (com ?api_key=) não vai para a mensagem
+        self.assertNotIn('secret-api-key', str(ctx.exception))
+
+
+class ConcurrentDetailFetcherTests(FakeBrokermintServerMixin, TestCase):
+    """
+    Testes da busca concorrente de detalhes (integrations.detail_fetcher)
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client = BrokermintClient(base_url=self.base_url, max_retries=1, backoff_base=0)
+
+    def test_token_bucket_caps_rate(self):
+        """Após a rajada, no máximo `rate` fichas por segundo"""
+        bucket = TokenBucket(rate=20, burst=1)
+        started = time.monotonic()
+        for _ in range(11):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.45)
+
+    def test_throughput_scales_with_concurrency(self):
+        """Com latência de 100 ms, 4 threads buscam ~4x mais rápido que 1"""
+        self.server.latency = 0.1
+        ids = list(range(1, 13))
+        timings = {}
+        for concurrency in (1, 4):
+            fetcher = ConcurrentDetailFetcher(client=self.client, concurrency=concurrency, rate=1000, burst=1000)
+            started = time.monotonic()
+            results = list(fetcher.fetch(ids))
+            timings[concurrency] = time.monotonic() - started
+            self.assertEqual(sorted(transaction_id for transaction_id, _, _ in results), ids)
+            self.assertTrue(all(details['id'] == transaction_id for transaction_id, details, _ in results))
+        self.assertLess(timings[4], timings[1] / 2)
+
+    def test_sync_writes_details_in_batches(self):
+        """Detalhes gravados em lote; 404 contado sem interromper"""
+        for brokermint_id in (1, 2, 3):
+            BrokermintTransaction.objects.create(brokermint_id=brokermint_id, status='active')
+        self.server.payloads['/v3/transactions/1'] = {
+            'id': 1, 'Parcel ID': 'PCL-1', 'Bedrooms': 3, 'Draw 1': '$1,250.00', 'closing_date': 1754006400}
+        self.server.faults['/v3/transactions/3'] = [404]
+        snapshots = []
+
+        result = sync_transaction_details(
+            client=self.client, concurrency=2, batch_size=1,
+            progress=lambda summary: snapshots.append(summary.processed))
+
+        self.assertEqual((result.total, result.updated, result.not_found, result.errors), (3, 2, 1, 0))
+        self.assertEqual(snapshots[-1], 3)
+        transaction = BrokermintTransaction.objects.get(brokermint_id=1)
+        self.assertTrue(transaction.has_detailed_data)
+        self.assertEqual((transaction.parcel_id, transaction.bedrooms), ('PCL-1', '3'))
+        self.assertEqual(transaction.draw_1_amount, Decimal('1250.00'))
+        self.assertEqual(transaction.closing_at, datetime(2025, 8, 1, tzinfo=dt_timezone.utc))
+        self.assertFalse(BrokermintTransaction.objects.get(brokermint_id=3).has_detailed_data)
+
+
+class PaginatedTransactionListingTests(FakeBrokermintServerMixin, TestCase):
+    """
+    Listagem paginada de transações (regressão do teto de count=1000)
+    """
+
+    def setUp(self):
+        super().setUp()
+        # 5.000 transações, das mais recentes para as mais antigas
+        self.server.transactions = [
+            {'id': brokermint_id, 'address': f'{brokermint_id} Lake St', 'city': 'Orlando',
+             'state': 'FL', 'status': 'active'}
+            for brokermint_id in range(5000, 0, -1)
+        ]
+        self.service = BrokermintSyncService()
+        self.service.client = BrokermintClient(base_url=self.base_url, max_retries=0)
+
+    def test_pages_through_all_transactions(self):
+        """5.000 transações em páginas de 1.000: nenhuma truncada"""
+        pages = list(self.service.client.iter_transaction_pages(page_size=1000))
+        self.assertEqual([len(page) for page in pages], [1000] * 5)
+        # Última página cheia: uma requisição a mais, que volta vazia
+        self.assertEqual(len(self.server.requests), 6)
+
+        result = self.service.sync_minimal_transactions(page_size=1000)
+
+        self.assertEqual((result.pages, result.seen, result.inserted), (5, 5000, 5000))
+        self.assertEqual(BrokermintTransaction.objects.count(), 5000)
+        self.assertFalse(BrokermintTransaction.objects.filter(has_detailed_data=True).exists())
+
+    def test_incremental_run_stops_at_unchanged_page(self):
+        """Incremental: grava a página alterada e para na primeira sem mudanças"""
+        self.service.sync_minimal_transactions(page_size=1000)
+        self.server.requests = []
+        self.server.transactions[0]['status'] = 'closed'
+        self.server.transactions.insert(0, {'id': 5001, 'address': 'New Lot', 'status': 'active'})
+
+        result = self.service.sync_minimal_transactions(incremental=True, page_size=1000)
+
+        self.assertTrue(result.stopped_early)
+        self.assertEqual((result.pages, result.inserted, result.updated), (2, 1, 1))
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(BrokermintTransaction.objects.get(brokermint_id=5000).status, 'closed')
+        self.assertEqual(BrokermintTransaction.objects.count(), 5001)
+
+        full = self.service.sync_minimal_transactions(page_size=1000)
+        self.assertFalse(full.stopped_early)
+        self.assertEqual((full.pages, full.unchanged, full.change_ratio), (6, 5001, 0.0))
+
+
+class BulkUpsertTests(TestCase):
+    """
+    Upsert em lote (integrations.upsert) usado pela sincronização
+    """
+
+    def test_counts_and_round_trips(self):
+        """Inseridas / atualizadas / inalteradas; round-trips por lote, não por linha"""
+        BrokermintTransaction.objects.create(brokermint_id=1, status='active', has_detailed_data=True)
+        BrokermintTransaction.objects.create(brokermint_id=2, status='active')
+        incoming = [
+            BrokermintTransaction(brokermint_id=brokermint_id, status=status)
+            for brokermint_id, status in ((1, 'closed'), (2, 'active'), (3, 'active'), (4, 'active'))
+        ]
+
+        # SELECT + INSERT ... ON CONFLICT por lote de 2
+        with self.assertNumQueries(4):
+            result = bulk_upsert(
+                BrokermintTransaction, incoming, unique_field='brokermint_id',
+                update_fields=['status'], batch_size=2)
+
+        self.assertEqual(result.as_dict(), {'inserted': 2, 'updated': 1, 'unchanged': 1, 'change_ratio': 0.75})
+        self.assertEqual([obj.brokermint_id for obj in result.inserted_objects], [3, 4])
+        closed = BrokermintTransaction.objects.get(brokermint_id=1)
+        # Campos fora de update_fields não são sobrescritos
+        self.assertEqual((closed.status, closed.has_detailed_data), ('closed', True))
+
+    def test_payload_hash_skips_unchanged_rows(self):
+        """Com payload_hash, lote inalterado custa só o SELECT; registro sem hash recebe o hash"""
+        BrokermintTransaction.objects.create(brokermint_id=1, status='active', address='1 Lake St')
+
+        def listing(status):
+            return [
+                BrokermintTransaction(brokermint_id=brokermint_id, status=status, address=f'{brokermint_id} Lake St')
+                for brokermint_id in (1, 2, 3)
+            ]
+
+        def upsert(status):
+            return bulk_upsert(
+                BrokermintTransaction, listing(status), unique_field='brokermint_id',
+                update_fields=['address', 'status'], hash_field='payload_hash')
+
+        first = upsert('active')
+        self.assertEqual((first.inserted, first.updated, first.unchanged), (2, 0, 1))
+        self.assertEqual(BrokermintTransaction.objects.filter(payload_hash='').count(), 0)
+
+        with self.assertNumQueries(1):
+            second = upsert('active')
+        self.assertEqual((second.unchanged, second.change_ratio), (3, 0.0))
+
+        third = upsert('closed')
+        self.assertEqual((third.updated, third.change_ratio), (3, 1.0))
+        self.assertEqual(BrokermintTransaction.objects.filter(status='closed').count(), 3)
+
+    def test_written_transactions_are_indexed_for_global_search(self):
+        """bulk_create/bulk_update não disparam post_save: o upsert agenda a reindexação"""
+        BrokermintTransaction.objects.create(brokermint_id=1, status='active', address='1 Lake St')
+        incoming = [
+            BrokermintTransaction(brokermint_id=brokermint_id, status='active', address=address)
+            for brokermint_id, address in ((1, '1 Shore Dr'), (2, '2 Lake St'))
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_upsert(BrokermintTransaction, incoming, unique_field='brokermint_id', update_fields=['address'])
+
+        titles = dict(
+            SearchDocument.objects.filter(entity_type='brokermint_transaction')
+            .values_list('object_id', 'title')
+        )
+        pks = dict(BrokermintTransaction.objects.values_list('brokermint_id', 'pk'))
+        self.assertEqual(titles, {pks[1]: '1 Shore Dr', pks[2]: '2 Lake St'})
+
+    def test_signature_activities_mark_new_signatures_only(self):
+        """Só atividades novas marcam a transação como assinada"""
+        BrokermintTransaction.objects.create(brokermint_id=10, status='active')
+        BrokermintTransaction.objects.create(brokermint_id=20, status='active')
+        BrokermintActivity.objects.create(
+            brokermint_id=200, content='old', bm_transaction_id=20, created_at_brokermint=1,
+            originator_id=1, document_id=2, event_label='signed')
+        payload = [
+            {'id': 100, 'content': 'signed', 'bm_transaction_id': 10, 'created_at': 1, 'originator_id': 1,
+             'document_id': 1, 'event_label': 'signed', 'metadata': {'signers': ['a@b.com']}},
+            {'id': 200, 'content': 'old', 'bm_transaction_id': 20, 'created_at': 1, 'originator_id': 1,
+             'document_id': 2, 'event_label': 'signed'},
+        ]
+
+        result = BrokermintSyncService().save_signature_activities(payload)
+
+        self.assertEqual((result.inserted, result.updated, result.unchanged), (1, 0, 1))
+        self.assertEqual(
+            set(BrokermintTransaction.objects.filter(is_contract_signed=True).values_list('brokermint_id', flat=True)),
+            {10})
+
+
+class TypedColumnsTests(TestCase):
+    """
+    Colunas tipadas (dinheiro / datas) da BrokermintTransaction
+    """
+
+    def test_parsers(self):
+        self.assertEqual(parse_money('$12,500.5'), Decimal('12500.50'))
+        self.assertEqual(parse_money('(1,000)'), Decimal('-1000.00'))
+        self.assertIsNone(parse_money(''))
+        self.assertIsNone(parse_money('TBD'))
+        # Fora do numeric(14, 2): None em vez de InvalidOperation / DataError no lote
+        self.assertIsNone(parse_money('1e40'))
+        self.assertIsNone(parse_money('1e20'))
+        self.assertIsNone(parse_money('-1000000000000'))
+        self.assertIsNone(parse_money('999999999999.999'))
+        self.assertEqual(parse_money('999999999999.99'), Decimal('999999999999.99'))
+        closing = datetime(2025, 8, 1, tzinfo=dt_timezone.utc)
+        self.assertEqual(parse_timestamp(int(closing.timestamp())), closing)
+        self.assertEqual(parse_timestamp(int(closing.timestamp()) * 1000), closing)
+        self.assertIsNone(parse_timestamp(None))
+
+    def test_backfill_enables_filters_and_sums_in_the_database(self):
+        """Backfill em lotes; filtro por fechamento e soma de draws pelas colunas tipadas"""
+        july, august = datetime(2025, 7, 15, tzinfo=dt_timezone.utc), datetime(2025, 8, 15, tzinfo=dt_timezone.utc)
+        for brokermint_id, closing, draw in ((1, july, '$1,000'), (2, august, '2500.25'), (3, august, 'n/a')):
+            BrokermintTransaction.objects.create(
+                brokermint_id=brokermint_id, status='active',
+                closing_date=int(closing.timestamp()), draw_1=draw, draw_2='100')
+        batches = []
+
+        processed = backfill_typed_columns(batch_size=2, progress=lambda done, last_pk: batches.append(done))
+
+        self.assertEqual((processed, batches), (3, [2, 3]))
+        august_closings = BrokermintTransaction.objects.closing_between(
+            datetime(2025, 8, 1, tzinfo=dt_timezone.utc), datetime(2025, 9, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(sorted(august_closings.values_list('brokermint_id', flat=True)), [2, 3])
+        totals = BrokermintTransaction.objects.draw_totals()
+        self.assertEqual(totals['draw_1_amount'], Decimal('3500.25'))
+        self.assertEqual(totals['draws_total'], Decimal('3800.25'))
+
+        # Resumível: nada depois do último pk
+        self.assertEqual(backfill_typed_columns(start_pk=BrokermintTransaction.objects.order_by('pk').last().pk), 0)
+
+
+class SignatureFanOutTests(FakeBrokermintServerMixin, TestCase):
+    """
+    Fan-out das atividades de assinatura (group + chord, em modo eager)
+    """
+
+    def setUp(self):
+        super().setUp()
+        eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        self.addCleanup(setattr, current_app.conf, 'task_always_eager', eager)
+        settings_override = override_settings(BROKERMINT_API_URL=self.base_url, BROKERMINT_MAX_RETRIES=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+
+        for brokermint_id in range(1, 8):
+            BrokermintTransaction.objects.create(brokermint_id=brokermint_id, status='active')
+        BrokermintTransaction.objects.create(brokermint_id=99, status='closed')
+        self.server.activities = {
+            brokermint_id: [{
+                'id': 1000 + brokermint_id, 'content': 'signed', 'bm_transaction_id': brokermint_id,
+                'created_at': 1, 'originator_id': 1, 'document_id': brokermint_id, 'event_label': 'signed',
+            }]
+            for brokermint_id in (2, 6)
+        }
+
+    def test_covers_every_open_transaction_in_chunks(self):
+        """7 transações em aberto em lotes de 3: 3 requisições, todas cobertas, watermark definido"""
+        fan_out_signature_sync(chunk_size=3)
+
+        self.assertEqual(self.server.requests, ['/v1/activities'] * 3)
+        self.assertFalse(BrokermintTransaction.objects.filter(
+            status='active', last_activity_check__isnull=True).exists())
+        self.assertIsNone(BrokermintTransaction.objects.get(brokermint_id=99).last_activity_check)
+        self.assertEqual(
+            set(BrokermintTransaction.objects.filter(is_contract_signed=True).values_list('brokermint_id', flat=True)),
+            {2, 6})
+
+        coverage = get_signature_coverage()
+        self.assertEqual((coverage['open_transactions'], coverage['covered']), (7, 7))
+        self.assertEqual(coverage['activities']['inserted'], 2)
+        self.assertIsNotNone(coverage['watermark'])
+
+        # Persistido na SyncRun: sobrevive ao cache (outro processo / restart)
+        cache.clear()
+        self.assertEqual(get_signature_coverage(), coverage)
+        self.assertEqual(SyncRun.objects.get(run_type=SyncRun.TYPE_SIGNATURES).coverage, coverage)
+
+    def test_failed_chunk_does_not_break_the_chord(self):
+        """Lote com erro: os demais são gravados; watermark fica vazio até cobrir todos"""
+        self.server.faults['/v1/activities'] = [500]
+
+        fan_out_signature_sync(chunk_size=3)
+
+        coverage = get_signature_coverage()
+        self.assertEqual((coverage['covered'], len(coverage['failed_chunks'])), (4, 1))
+        self.assertIsNone(coverage['watermark'])
+        # Lote que falhou volta primeiro na próxima execução
+        self.assertEqual(
+            BrokermintTransaction.objects.filter(status='active', last_activity_check__isnull=True).count(), 3)
+
+
+@override_settings(ROOT_URLCONF=__name__, BROKERMINT_WEBHOOK_SECRET='test-secret')
+class BrokermintWebhookTests(FakeBrokermintServerMixin, TestCase):
+    """
+    Endpoint assinado + inbox durável (drain, deduplicação, replay)
+    """
+
+    def setUp(self):
+        super().setUp()
+        settings_override = override_settings(BROKERMINT_API_URL=self.base_url, BROKERMINT_MAX_RETRIES=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        self.url = reverse('integrations:brokermint-webhook')
+
+    def post(self, payload, signature=None):
+        body = json.dumps(payload).encode()
+        if signature is None:
+            signature = sign_payload(body)
+        return self.client.post(self.url, data=body, content_type='application/json',
+                                headers={SIGNATURE_HEADER: signature})
+
+    def test_rejects_invalid_signature(self):
+        response = self.post({'event_id': 'evt-1', 'transaction_id': 1}, signature='sha256=deadbeef')
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(BrokermintWebhookEvent.objects.exists())
+
+    def test_accepts_batch_in_one_insert_without_calling_brokermint(self):
+        events = [{'event_id': f'evt-{number}', 'event_type': 'transaction.updated', 'transaction_id': number}
+                  for number in range(1, 4)]
+        with self.assertNumQueries(1):
+            response = self.post(events)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {'received': 3})
+        self.assertEqual(BrokermintWebhookEvent.objects.filter(processed_at__isnull=True).count(), 3)
+        self.assertEqual(self.server.requests, [])
+
+    def test_drain_dedupes_and_refreshes_only_affected_transactions(self):
+        """Reentrega do mesmo event_id vira duplicate; cada tipo de evento dispara só o seu refresh"""
+        BrokermintTransaction.objects.create(brokermint_id=7, status='active')
+        self.server.activities = {7: [{
+            'id': 700, 'content': 'signed', 'bm_transaction_id': 7, 'created_at': 1,
+            'originator_id': 1, 'document_id': 70, 'event_label': 'signed',
+        }]}
+        self.post({'event_id': 'evt-sig', 'event_type': 'signature.completed', 'transaction_id': 7})
+        self.post({'event_id': 'evt-sig', 'event_type': 'signature.completed', 'transaction_id': 7})
+        self.post({'event_id': 'evt-new', 'event_type': 'transaction.created', 'transaction': {'id': 8}})
+        self.post({'event_id': 'evt-ping', 'event_type': 'ping'})
+
+        totals = drain_inbox()
+
+        self.assertEqual(
+            {key: totals[key] for key in ('applied', 'duplicate', 'ignored', 'failed')},
+            {'applied': 2, 'duplicate': 1, 'ignored': 1, 'failed': 0})
+        self.assertEqual(sorted(self.server.requests), ['/v1/activities', '/v3/transactions/8'])
+        self.assertTrue(BrokermintTransaction.objects.get(brokermint_id=7).is_contract_signed)
+        self.assertTrue(BrokermintTransaction.objects.get(brokermint_id=8).has_detailed_data)
+        self.assertFalse(BrokermintWebhookEvent.objects.filter(processed_at__isnull=True).exists())
+
+        # Mesmo evento entregue de novo depois de aplicado: não chama o Brokermint
+        self.server.requests = []
+        self.post({'event_id': 'evt-sig', 'event_type': 'signature.completed', 'transaction_id': 7})
+        self.assertEqual(drain_inbox()['duplicate'], 1)
+        self.assertEqual(self.server.requests, [])
+
+    def test_brokermint_failure_keeps_events_queued_and_replay_requeues(self):
+        self.server.faults['/v3/transactions/5'] = [500]
+        self.post({'event_id': 'evt-5', 'event_type': 'transaction.updated', 'transaction_id': 5})
+
+        totals = drain_inbox()
+
+        event = BrokermintWebhookEvent.objects.get(event_id='evt-5')
+        self.assertEqual((totals['retried'], totals['applied']), (1, 0))
+        self.assertIsNone(event.processed_at)
+        self.assertEqual(event.attempts, 1)
+
+        drain_inbox()
+        event.refresh_from_db()
+        self.assertEqual(event.outcome, BrokermintWebhookEvent.OUTCOME_APPLIED)
+
+        replay_events(BrokermintWebhookEvent.objects.filter(event_id='evt-5'))
+        event.refresh_from_db()
+        self.assertEqual((event.processed_at, event.outcome, event.attempts), (None, '', 0))
+
+    def test_unexpected_error_does_not_stall_the_inbox(self):
+        """Erro fora do BrokermintError (ex: InvalidOperation): attempts sobe até failed e a fila anda"""
+        self.post({'event_id': 'evt-bad', 'event_type': 'transaction.updated', 'transaction_id': 5})
+
+        with mock.patch('integrations.webhooks._refresh', side_effect=InvalidOperation('quantize')):
+            for _ in range(WEBHOOK_MAX_ATTEMPTS):
+                drain_inbox()
+
+        event = BrokermintWebhookEvent.objects.get(event_id='evt-bad')
+        self.assertEqual(event.outcome, BrokermintWebhookEvent.OUTCOME_FAILED)
+        self.assertEqual(event.attempts, WEBHOOK_MAX_ATTEMPTS)
+        self.assertTrue(event.last_error.startswith('InvalidOperation'))
+
+        self.post({'event_id': 'evt-ok', 'event_type': 'transaction.updated', 'transaction_id': 6})
+        self.assertEqual(drain_inbox()['applied'], 1)
+
+    def test_lost_batch_transaction_still_counts_the_attempt(self):
+        """Erro ao gravar o resultado do lote: attempts (da reserva) e erro gravados numa transação separada"""
+        self.post({'event_id': 'evt-6', 'event_type': 'transaction.updated', 'transaction_id': 6})
+
+        mark = webhooks._mark
+
+        def failing_mark(events, **values):
+            if values.get('outcome') == BrokermintWebhookEvent.OUTCOME_APPLIED:
+                raise DatabaseError('boom')
+            return mark(events, **values)
+
+        with mock.patch('integrations.webhooks._mark', side_effect=failing_mark):
+            totals = drain_inbox()
+
+        event = BrokermintWebhookEvent.objects.get(event_id='evt-6')
+        self.assertEqual(totals['retried'], 1)
+        self.assertIsNone(event.processed_at)
+        self.assertEqual((event.attempts, event.last_error), (1, 'DatabaseError: boom'))
+        self.assertIsNone(event.claimed_until)
+
+    def test_batch_is_claimed_outside_the_refresh_transaction(self):
+        """Refresh roda sem transação aberta: lote já reservado e commitado antes do HTTP"""
+        self.post({'event_id': 'evt-9', 'event_type': 'transaction.updated', 'transaction_id': 9})
+        seen = {}
+
+        def refresh(service, signature_ids, transaction_ids):
+            event = BrokermintWebhookEvent.objects.get(event_id='evt-9')
+            seen['claimed'] = (event.attempts, event.claimed_until is not None)
+            # Outro drain durante o refresh não pega o lote reservado
+            seen['concurrent'] = webhooks._claim(10, timezone.now())
+
+        with mock.patch('integrations.webhooks._refresh', side_effect=refresh):
+            totals = drain_inbox()
+
+        self.assertEqual(totals['applied'], 1)
+        self.assertEqual(seen, {'claimed': (1, True), 'concurrent': ([], 0)})
+        event = BrokermintWebhookEvent.objects.get(event_id='evt-9')
+        self.assertEqual((event.outcome, event.claimed_until), (BrokermintWebhookEvent.OUTCOME_APPLIED, None))
+
+    def test_expired_claim_returns_to_the_queue(self):
+        """Drain que morreu com o lote reservado: a reserva expira e outro drain processa"""
+        self.post({'event_id': 'evt-10', 'event_type': 'transaction.updated', 'transaction_id': 10})
+        claimed, _ = webhooks._claim(10, timezone.now())
+        self.assertEqual(len(claimed), 1)
+        self.assertEqual(drain_inbox()['applied'], 0)
+
+        later = timezone.now() + WEBHOOK_CLAIM_TIMEOUT + timedelta(seconds=1)
+        with mock.patch('integrations.webhooks.timezone.now', return_value=later):
+            totals = drain_inbox()
+        self.assertEqual(totals['applied'], 1)
+        self.assertEqual(BrokermintWebhookEvent.objects.get(event_id='evt-10').attempts, 2)
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class SyncRunCheckpointTests(FakeBrokermintServerMixin, TestCase):
+    """
+    SyncRun / SyncCheckpoint: checkpoints, retomada após queda e histórico na API
+    """
+
+    def setUp(self):
+        super().setUp()
+        settings_override = override_settings(BROKERMINT_API_URL=self.base_url, BROKERMINT_MAX_RETRIES=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_full_listing_resumes_from_last_checkpoint(self):
+        """Queda na 3ª página: a próxima execução começa do offset da página que falhou"""
+        self.server.transactions = [{'id': number, 'status': 'active'} for number in range(1, 7)]
+        self.server.faults['/v3/transactions'] = [None, None, 500]
+        service = BrokermintSyncService()
+
+        with self.assertRaises(BrokermintError):
+            with track_sync_run(SyncRun.TYPE_MINIMAL, checkpoint_every=2) as run:
+                service.sync_minimal_transactions(page_size=2, run=run)
+
+        failed = SyncRun.objects.get()
+        self.assertEqual(failed.status, SyncRun.STATUS_FAILED)
+        self.assertEqual((failed.cursor, failed.processed, failed.last_processed_id), ({'offset': 4}, 4, 4))
+        self.assertEqual(failed.checkpoints.count(), 3)
+
+        self.server.requests = []
+        with track_sync_run(SyncRun.TYPE_MINIMAL) as run:
+            result = service.sync_minimal_transactions(page_size=2, run=run)
+
+        resumed = SyncRun.objects.latest('pk')
+        self.assertEqual(resumed.resumed_from, failed)
+        self.assertEqual((resumed.status, resumed.processed, resumed.cursor), (SyncRun.STATUS_COMPLETED, 2, {}))
+        self.assertEqual((result.pages, result.inserted), (1, 2))
+        self.assertEqual(BrokermintTransaction.objects.count(), 6)
+
+    def test_orphaned_running_details_run_is_resumed_after_its_cursor(self):
+        """Worker morto (running sem lease): vira interrupted e a próxima pula o que já foi processado"""
+        pending = [BrokermintTransaction.objects.create(brokermint_id=number) for number in range(1, 5)]
+        crashed = SyncRun.objects.create(
+            run_type=SyncRun.TYPE_DETAILS, cursor={'after_pk': pending[1].pk},
+            heartbeat_at=timezone.now() - timedelta(hours=1),
+        )
+
+        run = start_sync_run(SyncRun.TYPE_DETAILS)
+        sync_transaction_details(client=BrokermintClient(), concurrency=1, run=run)
+        run.finish()
+
+        crashed.refresh_from_db()
+        self.assertEqual(crashed.status, SyncRun.STATUS_INTERRUPTED)
+        self.assertTrue(run.resumed)
+        self.assertEqual(sorted(self.server.requests), ['/v3/transactions/3', '/v3/transactions/4'])
+        self.assertEqual((run.run.total, run.run.processed, run.run.updated), (2, 2, 2))
+        self.assertEqual(run.run.last_processed_id, pending[3].pk)
+
+    def test_api_lists_runs_with_throughput(self):
+        started = timezone.now() - timedelta(seconds=10)
+        SyncRun.objects.create(
+            run_type=SyncRun.TYPE_DETAILS, status=SyncRun.STATUS_COMPLETED, processed=50,
+            started_at=started, heartbeat_at=started + timedelta(seconds=10),
+            finished_at=started + timedelta(seconds=10),
+        )
+        SyncRun.objects.create(run_type=SyncRun.TYPE_MINIMAL)
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user('sync-viewer'))
+
+        response = client.get(reverse('integrations:sync-run-list'), {'run_type': 'details'})
+
+        self.assertEqual(response.status_code, 200)
+        runs = response.json()
+        runs = runs['results'] if isinstance(runs, dict) else runs
+        self.assertEqual(len(runs), 1)
+        self.assertEqual((runs[0]['elapsed'], runs[0]['throughput']), (10.0, 5.0))
+
+
+class SingleFlightLockTests(FakeBrokermintServerMixin, TestCase):
+    """
+    Lease single-flight: disparos sobrepostos viram skipped + uma única reexecução
+    """
+
+    def setUp(self):
+        super().setUp()
+        eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        self.addCleanup(setattr, current_app.conf, 'task_always_eager', eager)
+        settings_override = override_settings(BROKERMINT_API_URL=self.base_url, BROKERMINT_MAX_RETRIES=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        cache.clear()
+        self.server.transactions = [{'id': 1, 'status': 'active'}]
+
+    def test_overlapping_triggers_are_skipped_and_coalesced_into_one_rerun(self):
+        holder = SingleFlightLock('minimal')
+        self.assertTrue(holder.acquire(heartbeat=False))
+
+        for _ in range(3):
+            message = sync_minimal_transactions_task.delay(incremental=True).get()
+            self.assertIn('já em execução', message)
+
+        skipped = SyncRun.objects.filter(run_type=SyncRun.TYPE_MINIMAL, status=SyncRun.STATUS_SKIPPED)
+        self.assertEqual(skipped.count(), 3)
+        self.assertEqual(self.server.requests, [])
+
+        # Ao liberar, o dono enfileira uma única execução
+        holder.release()
+
+        self.assertEqual(self.server.requests, ['/v3/transactions'])
+        completed = SyncRun.objects.get(run_type=SyncRun.TYPE_MINIMAL, status=SyncRun.STATUS_COMPLETED)
+        self.assertEqual(completed.processed, 1)
+        # A reexecução liberou o lease
+        self.assertIsNone(cache.get(holder.key))
+
+    def test_heartbeat_keeps_lease_and_waiter_records_wait(self):
+        holder = SingleFlightLock('details', ttl=1)
+        self.assertTrue(holder.acquire())
+        self.addCleanup(holder.release)
+
+        time.sleep(1.5)
+        self.assertTrue(holder.owned())
+
+        waiter = SingleFlightLock('details', ttl=1)
+        self.assertFalse(waiter.acquire(wait=0.3))
+        self.assertGreaterEqual(waiter.waited, 0.3)
+
+        holder.release()
+        self.assertTrue(waiter.acquire(wait=0.3, heartbeat=False))
+        waiter.release()
+
+    def test_lease_requires_a_shared_store(self):
+        """Sem Redis o lease seria local ao processo: ImproperlyConfigured em vez de falso single-flight"""
+        with override_settings(BROKERMINT_LOCK_REDIS_URL='', BROKERMINT_LOCK_ALLOW_LOCAL=False):
+            with self.assertRaises(ImproperlyConfigured):
+                SingleFlightLock('minimal')
+
+    def test_redis_lease_uses_set_nx_px_and_token_checked_release(self):
+        client = mock.MagicMock()
+        client.set.return_value = True
+        scripts = {}
+        client.register_script.side_effect = lambda source: scripts.setdefault(source, mock.MagicMock(return_value=None))
+
+        with mock.patch('redis.Redis.from_url', return_value=client), \
+                override_settings(BROKERMINT_LOCK_REDIS_URL='redis://lease-test:6379/0'):
+            lock = SingleFlightLock('details', ttl=30)
+            self.assertTrue(lock.acquire(heartbeat=False))
+            token = lock.token
+            lock.release()
+        _redis_store.cache_clear()
+
+        client.set.assert_called_once_with(lock.key, token, nx=True, px=30000)
+        scripts[RedisLeaseStore.RELEASE_SCRIPT].assert_called_once_with(keys=[lock.key], args=[token])
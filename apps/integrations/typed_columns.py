@@ -0,0 +1,148 @@
+# integrations/typed_columns.py
+"""
+Colunas tipadas (sombra) da BrokermintTransaction
+
+O Brokermint entrega valores monetários como texto ("$12,500.00") e datas
+como timestamp unix; os campos originais continuam como vieram (CharField /
+BigIntegerField) e cada um ganha uma coluna tipada ao lado:
+
+- Dinheiro: <campo>_amount  (DecimalField)  ex: draw_1 -> draw_1_amount
+- Datas:    <campo sem _date>_at (DateTimeField)  ex: closing_date -> closing_at
+
+Filtros por data e somas de draws usam as colunas tipadas no banco, sem
+converter texto linha a linha em Python.
+
+Preenchidas por:
+- sync_service.apply_transaction_details() (sincronização de detalhes)
+- python manage.py backfill_typed_columns (registros já existentes)
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+
+# Campo original -> coluna tipada
+MONEY_COLUMNS = {
+    'soft_costs': 'soft_costs_amount',
+    'hard_costs': 'hard_costs_amount',
+    'estimated_construction_cost': 'estimated_construction_cost_amount',
+    'builder_fee': 'builder_fee_amount',
+    'draw_1': 'draw_1_amount',
+    'draw_2': 'draw_2_amount',
+    'draw_3': 'draw_3_amount',
+    'draw_4': 'draw_4_amount',
+    'draw_5': 'draw_5_amount',
+}
+DATE_COLUMNS = {
+    'acceptance_date': 'acceptance_at',
+    'expiration_date': 'expiration_at',
+    'closing_date': 'closing_at',
+    'listing_date': 'listing_at',
+    'buyer_agreement_date': 'buyer_agreement_at',
+    'buyer_expiration_date': 'buyer_expiration_at',
+}
+DRAW_AMOUNT_COLUMNS = [MONEY_COLUMNS[f'draw_{number}'] for number in range(1, 6)]
+TYPED_COLUMNS = [*MONEY_COLUMNS.values(), *DATE_COLUMNS.values()]
+
+BACKFILL_BATCH_SIZE = 1000
+# Timestamps acima disso estão em milissegundos (1e11 s ~ ano 5138)
+MILLISECONDS_THRESHOLD = 10 ** 11
+# Colunas <campo>_amount são numeric(14, 2): |valor| < 10^12
+MONEY_MAX_ABS = Decimal(10) ** 12
+
+
+def parse_money(value):
+    """
+    '$12,500.00' / '12500' / 12500 -> Decimal('12500.00')
+
+    Vazio, inválido ou fora do numeric(14, 2) da coluna (|valor| >= 10^12,
+    ex: '1e20') -> None: um valor ruim não derruba o lote inteiro.
+    """
+    if value is None:
+        return None
+    text = str(value).strip().replace('$', '').replace(',', '').replace(' ', '')
+    if not text:
+        return None
+    negative = text.startswith('(') and text.endswith(')')
+    try:
+        amount = Decimal(text.strip('()'))
+    except InvalidOperation:
+        return None
+    if not amount.is_finite() or abs(amount) >= MONEY_MAX_ABS:
+        return None
+    try:
+        amount = amount.quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return None
+    if abs(amount) >= MONEY_MAX_ABS:
+        # Arredondamento para cima (ex: 999999999999.999)
+        return None
+    return -amount if negative else amount
+
+
+def parse_timestamp(value):
+    """Timestamp unix (segundos ou milissegundos) -> datetime UTC; vazio ou inválido -> None"""
+    if value in (None, ''):
+        return None
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return None
+    if abs(seconds) >= MILLISECONDS_THRESHOLD:
+        seconds /= 1000
+    try:
+        return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+
+
+def fill_typed_columns(transaction_obj):
+    """Preenche as colunas tipadas a partir dos campos originais (sem salvar)"""
+    for source, target in MONEY_COLUMNS.items():
+        setattr(transaction_obj, target, parse_money(getattr(transaction_obj, source)))
+    for source, target in DATE_COLUMNS.items():
+        setattr(transaction_obj, target, parse_timestamp(getattr(transaction_obj, source)))
+    return transaction_obj
+
+
+def backfill_typed_columns(batch_size=BACKFILL_BATCH_SIZE, start_pk=0, pause=0.0, progress=None):
+    """
+    Preenche as colunas tipadas dos registros existentes, em lotes por pk
+
+    Online: cada lote é um SELECT (só os campos originais) + um bulk_update
+    em transação própria, então os locks duram um lote; `pause` segundos
+    entre lotes aliviam o banco. Pode ser interrompido e retomado com
+    start_pk = último pk informado ao progress.
+
+    Args:
+        progress: callable(processados, último_pk) chamado após cada lote
+
+    Returns:
+        Total de registros processados
+    """
+    from .models import BrokermintTransaction
+
+    source_fields = [*MONEY_COLUMNS, *DATE_COLUMNS]
+    last_pk = start_pk
+    processed = 0
+    while True:
+        batch = list(
+            BrokermintTransaction.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('pk', *source_fields)[:batch_size]
+        )
+        if not batch:
+            return processed
+
+        for obj in batch:
+            fill_typed_columns(obj)
+        with transaction.atomic():
+            BrokermintTransaction.objects.bulk_update(batch, TYPED_COLUMNS)
+
+        last_pk = batch[-1].pk
+        processed += len(batch)
+        if progress:
+            progress(processed, last_pk)
+        if pause:
+            time.sleep(pause)
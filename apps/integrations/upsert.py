@@ -0,0 +1,166 @@
+# integrations/upsert.py
+"""
+Upsert em lote dos dados do Brokermint
+
+bulk_upsert() grava N objetos em 2 round-trips por lote em vez de 1-4 por
+linha (update_or_create / filter().update()):
+1. SELECT dos registros existentes do lote (pela chave única)
+2. INSERT ... ON CONFLICT (chave) DO UPDATE apenas com as linhas novas ou
+   alteradas (bulk_create com update_conflicts)
+
+bulk_create não dispara post_save: as linhas gravadas são reindexadas na
+busca global (core.search_documents.schedule_reindex, no commit).
+
+O SELECT classifica cada linha em inserida / atualizada / inalterada; se
+outra execução inserir a mesma chave entre o SELECT e o INSERT, o ON
+CONFLICT resolve sem erro (só a contagem fica aproximada).
+
+Com hash_field (payload_hash), a comparação é pelo hash SHA-256 dos
+valores normalizados de update_fields: linhas inalteradas não são
+reescritas (sem WAL, sem histórico). Registros antigos ainda sem hash são
+comparados campo a campo e recebem o hash na primeira execução.
+
+USAGE:
+    from integrations.upsert import bulk_upsert
+
+    result = bulk_upsert(
+        BrokermintActivity,
+        [BrokermintActivity(brokermint_id=1, ...), ...],
+        unique_field='brokermint_id',
+        update_fields=['content', 'signers'],
+    )
+    print(result.as_dict())  # {'inserted': 1, 'updated': 0, 'unchanged': 0, 'change_ratio': 1.0}
+"""
+import hashlib
+import json
+from dataclasses import dataclass, field
+
+from core.search_documents import schedule_reindex
+
+UPSERT_BATCH_SIZE = 500
+
+
+@dataclass
+class UpsertResult:
+    """
+    Contagens de um bulk_upsert
+
+    Attributes:
+        inserted / updated / unchanged: Linhas por resultado
+        inserted_objects: Instâncias (de `objs`) que foram inseridas
+    """
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    inserted_objects: list = field(default_factory=list)
+
+    def merge(self, other):
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.inserted_objects.extend(other.inserted_objects)
+        return self
+
+    @property
+    def total(self):
+        return self.inserted + self.updated + self.unchanged
+
+    @property
+    def change_ratio(self):
+        """Fração das linhas recebidas que foi gravada (novas + alteradas)"""
+        return (self.inserted + self.updated) / self.total if self.total else 0.0
+
+    def as_dict(self):
+        return {
+            'inserted': self.inserted,
+            'updated': self.updated,
+            'unchanged': self.unchanged,
+            'change_ratio': round(self.change_ratio, 4),
+        }
+
+
+def _normalized_values(obj, fields):
+    return {f.name: f.to_python(getattr(obj, f.attname)) for f in fields}
+
+
+def payload_hash(values):
+    """SHA-256 estável de um dict de valores (chaves ordenadas, JSON compacto)"""
+    encoded = json.dumps(values, sort_keys=True, separators=(',', ':'), default=str, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+def bulk_upsert(model, objs, unique_field, update_fields, hash_field=None, batch_size=UPSERT_BATCH_SIZE):
+    """
+    Insere ou atualiza `objs` (instâncias não salvas) pela chave `unique_field`
+
+    Em conflito só `update_fields` (e `hash_field`) são sobrescritos; os
+    demais campos (ex: has_detailed_data, flags de assinatura) mantêm o
+    valor do banco. Chaves repetidas em `objs`: vale a última.
+
+    Args:
+        hash_field: Campo que guarda o payload_hash dos update_fields;
+            quando informado, só linhas com hash diferente são gravadas
+
+    Returns:
+        UpsertResult
+    """
+    manager = model._default_manager
+    fields = [model._meta.get_field(name) for name in update_fields]
+    by_key = {getattr(obj, unique_field): obj for obj in objs}
+    keys = list(by_key)
+    written_fields = list(update_fields) + ([hash_field] if hash_field else [])
+    result = UpsertResult()
+
+    for start in range(0, len(keys), batch_size):
+        chunk = keys[start:start + batch_size]
+        existing = {
+            row[unique_field]: row
+            for row in manager.filter(**{f'{unique_field}__in': chunk}).values(unique_field, *written_fields)
+        }
+
+        to_write = []
+        for key in chunk:
+            obj = by_key[key]
+            values = _normalized_values(obj, fields)
+            if hash_field:
+                setattr(obj, hash_field, payload_hash(values))
+            current = existing.get(key)
+
+            if current is None:
+                result.inserted += 1
+                result.inserted_objects.append(obj)
+                to_write.append(obj)
+            elif hash_field and current[hash_field]:
+                if current[hash_field] != getattr(obj, hash_field):
+                    result.updated += 1
+                    to_write.append(obj)
+                else:
+                    result.unchanged += 1
+            elif any(current[name] != value for name, value in values.items()):
+                result.updated += 1
+                to_write.append(obj)
+            else:
+                result.unchanged += 1
+                if hash_field:
+                    # Registro anterior ao payload_hash: grava só para guardar o hash
+                    to_write.append(obj)
+
+        if to_write:
+            manager.bulk_create(
+                to_write,
+                update_conflicts=True,
+                unique_fields=[unique_field],
+                update_fields=written_fields,
+            )
+            _assign_pks(manager, to_write, unique_field)
+            schedule_reindex(model, to_write)
+    return result
+
+
+def _assign_pks(manager, objs, unique_field):
+    """PK das instâncias gravadas (o backend pode não retorná-la no ON CONFLICT)"""
+    missing = {getattr(obj, unique_field): obj for obj in objs if obj.pk is None}
+    if missing:
+        pks = manager.filter(**{f'{unique_field}__in': list(missing)}).values_list(unique_field, 'pk')
+        for key, pk in pks:
+            missing[key].pk = pk
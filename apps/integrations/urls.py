@@ -1,13 +1,15 @@
 # integrations/urls.py - ÚNICO ARQUIVO DE URLs
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import BrokermintDocumentViewSet
+from .views import BrokermintDocumentViewSet, BrokermintWebhookView, SyncRunViewSet
 
 router = DefaultRouter()
 router.register(r'documents', BrokermintDocumentViewSet)
+router.register(r'sync-runs', SyncRunViewSet, basename='sync-run')
 
 app_name = 'integrations'
 
 urlpatterns = [
     path('api/', include(router.urls)),
+    path('webhooks/brokermint/', BrokermintWebhookView.as_view(), name='brokermint-webhook'),
 ]
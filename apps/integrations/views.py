@@ -1,13 +1,25 @@
 # integrations/views.py - ÚNICO ARQUIVO DE VIEWS
+import logging
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
-from .models import BrokermintDocument
-from .serializers import BrokermintDocumentSerializer, DocumentRefreshSerializer
+from .brokermint_client import BrokermintError, BrokermintNotFound
+from .models import BrokermintDocument, SyncRun
+from .serializers import (
+    BrokermintDocumentSerializer,
+    DocumentRefreshSerializer,
+    SyncCheckpointSerializer,
+    SyncRunSerializer,
+)
 from .sync_service import BrokermintSyncService
+from .webhooks import SIGNATURE_HEADER, InvalidWebhook, ingest, verify_signature
+
+logger = logging.getLogger(__name__)
 
 
 class BrokermintDocumentViewSet(viewsets.ReadOnlyModelViewSet):
@@ -48,8 +60,78 @@ class BrokermintDocumentViewSet(viewsets.ReadOnlyModelViewSet):
                     'message': 'Não foi possível obter nova URL'
                 }, status=status.HTTP_400_BAD_REQUEST)
 
+        except BrokermintNotFound as e:
+            return Response({
+                'success': False,
+                'message': str(e)
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        except BrokermintError as e:
+            logger.warning(f"Refresh do documento {document.pk}: {e}")
+            return Response({
+                'success': False,
+                'message': 'Brokermint indisponível, tente novamente mais tarde'
+            }, status=status.HTTP_502_BAD_GATEWAY)
+
         except Exception as e:
             return Response({
                 'success': False,
                 'message': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
+
+
+class SyncRunViewSet(viewsets.ReadOnlyModelViewSet):
+    """Histórico das sincronizações com o Brokermint (com throughput por execução)"""
+    serializer_class = SyncRunSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = SyncRun.objects.order_by('-started_at', '-pk')
+        for field in ('run_type', 'status', 'trigger'):
+            value = self.request.query_params.get(field)
+            if value:
+                queryset = queryset.filter(**{field: value})
+        return queryset
+
+    @swagger_auto_schema(
+        operation_summary="Sync Run Checkpoints",
+        operation_description="Checkpoints gravados durante a execução",
+        responses={200: SyncCheckpointSerializer(many=True)}
+    )
+    @action(detail=True, methods=['get'])
+    def checkpoints(self, request, pk=None):
+        """Checkpoints da execução"""
+        run = self.get_object()
+        return Response(SyncCheckpointSerializer(run.checkpoints.all(), many=True).data)
+
+
+class BrokermintWebhookView(APIView):
+    """
+    Recebe webhooks do Brokermint
+
+    Só valida a assinatura, grava na inbox (um INSERT) e responde 202; o
+    processamento é da task drain_webhook_inbox (integrations.webhooks).
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(
+        operation_summary="Brokermint Webhook",
+        operation_description=(
+            "Eventos do Brokermint (objeto ou lista), assinados com HMAC-SHA256 "
+            f"do corpo no header {SIGNATURE_HEADER}"
+        ),
+        responses={202: 'Aceito', 400: 'Corpo inválido', 403: 'Assinatura inválida'}
+    )
+    def post(self, request):
+        # Corpo cru: a assinatura é sobre os bytes recebidos, antes de qualquer parse
+        body = request.body
+        if not verify_signature(body, request.headers.get(SIGNATURE_HEADER)):
+            return Response({'detail': 'Assinatura inválida'}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            received = ingest(body)
+        except InvalidWebhook as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({'received': received}, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,343 @@
+# integrations/webhooks.py
+"""
+Webhooks do Brokermint: ingestão assinada + inbox durável
+
+Entrada (POST /integrations/webhooks/brokermint/):
+- Assinatura HMAC-SHA256 do corpo cru com BROKERMINT_WEBHOOK_SECRET no
+  header X-Brokermint-Signature (hex, com ou sem prefixo "sha256=")
+- Um evento (objeto) ou vários (lista) -> um único INSERT na inbox
+  (BrokermintWebhookEvent) e 202; nada de chamada ao Brokermint na requisição
+- Agenda um drain (no máximo um a cada WEBHOOK_DRAIN_DELAY segundos)
+
+Processamento (drain_inbox, task drain_webhook_inbox):
+- Lotes de pendentes reservados numa transação curta (SELECT ... FOR
+  UPDATE SKIP LOCKED no Postgres + claimed_until / attempts + 1); as
+  chamadas ao Brokermint rodam fora de transação
+- Deduplicação por event_id (no lote e contra eventos já aplicados)
+- Refresh só das transações afetadas: atividades de assinatura para
+  eventos de assinatura/documento, detalhes da transação para os demais
+- Resultado gravado em outra transação curta
+- Falha do Brokermint: evento volta para a fila até WEBHOOK_MAX_ATTEMPTS,
+  depois outcome=failed; reserva de um drain que morreu expira em
+  WEBHOOK_CLAIM_TIMEOUT
+
+USAGE:
+    body = json.dumps(event).encode()
+    headers = {SIGNATURE_HEADER: sign_payload(body)}
+    requests.post(url, data=body, headers=headers)
+"""
+import hashlib
+import hmac
+import json
+import logging
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.search_documents import schedule_reindex
+
+from .brokermint_client import BrokermintError
+from .models import BrokermintTransaction, BrokermintWebhookEvent
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_HEADER = 'X-Brokermint-Signature'
+WEBHOOK_DRAIN_BATCH_SIZE = 200
+WEBHOOK_DRAIN_DELAY = 5
+WEBHOOK_MAX_ATTEMPTS = 5
+# Reserva de um lote: cobre retries e Retry-After do cliente + detalhes em threads
+WEBHOOK_CLAIM_TIMEOUT = timedelta(minutes=15)
+DRAIN_SCHEDULED_CACHE_KEY = 'brokermint:webhook_drain_scheduled'
+
+# Tipos de evento que afetam atividades de assinatura / documentos
+SIGNATURE_EVENT_MARKERS = ('signature', 'activity', 'document')
+
+
+class InvalidWebhook(Exception):
+    """Corpo ilegível ou sem os campos mínimos"""
+
+
+# ====================================
+# ASSINATURA
+# ====================================
+def sign_payload(body, secret=None):
+    """Assinatura hex HMAC-SHA256 do corpo (bytes)"""
+    secret = secret if secret is not None else settings.BROKERMINT_WEBHOOK_SECRET
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body, signature):
+    """True se `signature` confere com o corpo; sem segredo configurado, sempre False"""
+    secret = getattr(settings, 'BROKERMINT_WEBHOOK_SECRET', '')
+    if not secret or not signature:
+        return False
+    signature = signature.strip()
+    if signature.startswith('sha256='):
+        signature = signature[len('sha256='):]
+    return hmac.compare_digest(sign_payload(body, secret), signature)
+
+
+# ====================================
+# INGESTÃO
+# ====================================
+def _transaction_id(payload):
+    for key in ('bm_transaction_id', 'transaction_id'):
+        if payload.get(key):
+            return payload[key]
+    nested = payload.get('transaction')
+    if isinstance(nested, dict):
+        return nested.get('id')
+    return None
+
+
+def parse_events(body):
+    """
+    Corpo cru -> lista de BrokermintWebhookEvent (não salvos)
+
+    Sem id no evento, o event_id é o SHA-256 do próprio evento: reentregas
+    idênticas são deduplicadas.
+
+    Raises:
+        InvalidWebhook
+    """
+    try:
+        data = json.loads(body)
+    except (TypeError, ValueError):
+        raise InvalidWebhook('Corpo não é JSON')
+    items = data if isinstance(data, list) else [data]
+    if not items or not all(isinstance(item, dict) for item in items):
+        raise InvalidWebhook('Esperado um evento (objeto) ou uma lista de eventos')
+
+    events = []
+    for item in items:
+        event_id = item.get('event_id') or item.get('id')
+        if not event_id:
+            event_id = hashlib.sha256(json.dumps(item, sort_keys=True).encode()).hexdigest()
+        transaction_id = _transaction_id(item)
+        try:
+            transaction_id = int(transaction_id) if transaction_id is not None else None
+        except (TypeError, ValueError):
+            transaction_id = None
+        events.append(BrokermintWebhookEvent(
+            event_id=str(event_id)[:100],
+            event_type=str(item.get('event_type') or item.get('type') or '')[:100],
+            bm_transaction_id=transaction_id,
+            payload=item,
+        ))
+    return events
+
+
+def ingest(body):
+    """Grava os eventos do corpo na inbox (um INSERT) e agenda o drain; retorna quantos"""
+    events = parse_events(body)
+    BrokermintWebhookEvent.objects.bulk_create(events)
+    transaction.on_commit(schedule_drain)
+    return len(events)
+
+
+def schedule_drain():
+    """Enfileira drain_webhook_inbox, coalescendo rajadas em um drain por janela"""
+    if not cache.add(DRAIN_SCHEDULED_CACHE_KEY, True, timeout=WEBHOOK_DRAIN_DELAY):
+        return
+    from .tasks import drain_webhook_inbox
+
+    try:
+        drain_webhook_inbox.apply_async(countdown=WEBHOOK_DRAIN_DELAY)
+    except Exception as exc:
+        # Broker fora: o evento já está na inbox; o beat drena depois
+        logger.warning(f"Drain de webhooks não agendado: {exc}")
+
+
+# ====================================
+# PROCESSAMENTO
+# ====================================
+def is_signature_event(event_type):
+    event_type = (event_type or '').lower()
+    return any(marker in event_type for marker in SIGNATURE_EVENT_MARKERS)
+
+
+def _mark(events, **values):
+    if events:
+        BrokermintWebhookEvent.objects.filter(pk__in=[event.pk for event in events]).update(**values)
+
+
+def _refresh(service, signature_ids, transaction_ids):
+    """Refresh direcionado: só as transações afetadas pelos eventos"""
+    from .detail_fetcher import sync_transaction_details
+
+    if signature_ids:
+        service.refresh_signature_activities(signature_ids)
+    if transaction_ids:
+        # Transação criada no Brokermint e ainda desconhecida: registro mínimo antes dos detalhes
+        BrokermintTransaction.objects.bulk_create(
+            [BrokermintTransaction(brokermint_id=brokermint_id, has_detailed_data=False)
+             for brokermint_id in transaction_ids],
+            ignore_conflicts=True,
+        )
+        # bulk_create não dispara post_save (os detalhes gravados abaixo reindexam de novo)
+        schedule_reindex(
+            BrokermintTransaction, BrokermintTransaction.objects.filter(brokermint_id__in=transaction_ids).only('pk'))
+        result = sync_transaction_details(transaction_ids=transaction_ids, client=service.client)
+        if result.aborted or result.errors:
+            raise BrokermintError(result.aborted or f'{result.errors} transações sem detalhes')
+
+
+def _claim(batch_size, now):
+    """
+    Reserva um lote de pendentes (transação curta, commit antes do refresh)
+
+    Os eventos recebem claimed_until = now + WEBHOOK_CLAIM_TIMEOUT (outros
+    drains pulam o lote) e attempts + 1: a tentativa conta mesmo que o
+    processo morra no meio. Eventos que já esgotaram as tentativas (drains
+    que morreram com eles reservados) saem da fila como failed.
+
+    Returns:
+        (eventos reservados, quantos marcados como failed)
+    """
+    with transaction.atomic():
+        events = list(
+            BrokermintWebhookEvent.objects.filter(processed_at__isnull=True)
+            .filter(Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+            .order_by('pk')
+            .select_for_update(skip_locked=True)[:batch_size]
+        )
+        exhausted = [event for event in events if event.attempts >= WEBHOOK_MAX_ATTEMPTS]
+        claimed = [event for event in events if event.attempts < WEBHOOK_MAX_ATTEMPTS]
+        _mark(exhausted, processed_at=now, outcome=BrokermintWebhookEvent.OUTCOME_FAILED, claimed_until=None)
+        _mark(claimed, claimed_until=now + WEBHOOK_CLAIM_TIMEOUT, attempts=F('attempts') + 1)
+    for event in claimed:
+        event.attempts += 1
+    return claimed, len(exhausted)
+
+
+def _record_failure(event_pks, exc, now):
+    """
+    Libera os eventos com last_error; os que chegaram a
+    WEBHOOK_MAX_ATTEMPTS (contadas na reserva) saem da fila como failed
+
+    Returns:
+        (retried, failed)
+    """
+    message = str(exc) if isinstance(exc, BrokermintError) else f'{type(exc).__name__}: {exc}'
+    pending = BrokermintWebhookEvent.objects.filter(pk__in=event_pks, processed_at__isnull=True)
+    failed = pending.filter(attempts__gte=WEBHOOK_MAX_ATTEMPTS).update(
+        processed_at=now, outcome=BrokermintWebhookEvent.OUTCOME_FAILED, claimed_until=None, last_error=message)
+    retried = pending.update(claimed_until=None, last_error=message)
+    return retried, failed
+
+
+def drain_inbox(batch_size=WEBHOOK_DRAIN_BATCH_SIZE, max_batches=None, service=None):
+    """
+    Processa os eventos pendentes da inbox
+
+    Por lote: reserva (_claim, transação curta) -> refresh no Brokermint sem
+    transação aberta -> resultado numa transação curta. Nenhum lock de linha
+    nem conexão em transação fica preso durante as chamadas HTTP; dois
+    drains simultâneos pegam lotes diferentes pela reserva.
+
+    Falha no lote (Brokermint fora ou qualquer outro erro: DataError,
+    InvalidOperation...): os eventos voltam para a fila e desistem após
+    WEBHOOK_MAX_ATTEMPTS, para um lote ruim não travar a inbox. Se nem o
+    resultado puder ser gravado, a falha é gravada numa transação separada;
+    se o processo morrer, a reserva expira em WEBHOOK_CLAIM_TIMEOUT.
+
+    Returns:
+        dict {applied, duplicate, ignored, failed, retried, transactions}
+    """
+    from .sync_service import BrokermintSyncService
+
+    service = service or BrokermintSyncService()
+    totals = {'applied': 0, 'duplicate': 0, 'ignored': 0, 'failed': 0, 'retried': 0, 'transactions': 0}
+    batches = 0
+
+    while max_batches is None or batches < max_batches:
+        now = timezone.now()
+        events, exhausted = _claim(batch_size, now)
+        totals['failed'] += exhausted
+        if not events:
+            if exhausted:
+                continue
+            break
+        batches += 1
+        applied, duplicates, ignored = [], [], []
+        retried = failed = 0
+        try:
+            already_applied = set(
+                BrokermintWebhookEvent.objects.filter(
+                    event_id__in={event.event_id for event in events},
+                    outcome=BrokermintWebhookEvent.OUTCOME_APPLIED,
+                ).values_list('event_id', flat=True)
+            )
+            unique = OrderedDict()
+            for event in events:
+                if event.event_id in already_applied or event.event_id in unique:
+                    duplicates.append(event)
+                elif event.bm_transaction_id is None:
+                    ignored.append(event)
+                else:
+                    unique[event.event_id] = event
+
+            signature_ids = sorted({
+                event.bm_transaction_id for event in unique.values() if is_signature_event(event.event_type)})
+            transaction_ids = sorted({
+                event.bm_transaction_id for event in unique.values()
+                if not is_signature_event(event.event_type)})
+
+            applied = list(unique.values())
+            refresh_error = None
+            try:
+                _refresh(service, signature_ids, transaction_ids)
+            except Exception as exc:
+                refresh_error = exc
+
+            with transaction.atomic():
+                if refresh_error is not None:
+                    retried, failed = _record_failure([event.pk for event in applied], refresh_error, now)
+                    applied = []
+                _mark(applied, processed_at=now, outcome=BrokermintWebhookEvent.OUTCOME_APPLIED,
+                      claimed_until=None, last_error='')
+                _mark(duplicates, processed_at=now, outcome=BrokermintWebhookEvent.OUTCOME_DUPLICATE,
+                      claimed_until=None)
+                _mark(ignored, processed_at=now, outcome=BrokermintWebhookEvent.OUTCOME_IGNORED,
+                      claimed_until=None)
+            if refresh_error is not None:
+                _log_failure(refresh_error, retried)
+        except Exception as exc:
+            # Resultado do lote não gravado: falha gravada à parte (attempts já contou na reserva)
+            with transaction.atomic():
+                retried, failed = _record_failure([event.pk for event in events], exc, timezone.now())
+            totals['retried'] += retried
+            totals['failed'] += failed
+            _log_failure(exc, retried)
+            break
+
+        totals['retried'] += retried
+        totals['failed'] += failed
+        totals['applied'] += len(applied)
+        totals['duplicate'] += len(duplicates)
+        totals['ignored'] += len(ignored)
+        if applied:
+            totals['transactions'] += len(signature_ids) + len(transaction_ids)
+        if totals['retried']:
+            # Lote com falha: não insistir nele agora
+            break
+
+    logger.info(f"Webhooks Brokermint: {totals}")
+    return totals
+
+
+def _log_failure(exc, retried):
+    if isinstance(exc, BrokermintError):
+        logger.warning(f"Webhooks Brokermint: refresh falhou ({exc}); {retried} eventos voltam para a fila")
+    else:
+        logger.exception(f"Webhooks Brokermint: erro inesperado no lote; {retried} eventos voltam para a fila")
+
+
+def replay_events(queryset):
+    """Devolve eventos da inbox para a fila (processed_at / outcome / attempts / reserva zerados)"""
+    return queryset.update(processed_at=None, outcome='', attempts=0, last_error='', claimed_until=None)
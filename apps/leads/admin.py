@@ -5,6 +5,7 @@ from django.urls import reverse
 from django.utils import timezone
 from .models import Lead
 from .models.lead_types import StatusChoice, ElevationChoice
+from core.resolver import Resolver
 from django import forms
 from django.contrib import messages
 from django.shortcuts import render
@@ -329,7 +330,7 @@ class LeadAdmin(admin.ModelAdmin):
     def mark_as_qualified(self, request, queryset):
         """Marca leads selecionados como qualificados"""
         try:
-            qualified_status = StatusChoice.objects.get(code='QUALIFIED')
+            qualified_status = Resolver.id(StatusChoice, 'QUALIFIED')
             updated = queryset.filter(status__code='PENDING').update(
                 status=qualified_status)
             self.message_user(request, f'{updated} leads marked as qualified.')
@@ -341,7 +342,7 @@ class LeadAdmin(admin.ModelAdmin):
     def mark_as_rejected(self, request, queryset):
         """Marca leads selecionados como rejeitados"""
         try:
-            rejected_status = StatusChoice.objects.get(code='REJECTED')
+            rejected_status = Resolver.id(StatusChoice, 'REJECTED')
             updated = queryset.exclude(
                 status__code='CONVERTED').update(status=rejected_status)
             self.message_user(request, f'{updated} leads marked as rejected.')
@@ -353,7 +354,7 @@ class LeadAdmin(admin.ModelAdmin):
     def mark_as_pending(self, request, queryset):
         """Volta leads para pending"""
         try:
-            pending_status = StatusChoice.objects.get(code='PENDING')
+            pending_status = Resolver.id(StatusChoice, 'PENDING')
             updated = queryset.exclude(
                 status__code='CONVERTED').update(status=pending_status)
             self.message_user(request, f'{updated} leads marked as pending.')
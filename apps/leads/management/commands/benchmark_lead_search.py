@@ -0,0 +1,159 @@
+# apps/leads/management/commands/benchmark_lead_search.py
+
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework import filters
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import County
+from core.search import FullTextSearchFilter
+from leads.models import Lead
+from leads.models.lead_types import ElevationChoice, StatusChoice
+from leads.views import LeadViewSet
+from projects.models import ModelProject
+
+FIRST_NAMES = [
+    'Robert', 'Sarah', 'Michael', 'Jennifer', 'David', 'Maria', 'James', 'Lisa',
+    'Christopher', 'Amanda', 'Matthew', 'Carlos', 'Ashley', 'Brian', 'Michelle',
+    'John', 'Patricia', 'Daniel', 'Linda', 'Joseph', 'Barbara', 'Thomas', 'Susan',
+]
+LAST_NAMES = [
+    'Smith', 'Johnson', 'Davis', 'Williams', 'Brown', 'Garcia', 'Wilson', 'Miller',
+    'Taylor', 'Anderson', 'Thomas', 'Rodriguez', 'Martinez', 'Thompson', 'White',
+    'Harris', 'Clark', 'Lewis', 'Walker', 'Young', 'Allen', 'King', 'Wright',
+]
+COMPANY_SUFFIXES = ['Family Trust', 'Enterprises LLC', 'Realty', 'Properties Inc', 'Holdings']
+DOMAINS = ['gmail.com', 'yahoo.com', 'outlook.com', 'hotmail.com', 'email.com']
+
+
+class _Rollback(Exception):
+    """Desfaz a transação do benchmark"""
+
+
+class Command(BaseCommand):
+    """
+    Compara a busca de leads com o SearchFilter do DRF (icontains) e com o
+    FullTextSearchFilter (tsvector + pg_trgm, core.search)
+
+    Gera --rows leads sintéticos dentro de uma transação desfeita ao final:
+    nenhum dado é gravado. Requer PostgreSQL com as migrações de busca
+    aplicadas (leads 0009_search_indexes).
+
+    USAGE:
+    python manage.py benchmark_lead_search
+    python manage.py benchmark_lead_search --rows 500000 --term smith --term ohn --explain
+    """
+
+    help = 'Benchmark: busca de leads SearchFilter (icontains) vs. FullTextSearchFilter'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=500000,
+                            help='Quantidade de leads sintéticos (default: 500000)')
+        parser.add_argument('--term', action='append', dest='terms',
+                            help='Termo de busca (repetível; default: amostra variada)')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Execuções por termo; vale a melhor (default: 3)')
+        parser.add_argument('--explain', action='store_true',
+                            help='Mostra o plano (EXPLAIN ANALYZE) de cada busca')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('O benchmark de busca requer PostgreSQL')
+
+        refs = self._references()
+        terms = options['terms'] or ['smith', 'ohn', 'garcia@gmail', 'robert smith', 'PCL-0042']
+
+        try:
+            with transaction.atomic():
+                self.stdout.write(f"📦 Gerando {options['rows']} leads sintéticos...")
+                started = time.perf_counter()
+                self._populate(options['rows'], refs)
+                with connection.cursor() as cursor:
+                    cursor.execute(f'ANALYZE {Lead._meta.db_table}')
+                self.stdout.write(f'   {time.perf_counter() - started:.1f}s\n')
+
+                self._compare(terms, options['repeat'], options['explain'])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    def _references(self):
+        refs = {
+            'county': County.objects.first(),
+            'status': StatusChoice.objects.first(),
+            'elevation': ElevationChoice.objects.first(),
+            'house_model': ModelProject.objects.first(),
+        }
+        missing = [name for name, obj in refs.items() if obj is None]
+        if missing:
+            raise CommandError(
+                f"Dados de referência ausentes: {', '.join(missing)} "
+                f"(execute populate_leads_choices / populate_model_m01_cic)"
+            )
+        return refs
+
+    def _populate(self, rows, refs, batch_size=5000):
+        rng = random.Random(42)
+        for start in range(0, rows, batch_size):
+            batch = []
+            for index in range(start, min(start + batch_size, rows)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                batch.append(Lead(
+                    client_full_name=f'{first} {last}',
+                    client_company_name=f'{last} {rng.choice(COMPANY_SUFFIXES)}',
+                    client_email=f'{first}.{last}{index}@{rng.choice(DOMAINS)}'.lower(),
+                    client_phone=f'+1941555{index % 10000:04d}',
+                    parcel_id=f'PCL-{index:07d}',
+                    state='FL',
+                    has_hoa=False,
+                    contract_value=Decimal('250000.00'),
+                    **refs,
+                ))
+            Lead.objects.bulk_create(batch)
+
+    def _compare(self, terms, repeat, explain):
+        view = LeadViewSet()
+        factory = APIRequestFactory()
+        header = f"{'Termo':<16} {'SearchFilter':>14} {'FullText':>14} {'Linhas':>16}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        totals = [0.0, 0.0]
+        for term in terms:
+            request = Request(factory.get('/api/leads/', {'search': term}))
+            results = []
+            for backend in (filters.SearchFilter(), FullTextSearchFilter()):
+                queryset = backend.filter_queryset(request, Lead.objects.order_by('-created_at'), view)
+                results.append(self._measure(queryset, repeat))
+                if explain:
+                    self.stdout.write(f'\n[{type(backend).__name__}] {term}')
+                    self.stdout.write(queryset[:20].explain(analyze=True))
+            (baseline, base_count), (fulltext, fast_count) = results
+            totals[0] += baseline
+            totals[1] += fulltext
+            self.stdout.write(
+                f'{term:<16} {baseline * 1000:>11.1f} ms {fulltext * 1000:>11.1f} ms '
+                f'{base_count:>7} / {fast_count:<7}'
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'\n⚡ FullTextSearchFilter {totals[0] / max(totals[1], 1e-9):.1f}x mais rápido '
+            f'(count + primeira página de 20)'
+        ))
+
+    @staticmethod
+    def _measure(queryset, repeat):
+        """(melhor tempo de count + primeira página, total de linhas)"""
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            count = queryset.count()
+            list(queryset[:20])
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, count
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("leads", "0007_alter_lead_created_by"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="lead",
+            index=models.Index(
+                fields=["created_at"], name="leads_lead_created_302c6d_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,99 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_search_indexes"),
+        ("leads", "0008_lead_created_at_index"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.CombinedSearchVector(
+                        django.contrib.postgres.search.CombinedSearchVector(
+                            django.contrib.postgres.search.SearchVector(
+                                "client_full_name", config="simple", weight="A"
+                            ),
+                            "||",
+                            django.contrib.postgres.search.SearchVector(
+                                "client_company_name", config="simple", weight="B"
+                            ),
+                            django.contrib.postgres.search.SearchConfig("simple"),
+                        ),
+                        "||",
+                        django.contrib.postgres.search.SearchVector(
+                            "client_email", config="simple", weight="B"
+                        ),
+                        django.contrib.postgres.search.SearchConfig("simple"),
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "parcel_id", config="simple", weight="C"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("simple"),
+                ),
+                name="lead_search_vector_gin",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("client_full_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="lead_full_name_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("client_company_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="lead_company_name_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("client_email"),
+                    name="gin_trgm_ops",
+                ),
+                name="lead_email_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("client_phone"),
+                    name="gin_trgm_ops",
+                ),
+                name="lead_phone_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="lead",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("parcel_id"),
+                    name="gin_trgm_ops",
+                ),
+                name="lead_parcel_id_trgm",
+            ),
+        ),
+    ]
@@ -8,11 +8,21 @@ from phonenumber_field.modelfields import PhoneNumberField
 from simple_history.models import HistoricalRecords
 from projects.models.model_project import ModelProject
 from leads.models.lead_types import StatusChoice, ElevationChoice
+from core.search import search_vector_index, trigram_index
 
 
 User = get_user_model()
 
 
+# Campos do tsvector de busca (FullTextSearchFilter) e pesos de relevância
+LEAD_SEARCH_VECTOR_FIELDS = (
+    ('client_full_name', 'A'),
+    ('client_company_name', 'B'),
+    ('client_email', 'B'),
+    ('parcel_id', 'C'),
+)
+
+
 class Lead(models.Model):
     """
     Lead de cliente potencial - captura inicial de dados
@@ -185,6 +195,9 @@ class Lead(models.Model):
         help_text="When lead was converted to contract"
     )
     history = HistoricalRecords(inherit=True)
+
+    SEARCH_VECTOR_FIELDS = LEAD_SEARCH_VECTOR_FIELDS
+
     class Meta:
         # app_label = ''
         verbose_name = 'Lead'
@@ -194,6 +207,14 @@ class Lead(models.Model):
             models.Index(fields=['status', 'created_at']),
             models.Index(fields=['county', 'status']),
             models.Index(fields=['client_email']),
+            models.Index(fields=['created_at']),
+            # Busca (core.search.FullTextSearchFilter)
+            search_vector_index(LEAD_SEARCH_VECTOR_FIELDS, 'lead_search_vector_gin'),
+            trigram_index('client_full_name', 'lead_full_name_trgm'),
+            trigram_index('client_company_name', 'lead_company_name_trgm'),
+            trigram_index('client_email', 'lead_email_trgm'),
+            trigram_index('client_phone', 'lead_phone_trgm'),
+            trigram_index('parcel_id', 'lead_parcel_id_trgm'),
         ]
 
     def __str__(self):
@@ -257,9 +278,9 @@ class Lead(models.Model):
     def mark_as_converted(self, user=None):
         """Marca lead como convertido"""
         from django.utils import timezone
+        from core.resolver import Resolver
         try:
-            converted_status = StatusChoice.objects.get(code='CONVERTED')
-            self.status = converted_status
+            self.status_id = Resolver.id(StatusChoice, 'CONVERTED')
             self.converted_at = timezone.now()
             self.save()
         except StatusChoice.DoesNotExist:
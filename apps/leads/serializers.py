@@ -3,6 +3,7 @@ from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from core.models import County, HOA, Realtor
 from core.serializers import CountyChoiceSerializer, HOAChoiceSerializer
+from core.representation import FastRepresentationMixin
 from .models import Lead
 from leads.models.lead_types import StatusChoice
 
@@ -18,7 +19,15 @@ class CountyChoiceSerializer(serializers.ModelSerializer):
         ref_name = "LeadsCountyChoice"
 
 
-class LeadListSerializer(serializers.ModelSerializer):
+class StatusChoiceSerializer(serializers.ModelSerializer):
+    """Serializer compacto de StatusChoice (?expand=status)"""
+
+    class Meta:
+        model = StatusChoice
+        fields = ['id', 'code', 'name', 'color', 'is_active']
+
+
+class LeadListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     """
     Serializer para listagem de leads - campos resumidos
 
@@ -260,16 +269,9 @@ class LeadCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Criação customizada - definir campos default"""
         # Status inicial sempre PENDING - buscar instância de StatusChoice
-
-        try:
-            pending_status = StatusChoice.objects.get(
-                code='PENDING', is_active=True)
-            validated_data['status'] = pending_status
-        except StatusChoice.DoesNotExist:
-            # Fallback para o primeiro status ativo se PENDING não existir
-            first_status = StatusChoice.objects.filter(is_active=True).first()
-            if first_status:
-                validated_data['status'] = first_status
+        initial_status = self.get_initial_status()
+        if initial_status:
+            validated_data['status'] = initial_status
 
         # Created_by vem do context (request.user)
         request = self.context.get('request')
@@ -278,6 +280,15 @@ class LeadCreateSerializer(serializers.ModelSerializer):
 
         return super().create(validated_data)
 
+    @staticmethod
+    def get_initial_status():
+        """Status inicial de um lead novo (PENDING ou primeiro status ativo)"""
+        try:
+            return StatusChoice.objects.get(code='PENDING', is_active=True)
+        except StatusChoice.DoesNotExist:
+            # Fallback para o primeiro status ativo se PENDING não existir
+            return StatusChoice.objects.filter(is_active=True).first()
+
 
 class LeadUpdateSerializer(serializers.ModelSerializer):
     """
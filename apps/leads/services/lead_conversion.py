@@ -9,6 +9,7 @@ from django.contrib.auth import get_user_model
 from projects.models import Contract, Incorporation
 from projects.models.choice_types import PaymentMethod, StatusContract
 from leads.models.lead_types import StatusChoice
+from core.resolver import Resolver
 
 # Importar constantes
 from ..constants import (
@@ -156,9 +157,9 @@ class LeadConversionService:
             # ====================================
             # 4. ATUALIZAR LEAD STATUS
             # ====================================
-            converted_status = cls._get_converted_lead_status(result)
-            if converted_status:
-                lead.status = converted_status
+            converted_status_id = cls._get_converted_lead_status(result)
+            if converted_status_id:
+                lead.status_id = converted_status_id
                 lead.converted_at = timezone.now()
                 lead.save()
                 result.lead_updated = True
@@ -313,19 +314,16 @@ class LeadConversionService:
     
     @classmethod
     def _get_converted_lead_status(cls, result: ConversionResult):
-        """Busca status 'CONVERTED' para leads"""
+        """ID do status 'CONVERTED' para leads (core.resolver)"""
         
         try:
-            converted_status = StatusChoice.objects.filter(
-                code__in=['CONVERTED', 'CONVERTIDO'],
-                is_active=True
-            ).first()
+            converted_status_id = Resolver.first_id(StatusChoice, ['CONVERTED', 'CONVERTIDO'])
             
-            if not converted_status:
+            if not converted_status_id:
                 result.warnings.append("No 'CONVERTED' status found for leads")
                 return None
             
-            return converted_status
+            return converted_status_id
             
         except Exception as e:
             result.warnings.append(f"Error finding converted lead status: {str(e)}")
@@ -18,6 +18,7 @@ class LeadProcessingService:
         """
         from django.core.exceptions import ValidationError
         from leads.models.lead_types import StatusChoice
+        from core.resolver import Resolver
 
         # Validações
         if lead.is_realtor and not realtor_obj:
@@ -44,8 +45,7 @@ class LeadProcessingService:
 
         # Mudar status
         try:
-            qualified_status = StatusChoice.objects.get(code='QUALIFIED')
-            lead.status = qualified_status
+            lead.status_id = Resolver.id(StatusChoice, 'QUALIFIED')
         except StatusChoice.DoesNotExist:
             raise ValidationError("QUALIFIED status not found in database")
 
@@ -1,12 +1,28 @@
-from django.test import TestCase
+import threading
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from core.models import County, Realtor, HOA
+from rest_framework.exceptions import Throttled
+from core.models import County, Realtor, HOA, SearchDocument
 from projects.models.choice_types import PaymentMethod
 from projects.models import Incorporation
 from .models import Lead
+from .models.lead_types import StatusChoice
+from .views import get_status_ids_by_codes
+from core.resolver import RESOLVER_TABLE_TTL, Resolver
+from core.search_documents import schedule_reindex
+from core.throttling import (
+    CONCURRENCY_RETRY_AFTER, ConcurrencyLimiter, PublicFormRateThrottle, ReferenceDataRateThrottle,
+    limit_concurrency,
+)
 from .constants import ConversionStatus
 
 User = get_user_model()
@@ -190,14 +206,14 @@ class LeadAPITests(APITestCase):
         
     def test_export_leads(self):
         """Teste para exportação de leads"""
-        response = self.client.get(f"{self.export_url}?format=csv")
+        response = self.client.get(f"{self.export_url}?export_format=csv")
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response['Content-Type'], 'text/csv')
         self.assertTrue('attachment; filename="leads_export.csv"' in response['Content-Disposition'])
         
         # Testar formato Excel
-        response = self.client.get(f"{self.export_url}?format=excel")
+        response = self.client.get(f"{self.export_url}?export_format=excel")
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
@@ -285,9 +301,327 @@ class LeadAPITests(APITestCase):
         self.assertTrue('related_by_contact' in response.data)
         self.assertEqual(response.data['related_by_contact']['count'], 1)
         
+    def test_status_resolver(self):
+        """Teste para o resolver code -> id (zero queries depois de aquecido)"""
+        cache.clear()
+        pending = StatusChoice.objects.create(code='PENDING', name='Pending', order=1)
+        qualified = StatusChoice.objects.create(code='QUALIFIED', name='Qualified', order=2)
+        StatusChoice.objects.create(code='CONVERTED', name='Converted', order=3)
+
+        self.assertEqual(get_status_ids_by_codes(['PENDING', 'QUALIFIED']), [pending.id, qualified.id])
+        with CaptureQueriesContext(connection) as queries:
+            get_status_ids_by_codes(['PENDING', 'QUALIFIED'])
+            Resolver.id(StatusChoice, 'CONVERTED')
+        self.assertEqual(len(queries), 0)
+
+        # Lista com filtro por status não faz lookup extra
+        with CaptureQueriesContext(connection) as plain:
+            self.client.get(self.list_url)
+        with CaptureQueriesContext(connection) as filtered:
+            self.client.get(f'{self.list_url}?convertible=true')
+        self.assertLessEqual(len(filtered), len(plain))
+
+        # Alteração invalida o mapa
+        qualified.is_active = False
+        qualified.save()
+        self.assertEqual(get_status_ids_by_codes(['PENDING', 'QUALIFIED']), [pending.id])
+        with self.assertRaises(StatusChoice.DoesNotExist):
+            Resolver.id(StatusChoice, 'MISSING')
+
+        # Alteração sem signal (update()) vale após RESOLVER_TABLE_TTL, em qualquer processo
+        StatusChoice.objects.filter(pk=pending.pk).update(is_active=False)
+        self.assertEqual(get_status_ids_by_codes(['PENDING']), [pending.id])
+        expired = time.monotonic() + RESOLVER_TABLE_TTL + 1
+        with mock.patch('core.resolver.time.monotonic', return_value=expired):
+            self.assertEqual(get_status_ids_by_codes(['PENDING']), [])
+
+    def test_search_leads(self):
+        """Teste para busca (FullTextSearchFilter): parcial, vários termos e relevância"""
+        company_match = Lead.objects.get(pk=self.lead.pk)
+        company_match.pk = None
+        company_match.client_full_name = 'Another Person'
+        company_match.client_company_name = 'Test Client Holdings'
+        company_match.client_email = 'another@example.com'
+        company_match.save()
+
+        # Busca parcial continua funcionando (trigram / icontains)
+        response = self.client.get(self.list_url, {'search': 'lient'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+        # Todos os termos precisam casar
+        response = self.client.get(self.list_url, {'search': 'another holdings'})
+        self.assertEqual([lead['id'] for lead in response.data['results']], [company_match.pk])
+
+        # Match no nome (peso A) vem antes do match na empresa (peso B)
+        if connection.vendor == 'postgresql':
+            response = self.client.get(self.list_url, {'search': 'test client'})
+            self.assertEqual(
+                [lead['id'] for lead in response.data['results']],
+                [self.lead.pk, company_match.pk]
+            )
+
+        # ?ordering= prevalece sobre a relevância
+        response = self.client.get(self.list_url, {'search': 'client', 'ordering': 'created_at'})
+        self.assertEqual(
+            [lead['id'] for lead in response.data['results']],
+            [self.lead.pk, company_match.pk]
+        )
+
+    def test_global_search(self):
+        """Teste para a busca global (GET /api/search/) com filtro de permissão"""
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lead.parcel_id = '12-34-56-7890'
+            self.lead.save()
+        document = SearchDocument.objects.get(entity_type='lead', object_id=self.lead.pk)
+        self.assertEqual(document.participant_ids, [self.user.pk])
+
+        search_url = reverse('core:search')
+        # Criador do lead (participante) encontra por prefixo de nome e de parcel
+        for query in ('test cli', '12-34-5', '1234'):
+            response = self.client.get(search_url, {'q': query})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                [(item['type'], item['id']) for item in response.data['results']],
+                [('lead', self.lead.pk)],
+                query
+            )
+
+        # Usuário sem permissão e sem participação não vê o lead
+        other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        self.client.force_authenticate(user=other)
+        response = self.client.get(search_url, {'q': 'test'})
+        self.assertEqual(response.data['results'], [])
+
+        other.is_staff = True
+        other.save()
+        response = self.client.get(search_url, {'q': 'test', 'types': 'lead'})
+        self.assertEqual(len(response.data['results']), 1)
+        response = self.client.get(search_url, {'q': 'test', 'types': 'unknown'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Remoção apaga o documento
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.filter(pk=self.lead.pk).first().delete()
+        self.assertFalse(SearchDocument.objects.filter(entity_type='lead', object_id=self.lead.pk).exists())
+
+    def test_reindex_resolves_dependents_per_batch(self):
+        """Teste para schedule_reindex: contratos dos leads resolvidos em uma query por lote"""
+        leads = [self.lead]
+        for i in range(5):
+            lead = Lead.objects.get(pk=self.lead.pk)
+            lead.pk = None
+            lead.client_email = f'batch{i}@example.com'
+            lead.save()
+            leads.append(lead)
+
+        with self.captureOnCommitCallbacks(), CaptureQueriesContext(connection) as queries:
+            schedule_reindex(Lead, leads)
+        self.assertEqual(len(queries), 1)
+
     def test_history_endpoint(self):
         """Teste para endpoint de histórico"""
         response = self.client.get(reverse('leads:lead-history', kwargs={'pk': self.lead.pk}))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         # O formato exato da resposta depende da implementação do histórico
+
+
+class ReferenceDataCacheTests(APITestCase):
+    """
+    Testes para o cache versionado de choices/form-data
+    """
+
+    def setUp(self):
+        """Configuração inicial para os testes"""
+        cache.clear()
+
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='adminpassword'
+        )
+        self.status_choice = StatusChoice.objects.create(
+            code='PENDING',
+            name='Pending',
+            order=1,
+            is_active=True
+        )
+        self.county = County.objects.create(name='Orange', state='FL')
+
+        self.choices_url = reverse('leads:lead-choices')
+        self.form_data_url = reverse('leads:lead-form-data')
+
+    def test_choices_are_cached(self):
+        """Teste para resposta em cache (sem queries) e ETag"""
+        response = self.client.get(self.choices_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get(self.choices_url)
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(cached.content, response.content)
+
+        response = self.client.get(self.choices_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_admin_edits_invalidate_cache(self):
+        """Teste para invalidação ao editar/remover pelo admin"""
+        response = self.client.get(self.choices_url)
+        etag = response['ETag']
+        self.assertEqual(response.json()['status_choices'][0]['name'], 'Pending')
+        self.client.get(self.form_data_url)
+
+        admin_client = Client()
+        admin_client.force_login(self.admin)
+        response = admin_client.post(
+            reverse('admin:leads_statuschoice_change', args=[self.status_choice.pk]),
+            {
+                'code': 'PENDING',
+                'name': 'Awaiting review',
+                'description': '',
+                'icon': '',
+                'color': '',
+                'order': 1,
+                'is_active': 'on',
+            }
+        )
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client.get(self.choices_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['status_choices'][0]['name'], 'Awaiting review')
+
+        response = admin_client.post(
+            reverse('admin:core_county_delete', args=[self.county.pk]),
+            {'post': 'yes'}
+        )
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client.get(self.form_data_url)
+        self.assertEqual(response.json()['counties'], [])
+
+
+class AdmissionControlTests(APITestCase):
+    """
+    Testes para throttles e limite de concorrência (core.throttling)
+    """
+
+    def setUp(self):
+        """Configuração inicial para os testes"""
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpassword'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_anonymous_reference_data_is_throttled(self):
+        """Teste para throttle por IP do choices público"""
+        anonymous = APIClient()
+        with mock.patch.object(ReferenceDataRateThrottle, 'rate', '2/min', create=True):
+            for _ in range(2):
+                response = anonymous.get(reverse('leads:lead-choices'))
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+            response = anonymous.get(reverse('leads:lead-choices'))
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+
+            # Outro IP tem a própria cota
+            response = anonymous.get(reverse('leads:lead-choices'), REMOTE_ADDR='10.0.0.2')
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_anonymous_lead_create_is_throttled(self):
+        """Teste para throttle por IP do POST /api/leads/ público"""
+        anonymous = APIClient()
+        with mock.patch.object(PublicFormRateThrottle, 'rate', '2/min', create=True):
+            for _ in range(2):
+                response = anonymous.post(reverse('leads:lead-list'), {}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+            response = anonymous.post(reverse('leads:lead-list'), {}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+
+    def test_export_rejected_while_slots_are_busy(self):
+        """Teste para 429 + Retry-After com exportações em andamento"""
+        limiter = ConcurrencyLimiter('export')
+        export_url = f"{reverse('leads:lead-export')}?export_format=csv"
+
+        held = [limiter.acquire() for _ in range(limiter.limit)]
+        self.assertTrue(all(held))
+        try:
+            response = self.client.get(export_url)
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(response['Retry-After'], str(CONCURRENCY_RETRY_AFTER))
+        finally:
+            for slot in held:
+                limiter.release(slot)
+
+        response = self.client.get(export_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(limiter.in_flight(), 0)
+
+    def test_leaked_slot_expires_under_traffic(self):
+        """Teste para vaga nunca liberada: expira no TTL mesmo com chamadas chegando"""
+        limiter = ConcurrencyLimiter('export')
+        with mock.patch('core.throttling.CONCURRENCY_SLOT_TIMEOUT', 1):
+            leaked = [limiter.acquire() for _ in range(limiter.limit)]
+            self.assertTrue(all(leaked))
+
+            deadline = time.monotonic() + 3
+            slot = limiter.acquire()
+            while slot is None and time.monotonic() < deadline:
+                time.sleep(0.1)
+                slot = limiter.acquire()
+
+        self.assertIsNotNone(slot)
+        # O dono original não libera a vaga que agora é de outro
+        limiter.release(leaked[0])
+        self.assertEqual(limiter.in_flight(), 1)
+        limiter.release(slot)
+        self.assertEqual(limiter.in_flight(), 0)
+
+    def test_concurrent_calls_are_capped(self):
+        """Teste com chamadas simultâneas em threads: no máximo `limit` executam"""
+        limiter = ConcurrencyLimiter('stats')
+        callers = limiter.limit + 3
+        arrived = threading.Barrier(callers)
+        running = threading.Semaphore(0)
+        proceed = threading.Event()
+        outcomes = []
+
+        @limit_concurrency('stats')
+        def expensive_view():
+            running.release()
+            proceed.wait(timeout=5)
+            return 'ok'
+
+        def call():
+            arrived.wait(timeout=5)
+            try:
+                outcomes.append(expensive_view())
+            except Throttled as exc:
+                outcomes.append(exc.wait)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for _ in range(limiter.limit):
+            self.assertTrue(running.acquire(timeout=5))
+        # Rejeitadas respondem na hora, sem esperar as que estão executando
+        deadline = time.monotonic() + 5
+        while len(outcomes) < callers - limiter.limit and time.monotonic() < deadline:
+            time.sleep(0.01)
+        proceed.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(outcomes.count('ok'), limiter.limit)
+        self.assertEqual(outcomes.count(CONCURRENCY_RETRY_AFTER), callers - limiter.limit)
+        self.assertEqual(limiter.in_flight(), 0)
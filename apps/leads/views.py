@@ -16,7 +16,19 @@ from django.utils import timezone
 from django.http import HttpResponse
 from datetime import timedelta
 from core.models import County, Realtor, HOA
+from core.bulk import BulkWriteMixin
+from core.conditional import ConditionalGetMixin
+from core.detail_cache import DetailCacheMixin
+from core.eager_loading import EagerLoadingMixin
+from core.mixins import SparseFieldsetMixin
 from core.pagination import CustomPageNumberPagination
+from core.reference_cache import cached_reference_data
+from core.search import FullTextSearchFilter
+from core.serializers import RealtorChoiceSerializer
+from core.throttling import (
+    ExportRateThrottle, PublicFormRateThrottle, ReferenceDataRateThrottle, StatsRateThrottle, limit_concurrency
+)
+from core.resolver import Resolver
 from projects.models.choice_types import PaymentMethod
 from projects.models import Incorporation
 from projects.models.model_project import ModelProject
@@ -28,7 +40,8 @@ from .serializers import (
     LeadCreateSerializer,
     LeadUpdateSerializer,
     LeadConversionSerializer,
-    CountyChoiceSerializer
+    CountyChoiceSerializer,
+    StatusChoiceSerializer
 )
 from .constants import ConversionStatus
 from .services import LeadConversionService, LeadProcessingService
@@ -38,11 +51,9 @@ from core.swagger_tags import API_TAGS
 
 
 def get_status_ids_by_codes(codes):
-    """Helper function to get StatusChoice IDs by codes"""
+    """Helper function to get active StatusChoice IDs by codes (core.resolver)"""
     from leads.models.lead_types import StatusChoice
-    if isinstance(codes, str):
-        codes = [codes]
-    return list(StatusChoice.objects.filter(code__in=codes, is_active=True).values_list('id', flat=True))
+    return Resolver.ids(StatusChoice, codes, active_only=True)
 
 
 def get_status_id_by_code(code):
@@ -83,7 +94,7 @@ class HasLeadConversionPermission(permissions.BasePermission):
         return request.user.has_perm('leads.convert_lead')
 
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(BulkWriteMixin, DetailCacheMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento completo de leads
 
@@ -95,12 +106,19 @@ class LeadViewSet(viewsets.ModelViewSet):
     - DELETE /api/leads/{id}/ - Remover lead
     - POST /api/leads/{id}/convert/ - Converter para contrato
     - GET /api/leads/form-data/ - Dados para formulário
+    - POST /api/leads/bulk/ - Criar leads em lote
+    - PATCH /api/leads/bulk/ - Atualizar leads em lote
     """
 
     queryset = Lead.objects.select_related('county', 'created_by').all()
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
+                       filters.OrderingFilter, FullTextSearchFilter]
     pagination_class = CustomPageNumberPagination
+    expandable_fields = {
+        'county': CountyChoiceSerializer,
+        'realtor': RealtorChoiceSerializer,
+        'status': StatusChoiceSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -137,13 +155,19 @@ class LeadViewSet(viewsets.ModelViewSet):
         """
         Permissões por ação:
         - create: Público (formulário web)
-        - form-data: Público (dados para formulário)
+        - form-data / choices: Público (dados para formulário)
         - Outras: Autenticado
         """
-        if self.action in ['create', 'form_data']:
+        if self.action in ['create', 'form_data', 'choices']:
             return [AllowAny()]
         return [IsAuthenticated()]
 
+    def get_throttles(self):
+        """create é público (formulário web): throttle public_form por IP/usuário"""
+        if self.action == 'create':
+            return [PublicFormRateThrottle()]
+        return super().get_throttles()
+
     @swagger_auto_schema(
         tags=[API_TAGS['LEADS']],
         operation_summary="Listar leads",
@@ -172,7 +196,8 @@ class LeadViewSet(viewsets.ModelViewSet):
         request_body=LeadCreateSerializer,
         responses={
             201: LeadDetailSerializer(),
-            400: 'Dados inválidos'
+            400: 'Dados inválidos',
+            429: 'Muitas requisições (throttle public_form)'
         }
     )
     def create(self, request, *args, **kwargs):
@@ -323,6 +348,18 @@ class LeadViewSet(viewsets.ModelViewSet):
 
         return queryset
 
+    def get_bulk_queryset(self):
+        """Relações lidas por validate_status() e Lead.clean() no PATCH em lote"""
+        return self.get_queryset().select_related('status', 'realtor', 'hoa__county')
+
+    def get_bulk_create_defaults(self):
+        """Mesmos defaults de LeadCreateSerializer.create(): status inicial + created_by"""
+        defaults = {'created_by': self.request.user}
+        initial_status = LeadCreateSerializer.get_initial_status()
+        if initial_status:
+            defaults['status'] = initial_status
+        return defaults
+
     def perform_create(self, serializer):
         """
         Customizar criação - definir created_by
@@ -385,7 +422,9 @@ class LeadViewSet(viewsets.ModelViewSet):
         operation_description="Retorna dados necessários para o formulário de leads",
         responses={200: 'Dados para formulário'}
     )
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny],
+            throttle_classes=[ReferenceDataRateThrottle])
+    @cached_reference_data()
     def form_data(self, request):
         """
         Endpoint para obter dados necessários para formulário
@@ -456,7 +495,9 @@ class LeadViewSet(viewsets.ModelViewSet):
         operation_description="Retorna todas as opções de choices para formulários de leads",
         responses={200: 'Choices disponíveis para leads'}
     )
-    @action(detail=False, methods=['get'], permission_classes=[AllowAny])
+    @action(detail=False, methods=['get'], permission_classes=[AllowAny],
+            throttle_classes=[ReferenceDataRateThrottle])
+    @cached_reference_data()
     def choices(self, request):
         """
         Endpoint para obter todas as choices disponíveis para leads
@@ -700,7 +741,8 @@ class LeadViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de leads",
         responses={200: 'Estatísticas de leads'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de leads
@@ -1076,7 +1118,8 @@ class LeadViewSet(viewsets.ModelViewSet):
         operation_description="Retorna dados para o dashboard de leads",
         responses={200: 'Dashboard de leads'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def dashboard(self, request):
         """
         Dashboard com métricas e gráficos para leads
@@ -1483,21 +1526,23 @@ class LeadViewSet(viewsets.ModelViewSet):
         Exporta leads para CSV ou Excel
         
         PARÂMETROS DISPONÍVEIS:
-        - format=csv|excel (default: csv)
+        - export_format=csv|excel (default: csv); não usar ?format=, que o
+          DRF consome na negociação de conteúdo (404 antes da view)
         - include_all=true|false (default: false)
         - Todos os filtros da listagem também funcionam
         
         EXEMPLOS:
-        - /api/leads/export/?format=csv&include_all=true
-        - /api/leads/export/?format=csv&status=PENDING
-        - /api/leads/export/?format=csv&county=1&include_all=true
+        - /api/leads/export/?export_format=csv&include_all=true
+        - /api/leads/export/?export_format=csv&status=PENDING
+        - /api/leads/export/?export_format=csv&county=1&include_all=true
         """,
         responses={
             200: 'Arquivo CSV/Excel para download',
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """Export corrigido - tratando objetos relacionais"""
         try:
@@ -1505,10 +1550,10 @@ class LeadViewSet(viewsets.ModelViewSet):
             queryset = self.filter_queryset(self.get_queryset())
 
             # Determinar formato
-            export_format = request.query_params.get('format', 'csv').lower()
+            export_format = request.query_params.get('export_format', 'csv').lower()
             if export_format not in ['csv', 'excel']:
                 return Response(
-                    {'error': 'Invalid format. Valid options: csv, excel'},
+                    {'error': 'Invalid export_format. Valid options: csv, excel'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
@@ -0,0 +1,125 @@
+# apps/projects/management/commands/benchmark_bulk_tasks.py
+
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from projects.models import PhaseProject
+from projects.views import TaskProjectViewSet
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    """Desfaz a transação do benchmark"""
+
+
+class Command(BaseCommand):
+    """
+    Compara a criação de tarefas linha a linha (POST /tasks/) com o
+    endpoint em lote (POST /tasks/bulk/)
+
+    Tudo roda dentro de transações desfeitas ao final: nenhum dado é gravado.
+
+    USAGE:
+    python manage.py benchmark_bulk_tasks --phase 12
+    python manage.py benchmark_bulk_tasks --phase 12 --rows 1000 --user 1
+    """
+
+    help = 'Benchmark: criação de TaskProject por linha vs. POST /tasks/bulk/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--phase', type=int, required=True,
+                            help='ID da PhaseProject que receberá as tarefas')
+        parser.add_argument('--rows', type=int, default=1000,
+                            help='Quantidade de tarefas (default: 1000)')
+        parser.add_argument('--user', type=int,
+                            help='ID do usuário autenticado (default: primeiro superuser)')
+
+    def handle(self, *args, **options):
+        try:
+            phase = PhaseProject.objects.select_related('model_phase').get(pk=options['phase'])
+        except PhaseProject.DoesNotExist:
+            raise CommandError(f"PhaseProject {options['phase']} não encontrada")
+
+        model_task = phase.model_phase.tasks.first() if phase.model_phase_id else None
+        if model_task is None:
+            raise CommandError('A fase precisa de um ModelPhase com ao menos uma ModelTask')
+
+        if options['user']:
+            user = User.objects.get(pk=options['user'])
+        else:
+            user = User.objects.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError('Nenhum usuário disponível (use --user)')
+
+        payload = self._payload(phase, model_task, options['rows'])
+        self.stdout.write(f'📦 {len(payload)} tarefas na fase {phase.pk}\n')
+
+        per_row = self._run(self._per_row, payload, user)
+        bulk = self._run(self._bulk, payload, user)
+
+        for label, (elapsed, queries) in (('Por linha', per_row), ('Bulk', bulk)):
+            self.stdout.write(
+                f'{label:<10} {elapsed:>8.2f}s  {queries:>7} queries  '
+                f'{elapsed / len(payload) * 1000:>7.2f} ms/linha'
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'\n⚡ Bulk {per_row[0] / bulk[0]:.1f}x mais rápido, '
+            f'{per_row[1] - bulk[1]} queries a menos'
+        ))
+
+    def _payload(self, phase, model_task, rows):
+        start = (phase.tasks.aggregate(last=Max('execution_order'))['last'] or 0) + 1
+        return [
+            {
+                'phase_project': phase.pk,
+                'model_task': model_task.pk,
+                'task_name': f'Benchmark task {index}',
+                'task_code': f'BENCH-{index:05d}',
+                'task_description': 'Benchmark',
+                'execution_order': start + index,
+                'estimated_duration_hours': str(Decimal('1.00')),
+            }
+            for index in range(rows)
+        ]
+
+    def _run(self, runner, payload, user):
+        """(segundos, queries) de uma execução desfeita ao final"""
+        elapsed = queries = 0
+        try:
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    runner(payload, user)
+                    elapsed = time.perf_counter() - started
+                queries = len(captured)
+                raise _Rollback
+        except _Rollback:
+            pass
+        return elapsed, queries
+
+    def _per_row(self, payload, user):
+        factory = APIRequestFactory()
+        view = TaskProjectViewSet.as_view({'post': 'create'})
+        for item in payload:
+            request = factory.post('/api/projects/tasks/', item, format='json')
+            force_authenticate(request, user=user)
+            response = view(request)
+            if response.status_code != 201:
+                raise CommandError(f'Falha no POST por linha: {response.data}')
+
+    def _bulk(self, payload, user):
+        factory = APIRequestFactory()
+        view = TaskProjectViewSet.as_view({'post': 'bulk'})
+        request = factory.post('/api/projects/tasks/bulk/', payload, format='json')
+        force_authenticate(request, user=user)
+        response = view(request)
+        if response.status_code != 201:
+            raise CommandError(f'Falha no POST em lote: {response.data}')
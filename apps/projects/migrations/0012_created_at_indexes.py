@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0011_remove_contractproject_data_atualizacao_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="incorporation",
+            index=models.Index(
+                fields=["created_at"], name="projects_in_created_29d942_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["created_at"], name="projects_pr_created_6b02e3_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="contact",
+            index=models.Index(
+                fields=["created_at"], name="projects_co_created_2450de_idx"
+            ),
+        ),
+    ]
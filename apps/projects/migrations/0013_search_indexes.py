@@ -0,0 +1,65 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("core", "0002_search_indexes"),
+        ("projects", "0012_created_at_indexes"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.SearchVector(
+                        "project_name", config="simple", weight="A"
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "address", config="simple", weight="B"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("simple"),
+                ),
+                name="project_search_vector_gin",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("project_name"),
+                    name="gin_trgm_ops",
+                ),
+                name="project_name_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="project",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("address"),
+                    name="gin_trgm_ops",
+                ),
+                name="project_address_trgm",
+            ),
+        ),
+        django.contrib.postgres.operations.AddIndexConcurrently(
+            model_name="contract",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("contract_number"),
+                    name="gin_trgm_ops",
+                ),
+                name="contract_number_trgm",
+            ),
+        ),
+    ]
@@ -132,6 +132,7 @@ class Contact(models.Model):
             models.Index(fields=['project']),
             models.Index(fields=['owner']),
             models.Index(fields=['is_active']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
@@ -88,6 +88,7 @@ class Incorporation(models.Model):
             models.Index(fields=['incorporation_status']),
             models.Index(fields=['county']),
             models.Index(fields=['launch_date']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
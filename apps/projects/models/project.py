@@ -14,9 +14,16 @@ from projects.models.phase_project import PhaseProject
 from projects.models.model_phase import ModelPhase
 from projects.models.model_task import ModelTask
 from projects.models.task_project import TaskProject
+from core.search import search_vector_index, trigram_index
 
 User = get_user_model()
 
+# Campos do tsvector de busca (FullTextSearchFilter) e pesos de relevância
+PROJECT_SEARCH_VECTOR_FIELDS = (
+    ('project_name', 'A'),
+    ('address', 'B'),
+)
+
 
 class Project(models.Model):
     """
@@ -162,9 +169,18 @@ class Project(models.Model):
     )
     history = HistoricalRecords(inherit=True)
 
+    SEARCH_VECTOR_FIELDS = PROJECT_SEARCH_VECTOR_FIELDS
+
     class Meta:
        # abstract = True  # ← Classe abstrata!
         ordering = ['incorporation']
+        indexes = [
+            models.Index(fields=['created_at']),
+            # Busca (core.search.FullTextSearchFilter)
+            search_vector_index(PROJECT_SEARCH_VECTOR_FIELDS, 'project_search_vector_gin'),
+            trigram_index('project_name', 'project_name_trgm'),
+            trigram_index('address', 'project_address_trgm'),
+        ]
 
     def __str__(self):
         return f"{self.project_name} ({self.get_type_display()}) - {self.incorporation.name if self.incorporation else 'No Incorporation'} - "
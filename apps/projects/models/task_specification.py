@@ -146,10 +146,14 @@ class TaskSpecification(models.Model):
     
     def save(self, *args, **kwargs):
         """Auto-calculate total cost"""
-        if (self.actual_unit_cost is not None and self.actual_unit_cost > 0 and 
+        self.calculate_actual_total_cost()
+        super().save(*args, **kwargs)
+
+    def calculate_actual_total_cost(self):
+        """Total cost from actual quantity x unit cost (also used by bulk writes)"""
+        if (self.actual_unit_cost is not None and self.actual_unit_cost > 0 and
             self.actual_quantity_used is not None):
             self.actual_total_cost = self.actual_quantity_used * self.actual_unit_cost
-        super().save(*args, **kwargs)
     
     @property
     def quantity_variance(self):
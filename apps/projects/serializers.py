@@ -1,11 +1,16 @@
 # apps/projects/serializers.py
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from core.bulk import BULK_MAX_ITEMS
+from core.eager_loading import eager_load
+from core.representation import FastRepresentationMixin
 from .models.incorporation import Incorporation
 from ..contracts.models.contract import Contract
 from .models.project import Project
 from .models.phase_project import PhaseProject
 from .models.task_project import TaskProject
+from .models.task_resource import TaskResource
+from .models.task_specification import TaskSpecification
 from .models.contact import Contact
 from ..contracts.models.contract_owner import ContractOwner
 from .models.contract_project import ContractProject
@@ -79,12 +84,32 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'full_name', 'is_active']
 
+    @eager_load()
     def get_full_name(self, obj):
         return obj.get_full_name() or obj.username
 
 
+# Serializers compactos para ?expand= (SparseFieldsetMixin.expandable_fields)
+class IncorporationSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Incorporation
+        fields = [
+            'id', 'name', 'incorporation_type', 'incorporation_status',
+            'county', 'launch_date', 'is_active'
+        ]
+
+
+class ProjectSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        fields = [
+            'id', 'project_name', 'incorporation', 'status_project',
+            'address', 'completion_percentage', 'expected_delivery_date'
+        ]
+
+
 # Serializers para Incorporation
-class IncorporationListSerializer(serializers.ModelSerializer):
+class IncorporationListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     incorporation_type_name = serializers.CharField(
         source='incorporation_type.name', read_only=True)
     incorporation_status_name = serializers.CharField(
@@ -224,7 +249,7 @@ class ContractProjectSerializer(serializers.ModelSerializer):
 
 
 # Serializers para Project
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     incorporation_name = serializers.CharField(
         source='incorporation.name', read_only=True)
     model_project_name = serializers.CharField(
@@ -280,7 +305,7 @@ class ProjectCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 # Serializers para PhaseProject
-class PhaseProjectListSerializer(serializers.ModelSerializer):
+class PhaseProjectListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     project_name = serializers.CharField(
         source='project.project_name', read_only=True)
     model_phase_name = serializers.CharField(
@@ -339,7 +364,7 @@ class PhaseProjectCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 # Serializers para TaskProject
-class TaskProjectListSerializer(serializers.ModelSerializer):
+class TaskProjectListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     phase_project_name = serializers.CharField(
         source='phase_project.phase_name', read_only=True)
     model_task_name = serializers.CharField(
@@ -404,8 +429,44 @@ class TaskProjectCreateUpdateSerializer(serializers.ModelSerializer):
         ]
 
 
+class TaskBatchTransitionSerializer(serializers.Serializer):
+    """
+    Serializer para transição de status de várias tarefas
+
+    USAGE:
+    - POST /api/projects/tasks/batch-transition/
+    """
+
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        help_text="IDs das tarefas"
+    )
+    target_status = serializers.ChoiceField(
+        choices=[
+            ('IN_PROGRESS', 'In Progress'),
+            ('PAUSED', 'Paused'),
+            ('COMPLETED', 'Completed'),
+        ]
+    )
+    reason = serializers.CharField(
+        required=False,
+        allow_blank=True,
+        max_length=500,
+        help_text="Motivo (usado ao pausar)"
+    )
+
+    def validate_task_ids(self, value):
+        """Remove duplicatas mantendo a ordem e limita o tamanho do lote"""
+        task_ids = list(dict.fromkeys(value))
+        if len(task_ids) > BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                f'Too many tasks: {len(task_ids)} (max {BULK_MAX_ITEMS}).')
+        return task_ids
+
+
 # Serializers para Contact
-class ContactListSerializer(serializers.ModelSerializer):
+class ContactListSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     contact_name = serializers.CharField(
         source='contact.get_full_name', read_only=True)
     contact_email = serializers.CharField(
@@ -427,6 +488,7 @@ class ContactListSerializer(serializers.ModelSerializer):
             'created_by', 'created_by_name', 'created_at'
         ]
 
+    @eager_load('owner__client')
     def get_owner_name(self, obj):
         if obj.owner and obj.owner.client:
             return obj.owner.client.get_full_name()
@@ -1319,15 +1381,104 @@ class ContractProjectCreateUpdateSerializer(serializers.ModelSerializer):
 
 
 # =====================================================
-# TASK RESOURCE SERIALIZERS (ESTRUTURA PREPARADA)
+# TASK RESOURCE SERIALIZERS
 # =====================================================
 
-# Estes serializers serão implementados quando o modelo TaskResource for criado
-# class TaskResourceListSerializer(serializers.ModelSerializer):
-#     pass
+class TaskResourceListSerializer(serializers.ModelSerializer):
+    model_task_name = serializers.CharField(
+        source='model_task.task_name', read_only=True)
+    resource_type_display = serializers.CharField(
+        source='get_resource_type_display', read_only=True)
+    estimated_total_cost = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = TaskResource
+        fields = [
+            'id', 'model_task', 'model_task_name', 'resource_name',
+            'resource_type', 'resource_type_display', 'required_quantity',
+            'unit_measure', 'estimated_unit_cost', 'estimated_total_cost',
+            'is_mandatory', 'is_active', 'created_at'
+        ]
 
-# class TaskResourceDetailSerializer(serializers.ModelSerializer):
-#     pass
 
-# class TaskResourceCreateUpdateSerializer(serializers.ModelSerializer):
-#     pass
+class TaskResourceDetailSerializer(serializers.ModelSerializer):
+    model_task = ModelTaskListSerializer(read_only=True)
+    created_by = UserSerializer(read_only=True)
+    resource_type_display = serializers.CharField(
+        source='get_resource_type_display', read_only=True)
+    estimated_total_cost = serializers.DecimalField(
+        max_digits=14, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = TaskResource
+        fields = [
+            'id', 'model_task', 'resource_name', 'resource_type',
+            'resource_type_display', 'required_quantity', 'unit_measure',
+            'estimated_unit_cost', 'estimated_total_cost', 'is_mandatory',
+            'is_active', 'created_by', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['created_by', 'created_at', 'updated_at']
+
+
+class TaskResourceCreateUpdateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskResource
+        fields = [
+            'model_task', 'resource_name', 'resource_type',
+            'required_quantity', 'unit_measure', 'estimated_unit_cost',
+            'is_mandatory', 'is_active'
+        ]
+
+
+# =====================================================
+# TASK SPECIFICATION SERIALIZERS
+# =====================================================
+
+class TaskSpecificationListSerializer(serializers.ModelSerializer):
+    task_project_name = serializers.CharField(
+        source='task_project.task_name', read_only=True)
+    task_resource_name = serializers.CharField(
+        source='task_resource.resource_name', read_only=True)
+    specification_status_display = serializers.CharField(
+        source='get_specification_status_display', read_only=True)
+
+    class Meta:
+        model = TaskSpecification
+        fields = [
+            'id', 'task_project', 'task_project_name', 'task_resource',
+            'task_resource_name', 'planned_quantity', 'actual_quantity_used',
+            'actual_unit_cost', 'actual_total_cost', 'specification_status',
+            'specification_status_display', 'supplier_used', 'created_at'
+        ]
+
+
+class TaskSpecificationDetailSerializer(serializers.ModelSerializer):
+    task_project = TaskProjectListSerializer(read_only=True)
+    task_resource = TaskResourceListSerializer(read_only=True)
+    created_by = UserSerializer(read_only=True)
+    specification_status_display = serializers.CharField(
+        source='get_specification_status_display', read_only=True)
+
+    class Meta:
+        model = TaskSpecification
+        fields = [
+            'id', 'task_project', 'task_resource', 'usage_description',
+            'planned_quantity', 'actual_quantity_used', 'specification_status',
+            'specification_status_display', 'actual_unit_cost',
+            'actual_total_cost', 'supplier_used', 'notes',
+            'created_by', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'actual_total_cost', 'created_by', 'created_at', 'updated_at'
+        ]
+
+
+class TaskSpecificationCreateUpdateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TaskSpecification
+        fields = [
+            'task_project', 'task_resource', 'usage_description',
+            'planned_quantity', 'actual_quantity_used', 'specification_status',
+            'actual_unit_cost', 'supplier_used', 'notes'
+        ]
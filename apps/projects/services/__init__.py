@@ -0,0 +1,15 @@
+# apps/projects/services/__init__.py
+
+"""
+Services para execução de projetos
+
+SERVICES DISPONÍVEIS:
+- TaskTransitionService: Transições de status de tarefas em lote
+"""
+
+from .task_transitions import TaskTransitionService, TransitionResult
+
+__all__ = [
+    'TaskTransitionService',
+    'TransitionResult',
+]
@@ -0,0 +1,386 @@
+# apps/projects/services/task_transitions.py
+from collections import defaultdict
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import List
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from core.detail_cache import invalidate_detail_cache
+from ..models.model_phase import ModelPhase
+from ..models.model_task import ModelTask
+from ..models.phase_project import PhaseProject
+from ..models.project import Project
+from ..models.task_project import TaskProject
+from ..models.task_resource import TaskResource
+from ..models.task_specification import TaskSpecification
+
+
+@dataclass
+class TransitionResult:
+    """
+    Resultado de uma transição em lote
+
+    Attributes:
+        success: Se todas as transições foram aplicadas
+        errors: Erros por tarefa ({'task_id': id, 'error': msg})
+        changes: Mudanças de status causadas (tarefas pedidas, dependentes
+            liberadas, fases concluídas/liberadas)
+        rollup: Percentuais de conclusão recalculados de fases e projetos
+    """
+    success: bool = False
+    errors: List[dict] = field(default_factory=list)
+    changes: List[dict] = field(default_factory=list)
+    rollup: dict = field(default_factory=lambda: {'phases': [], 'projects': []})
+
+    def record(self, kind, obj, old_status, new_status, reason):
+        self.changes.append({
+            'type': kind,
+            'id': obj.pk,
+            'from': old_status,
+            'to': new_status,
+            'reason': reason,
+        })
+
+
+class TaskTransitionService:
+    """
+    Transições de status de várias tarefas em uma única transação
+
+    BUSINESS LOGIC (mesmas regras de TaskProject.start_task/pause_task/
+    resume_task/complete_task):
+    - IN_PROGRESS: inicia tarefas READY_TO_START (pré-requisitos do modelo
+      concluídos) ou retoma tarefas PAUSED
+    - PAUSED: pausa tarefas IN_PROGRESS
+    - COMPLETED: conclui tarefas IN_PROGRESS/PAUSED
+
+    PROPAGAÇÃO (uma única passada sobre o conjunto afetado):
+    - Tarefas dependentes com todos os pré-requisitos concluídos → READY_TO_START
+    - Percentual de conclusão das fases afetadas; fases com 100% → COMPLETED
+    - Fases dependentes com todos os pré-requisitos concluídos → READY_TO_START
+    - Percentual de conclusão dos projetos afetados
+
+    Todas as consultas são feitas por conjunto (IN), independente do número
+    de tarefas; nada é gravado se alguma tarefa não puder transicionar.
+    """
+
+    TARGET_STATUSES = ('IN_PROGRESS', 'PAUSED', 'COMPLETED')
+    RELEASABLE_TASK_STATUSES = ('PENDING', 'WAITING_PREREQUISITES')
+    RELEASABLE_PHASE_STATUSES = ('NOT_STARTED', 'WAITING_PREREQUISITES')
+
+    @classmethod
+    @transaction.atomic
+    def transition(cls, queryset, task_ids, target_status, user=None, reason='') -> TransitionResult:
+        """
+        Aplica `target_status` a todas as tarefas de `task_ids`
+
+        Args:
+            queryset: Queryset base de TaskProject (permissões/filtros da view)
+            task_ids: IDs das tarefas
+            target_status: IN_PROGRESS, PAUSED ou COMPLETED
+            user: Usuário responsável (assigned_to ao iniciar, histórico)
+            reason: Motivo da pausa (anexado às notas)
+        """
+        result = TransitionResult()
+        now = timezone.now()
+
+        tasks = list(
+            queryset.select_related(None)
+            .select_related('phase_project')
+            .select_for_update(of=('self',))
+            .filter(pk__in=task_ids)
+        )
+        found = {task.pk for task in tasks}
+        for task_id in task_ids:
+            if task_id not in found:
+                result.errors.append({'task_id': task_id, 'error': 'Task not found.'})
+
+        blocked = cls._blocked_starts(tasks) if target_status == 'IN_PROGRESS' else set()
+        for task in tasks:
+            error = cls._transition_error(task, target_status, blocked)
+            if error:
+                result.errors.append({'task_id': task.pk, 'error': error})
+
+        if result.errors:
+            transaction.set_rollback(True)
+            return result
+
+        # ====================================
+        # 1. TRANSIÇÕES PEDIDAS
+        # ====================================
+        started = []
+        completed = []
+        for task in tasks:
+            old_status = task.task_status
+            if target_status == 'IN_PROGRESS' and old_status == 'READY_TO_START':
+                task.actual_start_date = now
+                if user:
+                    task.assigned_to = user
+                started.append(task)
+            elif target_status == 'PAUSED' and reason:
+                task.notes += f"\nPaused: {reason}"
+            elif target_status == 'COMPLETED':
+                task.actual_end_date = now
+                task.completion_percentage = Decimal('100.00')
+                if task.actual_start_date:
+                    delta = task.actual_end_date - task.actual_start_date
+                    task.actual_duration_hours = Decimal(str(delta.total_seconds() / 3600))
+                completed.append(task)
+            task.task_status = target_status
+            task.updated_at = now
+            result.record('task', task, old_status, target_status, 'requested')
+
+        bulk_update_with_history(tasks, TaskProject, [
+            'task_status', 'actual_start_date', 'actual_end_date', 'assigned_to',
+            'completion_percentage', 'actual_duration_hours', 'notes', 'updated_at',
+        ], default_user=user)
+
+        if started:
+            cls._create_specifications(started, user)
+
+        # ====================================
+        # 2. PROPAGAÇÃO (uma passada)
+        # ====================================
+        if completed:
+            cls._release_dependent_tasks(completed, result, user, now)
+
+        phase_ids = {task.phase_project_id for task in tasks}
+        completed_phases = cls._rollup_phases(phase_ids, result, user, now)
+        if completed_phases:
+            cls._release_dependent_phases(completed_phases, result, user, now)
+
+        project_ids = set(
+            PhaseProject.objects.filter(pk__in=phase_ids).values_list('project_id', flat=True)
+        )
+        cls._rollup_projects(project_ids, result, user, now)
+
+        # bulk_update não dispara post_save: invalida o detalhe dos projetos
+        invalidate_detail_cache(TaskProject, tasks)
+
+        result.success = True
+        return result
+
+    # ====================================
+    # VALIDAÇÃO
+    # ====================================
+
+    @classmethod
+    def _transition_error(cls, task, target_status, blocked):
+        """Mensagem de erro se a tarefa não pode ir para target_status (mesmas regras das ações unitárias)"""
+        current = task.task_status
+        if target_status == 'IN_PROGRESS':
+            if current == 'PAUSED':
+                return None
+            if current != 'READY_TO_START' or task.pk in blocked:
+                return 'This task cannot be started. Check if all prerequisites are completed.'
+            return None
+        if target_status == 'PAUSED' and current != 'IN_PROGRESS':
+            return 'Only tasks in progress can be paused.'
+        if target_status == 'COMPLETED' and current not in ('IN_PROGRESS', 'PAUSED'):
+            return 'Only tasks in progress or paused can be completed.'
+        return None
+
+    @classmethod
+    def _prerequisite_map(cls, through, source, target, ids):
+        """{id: {ids dos pré-requisitos ativos}} a partir da tabela M2M (uma query)"""
+        prerequisites = defaultdict(set)
+        rows = through.objects.filter(
+            **{f'{source}__in': ids, f'{target}__is_active': True}
+        ).values_list(source, f'{target}_id')
+        for item_id, prerequisite_id in rows:
+            prerequisites[item_id].add(prerequisite_id)
+        return prerequisites
+
+    @classmethod
+    def _task_prerequisites(cls, model_task_ids):
+        through = ModelTask.prerequisite_tasks.through
+        return cls._prerequisite_map(
+            through, 'from_modeltask_id', 'to_modeltask', model_task_ids)
+
+    @classmethod
+    def _completed_model_tasks(cls, phase_ids):
+        """{(phase_id, model_task_id)} já concluídos nas fases"""
+        return set(
+            TaskProject.objects.filter(phase_project_id__in=phase_ids, task_status='COMPLETED')
+            .values_list('phase_project_id', 'model_task_id')
+        )
+
+    @classmethod
+    def _blocked_starts(cls, tasks):
+        """IDs das tarefas READY_TO_START com pré-requisitos do modelo ainda pendentes"""
+        candidates = [task for task in tasks if task.task_status == 'READY_TO_START']
+        if not candidates:
+            return set()
+        prerequisites = cls._task_prerequisites({task.model_task_id for task in candidates})
+        done = cls._completed_model_tasks({task.phase_project_id for task in candidates})
+        return {
+            task.pk for task in candidates
+            if any((task.phase_project_id, prereq) not in done
+                   for prereq in prerequisites.get(task.model_task_id, ()))
+        }
+
+    # ====================================
+    # EFEITOS
+    # ====================================
+
+    @classmethod
+    def _create_specifications(cls, tasks, user):
+        """Equivalente em lote de TaskProject.create_specifications_from_model"""
+        with_specs = set(
+            TaskSpecification.objects.filter(task_project__in=tasks)
+            .values_list('task_project_id', flat=True).distinct()
+        )
+        pending = [task for task in tasks if task.pk not in with_specs]
+        if not pending:
+            return
+
+        resources = defaultdict(list)
+        for resource in TaskResource.objects.filter(
+            model_task_id__in={task.model_task_id for task in pending}, is_active=True
+        ):
+            resources[resource.model_task_id].append(resource)
+
+        specifications = [
+            TaskSpecification(
+                task_project=task,
+                task_resource=resource,
+                planned_quantity=resource.required_quantity,
+                created_by_id=task.created_by_id,
+            )
+            for task in pending
+            for resource in resources.get(task.model_task_id, ())
+        ]
+        if specifications:
+            bulk_create_with_history(specifications, TaskSpecification, default_user=user)
+
+    @classmethod
+    def _release_dependent_tasks(cls, completed, result, user, now):
+        """Libera (READY_TO_START) dependentes com todos os pré-requisitos concluídos"""
+        phase_ids = {task.phase_project_id for task in completed}
+        dependents = list(
+            TaskProject.objects.filter(
+                phase_project_id__in=phase_ids,
+                task_status__in=cls.RELEASABLE_TASK_STATUSES,
+                model_task__prerequisite_tasks__in={task.model_task_id for task in completed},
+            ).distinct()
+        )
+        if not dependents:
+            return
+
+        prerequisites = cls._task_prerequisites({task.model_task_id for task in dependents})
+        done = cls._completed_model_tasks(phase_ids)
+        released = []
+        for task in dependents:
+            if all((task.phase_project_id, prereq) in done
+                   for prereq in prerequisites.get(task.model_task_id, ())):
+                result.record('task', task, task.task_status, 'READY_TO_START', 'prerequisites_completed')
+                task.task_status = 'READY_TO_START'
+                task.updated_at = now
+                released.append(task)
+
+        if released:
+            bulk_update_with_history(
+                released, TaskProject, ['task_status', 'updated_at'], default_user=user)
+
+    @classmethod
+    def _rollup_phases(cls, phase_ids, result, user, now):
+        """Recalcula o percentual das fases afetadas (uma query) e conclui as que chegaram a 100%"""
+        counts = {
+            row['phase_project']: row
+            for row in TaskProject.objects.filter(phase_project_id__in=phase_ids)
+            .values('phase_project')
+            .annotate(total=Count('id'), done=Count('id', filter=Q(task_status='COMPLETED')))
+        }
+
+        phases = list(PhaseProject.objects.filter(pk__in=phase_ids))
+        changed = []
+        completed = []
+        for phase in phases:
+            row = counts.get(phase.pk)
+            if not row or not row['total']:
+                continue
+            percentage = (Decimal(row['done']) / Decimal(row['total']) * 100).quantize(Decimal('0.01'))
+            if percentage == 100 and phase.phase_status != 'COMPLETED':
+                result.record('phase', phase, phase.phase_status, 'COMPLETED', 'all_tasks_completed')
+                phase.phase_status = 'COMPLETED'
+                phase.actual_end_date = now.date()
+                completed.append(phase)
+            elif percentage == phase.completion_percentage:
+                continue
+            phase.completion_percentage = percentage
+            phase.updated_at = now
+            changed.append(phase)
+            result.rollup['phases'].append({'id': phase.pk, 'completion_percentage': percentage})
+
+        if changed:
+            bulk_update_with_history(changed, PhaseProject, [
+                'phase_status', 'actual_end_date', 'completion_percentage', 'updated_at'
+            ], default_user=user)
+        return completed
+
+    @classmethod
+    def _release_dependent_phases(cls, completed, result, user, now):
+        """Libera (READY_TO_START) fases dependentes com todos os pré-requisitos concluídos"""
+        project_ids = {phase.project_id for phase in completed}
+        dependents = list(
+            PhaseProject.objects.filter(
+                project_id__in=project_ids,
+                phase_status__in=cls.RELEASABLE_PHASE_STATUSES,
+                model_phase__prerequisite_phases__in={phase.model_phase_id for phase in completed},
+            ).distinct()
+        )
+        if not dependents:
+            return
+
+        prerequisites = cls._prerequisite_map(
+            ModelPhase.prerequisite_phases.through, 'from_modelphase_id', 'to_modelphase',
+            {phase.model_phase_id for phase in dependents}
+        )
+        done = set(
+            PhaseProject.objects.filter(project_id__in=project_ids, phase_status='COMPLETED')
+            .values_list('project_id', 'model_phase_id')
+        )
+        released = []
+        for phase in dependents:
+            if all((phase.project_id, prereq) in done
+                   for prereq in prerequisites.get(phase.model_phase_id, ())):
+                result.record('phase', phase, phase.phase_status, 'READY_TO_START', 'prerequisites_completed')
+                phase.phase_status = 'READY_TO_START'
+                phase.updated_at = now
+                released.append(phase)
+
+        if released:
+            bulk_update_with_history(
+                released, PhaseProject, ['phase_status', 'updated_at'], default_user=user)
+
+    @classmethod
+    def _rollup_projects(cls, project_ids, result, user, now):
+        """Percentual de conclusão dos projetos afetados (tarefas concluídas / total, uma query)"""
+        if not project_ids:
+            return
+        counts = {
+            row['phase_project__project']: row
+            for row in TaskProject.objects.filter(phase_project__project_id__in=project_ids)
+            .values('phase_project__project')
+            .annotate(total=Count('id'), done=Count('id', filter=Q(task_status='COMPLETED')))
+        }
+
+        changed = []
+        for project in Project.objects.filter(pk__in=project_ids):
+            row = counts.get(project.pk)
+            if not row or not row['total']:
+                continue
+            percentage = (Decimal(row['done']) / Decimal(row['total']) * 100).quantize(Decimal('0.01'))
+            if percentage == project.completion_percentage:
+                continue
+            project.completion_percentage = percentage
+            project.updated_at = now
+            changed.append(project)
+            result.rollup['projects'].append({'id': project.pk, 'completion_percentage': percentage})
+
+        if changed:
+            bulk_update_with_history(
+                changed, Project, ['completion_percentage', 'updated_at'], default_user=user)
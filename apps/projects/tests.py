@@ -1,9 +1,13 @@
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
 from core.models import County
+from core.throttling import ConcurrencyLimiter
 from .models.incorporation import Incorporation
 from ..contracts.models.contract import Contract
 from .models.project import Project
@@ -84,7 +88,113 @@ class IncorporationAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['name'], 'Test Incorporation')
-        
+
+    def test_list_incorporations_cursor_pagination(self):
+        """Teste para paginação por cursor (keyset)"""
+        for i in range(4):
+            Incorporation.objects.create(
+                name=f'Cursor Incorporation {i}',
+                incorporation_type=self.incorporation_type,
+                incorporation_status=self.incorporation_status,
+                county=self.county,
+                created_by=self.user
+            )
+
+        names = []
+        url = f'{self.list_url}?pagination=cursor&page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['pagination'], 'cursor')
+            self.assertNotIn('count', response.data)
+            names.extend(item['name'] for item in response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(len(names), 5)
+        self.assertEqual(len(set(names)), 5)
+
+        # Ordenação sem índice é rejeitada
+        response = self.client.get(f'{self.list_url}?pagination=cursor&ordering=name')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Cursor adulterado
+        response = self.client.get(f'{self.list_url}?pagination=cursor&cursor=invalid')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_conditional_get(self):
+        """Teste para ETag / If-None-Match em lista e detalhe"""
+        for url in (self.list_url, self.detail_url):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response['ETag']
+
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertEqual(response['ETag'], etag)
+
+        # Qualquer alteração invalida o ETag
+        response = self.client.get(self.detail_url)
+        etag = response['ETag']
+        self.incorporation.name = 'Renamed Incorporation'
+        self.incorporation.save()
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['name'], 'Renamed Incorporation')
+
+    def test_page_size_is_capped(self):
+        """Teste para o limite máximo de page_size"""
+        response = self.client.get(f'{self.list_url}?page_size=100000')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLessEqual(response.data['page_size'], 200)
+
+    def test_batch_get(self):
+        """Teste para POST /api/batch/ (menos queries que as chamadas separadas)"""
+        client = APIClient()
+        client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+        paths = [self.detail_url, self.projects_url, self.list_url]
+
+        with CaptureQueriesContext(connection) as separate:
+            for path in paths:
+                self.assertEqual(client.get(path).status_code, status.HTTP_200_OK)
+
+        batch_url = reverse('core:batch')
+        with CaptureQueriesContext(connection) as batched:
+            response = client.post(
+                batch_url,
+                [{'path': self.detail_url, 'query': {'fields': 'id,name'}}]
+                + [{'path': path} for path in paths[1:]]
+                + [{'path': '/admin/'}, {'path': '/api/unknown/'}],
+                format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertLess(len(batched), len(separate))
+        statuses = [item['status'] for item in response.data['responses']]
+        self.assertEqual(statuses, [200, 200, 200, 400, 404])
+        self.assertEqual(response.data['responses'][0]['body'],
+                         {'id': self.incorporation.id, 'name': 'Test Incorporation'})
+
+        response = client.post(batch_url, [{'path': self.detail_url}] * 1000, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_batch_rejects_file_responses(self):
+        """Teste para sub-requests com resposta streaming/arquivo no /api/batch/"""
+        bundle_url = reverse('projects:incorporation-bundle', kwargs={'pk': self.incorporation.pk})
+        response = self.client.post(
+            reverse('core:batch'),
+            [{'path': bundle_url}, {'path': self.detail_url}],
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [item['status'] for item in response.data['responses']]
+        self.assertEqual(statuses, [406, 200])
+        # A resposta streaming foi fechada: a vaga de concorrência do export voltou
+        self.assertEqual(ConcurrencyLimiter('export').in_flight(), 0)
+
     def test_create_incorporation(self):
         """Teste para criar uma nova incorporação"""
         data = {
@@ -164,6 +274,49 @@ class IncorporationAPITests(APITestCase):
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['project_name'], 'Test Project')
 
+    def test_incorporation_bundle(self):
+        """Teste para exportar o bundle ZIP da incorporação"""
+        import io
+        import zipfile
+
+        project_status = ProjectStatus.objects.create(
+            code='PLANNING',
+            name='Em Planejamento',
+            color='#00FF00',
+            icon='planning',
+            order=1,
+            is_active=True
+        )
+        Project.objects.create(
+            project_name='Bundle Project',
+            incorporation=self.incorporation,
+            status_project=project_status,
+            address='Test Address',
+            area_total=100.0,
+            completion_percentage=0,
+            expected_delivery_date='2025-12-31',
+            created_by=self.user
+        )
+
+        url = reverse('projects:incorporation-bundle', kwargs={'pk': self.incorporation.pk})
+        # Uma query por entidade + get_object
+        with self.assertNumQueries(7):
+            response = self.client.get(url)
+            content = b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+
+        archive = zipfile.ZipFile(io.BytesIO(content))
+        self.assertEqual(
+            archive.namelist(),
+            ['projects.csv', 'phases.csv', 'tasks.csv',
+             'contracts.csv', 'owners.csv', 'contacts.csv']
+        )
+        projects_csv = archive.read('projects.csv').decode('utf-8').splitlines()
+        self.assertEqual(len(projects_csv), 2)
+        self.assertIn('Bundle Project', projects_csv[1])
+
 
 class ProjectAPITests(APITestCase):
     """
@@ -253,7 +406,35 @@ class ProjectAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['project_name'], 'Test Project')
-        
+
+    def test_list_projects_sparse_fields(self):
+        """Teste para ?fields= e ?expand= na listagem"""
+        response = self.client.get(f'{self.list_url}?fields=id,project_name')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'project_name'})
+
+        response = self.client.get(
+            f'{self.list_url}?fields=id,incorporation&expand=incorporation')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data['results'][0]
+        self.assertEqual(set(result), {'id', 'incorporation'})
+        self.assertEqual(result['incorporation']['id'], self.incorporation.id)
+        self.assertEqual(result['incorporation']['name'], self.incorporation.name)
+
+    def test_expand_only_declared_fields(self):
+        """?expand= só expande FKs de expandable_fields, com o serializer declarado"""
+        response = self.client.get(
+            f'{self.list_url}?fields=id,created_by,model_project&expand=created_by,model_project')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        result = response.data['results'][0]
+        self.assertEqual(result['created_by']['id'], self.user.id)
+        self.assertNotIn('password', result['created_by'])
+        self.assertNotIn('is_superuser', result['created_by'])
+        self.assertNotIsInstance(result['model_project'], dict)
+
     def test_create_project(self):
         """Teste para criar um novo projeto"""
         data = {
@@ -447,7 +628,52 @@ class TaskProjectAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
         self.assertEqual(response.data['results'][0]['task_name'], 'Test Task')
-        
+
+    def test_list_tasks_fast_representation(self):
+        """Teste para o fast path de to_representation (saída igual à do DRF)"""
+        from rest_framework import serializers
+        from .serializers import TaskProjectListSerializer
+
+        self.task.actual_start_date = None
+        self.task.save()
+        serializer = TaskProjectListSerializer()
+        self.assertEqual(
+            serializer.to_representation(self.task),
+            serializers.Serializer.to_representation(serializer, self.task)
+        )
+
+        response = self.client.get(self.list_url)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['results'][0]['completion_percentage'],
+                         response.data['results'][0]['completion_percentage'])
+
+    def test_list_tasks_query_count_is_constant(self):
+        """Teste para o eager loading automático (sem N+1 na listagem)"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as single:
+            self.client.get(self.list_url)
+
+        for i in range(2, 8):
+            TaskProject.objects.create(
+                task_name=f'Task {i}',
+                task_code=f'TT-00{i}',
+                phase_project=self.phase,
+                task_status='PENDING',
+                priority='MEDIUM',
+                execution_order=i,
+                completion_percentage=0,
+                assigned_to=self.user,
+                created_by=self.user
+            )
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(self.list_url)
+
+        self.assertEqual(len(response.data['results']), 7)
+        self.assertEqual(len(many), len(single))
+
     def test_create_task(self):
         """Teste para criar uma nova tarefa"""
         data = {
@@ -468,7 +694,143 @@ class TaskProjectAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.data['task_name'], 'New Task')
         self.assertEqual(TaskProject.objects.count(), 2)
-        
+
+    def test_bulk_create_and_update_tasks(self):
+        """Teste para criação/atualização em lote (queries constantes, erros por item)"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        bulk_url = reverse('projects:task-bulk')
+
+        def payload(count):
+            return [
+                {
+                    'task_name': f'Bulk Task {i}',
+                    'task_code': f'BT-{i:03d}',
+                    'phase_project': self.phase.id,
+                    'execution_order': 100 + i,
+                    'assigned_to': self.user.id,
+                }
+                for i in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as few:
+            response = self.client.post(bulk_url, payload(2), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        TaskProject.objects.exclude(pk=self.task.pk).delete()
+
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.post(bulk_url, payload(50), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 50)
+        self.assertEqual(len(many), len(few))
+        self.assertEqual(TaskProject.objects.count(), 51)
+
+        # Duplicata no lote + FK inexistente: nada é gravado
+        invalid = payload(53)[50:]
+        invalid[1]['task_code'] = invalid[0]['task_code']
+        invalid[2]['phase_project'] = 999999
+        response = self.client.post(bulk_url, invalid, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([item['index'] for item in response.data['errors']], [1, 2])
+        self.assertEqual(TaskProject.objects.count(), 51)
+
+        # Atualização parcial em lote
+        ids = list(TaskProject.objects.values_list('id', flat=True)[:2])
+        with CaptureQueriesContext(connection) as patched:
+            response = self.client.patch(bulk_url, [
+                {'id': pk, 'task_status': 'READY_TO_START'} for pk in ids
+            ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # O UPDATE grava só os campos recebidos (e os auto_now), não a linha inteira
+        updates = [query['sql'] for query in patched if query['sql'].startswith('UPDATE')]
+        self.assertTrue(updates)
+        for sql in updates:
+            self.assertIn('"task_status"', sql)
+            self.assertNotIn('"task_name"', sql)
+        self.assertEqual(response.data['updated'], len(ids))
+        self.assertEqual(
+            TaskProject.objects.filter(task_status='READY_TO_START').count(), len(ids))
+
+    def test_batch_transition_tasks(self):
+        """Teste para transição em lote com conclusão da fase em uma passada"""
+        batch_url = reverse('projects:task-batch-transition')
+        other = TaskProject.objects.create(
+            task_name='Other Task',
+            task_code='TT-002',
+            phase_project=self.phase,
+            task_status='PAUSED',
+            priority='MEDIUM',
+            execution_order=2,
+            completion_percentage=0,
+            created_by=self.user
+        )
+        TaskProject.objects.filter(pk=self.task.pk).update(task_status='IN_PROGRESS')
+
+        # Tarefa que não pode transicionar: nada é gravado
+        response = self.client.post(batch_url, {
+            'task_ids': [self.task.pk, other.pk],
+            'target_status': 'PAUSED',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([item['task_id'] for item in response.data['errors']], [other.pk])
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.task_status, 'IN_PROGRESS')
+
+        response = self.client.post(batch_url, {
+            'task_ids': [self.task.pk, other.pk],
+            'target_status': 'COMPLETED',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        changes = {(item['type'], item['id']): item for item in response.data['changes']}
+        self.assertEqual(changes[('task', self.task.pk)]['to'], 'COMPLETED')
+        self.assertEqual(changes[('task', other.pk)]['from'], 'PAUSED')
+        self.assertEqual(changes[('phase', self.phase.pk)]['to'], 'COMPLETED')
+
+        self.phase.refresh_from_db()
+        self.assertEqual(self.phase.phase_status, 'COMPLETED')
+        self.project.refresh_from_db()
+        self.assertEqual(self.project.completion_percentage, 100)
+
+    def test_project_detail_cache_invalidated_by_task(self):
+        """Teste para o cache do detalhe do projeto (core.detail_cache)"""
+        project_url = reverse('projects:project-detail', kwargs={'pk': self.project.pk})
+        response = self.client.get(project_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # update() não dispara signals: o detalhe continua vindo do cache
+        Project.objects.filter(pk=self.project.pk).update(project_name='Renamed Project')
+        response = self.client.get(project_url)
+        self.assertEqual(response.data['project_name'], 'Test Project')
+
+        # Salvar uma tarefa do projeto invalida o detalhe
+        self.task.save()
+        response = self.client.get(project_url)
+        self.assertEqual(response.data['project_name'], 'Renamed Project')
+
+        not_modified = self.client.get(project_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_project_detail_cache_invalidated_by_sibling_project(self):
+        """Teste para os agregados da incorporação no detalhe do projeto em cache"""
+        project_url = reverse('projects:project-detail', kwargs={'pk': self.project.pk})
+        response = self.client.get(project_url)
+        self.assertEqual(response.data['incorporation']['total_projects'], 1)
+
+        # Novo projeto na mesma incorporação muda total_projects
+        Project.objects.create(
+            project_name='Sibling Project',
+            incorporation=self.incorporation,
+            status_project=self.project_status,
+            address='Sibling Address',
+            area_total=80.0,
+            completion_percentage=0,
+            expected_delivery_date='2025-12-31',
+            created_by=self.user
+        )
+        response = self.client.get(project_url)
+        self.assertEqual(response.data['incorporation']['total_projects'], 2)
+
     def test_retrieve_task(self):
         """Teste para obter detalhes de uma tarefa"""
         response = self.client.get(self.detail_url)
@@ -30,7 +30,8 @@ from .views import (
     ContractProjectViewSet,
 
     # NOVAS ViewSets - Task Resources
-    #TaskResourceViewSet,
+    TaskResourceViewSet,
+    TaskSpecificationViewSet,
 
 )
 
@@ -82,7 +83,10 @@ router.register(r'contract-projects', ContractProjectViewSet,
                 basename='contract-project')
 
 # NOVOS ENDPOINTS - TASK RESOURCES
-#router.register(r'task-resources', TaskResourceViewSet, basename='task-resource')
+router.register(r'task-resources', TaskResourceViewSet,
+                basename='task-resource')
+router.register(r'task-specifications', TaskSpecificationViewSet,
+                basename='task-specification')
 
 # URLs do app
 app_name = 'projects'
@@ -103,6 +107,7 @@ PATCH  /api/projects/incorporations/{id}/               - Atualizar incorporaç
 DELETE /api/projects/incorporations/{id}/               - Remover incorporação
 GET    /api/projects/incorporations/{id}/projects/      - Listar projetos da incorporação
 GET    /api/projects/incorporations/{id}/contracts/     - Listar contratos da incorporação
+GET    /api/projects/incorporations/{id}/bundle/        - Exportar bundle completo (ZIP com um CSV por entidade)
 GET    /api/projects/incorporations/stats/              - Estatísticas de incorporações
 GET    /api/projects/incorporations/dashboard/          - Dashboard de incorporações
 GET    /api/projects/incorporations/export/             - Exportar incorporações (CSV/Excel)
@@ -153,8 +158,11 @@ POST   /api/projects/tasks/{id}/start/                  - Iniciar tarefa
 POST   /api/projects/tasks/{id}/pause/                  - Pausar tarefa
 POST   /api/projects/tasks/{id}/resume/                 - Retomar tarefa
 POST   /api/projects/tasks/{id}/complete/               - Completar tarefa
+POST   /api/projects/tasks/batch-transition/            - Transição de status em lote (propagação única)
 GET    /api/projects/tasks/stats/                       - Estatísticas de tarefas
 GET    /api/projects/tasks/export/                      - Exportar tarefas (CSV/Excel)
+POST   /api/projects/tasks/bulk/                        - Criar tarefas em lote
+PATCH  /api/projects/tasks/bulk/                        - Atualizar tarefas em lote
 
 ## CONTACTS ENDPOINTS
 GET    /api/projects/contacts/                          - Lista contatos com filtros
@@ -166,6 +174,8 @@ GET    /api/projects/contacts/by-project/{project_id}/  - Listar contatos por pr
 GET    /api/projects/contacts/by-owner/{owner_id}/      - Listar contatos por proprietário
 GET    /api/projects/contacts/by-user/{user_id}/        - Listar contatos por usuário
 GET    /api/projects/contacts/export/                   - Exportar contatos (CSV/Excel)
+POST   /api/projects/contacts/bulk/                     - Criar contatos em lote
+PATCH  /api/projects/contacts/bulk/                     - Atualizar contatos em lote
 
 ## MODEL PROJECTS ENDPOINTS (NOVOS)
 GET    /api/projects/model-projects/                    - Lista modelos de projeto com filtros
@@ -300,8 +310,17 @@ POST   /api/projects/task-resources/                    - Criar novo recurso
 GET    /api/projects/task-resources/{id}/               - Detalhes de recurso
 PATCH  /api/projects/task-resources/{id}/               - Atualizar recurso
 DELETE /api/projects/task-resources/{id}/               - Remover recurso
-GET    /api/projects/task-resources/by-task/{task_id}/  - Por tarefa
-GET    /api/projects/task-resources/stats/              - Estatísticas
+POST   /api/projects/task-resources/bulk/               - Criar recursos em lote
+PATCH  /api/projects/task-resources/bulk/               - Atualizar recursos em lote
+
+## TASK SPECIFICATIONS ENDPOINTS (NOVOS)
+GET    /api/projects/task-specifications/               - Lista especificações com filtros
+POST   /api/projects/task-specifications/               - Criar nova especificação
+GET    /api/projects/task-specifications/{id}/          - Detalhes de especificação
+PATCH  /api/projects/task-specifications/{id}/          - Atualizar especificação
+DELETE /api/projects/task-specifications/{id}/          - Remover especificação
+POST   /api/projects/task-specifications/bulk/          - Criar especificações em lote
+PATCH  /api/projects/task-specifications/bulk/          - Atualizar especificações em lote
 
 
 
@@ -393,4 +412,17 @@ ordering=-created_at                                    - Mais recentes primeiro
 ordering=name                                           - Ordem alfabética
 ordering=completion_percentage                          - Menor percentual primeiro
 ordering=-completion_percentage                         - Maior percentual primeiro
+
+## PAGINAÇÃO
+page=2&page_size=50                                     - Página por número (page_size máx. PAGINATION_MAX_PAGE_SIZE)
+pagination=cursor&page_size=50                          - Cursor (keyset) para scroll infinito; seguir next/previous
+
+## CAMPOS E EXPANSÃO (list/retrieve)
+fields=id,project_name                                  - Retorna apenas os campos pedidos (query reduzida com .only())
+expand=incorporation,status_project                     - FKs retornadas como objeto aninhado (JOIN apenas dessas relações)
+
+## ESCRITA EM LOTE (tasks, contacts, task-resources, task-specifications, leads)
+POST   .../bulk/  [{...}, {...}]                        - Cria todos ou nenhum (máx. BULK_MAX_ITEMS itens)
+PATCH  .../bulk/  [{"id": 1, ...}, ...]                 - Atualização parcial em lote
+400    {"errors": [{"index": 3, "errors": {...}}]}      - Erros por item (índice na lista enviada)
 """
@@ -11,15 +11,25 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Sum, Count
 from django.db.models.functions import TruncDate
 from django.utils import timezone
-from django.http import HttpResponse
+from django.http import HttpResponse, StreamingHttpResponse
 from datetime import timedelta
+from core.bulk import BulkWriteMixin
+from core.conditional import ConditionalGetMixin
+from core.detail_cache import DetailCacheMixin
+from core.eager_loading import EagerLoadingMixin
+from core.mixins import SparseFieldsetMixin
 from core.pagination import CustomPageNumberPagination
+from core.search import FullTextSearchFilter
+from core.streaming import stream_zip
+from core.throttling import ExportRateThrottle, StatsRateThrottle, limit_concurrency
 from core.models import County
 from .models.incorporation import Incorporation
 from ..contracts.models.contract import Contract
 from .models.project import Project
 from .models.phase_project import PhaseProject
 from .models.task_project import TaskProject
+from .models.task_resource import TaskResource
+from .models.task_specification import TaskSpecification
 from .models.choice_types import ProjectType, ProjectStatus, IncorporationType, IncorporationStatus, ProductionCell
 from .models.model_project import ModelProject
 from .models.model_phase import ModelPhase
@@ -38,14 +48,20 @@ from .models.choice_types import (
 )
 
 
+from .services import TaskTransitionService
 from .serializers import (
     IncorporationListSerializer, IncorporationDetailSerializer, IncorporationCreateUpdateSerializer,
     ContractListSerializer, ContractDetailSerializer, ContractCreateUpdateSerializer,
     ProjectListSerializer, ProjectDetailSerializer, ProjectCreateUpdateSerializer,
     PhaseProjectListSerializer, PhaseProjectDetailSerializer, PhaseProjectCreateUpdateSerializer,
     TaskProjectListSerializer, TaskProjectDetailSerializer, TaskProjectCreateUpdateSerializer,
+    TaskBatchTransitionSerializer,
     ContactListSerializer, ContactDetailSerializer, ContactCreateUpdateSerializer,
     ContractOwnerSerializer, ContractProjectSerializer,
+    IncorporationSummarySerializer, ProjectSummarySerializer, UserSerializer,
+    ProjectTypeSerializer, ProjectStatusSerializer, ProductionCellSerializer,
+    IncorporationTypeSerializer, IncorporationStatusSerializer,
+    StatusContractSerializer, PaymentMethodSerializer, OwnerTypeSerializer,
     ModelProjectListSerializer,
     ModelProjectDetailSerializer,
     ModelProjectCreateUpdateSerializer,
@@ -75,13 +91,16 @@ from .serializers import (
     # Contract Management Serializers (melhorados)
     ContractOwnerListSerializer, ContractOwnerDetailSerializer, ContractOwnerCreateUpdateSerializer,
     ContractProjectListSerializer, ContractProjectDetailSerializer, ContractProjectCreateUpdateSerializer,
+    # Task Resources / Specifications
+    TaskResourceListSerializer, TaskResourceDetailSerializer, TaskResourceCreateUpdateSerializer,
+    TaskSpecificationListSerializer, TaskSpecificationDetailSerializer, TaskSpecificationCreateUpdateSerializer,
 )
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from core.swagger_tags import API_TAGS
 
 
-class IncorporationViewSet(viewsets.ModelViewSet):
+class IncorporationViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de incorporações (empreendimentos)
 
@@ -93,6 +112,7 @@ class IncorporationViewSet(viewsets.ModelViewSet):
     - DELETE /api/projects/incorporations/{id}/ - Remover incorporação
     - GET /api/projects/incorporations/{id}/projects/ - Listar projetos da incorporação
     - GET /api/projects/incorporations/{id}/contracts/ - Listar contratos da incorporação
+    - GET /api/projects/incorporations/{id}/bundle/ - Exportar bundle completo (ZIP)
     - GET /api/projects/incorporations/stats/ - Estatísticas de incorporações
     - GET /api/projects/incorporations/dashboard/ - Dashboard de incorporações
     """
@@ -103,6 +123,11 @@ class IncorporationViewSet(viewsets.ModelViewSet):
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = IncorporationListSerializer
+    expandable_fields = {
+        'incorporation_type': IncorporationTypeSerializer,
+        'incorporation_status': IncorporationStatusSerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -271,13 +296,155 @@ class IncorporationViewSet(viewsets.ModelViewSet):
         serializer = ContractListSerializer(contracts, many=True)
         return Response(serializer.data)
 
+    # Colunas de cada CSV do bundle: (arquivo, [(campo ORM, cabeçalho), ...])
+    BUNDLE_CHUNK_SIZE = 2000
+    BUNDLE_COLUMNS = [
+        ('projects.csv', Project, 'incorporation_id', [
+            ('id', 'ID'),
+            ('project_name', 'Project Name'),
+            ('status_project__name', 'Status'),
+            ('model_project__name', 'Model'),
+            ('production_cell__name', 'Production Cell'),
+            ('address', 'Address'),
+            ('area_total', 'Total Area'),
+            ('construction_cost', 'Construction Cost'),
+            ('sale_value', 'Sale Value'),
+            ('project_value', 'Project Value'),
+            ('roi', 'ROI'),
+            ('completion_percentage', 'Completion %'),
+            ('expected_delivery_date', 'Expected Delivery'),
+            ('created_at', 'Created At'),
+            ('updated_at', 'Updated At'),
+        ]),
+        ('phases.csv', PhaseProject, 'project__incorporation_id', [
+            ('id', 'ID'),
+            ('project_id', 'Project ID'),
+            ('phase_code', 'Phase Code'),
+            ('phase_name', 'Phase Name'),
+            ('phase_status', 'Status'),
+            ('priority', 'Priority'),
+            ('execution_order', 'Execution Order'),
+            ('planned_start_date', 'Planned Start'),
+            ('planned_end_date', 'Planned End'),
+            ('actual_start_date', 'Actual Start'),
+            ('actual_end_date', 'Actual End'),
+            ('completion_percentage', 'Completion %'),
+            ('estimated_cost', 'Estimated Cost'),
+            ('actual_cost', 'Actual Cost'),
+            ('updated_at', 'Updated At'),
+        ]),
+        ('tasks.csv', TaskProject, 'phase_project__project__incorporation_id', [
+            ('id', 'ID'),
+            ('phase_project__project_id', 'Project ID'),
+            ('phase_project_id', 'Phase ID'),
+            ('task_code', 'Task Code'),
+            ('task_name', 'Task Name'),
+            ('task_status', 'Status'),
+            ('priority', 'Priority'),
+            ('execution_order', 'Execution Order'),
+            ('planned_start_date', 'Planned Start'),
+            ('planned_end_date', 'Planned End'),
+            ('actual_start_date', 'Actual Start'),
+            ('actual_end_date', 'Actual End'),
+            ('completion_percentage', 'Completion %'),
+            ('assigned_to__username', 'Assigned To'),
+            ('estimated_cost', 'Estimated Cost'),
+            ('actual_cost', 'Actual Cost'),
+            ('updated_at', 'Updated At'),
+        ]),
+        ('contracts.csv', Contract, 'incorporation_id', [
+            ('id', 'ID'),
+            ('contract_number', 'Contract Number'),
+            ('lead_id', 'Lead ID'),
+            ('status_contract__name', 'Status'),
+            ('payment_method__name', 'Payment Method'),
+            ('contract_value', 'Contract Value'),
+            ('management_company', 'Management Company'),
+            ('sign_date', 'Sign Date'),
+            ('payment_date', 'Payment Date'),
+            ('created_at', 'Created At'),
+            ('updated_at', 'Updated At'),
+        ]),
+        ('owners.csv', ContractOwner, 'contract__incorporation_id', [
+            ('id', 'ID'),
+            ('contract_id', 'Contract ID'),
+            ('contract__contract_number', 'Contract Number'),
+            ('client_id', 'Client ID'),
+            ('client__email', 'Client Email'),
+            ('owner_type__name', 'Owner Type'),
+            ('percentual_propriedade', 'Ownership %'),
+            ('created_at', 'Created At'),
+        ]),
+        ('contacts.csv', Contact, 'project__incorporation_id', [
+            ('id', 'ID'),
+            ('project_id', 'Project ID'),
+            ('contact_id', 'User ID'),
+            ('contact__email', 'Email'),
+            ('owner_id', 'Owner ID'),
+            ('contact_role', 'Role'),
+            ('is_active', 'Active'),
+            ('created_at', 'Created At'),
+        ]),
+    ]
+
+    def _bundle_entries(self, incorporation):
+        """
+        Gera (arquivo, cabeçalho, linhas) para cada entidade do bundle
+
+        Cada entidade é buscada com UMA query filtrada pela chave da
+        incorporação, lida via iterator() (cursor no servidor), então a
+        memória fica constante mesmo com dezenas de milhares de tarefas.
+        """
+        for filename, model, key, columns in self.BUNDLE_COLUMNS:
+            fields = [field for field, _ in columns]
+            rows = model.objects.filter(
+                **{key: incorporation.pk}
+            ).order_by('pk').values_list(*fields).iterator(
+                chunk_size=self.BUNDLE_CHUNK_SIZE)
+            yield filename, [header for _, header in columns], rows
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Bundle completo da incorporação (ZIP)",
+        operation_description=(
+            "Exporta a incorporação com projetos, fases, tarefas, contratos, "
+            "proprietários e contatos como um ZIP com um CSV por entidade, "
+            "gerado em streaming"
+        ),
+        responses={
+            200: 'Arquivo ZIP para download',
+            404: 'Incorporação não encontrada'
+        }
+    )
+    @action(detail=True, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
+    def bundle(self, request, pk=None):
+        """
+        Exportar incorporação e entidades relacionadas em um único ZIP
+
+        RETURNS:
+        - ZIP (streaming) com projects.csv, phases.csv, tasks.csv,
+          contracts.csv, owners.csv e contacts.csv
+        """
+        incorporation = self.get_object()
+
+        response = StreamingHttpResponse(
+            stream_zip(self._bundle_entries(incorporation)),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="incorporation_{incorporation.pk}_bundle.zip"'
+        )
+        return response
+
     @swagger_auto_schema(
         tags=[API_TAGS['PROJECTS']],
         operation_summary="Estatísticas de incorporações",
         operation_description="Retorna estatísticas de incorporações",
         responses={200: 'Estatísticas de incorporações'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de incorporações
@@ -397,7 +564,8 @@ class IncorporationViewSet(viewsets.ModelViewSet):
         operation_description="Retorna dados para o dashboard de incorporações",
         responses={200: 'Dashboard de incorporações'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def dashboard(self, request):
         """
         Dashboard com métricas e gráficos para incorporações
@@ -562,7 +730,8 @@ class IncorporationViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar incorporações para CSV ou Excel
@@ -717,7 +886,7 @@ class IncorporationViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ContractViewSet(viewsets.ModelViewSet):
+class ContractViewSet(DetailCacheMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de contratos
 
@@ -736,9 +905,15 @@ class ContractViewSet(viewsets.ModelViewSet):
     queryset = Contract.objects.select_related(
         'lead', 'incorporation', 'created_by', 'status_contract', 'payment_method').all()
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
+                       filters.OrderingFilter, FullTextSearchFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = ContractListSerializer
+    expandable_fields = {
+        'incorporation': IncorporationSummarySerializer,
+        'status_contract': StatusContractSerializer,
+        'payment_method': PaymentMethodSerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -923,7 +1098,8 @@ class ContractViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de contratos",
         responses={200: 'Estatísticas de contratos'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de contratos
@@ -1033,7 +1209,8 @@ class ContractViewSet(viewsets.ModelViewSet):
         operation_description="Retorna dados para o dashboard de contratos",
         responses={200: 'Dashboard de contratos'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def dashboard(self, request):
         """
         Dashboard com métricas e gráficos para contratos
@@ -1198,7 +1375,8 @@ class ContractViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar contratos para CSV ou Excel
@@ -1363,7 +1541,7 @@ class ContractViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(DetailCacheMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de projetos
 
@@ -1382,9 +1560,15 @@ class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.select_related(
         'incorporation', 'model_project', 'status_project', 'created_by').all()
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
+                       filters.OrderingFilter, FullTextSearchFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = ProjectListSerializer
+    expandable_fields = {
+        'incorporation': IncorporationSummarySerializer,
+        'status_project': ProjectStatusSerializer,
+        'production_cell': ProductionCellSerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -1568,7 +1752,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de projetos",
         responses={200: 'Estatísticas de projetos'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de projetos
@@ -1687,7 +1872,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
         operation_description="Retorna dados para o dashboard de projetos",
         responses={200: 'Dashboard de projetos'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def dashboard(self, request):
         """
         Dashboard com métricas e gráficos para projetos
@@ -1875,7 +2061,8 @@ class ProjectViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar projetos para CSV ou Excel
@@ -2055,7 +2242,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             return response
 
 
-class PhaseProjectViewSet(viewsets.ModelViewSet):
+class PhaseProjectViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de fases de projeto
 
@@ -2077,6 +2264,12 @@ class PhaseProjectViewSet(viewsets.ModelViewSet):
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = PhaseProjectListSerializer
+    expandable_fields = {
+        'project': ProjectSummarySerializer,
+        'technical_responsible': UserSerializer,
+        'supervisor': UserSerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -2399,7 +2592,8 @@ class PhaseProjectViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar fases de projeto para CSV ou Excel
@@ -2591,7 +2785,7 @@ class PhaseProjectViewSet(viewsets.ModelViewSet):
             return response
 
 
-class TaskProjectViewSet(viewsets.ModelViewSet):
+class TaskProjectViewSet(BulkWriteMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de tarefas de projeto
 
@@ -2605,8 +2799,11 @@ class TaskProjectViewSet(viewsets.ModelViewSet):
     - POST /api/projects/tasks/{id}/pause/ - Pausar tarefa
     - POST /api/projects/tasks/{id}/resume/ - Retomar tarefa
     - POST /api/projects/tasks/{id}/complete/ - Completar tarefa
+    - POST /api/projects/tasks/batch-transition/ - Transição de status em lote
     - GET /api/projects/tasks/stats/ - Estatísticas de tarefas
     - GET /api/projects/tasks/export/ - Exportar tarefas (CSV/Excel)
+    - POST /api/projects/tasks/bulk/ - Criar tarefas em lote
+    - PATCH /api/projects/tasks/bulk/ - Atualizar tarefas em lote
     """
 
     queryset = TaskProject.objects.select_related(
@@ -2616,6 +2813,12 @@ class TaskProjectViewSet(viewsets.ModelViewSet):
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = TaskProjectListSerializer
+    expandable_fields = {
+        'assigned_to': UserSerializer,
+        'supervisor': UserSerializer,
+        'approved_by': UserSerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -2923,6 +3126,49 @@ class TaskProjectViewSet(viewsets.ModelViewSet):
                 'detail': 'An error occurred while completing the task.'
             }, status=status.HTTP_400_BAD_REQUEST)
 
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Transição de status em lote",
+        operation_description=(
+            "Aplica o mesmo status (IN_PROGRESS, PAUSED ou COMPLETED) a várias tarefas "
+            "em uma transação. Liberação de dependentes e conclusão de fases/projetos "
+            "são calculadas uma única vez sobre o conjunto afetado."
+        ),
+        request_body=TaskBatchTransitionSerializer,
+        responses={
+            200: 'Transições aplicadas; retorna todas as mudanças de status causadas',
+            400: 'Dados inválidos ou tarefas que não podem transicionar (nada é gravado)'
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='batch-transition')
+    def batch_transition(self, request):
+        """
+        Transição de status de várias tarefas
+        """
+        serializer = TaskBatchTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = TaskTransitionService.transition(
+            self.get_queryset(),
+            serializer.validated_data['task_ids'],
+            serializer.validated_data['target_status'],
+            user=request.user,
+            reason=serializer.validated_data.get('reason', ''),
+        )
+
+        if not result.success:
+            return Response({
+                'error': 'Batch transition failed',
+                'errors': result.errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            'message': 'Tasks updated successfully',
+            'target_status': serializer.validated_data['target_status'],
+            'changes': result.changes,
+            'rollup': result.rollup,
+        })
+
     @swagger_auto_schema(
         tags=[API_TAGS['PROJECTS']],
         operation_summary="Estatísticas de tarefas de projeto",
@@ -2950,7 +3196,8 @@ class TaskProjectViewSet(viewsets.ModelViewSet):
         ],
         responses={200: 'Estatísticas de tarefas de projeto'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de tarefas
@@ -3119,7 +3366,8 @@ class TaskProjectViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar tarefas para CSV ou Excel
@@ -3318,7 +3566,7 @@ class TaskProjectViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ContactViewSet(viewsets.ModelViewSet):
+class ContactViewSet(BulkWriteMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de contatos de projeto
 
@@ -3331,15 +3579,21 @@ class ContactViewSet(viewsets.ModelViewSet):
     - GET /api/projects/contacts/by-project/{project_id}/ - Listar contatos por projeto
     - GET /api/projects/contacts/by-owner/{owner_id}/ - Listar contatos por proprietário
     - GET /api/projects/contacts/by-user/{user_id}/ - Listar contatos por usuário
+    - POST /api/projects/contacts/bulk/ - Criar contatos em lote
+    - PATCH /api/projects/contacts/bulk/ - Atualizar contatos em lote
     """
 
     queryset = Contact.objects.select_related(
         'contact', 'project', 'owner', 'created_by'
     ).all()
     filter_backends = [DjangoFilterBackend,
-                       filters.SearchFilter, filters.OrderingFilter]
+                       filters.OrderingFilter, FullTextSearchFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = ContactListSerializer
+    expandable_fields = {
+        'project': ProjectSummarySerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -3562,7 +3816,8 @@ class ContactViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar contatos para CSV ou Excel
@@ -3735,7 +3990,7 @@ class ContactViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ModelProjectViewSet(viewsets.ModelViewSet):
+class ModelProjectViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de modelos de projeto (templates)
 
@@ -3757,6 +4012,10 @@ class ModelProjectViewSet(viewsets.ModelViewSet):
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = ModelProjectListSerializer
+    expandable_fields = {
+        'project_type': ProjectTypeSerializer,
+        'created_by': UserSerializer,
+    }
 
     # Filtros disponíveis
     filterset_fields = {
@@ -3994,7 +4253,8 @@ class ModelProjectViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de modelos de projeto",
         responses={200: 'Estatísticas de modelos de projeto'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de modelos de projeto
@@ -4129,7 +4389,8 @@ class ModelProjectViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar modelos de projeto para CSV ou Excel
@@ -4294,7 +4555,7 @@ class ModelProjectViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ModelPhaseViewSet(viewsets.ModelViewSet):
+class ModelPhaseViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de fases de modelo (templates)
 
@@ -4541,7 +4802,8 @@ class ModelPhaseViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de fases de modelo",
         responses={200: 'Estatísticas de fases de modelo'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de fases de modelo
@@ -4692,7 +4954,8 @@ class ModelPhaseViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar fases de modelo para CSV ou Excel
@@ -4853,7 +5116,7 @@ class ModelPhaseViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ModelTaskViewSet(viewsets.ModelViewSet):
+class ModelTaskViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de tarefas de modelo (templates)
 
@@ -5083,7 +5346,8 @@ class ModelTaskViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de tarefas de modelo",
         responses={200: 'Estatísticas de tarefas de modelo'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de tarefas de modelo
@@ -5290,7 +5554,8 @@ class ModelTaskViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar tarefas de modelo para CSV ou Excel
@@ -5475,7 +5740,7 @@ class ModelTaskViewSet(viewsets.ModelViewSet):
 # Adicionar estas ViewSets ao final do arquivo apps/projects/views.py
 
 
-class CostGroupViewSet(viewsets.ModelViewSet):
+class CostGroupViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de grupos de custo
 
@@ -5639,7 +5904,8 @@ class CostGroupViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de grupos de custo",
         responses={200: 'Estatísticas de grupos de custo'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de grupos de custo
@@ -5731,7 +5997,8 @@ class CostGroupViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar grupos de custo para CSV ou Excel
@@ -5870,7 +6137,7 @@ class CostGroupViewSet(viewsets.ModelViewSet):
             return response
 
 
-class CostSubGroupViewSet(viewsets.ModelViewSet):
+class CostSubGroupViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de subgrupos de custo
 
@@ -6011,7 +6278,8 @@ class CostSubGroupViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de subgrupos de custo",
         responses={200: 'Estatísticas de subgrupos de custo'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de subgrupos de custo
@@ -6157,7 +6425,8 @@ class CostSubGroupViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar subgrupos de custo para CSV ou Excel
@@ -6306,7 +6575,7 @@ class CostSubGroupViewSet(viewsets.ModelViewSet):
             return response
 
 
-class ProductionCellViewSet(viewsets.ModelViewSet):
+class ProductionCellViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de células de produção
 
@@ -6440,7 +6709,8 @@ class ProductionCellViewSet(viewsets.ModelViewSet):
         operation_description="Retorna estatísticas de células de produção",
         responses={200: 'Estatísticas de células de produção'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         """
         Endpoint para estatísticas de células de produção
@@ -6521,7 +6791,8 @@ class ProductionCellViewSet(viewsets.ModelViewSet):
             400: 'Formato inválido'
         }
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[ExportRateThrottle])
+    @limit_concurrency('export')
     def export(self, request):
         """
         Exportar células de produção para CSV ou Excel
@@ -6662,7 +6933,7 @@ class ProductionCellViewSet(viewsets.ModelViewSet):
 # CHOICE TYPES VIEWSETS
 # =====================================================
 
-class ProjectTypeViewSet(viewsets.ModelViewSet):
+class ProjectTypeViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de tipos de projeto
 
@@ -6713,7 +6984,8 @@ class ProjectTypeViewSet(viewsets.ModelViewSet):
         operation_summary="Estatísticas de tipos de projeto",
         responses={200: 'Estatísticas de tipos de projeto'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         queryset = self.get_queryset()
 
@@ -6743,7 +7015,7 @@ class ProjectTypeViewSet(viewsets.ModelViewSet):
         })
 
 
-class ProjectStatusViewSet(viewsets.ModelViewSet):
+class ProjectStatusViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciamento de status de projeto"""
 
     queryset = ProjectStatus.objects.all()
@@ -6767,7 +7039,8 @@ class ProjectStatusViewSet(viewsets.ModelViewSet):
             return ProjectStatusCreateUpdateSerializer
         return self.serializer_class
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         queryset = self.get_queryset()
 
@@ -6796,7 +7069,7 @@ class ProjectStatusViewSet(viewsets.ModelViewSet):
         })
 
 
-class IncorporationTypeViewSet(viewsets.ModelViewSet):
+class IncorporationTypeViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciamento de tipos de incorporação"""
 
     queryset = IncorporationType.objects.all()
@@ -6821,7 +7094,7 @@ class IncorporationTypeViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
 
-class IncorporationStatusViewSet(viewsets.ModelViewSet):
+class IncorporationStatusViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciamento de status de incorporação"""
 
     queryset = IncorporationStatus.objects.all()
@@ -6846,7 +7119,7 @@ class IncorporationStatusViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
 
-class StatusContractViewSet(viewsets.ModelViewSet):
+class StatusContractViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciamento de status de contrato"""
 
     queryset = StatusContract.objects.all()
@@ -6871,7 +7144,7 @@ class StatusContractViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
 
-class PaymentMethodViewSet(viewsets.ModelViewSet):
+class PaymentMethodViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciamento de métodos de pagamento"""
 
     queryset = PaymentMethod.objects.all()
@@ -6896,7 +7169,7 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
         return self.serializer_class
 
 
-class OwnerTypeViewSet(viewsets.ModelViewSet):
+class OwnerTypeViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """ViewSet para gerenciamento de tipos de proprietário"""
 
     queryset = OwnerType.objects.all()
@@ -6925,7 +7198,7 @@ class OwnerTypeViewSet(viewsets.ModelViewSet):
 # CONTRACT MANAGEMENT VIEWSETS
 # =====================================================
 
-class ContractOwnerViewSet(viewsets.ModelViewSet):
+class ContractOwnerViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de proprietários de contratos
 
@@ -6947,6 +7220,10 @@ class ContractOwnerViewSet(viewsets.ModelViewSet):
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = ContractOwnerListSerializer
+    expandable_fields = {
+        'owner_type': OwnerTypeSerializer,
+        'created_by': UserSerializer,
+    }
 
     filterset_fields = {
         'contract': ['exact'],
@@ -7034,7 +7311,8 @@ class ContractOwnerViewSet(viewsets.ModelViewSet):
         operation_summary="Estatísticas de proprietários",
         responses={200: 'Estatísticas de proprietários'}
     )
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         queryset = self.get_queryset()
 
@@ -7075,7 +7353,7 @@ class ContractOwnerViewSet(viewsets.ModelViewSet):
         })
 
 
-class ContractProjectViewSet(viewsets.ModelViewSet):
+class ContractProjectViewSet(ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
     ViewSet para gerenciamento de projetos de contratos
 
@@ -7097,6 +7375,9 @@ class ContractProjectViewSet(viewsets.ModelViewSet):
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
     serializer_class = ContractProjectListSerializer
+    expandable_fields = {
+        'project': ProjectSummarySerializer,
+    }
 
     filterset_fields = {
         'contract': ['exact'],
@@ -7160,7 +7441,8 @@ class ContractProjectViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(contract_projects, many=True)
         return Response(serializer.data)
 
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], throttle_classes=[StatsRateThrottle])
+    @limit_concurrency('stats')
     def stats(self, request):
         queryset = self.get_queryset()
 
@@ -7199,9 +7481,9 @@ class ContractProjectViewSet(viewsets.ModelViewSet):
 # TASK RESOURCES VIEWSET
 # =====================================================
 
-class TaskResourceViewSet(viewsets.ModelViewSet):
+class TaskResourceViewSet(BulkWriteMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     """
-    ViewSet para gerenciamento de recursos de tarefas
+    ViewSet para gerenciamento de recursos de tarefas (templates)
 
     ENDPOINTS:
     - GET /api/projects/task-resources/ - Lista recursos com filtros
@@ -7209,20 +7491,282 @@ class TaskResourceViewSet(viewsets.ModelViewSet):
     - GET /api/projects/task-resources/{id}/ - Detalhes de recurso
     - PATCH /api/projects/task-resources/{id}/ - Atualizar recurso
     - DELETE /api/projects/task-resources/{id}/ - Remover recurso
-    - GET /api/projects/task-resources/by-task/{task_id}/ - Por tarefa
-    - GET /api/projects/task-resources/stats/ - Estatísticas
+    - POST /api/projects/task-resources/bulk/ - Criar recursos em lote
+    - PATCH /api/projects/task-resources/bulk/ - Atualizar recursos em lote
     """
 
-    # Assumindo que TaskResource será criado como modelo
-    queryset = None  # Será definido quando o modelo for criado
+    queryset = TaskResource.objects.select_related('model_task', 'created_by').all()
     filter_backends = [DjangoFilterBackend,
                        filters.SearchFilter, filters.OrderingFilter]
     pagination_class = CustomPageNumberPagination
-    serializer_class = None  # Será definido no serializers.py
+    serializer_class = TaskResourceListSerializer
+
+    # Filtros disponíveis
+    filterset_fields = {
+        'model_task': ['exact', 'in'],
+        'resource_type': ['exact', 'in'],
+        'is_mandatory': ['exact'],
+        'is_active': ['exact'],
+        'created_at': ['date', 'date__gte', 'date__lte'],
+    }
+
+    # Campos de busca
+    search_fields = [
+        'resource_name',
+        'unit_measure',
+        'model_task__task_name',
+    ]
+
+    # Ordenação
+    ordering_fields = [
+        'model_task',
+        'resource_name',
+        'resource_type',
+        'required_quantity',
+        'estimated_unit_cost',
+        'created_at',
+    ]
+    ordering = ['model_task', 'resource_type', 'resource_name']
 
     def get_permissions(self):
+        """Permissões por ação"""
         return [IsAuthenticated()]
 
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Listar recursos",
+        operation_description="Retorna uma lista paginada de recursos com filtros",
+        responses={200: TaskResourceListSerializer(many=True)}
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Detalhes do recurso",
+        operation_description="Retorna detalhes completos de um recurso específico",
+        responses={
+            200: TaskResourceDetailSerializer(),
+            404: 'Recurso não encontrado'
+        }
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Criar recurso",
+        operation_description="Cria um novo recurso",
+        request_body=TaskResourceCreateUpdateSerializer,
+        responses={
+            201: TaskResourceDetailSerializer(),
+            400: 'Dados inválidos'
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Atualizar recurso",
+        operation_description="Atualiza um recurso existente",
+        request_body=TaskResourceCreateUpdateSerializer,
+        responses={
+            200: TaskResourceDetailSerializer(),
+            400: 'Dados inválidos',
+            404: 'Recurso não encontrado'
+        }
+    )
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Atualizar recurso parcialmente",
+        operation_description="Atualiza parcialmente um recurso existente",
+        request_body=TaskResourceCreateUpdateSerializer,
+        responses={
+            200: TaskResourceDetailSerializer(),
+            400: 'Dados inválidos',
+            404: 'Recurso não encontrado'
+        }
+    )
+    def partial_update(self, request, *args, **kwargs):
+        return super().partial_update(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Excluir recurso",
+        operation_description="Exclui um recurso existente",
+        responses={
+            204: 'Recurso excluído com sucesso',
+            404: 'Recurso não encontrado'
+        }
+    )
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    def get_serializer_class(self):
+        """Retorna o serializer apropriado com base na ação"""
+        if self.action == 'retrieve':
+            return TaskResourceDetailSerializer
+        elif self.action in ['create', 'update', 'partial_update']:
+            return TaskResourceCreateUpdateSerializer
+        return self.serializer_class
+
+    def perform_create(self, serializer):
+        """Customizar criação - definir created_by"""
+        serializer.save(created_by=self.request.user)
+
+
+# =====================================================
+# TASK SPECIFICATIONS VIEWSET
+# =====================================================
+
+class TaskSpecificationViewSet(BulkWriteMixin, ConditionalGetMixin, EagerLoadingMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
+    """
+    ViewSet para especificações de recursos das tarefas de projeto
+
+    ENDPOINTS:
+    - GET /api/projects/task-specifications/ - Lista especificações com filtros
+    - POST /api/projects/task-specifications/ - Criar nova especificação
+    - GET /api/projects/task-specifications/{id}/ - Detalhes de especificação
+    - PATCH /api/projects/task-specifications/{id}/ - Atualizar especificação
+    - DELETE /api/projects/task-specifications/{id}/ - Remover especificação
+    - POST /api/projects/task-specifications/bulk/ - Criar especificações em lote
+    - PATCH /api/projects/task-specifications/bulk/ - Atualizar especificações em lote
+    """
+
+    queryset = TaskSpecification.objects.select_related(
+        'task_project', 'task_resource', 'created_by').all()
+    filter_backends = [DjangoFilterBackend,
+                       filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = CustomPageNumberPagination
+    serializer_class = TaskSpecificationListSerializer
+
+    # Filtros disponíveis
+    filterset_fields = {
+        'task_project': ['exact', 'in'],
+        'task_project__phase_project': ['exact'],
+        'task_resource': ['exact', 'in'],
+        'specification_status': ['exact', 'in'],
+        'created_at': ['date', 'date__gte', 'date__lte'],
+    }
+
+    # Campos de busca
+    search_fields = [
+        'task_project__task_name',
+        'task_resource__resource_name',
+        'supplier_used',
+        'usage_description',
+    ]
+
+    # Ordenação
+    ordering_fields = [
+        'task_project',
+        'task_resource',
+        'planned_quantity',
+        'actual_quantity_used',
+        'actual_total_cost',
+        'specification_status',
+        'created_at',
+    ]
+    ordering = ['task_project', 'task_resource']
+
+    def get_permissions(self):
+        """Permissões por ação"""
+        return [IsAuthenticated()]
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Listar especificações",
+        operation_description="Retorna uma lista paginada de especificações com filtros",
+        responses={200: TaskSpecificationListSerializer(many=True)}
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Detalhes da especificação",
+        operation_description="Retorna detalhes completos de uma especificação específica",
+        responses={
+            200: TaskSpecificationDetailSerializer(),
+            404: 'Especificação não encontrada'
+        }
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Criar especificação",
+        operation_description="Cria uma nova especificação",
+        request_body=TaskSpecificationCreateUpdateSerializer,
+        responses={
+            201: TaskSpecificationDetailSerializer(),
+            400: 'Dados inválidos'
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Atualizar especificação",
+        operation_description="Atualiza uma especificação existente",
+        request_body=TaskSpecificationCreateUpdateSerializer,
+        responses={
+            200: TaskSpecificationDetailSerializer(),
+            400: 'Dados inválidos',
+            404: 'Especificação não encontrada'
+        }
+    )
+    def update(self, request, *args, **kwargs):
+        return super().update(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Atualizar especificação parcialmente",
+        operation_description="Atualiza parcialmente uma especificação existente",
+        request_body=TaskSpecificationCreateUpdateSerializer,
+        responses={
+            200: TaskSpecificationDetailSerializer(),
+            400: 'Dados inválidos',
+            404: 'Especificação não encontrada'
+        }
+    )
+    def partial_update(self, request, *args, **kwargs):
+        return super().partial_update(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        tags=[API_TAGS['PROJECTS']],
+        operation_summary="Excluir especificação",
+        operation_description="Exclui uma especificação existente",
+        responses={
+            204: 'Especificação excluída com sucesso',
+            404: 'Especificação não encontrada'
+        }
+    )
+    def destroy(self, request, *args, **kwargs):
+        return super().destroy(request, *args, **kwargs)
+
+    def get_serializer_class(self):
+        """Retorna o serializer apropriado com base na ação"""
+        if self.action == 'retrieve':
+            return TaskSpecificationDetailSerializer
+        elif self.action in ['create', 'update', 'partial_update']:
+            return TaskSpecificationCreateUpdateSerializer
+        return self.serializer_class
+
+    def perform_create(self, serializer):
+        """Customizar criação - definir created_by"""
+        serializer.save(created_by=self.request.user)
+
+    def prepare_bulk_instance(self, instance, created):
+        """bulk_create/bulk_update não chamam save(): recalcular custo total"""
+        instance.calculate_actual_total_cost()
+
 
 __all__ = [
     'IncorporationViewSet',
@@ -7246,6 +7790,7 @@ __all__ = [
     'PaymentMethodViewSet',
     'OwnerTypeViewSet',
     'ContractOwnerViewSet',
-    'ContractProjectViewSet'  # ,
-    # 'TaskResourceViewSet',
+    'ContractProjectViewSet',
+    'TaskResourceViewSet',
+    'TaskSpecificationViewSet',
 ]
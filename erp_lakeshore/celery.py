@@ -12,13 +12,22 @@ app.autodiscover_tasks()
 # Configuração das tarefas periódicas
 app.conf.beat_schedule = {
     'check-signatures-every-hour': {
-        'task': 'integrations.tasks.sync_signature_activities_only',
-        'schedule': 60.0 * 60.0,  # 1 hora
-        'kwargs': {'hours_back': 2}  # Verificar últimas 2h
+        'task': 'integrations.tasks.fan_out_signature_sync',
+        'schedule': 60.0 * 60.0,  # 1 hora - todas as transações em aberto
     },
     'minimal-sync-every-6-hours': {
         'task': 'integrations.tasks.sync_minimal_transactions_task',
         'schedule': 60.0 * 60.0 * 6,  # 6 horas
+        'kwargs': {'incremental': True}  # Para na primeira página sem mudanças
+    },
+    'drain-webhook-inbox-every-minute': {
+        'task': 'integrations.tasks.drain_webhook_inbox',
+        'schedule': 60.0,  # Rede de segurança: o endpoint já agenda o drain
+    },
+    'full-listing-sync-daily': {
+        'task': 'integrations.tasks.sync_minimal_transactions_task',
+        'schedule': 60.0 * 60.0 * 24,  # 24 horas
+        'kwargs': {'incremental': False}  # Percorre todas as páginas
     },
 }
 
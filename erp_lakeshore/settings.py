@@ -42,6 +42,43 @@ ALLOWED_HOSTS = config(
     'ALLOWED_HOSTS', default='localhost,127.0.0.1,api.lakeshoredevelopmentfl.com,erp-lakeshore-alb-842248284.us-east-2.elb.amazonaws.com').split(',')
 
 BROKERMINT_API_KEY = config('BROKERMINT_API_KEY', default='')
+# Segredo HMAC dos webhooks (integrations.webhooks); vazio = webhooks recusados
+BROKERMINT_WEBHOOK_SECRET = config('BROKERMINT_WEBHOOK_SECRET', default='')
+
+# Cliente HTTP do Brokermint (integrations.brokermint_client)
+# Timeouts em segundos; retries com backoff exponencial + jitter em 5xx/429/conexão
+BROKERMINT_API_URL = config('BROKERMINT_API_URL', default='https://my.brokermint.com/api')
+BROKERMINT_CONNECT_TIMEOUT = config('BROKERMINT_CONNECT_TIMEOUT', default=5, cast=float)
+BROKERMINT_READ_TIMEOUT = config('BROKERMINT_READ_TIMEOUT', default=30, cast=float)
+BROKERMINT_MAX_RETRIES = config('BROKERMINT_MAX_RETRIES', default=4, cast=int)
+BROKERMINT_BACKOFF_BASE = config('BROKERMINT_BACKOFF_BASE', default=1.0, cast=float)
+BROKERMINT_BACKOFF_MAX = config('BROKERMINT_BACKOFF_MAX', default=30.0, cast=float)
+BROKERMINT_MAX_RETRY_AFTER = config('BROKERMINT_MAX_RETRY_AFTER', default=120.0, cast=float)
+BROKERMINT_POOL_SIZE = config('BROKERMINT_POOL_SIZE', default=10, cast=int)
+# Transações por página na listagem (count); 1000 é o máximo aceito pela API
+BROKERMINT_PAGE_SIZE = config('BROKERMINT_PAGE_SIZE', default=1000, cast=int)
+
+# Busca concorrente de detalhes (integrations.detail_fetcher)
+# Limite de taxa (req/s e rajada) por processo; concorrência = threads simultâneas
+BROKERMINT_RATE_LIMIT = config('BROKERMINT_RATE_LIMIT', default=5.0, cast=float)
+BROKERMINT_RATE_BURST = config('BROKERMINT_RATE_BURST', default=5, cast=int)
+BROKERMINT_DETAIL_CONCURRENCY = config('BROKERMINT_DETAIL_CONCURRENCY', default=4, cast=int)
+
+# Fan-out das atividades de assinatura (integrations.tasks.fan_out_signature_sync)
+# IDs de transação por requisição e limite de requisições por worker (Celery rate_limit)
+BROKERMINT_SIGNATURE_CHUNK_SIZE = config('BROKERMINT_SIGNATURE_CHUNK_SIZE', default=50, cast=int)
+BROKERMINT_SIGNATURE_TASK_RATE_LIMIT = config('BROKERMINT_SIGNATURE_TASK_RATE_LIMIT', default='30/m')
+
+# Histórico e retomada das sincronizações (integrations.sync_runs): checkpoint a cada N registros
+BROKERMINT_CHECKPOINT_EVERY = config('BROKERMINT_CHECKPOINT_EVERY', default=500, cast=int)
+# Single-flight (integrations.locks): lease em segundos, renovado a cada ttl/3 enquanto a execução roda;
+# o fan-out de assinaturas (chord, sem heartbeat) segura o lease até o callback ou até o seu ttl
+BROKERMINT_LOCK_TTL = config('BROKERMINT_LOCK_TTL', default=120, cast=int)
+BROKERMINT_SIGNATURE_LOCK_TTL = config('BROKERMINT_SIGNATURE_LOCK_TTL', default=3600, cast=int)
+# Leases no Redis (o mesmo do Celery por padrão), compartilhados por web, workers, beat e comandos.
+# Sem Redis só com BROKERMINT_LOCK_ALLOW_LOCAL (um único processo); senão ImproperlyConfigured
+BROKERMINT_LOCK_REDIS_URL = config('BROKERMINT_LOCK_REDIS_URL', default=config('REDIS_URL', default=''))
+BROKERMINT_LOCK_ALLOW_LOCAL = config('BROKERMINT_LOCK_ALLOW_LOCAL', default=False, cast=bool)
 
 
 # Em desenvolvimento, adicionar ngrok dinamicamente se necessário
@@ -66,6 +103,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",  # busca full-text / pg_trgm (core.search)
     "simple_history",
 
 
@@ -125,7 +163,12 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        'core.fast_json.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
@@ -133,7 +176,84 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
     ],
+
+    # Throttles por escopo (core.throttling), por usuário ou IP
+    'DEFAULT_THROTTLE_RATES': {
+        'reference': config('THROTTLE_RATE_REFERENCE', default='120/min'),
+        'public_form': config('THROTTLE_RATE_PUBLIC_FORM', default='10/min'),
+        'stats': config('THROTTLE_RATE_STATS', default='30/min'),
+        'export': config('THROTTLE_RATE_EXPORT', default='10/min'),
+    },
+}
+
+# Concorrência das ações pesadas (core.throttling.limit_concurrency)
+# Requisições simultâneas por escopo; acima disso 429 com Retry-After (segundos).
+# Uma chave por vaga no cache default (Redis: CACHE_URL ou REDIS_URL), global entre os workers.
+# CONCURRENCY_SLOT_TIMEOUT: vaga não liberada expira após esse tempo (cobrir a requisição mais longa)
+CONCURRENCY_LIMITS = {
+    'stats': config('STATS_MAX_CONCURRENCY', default=2, cast=int),
+    'export': config('EXPORT_MAX_CONCURRENCY', default=1, cast=int),
 }
+CONCURRENCY_RETRY_AFTER = config('CONCURRENCY_RETRY_AFTER', default=5, cast=int)
+CONCURRENCY_SLOT_TIMEOUT = config('CONCURRENCY_SLOT_TIMEOUT', default=120, cast=int)
+
+# Paginação (core.pagination)
+# Limite de page_size aceito via query param (page number e cursor)
+PAGINATION_MAX_PAGE_SIZE = config('PAGINATION_MAX_PAGE_SIZE', default=200, cast=int)
+
+# Eager loading automático (core.eager_loading)
+# Loga campos de serializers que não puderam ser planejados (N+1 em potencial)
+EAGER_LOADING_DEBUG = config('EAGER_LOADING_DEBUG', default=False, cast=bool)
+
+# Escrita em lote (core.bulk)
+# Máximo de itens aceitos por requisição em POST/PATCH .../bulk/
+BULK_MAX_ITEMS = config('BULK_MAX_ITEMS', default=1000, cast=int)
+
+# Leitura em lote (core.batch)
+# Máximo de sub-requests e orçamento total de queries por POST /api/batch/
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+BATCH_MAX_QUERIES = config('BATCH_MAX_QUERIES', default=500, cast=int)
+
+# Busca global (core.search_documents)
+# Resultados por página, máximo permitido em ?limit= e candidatos ranqueados por busca
+SEARCH_RESULTS_LIMIT = config('SEARCH_RESULTS_LIMIT', default=10, cast=int)
+SEARCH_MAX_RESULTS = config('SEARCH_MAX_RESULTS', default=50, cast=int)
+SEARCH_CANDIDATES = config('SEARCH_CANDIDATES', default=200, cast=int)
+
+# Cache
+# Redis compartilhado entre os workers web, o Celery e os comandos: versão dos
+# dados de referência, throttles/vagas de concorrência, cobertura das
+# assinaturas, coalescência do inbox e leases das sincronizações.
+# Sem CACHE_URL usa o mesmo Redis do Celery (REDIS_URL); sem nenhum dos dois
+# (ex: testes locais) o cache é local ao processo
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_URL = config('CACHE_URL', default=REDIS_URL)
+DETAIL_CACHE_URL = config('DETAIL_CACHE_URL', default=REDIS_URL)
+CACHES = {
+    'default': (
+        {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}
+        if CACHE_URL else
+        {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    ),
+    # Respostas de detalhe (core.detail_cache): por padrão o Redis do Celery
+    # (REDIS_URL), para que a invalidação de um worker alcance os outros;
+    # DETAIL_CACHE_URL separa em outro Redis. LocMem só sem Redis configurado
+    'detail': (
+        {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': DETAIL_CACHE_URL}
+        if DETAIL_CACHE_URL else
+        {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'detail'}
+    ),
+}
+
+# Cache de choices/form-data (core.reference_cache), em segundos
+REFERENCE_CACHE_TIMEOUT = config('REFERENCE_CACHE_TIMEOUT', default=60 * 60 * 24, cast=int)
+
+# Validade máxima do mapa code -> id de cada processo (core.resolver), em segundos
+RESOLVER_TABLE_TTL = config('RESOLVER_TABLE_TTL', default=5 * 60, cast=int)
+
+# Cache de detalhe de Lead/Project/Contract (core.detail_cache), em segundos
+DETAIL_CACHE_ALIAS = 'detail'
+DETAIL_CACHE_TIMEOUT = config('DETAIL_CACHE_TIMEOUT', default=60 * 60, cast=int)
 
 # Configurações do Swagger/OpenAPI
 SWAGGER_SETTINGS = {